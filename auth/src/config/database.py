@@ -1,12 +1,30 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
 from config import get_settings
 
 settings = get_settings()
 
+# Auth сервис не подключает пакет shared, поэтому параметры пула задаются здесь
+# так же, как в shared.utils.database.create_database_engine
+connect_args = {"application_name": "auth-service"}
+if settings.db_statement_timeout_ms and not settings.db_pooler_mode:
+    connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+
+pool_options = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    echo=settings.debug
+)
+
 engine = create_engine(
     settings.database_url,
-    echo=settings.debug
+    connect_args=connect_args,
+    **pool_options
 )
 
 SessionLocal = sessionmaker(
@@ -16,6 +34,37 @@ SessionLocal = sessionmaker(
 )
 
 
+# Асинхронный движок для async def эндпоинтов: запросы через asyncpg не блокируют event loop
+async_server_settings = {"application_name": "auth-service"}
+async_connect_args = {"server_settings": async_server_settings}
+if settings.db_pooler_mode:
+    # Подготовленные выражения не переживают смену серверного соединения в PgBouncer
+    async_connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+elif settings.db_statement_timeout_ms:
+    async_server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+
+async_engine = create_async_engine(
+    make_url(settings.database_url).set(drivername="postgresql+asyncpg"),
+    connect_args=async_connect_args,
+    **pool_options
+)
+
+
+if settings.db_pooler_mode and settings.db_statement_timeout_ms:
+    # В режиме транзакций параметры запуска недоступны - таймаут на каждую транзакцию
+    @event.listens_for(engine, "begin")
+    @event.listens_for(async_engine.sync_engine, "begin")
+    def set_statement_timeout(connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {settings.db_statement_timeout_ms}")
+
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 def get_db() -> Session:
     db = SessionLocal()
     try:
@@ -24,6 +73,21 @@ def get_db() -> Session:
         db.close()
 
 
+async def get_async_db() -> AsyncSession:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     from entities.database_models import Base
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+
+
+def get_pool_stats() -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0)
+    }
\ No newline at end of file
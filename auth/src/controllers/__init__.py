@@ -1,3 +1,3 @@
-from controllers import auth_controller, user_controller
+from controllers import auth_controller, user_controller, jwks_controller
 
-__all__ = ["auth_controller", "user_controller"] 
\ No newline at end of file
+__all__ = ["auth_controller", "user_controller", "jwks_controller"] 
\ No newline at end of file
@@ -1,13 +1,20 @@
+from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from entities.user import UserCreate, UserResponse
-from entities.token import Token
+from entities.token import Token, RevocationList
 from pydantic import BaseModel
 from use_cases.register_user_use_case import RegisterUserUseCase, RegisterUserRequest
 from use_cases.authenticate_user_use_case import AuthenticateUserUseCase, AuthenticateUserRequest
+from use_cases.refresh_token_use_case import RefreshTokenUseCase, RefreshTokenRequest
+from use_cases.logout_use_case import LogoutUseCase, LogoutRequest
 from repositories.user_repository import UserRepository
+from repositories.token_repository import TokenRepository
 from config.database import get_db
+from utils.password_utils import PasswordHasherBusyError
+from utils.token_metrics import token_metrics
 
 class LoginRequest(BaseModel):
     email: str
@@ -44,6 +51,12 @@ def register_user(
             first_name=response.first_name,
             last_name=response.last_name
         )
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -57,17 +70,75 @@ def login_user(
     db: Session = Depends(get_db)
 ):
     user_repository = UserRepository(db)
-    authenticate_use_case = AuthenticateUserUseCase(user_repository)
+    token_repository = TokenRepository(db)
+    authenticate_use_case = AuthenticateUserUseCase(user_repository, token_repository)
     
     try:
         request = AuthenticateUserRequest(email=login_data.email, password=login_data.password)
         response = authenticate_use_case.execute(request)
         return Token(
             access_token=response.access_token,
-            token_type=response.token_type
+            token_type=response.token_type,
+            refresh_token=response.refresh_token,
+            expires_in=response.expires_in
+        )
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
         )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e)
-        ) 
\ No newline at end of file
+        )
+
+
+@router.post("/refresh", response_model=Token)
+def refresh_token(
+    refresh_data: RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    # Обмен refresh токена - поиск по индексу вместо проверки bcrypt
+    refresh_use_case = RefreshTokenUseCase(UserRepository(db), TokenRepository(db))
+    
+    try:
+        return refresh_use_case.execute(refresh_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout_user(
+    logout_data: LogoutRequest,
+    db: Session = Depends(get_db)
+):
+    logout_use_case = LogoutUseCase(TokenRepository(db))
+    
+    try:
+        logout_use_case.execute(logout_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+
+
+@router.get("/revocations", response_model=RevocationList)
+def list_revocations(
+    since: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """Revoked access tokens that have not expired yet, for bulk sync by other services"""
+    server_time = datetime.utcnow()
+    revoked = TokenRepository(db).list_revoked(since)
+    return RevocationList(revoked=revoked, server_time=server_time)
+
+
+@router.get("/stats")
+def get_token_stats():
+    return token_metrics.get_stats()
\ No newline at end of file
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response
+
+from utils.token_utils import get_key_ring
+
+router = APIRouter(tags=["authentication"])
+
+
+@router.get("/.well-known/jwks.json")
+def get_jwks(response: Response):
+    # Клиенты кэшируют набор ключей и перечитывают его при встрече неизвестного kid
+    response.headers["Cache-Control"] = "public, max-age=300"
+    key_ring = get_key_ring()
+    if key_ring is None:
+        return {"keys": []}
+    return key_ring.jwks()
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
 
-from entities.user import UserResponse, UserUpdate
+from entities.user import UserResponse, UserUpdate, UserBatchRequest
 from repositories.user_repository import UserRepository
 from config.database import get_db
 
@@ -45,6 +45,29 @@ def list_users(
     ]
 
 
+@router.post("/batch", response_model=List[UserResponse])
+def get_users_batch(
+    batch_request: UserBatchRequest,
+    db: Session = Depends(get_db)
+):
+    # Ненайденные id просто отсутствуют в ответе
+    user_repository = UserRepository(db)
+    users = user_repository.get_by_ids(batch_request.ids)
+    return [
+        UserResponse(
+            id=str(user.id),
+            email=user.email,
+            username=user.username,
+            role=user.role,
+            is_active=user.is_active,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            created_at=user.created_at,
+            updated_at=user.updated_at
+        ) for user in users
+    ]
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: UUID,
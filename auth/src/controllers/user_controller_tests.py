@@ -1,5 +1,6 @@
 import pytest
 from unittest.mock import MagicMock
+from uuid import uuid4
 from fastapi.testclient import TestClient
 from entities.user import UserRole
 from main import app
@@ -76,4 +77,16 @@ def test_get_current_user_not_implemented(f_test_client):
     
     assert response.status_code == 501
     data = response.json()
-    assert "Not implemented yet" in data["detail"] 
\ No newline at end of file
+    assert "Not implemented yet" in data["detail"]
+
+
+def test_get_users_batch_too_many_ids(f_test_client):
+    response = f_test_client.post("/users/batch", json={"ids": [str(uuid4()) for _ in range(501)]})
+    
+    assert response.status_code == 422
+
+
+def test_get_users_batch_empty_ids(f_test_client):
+    response = f_test_client.post("/users/batch", json={"ids": []})
+    
+    assert response.status_code == 422
@@ -21,4 +21,27 @@ class UserModel(Base):
     first_name = Column(String)
     last_name = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
+
+class RefreshTokenModel(Base):
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Все токены, выпущенные ротацией от одного входа, принадлежат одному семейству
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    # Храним только хэш: утечка таблицы не дает готовых токенов
+    token_hash = Column(String, unique=True, nullable=False)
+    access_jti = Column(String, nullable=False)
+    access_expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RevokedTokenModel(Base):
+    __tablename__ = "revoked_tokens"
+    
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
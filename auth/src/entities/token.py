@@ -1,14 +1,38 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from uuid import UUID
+from datetime import datetime
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
 
 
 class TokenData(BaseModel):
     user_id: Optional[UUID] = None
     username: Optional[str] = None
-    role: Optional[str] = None 
\ No newline at end of file
+    role: Optional[str] = None
+
+
+class RefreshToken(BaseModel):
+    id: UUID
+    family_id: UUID
+    user_id: UUID
+    access_jti: str
+    access_expires_at: datetime
+    expires_at: datetime
+    revoked_at: Optional[datetime] = None
+
+
+class RevokedToken(BaseModel):
+    jti: str
+    expires_at: datetime
+
+
+class RevocationList(BaseModel):
+    revoked: List[RevokedToken]
+    # Значение since для следующей синхронизации
+    server_time: datetime
\ No newline at end of file
@@ -11,7 +11,7 @@ from uuid import UUID
 from datetime import datetime
 
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Optional, List
 from enum import Enum
 from uuid import UUID, uuid4
 from datetime import datetime
@@ -70,4 +70,8 @@ class UserResponse(BaseModel):
     first_name: Optional[str]
     last_name: Optional[str]
     created_at: Optional[datetime] = None
-    updated_at: Optional[datetime] = None 
\ No newline at end of file
+    updated_at: Optional[datetime] = None
+
+
+class UserBatchRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=500)
\ No newline at end of file
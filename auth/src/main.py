@@ -1,18 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import structlog
 
 from config import get_settings, setup_logging
-from config.database import create_tables, engine
-from controllers import auth_controller, user_controller
+from config.database import create_tables, engine, get_pool_stats
+from controllers import auth_controller, user_controller, jwks_controller
 from admin import setup_admin
+from utils.password_utils import configure_password_hasher, get_password_hasher
+from utils.token_utils import get_key_ring
 
 settings = get_settings()
 
 app = FastAPI(
     title="Auth Service",
     description="Authentication and authorization service",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -28,19 +32,33 @@ logger = structlog.get_logger()
 
 app.include_router(auth_controller.router)
 app.include_router(user_controller.router)
+app.include_router(jwks_controller.router)
 
 @app.on_event("startup")
 def startup_event():
     logger.info("Auth service starting up")
     create_tables()
     setup_admin(app, engine)
+    configure_password_hasher(
+        rounds=settings.bcrypt_rounds,
+        workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+        queue_timeout_seconds=settings.password_hash_queue_timeout_seconds
+    )
+    # Загружаем ключи подписи сразу, чтобы ошибка в файле ключа была видна при старте
+    get_key_ring()
     logger.info("Database tables created")
     logger.info("Admin panel setup complete")
 
 @app.on_event("shutdown")
 def shutdown_event():
     logger.info("Auth service shutting down")
+    get_password_hasher().shutdown()
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy", "service": "auth"} 
\ No newline at end of file
+    return {"status": "healthy", "service": "auth"}
+
+@app.get("/health/db")
+def database_pool_health():
+    return get_pool_stats()
\ No newline at end of file
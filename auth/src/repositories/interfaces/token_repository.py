@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional, List
+from uuid import UUID
+
+from entities.token import RefreshToken, RevokedToken
+
+
+class ITokenRepository(ABC):
+    @abstractmethod
+    def create_refresh_token(self, user_id: UUID, family_id: UUID, token_hash: str, access_jti: str,
+                             access_expires_at: datetime, expires_at: datetime) -> RefreshToken:
+        pass
+    
+    @abstractmethod
+    def get_refresh_token(self, token_hash: str) -> Optional[RefreshToken]:
+        pass
+    
+    @abstractmethod
+    def revoke_refresh_token(self, token_id: UUID) -> bool:
+        """Atomically revoke an active token. Returns False if it was already revoked"""
+        pass
+    
+    @abstractmethod
+    def revoke_family(self, family_id: UUID) -> int:
+        """Revoke every token of the family together with access tokens still alive"""
+        pass
+    
+    @abstractmethod
+    def list_revoked(self, since: Optional[datetime] = None) -> List[RevokedToken]:
+        pass
@@ -14,6 +14,10 @@ class IUserRepository(ABC):
     def get_by_id(self, user_id: UUID) -> Optional[User]:
         pass
     
+    @abstractmethod
+    def get_by_ids(self, user_ids: List[UUID]) -> List[User]:
+        pass
+    
     @abstractmethod
     def get_by_email(self, email: str) -> Optional[User]:
         pass
@@ -26,6 +30,10 @@ class IUserRepository(ABC):
     def update(self, user_id: UUID, user_data: UserUpdate) -> Optional[User]:
         pass
     
+    @abstractmethod
+    def update_password_hash(self, user_id: UUID, hashed_password: str) -> None:
+        pass
+    
     @abstractmethod
     def delete(self, user_id: UUID) -> bool:
         pass
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Optional, List
+from uuid import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
+
+from entities.token import RefreshToken, RevokedToken
+from entities.database_models import RefreshTokenModel, RevokedTokenModel
+from repositories.interfaces.token_repository import ITokenRepository
+
+
+class TokenRepository(ITokenRepository):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def create_refresh_token(self, user_id: UUID, family_id: UUID, token_hash: str, access_jti: str,
+                             access_expires_at: datetime, expires_at: datetime) -> RefreshToken:
+        db_token = RefreshTokenModel(
+            user_id=user_id,
+            family_id=family_id,
+            token_hash=token_hash,
+            access_jti=access_jti,
+            access_expires_at=access_expires_at,
+            expires_at=expires_at
+        )
+
+        self.session.add(db_token)
+        self.session.commit()
+
+        return self._to_entity(db_token)
+
+    def get_refresh_token(self, token_hash: str) -> Optional[RefreshToken]:
+        db_token = self.session.execute(
+            select(RefreshTokenModel).where(RefreshTokenModel.token_hash == token_hash)
+        ).scalar_one_or_none()
+
+        if not db_token:
+            return None
+
+        return self._to_entity(db_token)
+
+    def revoke_refresh_token(self, token_id: UUID) -> bool:
+        # Условный UPDATE: из двух одновременных обменов одного токена выигрывает только один
+        result = self.session.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.id == token_id, RefreshTokenModel.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+        self.session.commit()
+        return result.rowcount == 1
+
+    def revoke_family(self, family_id: UUID) -> int:
+        now = datetime.utcnow()
+        self.session.execute(
+            update(RefreshTokenModel)
+            .where(RefreshTokenModel.family_id == family_id, RefreshTokenModel.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+
+        # Access токены семейства еще могут быть действительны - вносим их в список отзыва
+        rows = self.session.execute(
+            select(RefreshTokenModel.access_jti, RefreshTokenModel.access_expires_at)
+            .where(RefreshTokenModel.family_id == family_id, RefreshTokenModel.access_expires_at > now)
+        ).all()
+        if rows:
+            self.session.execute(
+                insert(RevokedTokenModel)
+                .values([{"jti": jti, "expires_at": expires_at, "revoked_at": now} for jti, expires_at in rows])
+                .on_conflict_do_nothing(index_elements=[RevokedTokenModel.jti])
+            )
+
+        # Истекшие записи больше не нужны: такой токен отклонит проверка exp
+        self.session.execute(delete(RevokedTokenModel).where(RevokedTokenModel.expires_at <= now))
+        self.session.commit()
+        return len(rows)
+
+    def list_revoked(self, since: Optional[datetime] = None) -> List[RevokedToken]:
+        query = select(RevokedTokenModel.jti, RevokedTokenModel.expires_at).where(
+            RevokedTokenModel.expires_at > datetime.utcnow()
+        )
+        if since is not None:
+            query = query.where(RevokedTokenModel.revoked_at >= since)
+
+        return [RevokedToken(jti=jti, expires_at=expires_at) for jti, expires_at in self.session.execute(query)]
+
+    def _to_entity(self, db_token: RefreshTokenModel) -> RefreshToken:
+        return RefreshToken(
+            id=db_token.id,
+            family_id=db_token.family_id,
+            user_id=db_token.user_id,
+            access_jti=db_token.access_jti,
+            access_expires_at=db_token.access_expires_at,
+            expires_at=db_token.expires_at,
+            revoked_at=db_token.revoked_at
+        )
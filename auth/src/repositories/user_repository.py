@@ -26,10 +26,9 @@ class UserRepository(IUserRepository):
         )
         
         self.session.add(db_user)
-        self.session.commit()
-        self.session.refresh(db_user)
+        self.session.flush()
         
-        return User(
+        result = User(
             id=db_user.id,
             email=db_user.email,
             username=db_user.username,
@@ -39,6 +38,8 @@ class UserRepository(IUserRepository):
             first_name=db_user.first_name,
             last_name=db_user.last_name
         )
+        self.session.commit()
+        return result
     
     def get_by_id(self, user_id: UUID) -> Optional[User]:
         db_user = self.session.query(UserModel).filter(UserModel.id == user_id).first()
@@ -57,6 +58,29 @@ class UserRepository(IUserRepository):
             last_name=db_user.last_name
         )
     
+    def get_by_ids(self, user_ids: List[UUID]) -> List[User]:
+        if not user_ids:
+            return []
+        
+        # Один запрос с IN вместо запроса на каждого пользователя
+        db_users = self.session.execute(
+            select(UserModel).where(UserModel.id.in_(set(user_ids)))
+        ).scalars().all()
+        
+        return [
+            User(
+                id=db_user.id,
+                email=db_user.email,
+                username=db_user.username,
+                hashed_password=db_user.hashed_password,
+                role=db_user.role,
+                is_active=db_user.is_active,
+                first_name=db_user.first_name,
+                last_name=db_user.last_name
+            )
+            for db_user in db_users
+        ]
+    
     def get_by_email(self, email: str) -> Optional[User]:
         db_user = self.session.query(UserModel).filter(UserModel.email == email).first()
         
@@ -92,7 +116,7 @@ class UserRepository(IUserRepository):
         )
     
     def update(self, user_id: UUID, user_data: UserUpdate) -> Optional[User]:
-        db_user = self.session.query(UserModel).filter(UserModel.id == user_id).first()
+        db_user = self.session.get(UserModel, UUID(str(user_id)))
         
         if not db_user:
             return None
@@ -110,10 +134,9 @@ class UserRepository(IUserRepository):
         if user_data.last_name is not None:
             db_user.last_name = user_data.last_name
         
-        self.session.commit()
-        self.session.refresh(db_user)
+        self.session.flush()
         
-        return User(
+        result = User(
             id=db_user.id,
             email=db_user.email,
             username=db_user.username,
@@ -123,9 +146,17 @@ class UserRepository(IUserRepository):
             first_name=db_user.first_name,
             last_name=db_user.last_name
         )
+        self.session.commit()
+        return result
+    
+    def update_password_hash(self, user_id: UUID, hashed_password: str) -> None:
+        self.session.execute(
+            update(UserModel).where(UserModel.id == user_id).values(hashed_password=hashed_password)
+        )
+        self.session.commit()
     
     def delete(self, user_id: UUID) -> bool:
-        db_user = self.session.query(UserModel).filter(UserModel.id == user_id).first()
+        db_user = self.session.get(UserModel, UUID(str(user_id)))
         if not db_user:
             return False
         
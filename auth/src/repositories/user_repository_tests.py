@@ -51,6 +51,18 @@ def test_get_by_id_not_found(f_user_repository: UserRepository):
     assert user is None
 
 
+def test_get_by_ids(f_user_repository: UserRepository, f_user_create_data: UserCreate):
+    created_user = f_user_repository.create(f_user_create_data)
+    
+    users = f_user_repository.get_by_ids([created_user.id, uuid4(), created_user.id])
+    
+    assert [user.id for user in users] == [created_user.id]
+
+
+def test_get_by_ids_empty(f_user_repository: UserRepository):
+    assert f_user_repository.get_by_ids([]) == []
+
+
 def test_get_by_email(f_user_repository: UserRepository, f_user_create_data: UserCreate):
     created_user = f_user_repository.create(f_user_create_data)
     user = f_user_repository.get_by_email(created_user.email)
@@ -1,9 +1,11 @@
+from typing import Optional
 from pydantic import BaseModel, EmailStr, Field
 from entities.user import User
-from entities.token import Token
 from repositories.interfaces.user_repository import IUserRepository
-from utils.password_utils import verify_password
-from utils.token_utils import create_access_token
+from repositories.interfaces.token_repository import ITokenRepository
+from use_cases.refresh_token_use_case import issue_token_pair
+from utils.password_utils import verify_password, needs_rehash, hash_password
+from utils.token_metrics import token_metrics
 
 
 class AuthenticateUserRequest(BaseModel):
@@ -14,11 +16,14 @@ class AuthenticateUserRequest(BaseModel):
 class AuthenticateUserResponse(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
 
 
 class AuthenticateUserUseCase:
-    def __init__(self, user_repository: IUserRepository):
+    def __init__(self, user_repository: IUserRepository, token_repository: ITokenRepository):
         self.user_repository = user_repository
+        self.token_repository = token_repository
     
     def execute(self, request: AuthenticateUserRequest) -> AuthenticateUserResponse:
         user = self.user_repository.get_by_email(request.email)
@@ -31,15 +36,16 @@ class AuthenticateUserUseCase:
         if not user.is_active:
             raise ValueError("User account is disabled")
         
-        # Включаем роль пользователя в токен
-        access_token = create_access_token(data={
-            "sub": str(user.id),
-            "email": user.email,
-            "role": user.role
-        })
-        token = Token(access_token=access_token, token_type="bearer")
+        # Стоимость bcrypt изменилась - пароль известен только сейчас, перехэшируем
+        if needs_rehash(user.hashed_password):
+            self.user_repository.update_password_hash(user.id, hash_password(request.password))
+        
+        token = issue_token_pair(user, self.token_repository)
+        token_metrics.record_login()
         
         return AuthenticateUserResponse(
             access_token=token.access_token,
-            token_type=token.token_type
-        ) 
\ No newline at end of file
+            token_type=token.token_type,
+            refresh_token=token.refresh_token,
+            expires_in=token.expires_in
+        )
\ No newline at end of file
@@ -11,8 +11,18 @@ def m_user_repository():
 
 
 @pytest.fixture
-def f_authenticate_use_case(m_user_repository):
-    return AuthenticateUserUseCase(m_user_repository)
+def m_token_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def f_authenticate_use_case(m_user_repository, m_token_repository):
+    return AuthenticateUserUseCase(m_user_repository, m_token_repository)
+
+
+@pytest.fixture
+def f_token():
+    return Token(access_token="test_token", token_type="bearer", refresh_token="test_refresh_token", expires_in=300)
 
 
 @pytest.fixture
@@ -35,12 +45,12 @@ def f_authenticate_request():
     )
 
 
-def test_authenticate_user_success(f_authenticate_use_case, m_user_repository, f_mock_user, f_authenticate_request):
+def test_authenticate_user_success(f_authenticate_use_case, m_user_repository, f_mock_user, f_authenticate_request, f_token):
     # Mock repository and password verification
     m_user_repository.get_by_email.return_value = f_mock_user
     
     with patch('use_cases.authenticate_user_use_case.verify_password', return_value=True):
-        with patch('use_cases.authenticate_user_use_case.create_access_token', return_value="test_token"):
+        with patch('use_cases.authenticate_user_use_case.issue_token_pair', return_value=f_token):
             # Execute use case
             result = f_authenticate_use_case.execute(f_authenticate_request)
     
@@ -50,6 +60,7 @@ def test_authenticate_user_success(f_authenticate_use_case, m_user_repository, f
     # Verify result
     assert result.access_token == "test_token"
     assert result.token_type == "bearer"
+    assert result.refresh_token == "test_refresh_token"
 
 
 def test_authenticate_user_not_found(f_authenticate_use_case, m_user_repository, f_authenticate_request):
@@ -93,4 +104,28 @@ def test_authenticate_user_inactive_account(f_authenticate_use_case, m_user_repo
             f_authenticate_use_case.execute(f_authenticate_request)
     
     # Verify repository calls
-    m_user_repository.get_by_email.assert_called_once_with(f_authenticate_request.email) 
\ No newline at end of file
+    m_user_repository.get_by_email.assert_called_once_with(f_authenticate_request.email)
+
+
+def test_authenticate_user_rehashes_outdated_password(f_authenticate_use_case, m_user_repository, f_mock_user, f_authenticate_request, f_token):
+    m_user_repository.get_by_email.return_value = f_mock_user
+    
+    with patch('use_cases.authenticate_user_use_case.verify_password', return_value=True), \
+         patch('use_cases.authenticate_user_use_case.needs_rehash', return_value=True), \
+         patch('use_cases.authenticate_user_use_case.hash_password', return_value="new_hash"), \
+         patch('use_cases.authenticate_user_use_case.issue_token_pair', return_value=f_token):
+        f_authenticate_use_case.execute(f_authenticate_request)
+    
+    m_user_repository.update_password_hash.assert_called_once_with(f_mock_user.id, "new_hash")
+
+
+def test_authenticate_user_keeps_current_password_hash(f_authenticate_use_case, m_user_repository, f_mock_user, f_authenticate_request, f_token):
+    m_user_repository.get_by_email.return_value = f_mock_user
+    
+    with patch('use_cases.authenticate_user_use_case.verify_password', return_value=True), \
+         patch('use_cases.authenticate_user_use_case.needs_rehash', return_value=False), \
+         patch('use_cases.authenticate_user_use_case.issue_token_pair', return_value=f_token):
+        f_authenticate_use_case.execute(f_authenticate_request)
+    
+    m_user_repository.update_password_hash.assert_not_called()
+
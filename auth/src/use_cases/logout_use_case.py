@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+from repositories.interfaces.token_repository import ITokenRepository
+from utils.token_utils import hash_refresh_token
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1)
+
+
+class LogoutUseCase:
+    def __init__(self, token_repository: ITokenRepository):
+        self.token_repository = token_repository
+    
+    def execute(self, request: LogoutRequest) -> None:
+        stored_token = self.token_repository.get_refresh_token(hash_refresh_token(request.refresh_token))
+        if not stored_token:
+            raise ValueError("Invalid refresh token")
+        
+        # Отзываем всю цепочку ротации этого входа и действующий access токен
+        self.token_repository.revoke_family(stored_token.family_id)
@@ -0,0 +1,84 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+import structlog
+
+from entities.user import User
+from entities.token import Token
+from repositories.interfaces.user_repository import IUserRepository
+from repositories.interfaces.token_repository import ITokenRepository
+from utils.token_utils import create_access_token, create_refresh_token, hash_refresh_token
+from utils.token_metrics import token_metrics
+from config import get_settings
+
+settings = get_settings()
+logger = structlog.get_logger(__name__)
+
+
+def issue_token_pair(user: User, token_repository: ITokenRepository, family_id: Optional[UUID] = None) -> Token:
+    """Access token plus a refresh token stored in the given (or a new) family"""
+    now = datetime.utcnow()
+    access_expires_delta = timedelta(minutes=settings.access_token_expire_minutes)
+    access_jti = uuid.uuid4().hex
+    
+    # Включаем роль пользователя в токен
+    access_token = create_access_token(data={
+        "sub": str(user.id),
+        "email": user.email,
+        "role": user.role,
+        "jti": access_jti
+    }, expires_delta=access_expires_delta)
+    
+    refresh_token = create_refresh_token()
+    token_repository.create_refresh_token(
+        user_id=user.id,
+        family_id=family_id or uuid.uuid4(),
+        token_hash=hash_refresh_token(refresh_token),
+        access_jti=access_jti,
+        access_expires_at=now + access_expires_delta,
+        expires_at=now + timedelta(days=settings.refresh_token_expire_days)
+    )
+    
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        refresh_token=refresh_token,
+        expires_in=int(access_expires_delta.total_seconds())
+    )
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1)
+
+
+class RefreshTokenUseCase:
+    def __init__(self, user_repository: IUserRepository, token_repository: ITokenRepository):
+        self.user_repository = user_repository
+        self.token_repository = token_repository
+    
+    def execute(self, request: RefreshTokenRequest) -> Token:
+        stored_token = self.token_repository.get_refresh_token(hash_refresh_token(request.refresh_token))
+        if not stored_token or stored_token.expires_at <= datetime.utcnow():
+            token_metrics.record_refresh_rejected()
+            raise ValueError("Invalid refresh token")
+        
+        # Повторное предъявление уже обмененного токена означает утечку:
+        # отзываем все семейство, включая выданные по нему access токены
+        if stored_token.revoked_at is not None or not self.token_repository.revoke_refresh_token(stored_token.id):
+            self.token_repository.revoke_family(stored_token.family_id)
+            token_metrics.record_refresh_rejected(reuse=True)
+            logger.warning("Refresh token reuse detected", user_id=str(stored_token.user_id),
+                           family_id=str(stored_token.family_id))
+            raise ValueError("Invalid refresh token")
+        
+        user = self.user_repository.get_by_id(stored_token.user_id)
+        if not user or not user.is_active:
+            self.token_repository.revoke_family(stored_token.family_id)
+            token_metrics.record_refresh_rejected()
+            raise ValueError("User account is disabled")
+        
+        token = issue_token_pair(user, self.token_repository, stored_token.family_id)
+        token_metrics.record_refresh()
+        return token
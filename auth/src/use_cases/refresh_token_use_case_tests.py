@@ -0,0 +1,115 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from uuid import uuid4
+from entities.user import UserRole
+from entities.token import RefreshToken
+from use_cases.refresh_token_use_case import RefreshTokenUseCase, RefreshTokenRequest
+from use_cases.logout_use_case import LogoutUseCase, LogoutRequest
+from utils.token_utils import hash_refresh_token, verify_token
+
+
+@pytest.fixture
+def m_user_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def m_token_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def f_refresh_use_case(m_user_repository, m_token_repository):
+    return RefreshTokenUseCase(m_user_repository, m_token_repository)
+
+
+@pytest.fixture
+def f_mock_user():
+    user = MagicMock()
+    user.id = uuid4()
+    user.email = "test@example.com"
+    user.role = UserRole.CLIENT
+    user.is_active = True
+    return user
+
+
+@pytest.fixture
+def f_stored_token(f_mock_user):
+    return RefreshToken(
+        id=uuid4(),
+        family_id=uuid4(),
+        user_id=f_mock_user.id,
+        access_jti="old_jti",
+        access_expires_at=datetime.utcnow() + timedelta(minutes=5),
+        expires_at=datetime.utcnow() + timedelta(days=1)
+    )
+
+
+def test_refresh_rotates_token_within_family(f_refresh_use_case, m_user_repository, m_token_repository, f_mock_user, f_stored_token):
+    m_token_repository.get_refresh_token.return_value = f_stored_token
+    m_token_repository.revoke_refresh_token.return_value = True
+    m_user_repository.get_by_id.return_value = f_mock_user
+    
+    result = f_refresh_use_case.execute(RefreshTokenRequest(refresh_token="old_refresh_token"))
+    
+    m_token_repository.get_refresh_token.assert_called_once_with(hash_refresh_token("old_refresh_token"))
+    m_token_repository.revoke_refresh_token.assert_called_once_with(f_stored_token.id)
+    created = m_token_repository.create_refresh_token.call_args.kwargs
+    assert created["family_id"] == f_stored_token.family_id
+    assert created["token_hash"] == hash_refresh_token(result.refresh_token)
+    assert result.refresh_token != "old_refresh_token"
+    payload = verify_token(result.access_token)
+    assert payload["sub"] == str(f_mock_user.id)
+    assert payload["jti"] == created["access_jti"]
+
+
+def test_refresh_reuse_revokes_family(f_refresh_use_case, m_user_repository, m_token_repository, f_stored_token):
+    m_token_repository.get_refresh_token.return_value = f_stored_token.model_copy(update={"revoked_at": datetime.utcnow()})
+    
+    with pytest.raises(ValueError, match="Invalid refresh token"):
+        f_refresh_use_case.execute(RefreshTokenRequest(refresh_token="old_refresh_token"))
+    
+    m_token_repository.revoke_family.assert_called_once_with(f_stored_token.family_id)
+    m_token_repository.create_refresh_token.assert_not_called()
+
+
+def test_refresh_lost_race_is_treated_as_reuse(f_refresh_use_case, m_token_repository, f_stored_token):
+    m_token_repository.get_refresh_token.return_value = f_stored_token
+    m_token_repository.revoke_refresh_token.return_value = False
+    
+    with pytest.raises(ValueError, match="Invalid refresh token"):
+        f_refresh_use_case.execute(RefreshTokenRequest(refresh_token="old_refresh_token"))
+    
+    m_token_repository.revoke_family.assert_called_once_with(f_stored_token.family_id)
+
+
+def test_refresh_expired_token_rejected(f_refresh_use_case, m_token_repository, f_stored_token):
+    m_token_repository.get_refresh_token.return_value = f_stored_token.model_copy(
+        update={"expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    
+    with pytest.raises(ValueError, match="Invalid refresh token"):
+        f_refresh_use_case.execute(RefreshTokenRequest(refresh_token="old_refresh_token"))
+    
+    m_token_repository.revoke_refresh_token.assert_not_called()
+
+
+def test_refresh_inactive_user_rejected(f_refresh_use_case, m_user_repository, m_token_repository, f_mock_user, f_stored_token):
+    f_mock_user.is_active = False
+    m_token_repository.get_refresh_token.return_value = f_stored_token
+    m_token_repository.revoke_refresh_token.return_value = True
+    m_user_repository.get_by_id.return_value = f_mock_user
+    
+    with pytest.raises(ValueError, match="User account is disabled"):
+        f_refresh_use_case.execute(RefreshTokenRequest(refresh_token="old_refresh_token"))
+    
+    m_token_repository.revoke_family.assert_called_once_with(f_stored_token.family_id)
+
+
+def test_logout_revokes_family(m_token_repository, f_stored_token):
+    m_token_repository.get_refresh_token.return_value = f_stored_token
+    
+    LogoutUseCase(m_token_repository).execute(LogoutRequest(refresh_token="old_refresh_token"))
+    
+    m_token_repository.revoke_family.assert_called_once_with(f_stored_token.family_id)
@@ -1,11 +1,111 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Optional
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+DEFAULT_BCRYPT_ROUNDS = 12
+
+_contexts: Dict[int, CryptContext] = {}
+
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the hashing queue stays full for longer than the timeout"""
+    pass
+
+
+def _get_context(rounds: int) -> CryptContext:
+    context = _contexts.get(rounds)
+    if context is None:
+        # Хэши с другой стоимостью помечаются needs_update и перехэшируются при входе
+        context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds
+        )
+        _contexts[rounds] = context
+    return context
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _get_context(rounds).hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str, rounds: int) -> bool:
+    return _get_context(rounds).verify(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """Bcrypt hashing offloaded to a process pool.
+
+    At most ``max_pending`` operations are queued or running at once; callers
+    wait up to ``queue_timeout_seconds`` for a slot and then get
+    PasswordHasherBusyError. With ``workers=0`` hashing runs in the calling thread.
+    """
+
+    def __init__(self, rounds: int = DEFAULT_BCRYPT_ROUNDS, workers: int = 0,
+                 max_pending: int = 64, queue_timeout_seconds: float = 5.0):
+        self.rounds = rounds
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if workers > 0:
+            # spawn: fork процесса с потоками uvicorn небезопасен
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password, self.rounds)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(_verify, plain_password, hashed_password, self.rounds)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        context = _get_context(self.rounds)
+        if context.identify(hashed_password) is None:
+            return False
+        return context.needs_update(hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _run(self, func: Callable, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout_seconds):
+            raise PasswordHasherBusyError("Password hashing queue is full")
+        try:
+            if self._executor is None:
+                return func(*args)
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+
+_hasher = PasswordHasher()
+
+
+def configure_password_hasher(rounds: int = DEFAULT_BCRYPT_ROUNDS, workers: int = 0,
+                              max_pending: int = 64, queue_timeout_seconds: float = 5.0) -> PasswordHasher:
+    """Replace the module-level hasher, shutting down the previous pool"""
+    global _hasher
+    _hasher.shutdown()
+    _hasher = PasswordHasher(rounds, workers, max_pending, queue_timeout_seconds)
+    return _hasher
+
+
+def get_password_hasher() -> PasswordHasher:
+    return _hasher
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password) 
\ No newline at end of file
+    return _hasher.verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    return _hasher.needs_rehash(hashed_password)
@@ -0,0 +1,49 @@
+import pytest
+from utils.password_utils import PasswordHasher, PasswordHasherBusyError
+
+
+@pytest.fixture
+def f_hasher():
+    return PasswordHasher(rounds=4)
+
+
+def test_hash_and_verify(f_hasher):
+    hashed = f_hasher.hash("TestPass123")
+    
+    assert f_hasher.verify("TestPass123", hashed) is True
+    assert f_hasher.verify("WrongPass123", hashed) is False
+
+
+def test_hash_uses_configured_rounds(f_hasher):
+    hashed = f_hasher.hash("TestPass123")
+    
+    assert hashed.split("$")[2] == "04"
+
+
+def test_needs_rehash_when_rounds_change(f_hasher):
+    hashed = f_hasher.hash("TestPass123")
+    
+    assert f_hasher.needs_rehash(hashed) is False
+    assert PasswordHasher(rounds=5).needs_rehash(hashed) is True
+
+
+def test_needs_rehash_ignores_unknown_hashes(f_hasher):
+    assert f_hasher.needs_rehash("not-a-bcrypt-hash") is False
+
+
+def test_busy_when_queue_is_full():
+    hasher = PasswordHasher(rounds=4, max_pending=1, queue_timeout_seconds=0.01)
+    hasher._slots.acquire()
+    
+    with pytest.raises(PasswordHasherBusyError):
+        hasher.hash("TestPass123")
+
+
+def test_hash_in_process_pool():
+    hasher = PasswordHasher(rounds=4, workers=1)
+    try:
+        hashed = hasher.hash("TestPass123")
+        
+        assert hasher.verify("TestPass123", hashed) is True
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,78 @@
+import base64
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+import structlog
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+# Обязательные поля JWK для отпечатка по RFC 7638
+_THUMBPRINT_MEMBERS = {"RSA": ("e", "kty", "n"), "EC": ("crv", "kty", "x", "y")}
+
+logger = structlog.get_logger(__name__)
+
+
+def _thumbprint(public_jwk: Dict[str, Any]) -> str:
+    members = {name: public_jwk[name] for name in _THUMBPRINT_MEMBERS[public_jwk["kty"]]}
+    digest = hashlib.sha256(json.dumps(members, separators=(",", ":"), sort_keys=True).encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+class SigningKey:
+    """Asymmetric key pair; kid is the JWK thumbprint of the public key"""
+
+    def __init__(self, pem: bytes, algorithm: str):
+        self.algorithm = algorithm
+        self.key = jwk.construct(pem, algorithm)
+        self.public_key = self.key.public_key()
+        self.public_jwk = self.public_key.to_dict()
+        self.kid = _thumbprint(self.public_jwk)
+        self.public_jwk.update({"kid": self.kid, "use": "sig", "alg": algorithm})
+
+
+class KeyRing:
+    """Current signing key plus retired public keys kept until their tokens expire"""
+
+    def __init__(self, current: SigningKey, previous: Optional[List[SigningKey]] = None):
+        self.current = current
+        self._verification_keys = {key.kid: key for key in [current] + (previous or [])}
+
+    def get_verification_key(self, kid: Optional[str]) -> Optional[SigningKey]:
+        if kid is None:
+            return None
+        return self._verification_keys.get(kid)
+
+    def jwks(self) -> Dict[str, Any]:
+        return {"keys": [key.public_jwk for key in self._verification_keys.values()]}
+
+
+def generate_private_key_pem(algorithm: str) -> bytes:
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+
+
+def load_key_ring(algorithm: str, private_key_file: Optional[str], previous_public_key_files: List[str]) -> KeyRing:
+    if private_key_file:
+        with open(private_key_file, "rb") as f:
+            current = SigningKey(f.read(), algorithm)
+    else:
+        # Без файла ключа токены перестают проверяться после рестарта - только для разработки
+        logger.warning("JWT private key file is not set, generating an ephemeral key", algorithm=algorithm)
+        current = SigningKey(generate_private_key_pem(algorithm), algorithm)
+
+    previous = []
+    for path in previous_public_key_files:
+        with open(path, "rb") as f:
+            previous.append(SigningKey(f.read(), algorithm))
+
+    return KeyRing(current, previous)
@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import patch
+from jose import jwt
+from utils import token_utils
+from utils.signing_keys import KeyRing, SigningKey, generate_private_key_pem
+
+
+@pytest.fixture(params=["RS256", "ES256"])
+def f_algorithm(request):
+    return request.param
+
+
+@pytest.fixture
+def f_signing_key(f_algorithm):
+    return SigningKey(generate_private_key_pem(f_algorithm), f_algorithm)
+
+
+def test_jwks_exposes_only_public_key(f_signing_key):
+    jwks = KeyRing(f_signing_key).jwks()
+    
+    assert len(jwks["keys"]) == 1
+    public_jwk = jwks["keys"][0]
+    assert public_jwk["kid"] == f_signing_key.kid
+    assert public_jwk["alg"] == f_signing_key.algorithm
+    assert "d" not in public_jwk
+
+
+def test_kid_is_stable_for_same_key(f_algorithm):
+    pem = generate_private_key_pem(f_algorithm)
+    
+    assert SigningKey(pem, f_algorithm).kid == SigningKey(pem, f_algorithm).kid
+
+
+def test_token_signed_with_kid_and_verified(f_algorithm, f_signing_key):
+    with patch.object(token_utils.settings, "algorithm", f_algorithm), \
+         patch.object(token_utils, "_key_ring", KeyRing(f_signing_key)):
+        token = token_utils.create_access_token({"sub": "1", "role": "client"})
+        payload = token_utils.verify_token(token)
+    
+    assert jwt.get_unverified_header(token)["kid"] == f_signing_key.kid
+    assert payload["sub"] == "1"
+
+
+def test_previous_key_still_verifies_after_rotation(f_algorithm, f_signing_key):
+    new_key = SigningKey(generate_private_key_pem(f_algorithm), f_algorithm)
+    
+    with patch.object(token_utils.settings, "algorithm", f_algorithm):
+        with patch.object(token_utils, "_key_ring", KeyRing(f_signing_key)):
+            old_token = token_utils.create_access_token({"sub": "1", "role": "client"})
+        with patch.object(token_utils, "_key_ring", KeyRing(new_key, [f_signing_key])):
+            assert token_utils.verify_token(old_token)["sub"] == "1"
+        with patch.object(token_utils, "_key_ring", KeyRing(new_key)):
+            assert token_utils.verify_token(old_token) is None
@@ -0,0 +1,42 @@
+from threading import Lock
+from typing import Any, Dict
+
+
+class TokenMetrics:
+    """Counters of full logins versus refresh-token exchanges"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.login_count = 0
+        self.refresh_count = 0
+        self.refresh_rejected_count = 0
+        self.refresh_reuse_count = 0
+
+    def record_login(self) -> None:
+        with self._lock:
+            self.login_count += 1
+
+    def record_refresh(self) -> None:
+        with self._lock:
+            self.refresh_count += 1
+
+    def record_refresh_rejected(self, reuse: bool = False) -> None:
+        with self._lock:
+            self.refresh_rejected_count += 1
+            if reuse:
+                self.refresh_reuse_count += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            issued = self.login_count + self.refresh_count
+            return {
+                "logins": self.login_count,
+                "refreshes": self.refresh_count,
+                "refreshes_rejected": self.refresh_rejected_count,
+                "refresh_reuse_detected": self.refresh_reuse_count,
+                # Доля выдач токенов без проверки bcrypt
+                "refresh_share": self.refresh_count / issued if issued else 0.0
+            }
+
+
+token_metrics = TokenMetrics()
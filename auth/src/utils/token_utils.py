@@ -1,26 +1,68 @@
+import hashlib
+import secrets
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from config import get_settings
+from utils.signing_keys import ASYMMETRIC_ALGORITHMS, KeyRing, load_key_ring
 
 settings = get_settings()
 
+_key_ring: Optional[KeyRing] = None
+
+
+def get_key_ring() -> Optional[KeyRing]:
+    """Signing keys for RS256/ES256; None when tokens are signed with the shared secret"""
+    global _key_ring
+    if _key_ring is None and settings.algorithm in ASYMMETRIC_ALGORITHMS:
+        _key_ring = load_key_ring(
+            settings.algorithm,
+            settings.jwt_private_key_file,
+            settings.jwt_previous_public_key_files
+        )
+    return _key_ring
+
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+        expire = now + timedelta(minutes=settings.access_token_expire_minutes)
+    
+    # jti нужен, чтобы отозвать конкретный токен до истечения exp
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+    to_encode.update({"exp": expire, "iat": now})
+    key_ring = get_key_ring()
+    if key_ring is None:
+        return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
+    # kid позволяет сервисам выбрать открытый ключ из JWKS при ротации
+    return jwt.encode(to_encode, key_ring.current.key, algorithm=settings.algorithm,
+                      headers={"kid": key_ring.current.kid})
 
 
 def verify_token(token: str) -> Optional[Dict[str, Any]]:
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        return payload
+        key_ring = get_key_ring()
+        if key_ring is None:
+            return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        
+        signing_key = key_ring.get_verification_key(jwt.get_unverified_header(token).get("kid"))
+        if signing_key is None:
+            return None
+        return jwt.decode(token, signing_key.public_key, algorithms=[settings.algorithm])
     except JWTError:
-        return None 
\ No newline at end of file
+        return None
+
+
+def create_refresh_token() -> str:
+    """Opaque refresh token; only its hash is stored"""
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    # Токен случайный с высокой энтропией, медленный хэш не нужен
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,120 @@
+"""Double-booking checks: AssignmentSchedule against a scan of assignments.
+
+Spreads N planned route assignments over a fleet of vehicles and drivers
+for a year, then times conflict checks for random slots (the indexed
+lookup against a scan over the resource's own assignments, as a query by
+vehicle_id would return them), booking with the check and a bulk
+free-windows query for the whole fleet over one day.
+
+Usage (from the repository root):
+    python -m benchmarks.assignment_schedule_benchmark [--assignments 100000] [--vehicles 1000] [--drivers 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fleet", "src"))
+
+from entities.route_assignment import RouteAssignment  # noqa: E402
+from utils.assignment_schedule import VEHICLE, AssignmentSchedule  # noqa: E402
+
+YEAR_START = datetime(2030, 1, 1)
+YEAR_HOURS = 365 * 24
+
+
+def random_slot(rng: random.Random):
+    start = YEAR_START + timedelta(hours=rng.uniform(0, YEAR_HOURS))
+    return start, start + timedelta(hours=rng.uniform(1, 12))
+
+
+def make_assignments(count: int, vehicle_ids, driver_ids, rng: random.Random):
+    assignments = []
+    for _ in range(count):
+        start, end = random_slot(rng)
+        assignments.append(RouteAssignment(
+            id=uuid4(), route_id=uuid4(), vehicle_id=rng.choice(vehicle_ids), driver_id=rng.choice(driver_ids),
+            estimated_duration_hours=(end - start).total_seconds() / 3600, scheduled_start=start, scheduled_end=end,
+            created_at=YEAR_START, updated_at=YEAR_START
+        ))
+    return assignments
+
+
+def linear_conflict(by_vehicle, by_driver, vehicle_id, driver_id, start, end):
+    for assignment in by_vehicle[vehicle_id]:
+        if assignment.scheduled_start < end and start < assignment.scheduled_end:
+            return assignment.id
+    for assignment in by_driver[driver_id]:
+        if assignment.scheduled_start < end and start < assignment.scheduled_end:
+            return assignment.id
+    return None
+
+
+def run(assignments: int, vehicles: int, drivers: int, queries: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    vehicle_ids = [uuid4() for _ in range(vehicles)]
+    driver_ids = [uuid4() for _ in range(drivers)]
+    stored = make_assignments(assignments, vehicle_ids, driver_ids, rng)
+
+    schedule = AssignmentSchedule()
+    started = time.perf_counter()
+    schedule.load(stored)
+    load = time.perf_counter() - started
+
+    by_vehicle, by_driver = defaultdict(list), defaultdict(list)
+    for assignment in stored:
+        by_vehicle[assignment.vehicle_id].append(assignment)
+        by_driver[assignment.driver_id].append(assignment)
+
+    requests = [(rng.choice(vehicle_ids), rng.choice(driver_ids), *random_slot(rng)) for _ in range(queries)]
+    started = time.perf_counter()
+    found = [schedule.find_conflict(*request) is not None for request in requests]
+    indexed = (time.perf_counter() - started) / queries
+
+    started = time.perf_counter()
+    expected = [linear_conflict(by_vehicle, by_driver, *request) is not None for request in requests]
+    linear = (time.perf_counter() - started) / queries
+    assert found == expected
+
+    booked, started = 0, time.perf_counter()
+    for vehicle_id, driver_id, start, end in requests:
+        try:
+            schedule.book(vehicle_id, driver_id, start, end, lambda: RouteAssignment(
+                id=uuid4(), route_id=uuid4(), vehicle_id=vehicle_id, driver_id=driver_id, estimated_duration_hours=1,
+                created_at=start, updated_at=start
+            ))
+            booked += 1
+        except Exception:
+            pass
+    book = (time.perf_counter() - started) / queries
+
+    day_start = YEAR_START + timedelta(days=rng.randrange(365))
+    started = time.perf_counter()
+    windows = schedule.free_windows(VEHICLE, vehicle_ids, day_start, day_start + timedelta(days=1),
+                                    min_duration=timedelta(hours=2))
+    bulk = time.perf_counter() - started
+    free = sum(1 for items in windows.values() if items)
+
+    print(f"{assignments:>7} assignments  load {load * 1000:>7.1f} ms  check {indexed * 1e6:>6.1f} us  "
+          f"linear {linear * 1e6:>9.1f} us  x{linear / indexed:,.0f}  book {book * 1e6:>6.1f} us "
+          f"({booked / queries:.0%} free)  free windows for {vehicles} vehicles {bulk * 1000:>6.1f} ms "
+          f"({free} with a 2 h gap)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assignments", type=int, default=100_000)
+    parser.add_argument("--vehicles", type=int, default=1000)
+    parser.add_argument("--drivers", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    run(args.assignments, args.vehicles, args.drivers, args.queries)
+
+
+if __name__ == "__main__":
+    main()
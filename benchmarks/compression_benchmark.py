@@ -0,0 +1,75 @@
+"""CPU cost and transfer time of compressed list responses.
+
+Builds the JSON body of GET /vehicles/ for N vehicles and, for every
+available encoding and level, measures compression time and size. The
+"time" columns add the transfer of the compressed body over links of the
+given bandwidth (internal network and a remote dispatch office), which is
+what the client waits for. A second table shows small bodies to pick the
+minimum size worth compressing.
+
+Usage (from the repository root):
+    python -m benchmarks.compression_benchmark [--rows 1000 10000] [--mbits 1000 100 10]
+"""
+import argparse
+import time
+from typing import List
+
+from benchmarks.json_response_benchmark import build_vehicles
+from entities.vehicle import Vehicle
+from shared.utils.compression import compressor, supported_encodings
+from shared.utils.responses import _adapter
+
+LEVELS = {"gzip": [1, 5, 6, 9], "br": [1, 4, 5, 11], "zstd": [1, 3, 6, 19]}
+
+
+def render(rows: int) -> bytes:
+    return _adapter(List[Vehicle]).dump_json(build_vehicles(rows))
+
+
+def compress(encoding: str, level: int, body: bytes, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        compressed = compressor(encoding, level).finish(body)
+        timings.append(time.perf_counter() - started)
+    return min(timings), len(compressed)
+
+
+def transfer(size: int, mbits: float) -> float:
+    return size * 8 / (mbits * 1_000_000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--mbits", type=float, nargs="+", default=[1000, 100, 10])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"encodings: {', '.join(supported_encodings())}; best of {args.repeat}")
+    for rows in args.rows:
+        body = render(rows)
+        print(f"\nrows={rows}, body {len(body) / 1024:.0f} KiB")
+        print(f"{'encoding':<12} {'cpu':>9} {'ratio':>7} " + " ".join(f"{f'{m:g} Mbit/s':>13}" for m in args.mbits))
+        print(f"{'identity':<12} {0:>6.1f} ms {1:>7.2f} "
+              + " ".join(f"{transfer(len(body), m) * 1000:>10.1f} ms" for m in args.mbits))
+        for encoding in supported_encodings():
+            for level in LEVELS[encoding]:
+                cpu, size = compress(encoding, level, body, args.repeat)
+                print(f"{f'{encoding}:{level}':<12} {cpu * 1000:>6.1f} ms {len(body) / size:>7.2f} "
+                      + " ".join(f"{(cpu + transfer(size, m)) * 1000:>10.1f} ms" for m in args.mbits))
+
+    print("\nsmall bodies (default levels)")
+    print(f"{'bytes':>8} " + " ".join(f"{encoding:>16}" for encoding in supported_encodings()))
+    single = render(1)[1:-1]
+    for count in (1, 2, 4, 8, 16):
+        body = b"[" + b",".join([single] * count) + b"]"
+        cells = []
+        for encoding in supported_encodings():
+            cpu, size = compress(encoding, None, body, args.repeat * 20)
+            cells.append(f"{size:>5} B {cpu * 1_000_000:>5.0f} us")
+        print(f"{len(body):>8} " + " ".join(f"{cell:>16}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
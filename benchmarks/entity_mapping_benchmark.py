@@ -0,0 +1,133 @@
+"""Row-to-entity mapping cost of list endpoints.
+
+Loads N cargo rows from an in-memory SQLite database and compares:
+
+    legacy          ORM objects -> validated Cargo(**fields) -> copied CargoResponse
+    from_attributes ORM objects -> Cargo.model_validate(from_attributes=True)
+    row mapper      column rows -> RowMapper entities -> RowMapper responses (no validation),
+                    as CargoRepository and the cargo controller do
+
+Fetching rows, mapping them and FastAPI response serialization of
+GET /cargo/ are timed separately.
+
+Usage (from the repository root):
+    python -m benchmarks.entity_mapping_benchmark [--rows 10000]
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "warehouse", "src"))
+
+from fastapi.routing import serialize_response  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from controllers.cargo_controller import cargo_response_mapper, router  # noqa: E402
+from entities.cargo import Cargo, CargoResponse, CargoStatus, CargoType  # noqa: E402
+from entities.database_models import Base, CargoModel  # noqa: E402
+from repositories.cargo_repository import CARGO_COLUMNS, cargo_mapper  # noqa: E402
+
+
+def seed(session: Session, rows: int) -> None:
+    now = datetime.utcnow()
+    session.add_all(
+        CargoModel(
+            id=f"cargo-{i}",
+            tracking_number=f"TRK{i:08d}",
+            cargo_type=CargoType.PERISHABLE.value if i % 2 else CargoType.GENERAL.value,
+            name=f"Cargo {i}",
+            description="Boxes",
+            weight=120.5,
+            volume=1.5,
+            dimensions={"length": 1.0, "width": 1.0, "height": 1.5},
+            value=1000.0,
+            insurance_amount=100.0,
+            temperature_requirements={"min_temp": 2.0, "max_temp": 8.0} if i % 2 else None,
+            special_handling=["keep_dry"],
+            fragility_level="low",
+            storage_duration=30,
+            expiration_date=now + timedelta(days=30),
+            status=CargoStatus.STORED.value,
+            warehouse_id="warehouse-1",
+            location_in_warehouse=f"A-{i % 100}",
+            created_at=now,
+            updated_at=now
+        )
+        for i in range(rows)
+    )
+    session.commit()
+
+
+def load_objects(session: Session, rows: int):
+    return session.query(CargoModel).limit(rows).all()
+
+
+def load_rows(session: Session, rows: int):
+    return session.query(*CARGO_COLUMNS).limit(rows).all()
+
+
+def legacy(db_cargos):
+    cargos = [Cargo(**{name: getattr(db_cargo, name) for name in Cargo.model_fields}) for db_cargo in db_cargos]
+    return [CargoResponse(**cargo.model_dump()) for cargo in cargos]
+
+
+def from_attributes(db_cargos):
+    return [Cargo.model_validate(db_cargo, from_attributes=True) for db_cargo in db_cargos]
+
+
+def row_mapper(rows):
+    return cargo_response_mapper.many(cargo_mapper.many(rows))
+
+
+MODES = [
+    ("legacy", load_objects, legacy),
+    ("from_attributes", load_objects, from_attributes),
+    ("row mapper", load_rows, row_mapper)
+]
+
+
+def measure(engine, load, mapping, rows: int, response_field):
+    # Новая сессия на каждый прогон: identity map не должна переживать замер
+    gc.collect()
+    with Session(engine) as session:
+        started = time.perf_counter()
+        loaded = load(session, rows)
+        fetched = time.perf_counter()
+        result = mapping(loaded)
+        mapped = time.perf_counter()
+        asyncio.run(serialize_response(field=response_field, response_content=result))
+        serialized = time.perf_counter()
+    return fetched - started, mapped - fetched, serialized - mapped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[CargoModel.__table__])
+    with Session(engine) as session:
+        seed(session, args.rows)
+    route = next(route for route in router.routes if route.path == "/cargo/" and "GET" in route.methods)
+
+    print(f"rows={args.rows}, best of {args.repeat}")
+    print(f"{'mode':<16} {'fetch':>10} {'mapping':>10} {'response':>10} {'total':>10}")
+    for name, load, mapping in MODES:
+        # Первый прогон строит схемы сериализации и не учитывается
+        measure(engine, load, mapping, min(args.rows, 100), route.response_field)
+        fetch, mapped, serialized = min(
+            (measure(engine, load, mapping, args.rows, route.response_field) for _ in range(args.repeat)),
+            key=sum
+        )
+        print(f"{name:<16} {fetch * 1000:>7.1f} ms {mapped * 1000:>7.1f} ms {serialized * 1000:>7.1f} ms "
+              f"{(fetch + mapped + serialized) * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Throughput of the fleet ETA engine on the assignment path.
+
+Builds N requests over random pairs of the built-in gazetteer places (with
+house numbers, as real addresses come) and times EtaEngine.estimate_many
+twice: cold (every address is resolved in the gazetteer) and warm (address
+pairs already memoized).
+
+Usage (from the repository root):
+    python -m benchmarks.eta_benchmark [--requests 100000] [--addresses 2000]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fleet", "src"))
+
+from entities.vehicle import VehicleType  # noqa: E402
+from shared.utils.geo import DEFAULT_GAZETTEER_PATH, Gazetteer  # noqa: E402
+from utils.eta_engine import EtaEngine, EtaRequest  # noqa: E402
+
+
+def build_requests(count: int, addresses: int, seed: int = 42):
+    rng = random.Random(seed)
+    with open(DEFAULT_GAZETTEER_PATH, newline="", encoding="utf-8") as file:
+        places = [row["name"] for row in csv.DictReader(file)]
+    pool = [f"ул. Складская {rng.randint(1, 200)}, {rng.choice(places)}" for _ in range(addresses)]
+    departure = datetime(2024, 1, 1, 8)
+    vehicle_types = list(VehicleType)
+    return [EtaRequest(rng.choice(pool), rng.choice(pool), rng.choice(vehicle_types), departure) for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--addresses", type=int, default=2000)
+    args = parser.parse_args()
+
+    requests = build_requests(args.requests, args.addresses)
+    engine = EtaEngine(Gazetteer())
+    print(f"requests={args.requests}, distinct addresses={args.addresses}")
+    for name in ("cold", "warm"):
+        started = time.perf_counter()
+        estimates = engine.estimate_many(requests)
+        elapsed = time.perf_counter() - started
+        resolved = sum(estimate is not None for estimate in estimates)
+        print(f"{name:<6} {elapsed * 1000:>8.1f} ms {args.requests / elapsed:>12,.0f} ETA/s  resolved {resolved}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Decode benchmark for event bus codecs.
+
+Compares the legacy stdlib json path with orjson and msgpack, with and
+without validation against the shared event models.
+
+Usage (from the repository root):
+    python -m benchmarks.event_codec_benchmark [--messages 50000]
+"""
+import argparse
+import json
+import time
+from uuid import uuid4
+
+from shared.events import codec
+from shared.events.models import VehicleAssignedEvent, get_event_model
+
+
+def build_message() -> dict:
+    event = VehicleAssignedEvent(
+        source_service="fleet",
+        order_id=str(uuid4()),
+        vehicle_id=str(uuid4()),
+        driver_id=str(uuid4()),
+        vehicle_license_plate="A123BC77",
+        driver_name="Иван Петров"
+    )
+    return {
+        "event_type": event.event_type,
+        "schema_version": event.schema_version,
+        "event_data": event.model_dump(),
+        "timestamp": event.timestamp.isoformat()
+    }
+
+
+def measure(name: str, body: bytes, decode, messages: int) -> None:
+    started = time.perf_counter()
+    for _ in range(messages):
+        decode(body)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<28} {len(body):>6} B {elapsed / messages * 1e6:>9.2f} us/msg "
+          f"{messages / elapsed:>12.0f} msg/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=50000)
+    args = parser.parse_args()
+
+    message = build_message()
+    model = get_event_model(message["event_type"])
+
+    legacy_body = json.dumps(message, default=str).encode()
+    json_body = codec.encode(message, codec.JSON_CONTENT_TYPE)
+    msgpack_body = codec.encode(message, codec.MSGPACK_CONTENT_TYPE)
+
+    def validated(decode):
+        return lambda body: model.model_validate(decode(body)["event_data"])
+
+    print(f"{'codec':<28} {'size':>8} {'decode':>15} {'throughput':>16}")
+    measure("stdlib json", legacy_body, json.loads, args.messages)
+    measure("orjson", json_body, codec.decode, args.messages)
+    measure("msgpack", msgpack_body,
+            lambda body: codec.decode(body, codec.MSGPACK_CONTENT_TYPE), args.messages)
+    measure("stdlib json + model", legacy_body, validated(json.loads), args.messages)
+    measure("orjson + model", json_body, validated(codec.decode), args.messages)
+    measure("msgpack + model", msgpack_body,
+            validated(lambda body: codec.decode(body, codec.MSGPACK_CONTENT_TYPE)), args.messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Latency of list endpoints by response rendering path.
+
+Serves N vehicles (already built entities, as the repository returns them)
+from three variants of GET /vehicles/ and times full requests through the
+ASGI test client:
+
+    json      response_model validation + stdlib json (FastAPI default)
+    orjson    response_model validation + ORJSONResponse (services' default)
+    trusted   trusted_response: pydantic-core serializer, no validation
+
+Usage (from the repository root):
+    python -m benchmarks.json_response_benchmark [--rows 1000 10000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fleet", "src"))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from entities.vehicle import FuelType, Vehicle, VehicleType  # noqa: E402
+from shared.utils.responses import trusted_response  # noqa: E402
+
+
+def build_vehicles(rows: int) -> List[Vehicle]:
+    now = datetime.utcnow()
+    return [
+        Vehicle(
+            license_plate=f"AB{i:06d}",
+            vehicle_type=VehicleType.TRUCK,
+            brand="Volvo",
+            model="FH16",
+            year=2020,
+            capacity_weight=18000.0,
+            capacity_volume=80.0,
+            fuel_type=FuelType.DIESEL,
+            fuel_efficiency=28.5,
+            insurance_expiry=now + timedelta(days=365),
+            registration_expiry=now + timedelta(days=365),
+            updated_at=now
+        )
+        for i in range(rows)
+    ]
+
+
+def build_app(vehicles: List[Vehicle]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/json", response_model=List[Vehicle], response_class=JSONResponse)
+    def as_json():
+        return vehicles
+
+    @app.get("/orjson", response_model=List[Vehicle], response_class=ORJSONResponse)
+    def as_orjson():
+        return vehicles
+
+    @app.get("/trusted", response_model=List[Vehicle])
+    def as_trusted():
+        return trusted_response(List[Vehicle], vehicles)
+
+    return app
+
+
+def measure(client: TestClient, path: str, repeat: int) -> float:
+    client.get(path)
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"best of {args.repeat}")
+    print(f"{'rows':>8} {'json':>10} {'orjson':>10} {'trusted':>10}")
+    for rows in args.rows:
+        client = TestClient(build_app(build_vehicles(rows)))
+        bodies = {path: client.get(path).json() for path in ("/json", "/orjson", "/trusted")}
+        # Все варианты должны отдавать один и тот же JSON
+        assert bodies["/json"] == bodies["/orjson"] == bodies["/trusted"]
+        timings = [measure(client, path, args.repeat) for path in ("/json", "/orjson", "/trusted")]
+        print(f"{rows:>8} " + " ".join(f"{timing * 1000:>7.1f} ms" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Login throughput benchmark for bcrypt verification in the auth service.
+
+Simulates a login storm: many request threads verify passwords at once,
+either inline (GIL-bound threadpool) or through the process pool.
+
+Usage (from the repository root):
+    python -m benchmarks.login_throughput_benchmark [--logins 200] [--rounds 12]
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "auth", "src"))
+
+from utils.password_utils import PasswordHasher  # noqa: E402
+
+
+def run(name: str, hasher: PasswordHasher, hashed: str, logins: int, threads: int) -> None:
+    # Прогрев пула процессов, чтобы не учитывать время их запуска
+    hasher.verify("TestPass123", hashed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda _: hasher.verify("TestPass123", hashed), range(logins)))
+    elapsed = time.perf_counter() - started
+
+    assert all(results)
+    print(f"{name:<24} {logins / elapsed:>10.1f} logins/s {elapsed / logins * 1000:>10.1f} ms/login")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--threads", type=int, default=40, help="request threads (anyio default is 40)")
+    args = parser.parse_args()
+
+    hashed = PasswordHasher(rounds=args.rounds).hash("TestPass123")
+    print(f"bcrypt rounds={args.rounds}, logins={args.logins}, request threads={args.threads}")
+
+    run("inline", PasswordHasher(rounds=args.rounds), hashed, args.logins, args.threads)
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        hasher = PasswordHasher(rounds=args.rounds, workers=workers)
+        try:
+            run(f"process pool x{workers}", hasher, hashed, args.logins, args.threads)
+        finally:
+            hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
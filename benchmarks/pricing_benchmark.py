@@ -0,0 +1,84 @@
+"""Throughput of the orders pricing engine.
+
+Prices N candidate orders (random pairs of the built-in gazetteer places,
+weights, volumes and cargo types) against V vehicles with
+PricingEngine.quote_many, cold and warm (address pairs and cargo multipliers
+memoized), and compares it with calling PricingEngine.quote for every pair.
+Also times the single quote made when an order is created.
+
+Usage (from the repository root):
+    python -m benchmarks.pricing_benchmark [--orders 1000] [--vehicles 100] [--addresses 2000]
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+
+# В конец: orders/src/shared - заглушка, общий пакет shared берется из корня репозитория
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "orders", "src"))
+
+from shared.utils.geo import DEFAULT_GAZETTEER_PATH, Gazetteer  # noqa: E402
+from utils.pricing_engine import CargoQuote, PricingEngine, VehicleQuote  # noqa: E402
+
+CARGO_TYPES = ["general", "electronics", "fragile", "refrigerated", "hazardous", "furniture"]
+
+
+def build_cargo(count: int, addresses: int, seed: int = 42):
+    rng = random.Random(seed)
+    with open(DEFAULT_GAZETTEER_PATH, newline="", encoding="utf-8") as file:
+        places = [row["name"] for row in csv.DictReader(file)]
+    pool = [f"ул. Складская {rng.randint(1, 200)}, {rng.choice(places)}" for _ in range(addresses)]
+    return [
+        CargoQuote(rng.choice(pool), rng.choice(pool), rng.choice(CARGO_TYPES),
+                   round(rng.uniform(50, 25000), 0), round(rng.uniform(0.5, 90), 1))
+        for _ in range(count)
+    ]
+
+
+def build_vehicles(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [VehicleQuote(rng.uniform(2.0, 8.0), rng.choice([1500, 3500, 10000, 20000, 40000]), rng.choice([10, 20, 45, 90]))
+            for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--vehicles", type=int, default=100)
+    parser.add_argument("--addresses", type=int, default=2000)
+    args = parser.parse_args()
+
+    cargo = build_cargo(args.orders, args.addresses)
+    vehicles = build_vehicles(args.vehicles)
+    pairs = args.orders * args.vehicles
+    engine = PricingEngine(Gazetteer())
+    print(f"orders={args.orders}, vehicles={args.vehicles}, pairs={pairs}")
+    for name in ("cold", "warm"):
+        started = time.perf_counter()
+        matrix = engine.quote_many(cargo, vehicles)
+        elapsed = time.perf_counter() - started
+        priced = sum(cost is not None for row in matrix.costs_by_vehicle for cost in row)
+        print(f"quote_many {name:<6} {elapsed * 1000:>8.1f} ms {pairs / elapsed:>12,.0f} pairs/s  priced {priced}")
+
+    started = time.perf_counter()
+    for item in cargo:
+        for vehicle in vehicles:
+            if item.cargo_weight <= vehicle.capacity_weight and item.cargo_volume <= vehicle.capacity_volume:
+                engine.quote(item, vehicle.fuel_efficiency)
+    elapsed = time.perf_counter() - started
+    print(f"quote per pair    {elapsed * 1000:>8.1f} ms {pairs / elapsed:>12,.0f} pairs/s")
+
+    # Цена при создании заказа: новый адрес (разбор по справочнику) и уже встречавшийся
+    fresh = build_cargo(1000, 1000, seed=1)
+    for name, items in (("new addresses", fresh), ("known addresses", fresh)):
+        started = time.perf_counter()
+        for item in items:
+            engine.quote(item)
+        elapsed = time.perf_counter() - started
+        print(f"create-time quote, {name:<16} {elapsed / len(items) * 1e6:>8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
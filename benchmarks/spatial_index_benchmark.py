@@ -0,0 +1,86 @@
+"""Nearest-vehicle lookup: SpatialIndex against a linear scan.
+
+Places N vehicles (most around a few cities, the rest spread over the
+country), then times position updates and k-nearest queries with a
+capacity-like predicate that accepts every other vehicle, comparing the
+answers with a scan over all positions.
+
+Usage (from the repository root):
+    python -m benchmarks.spatial_index_benchmark [--vehicles 1000 10000 100000] [--queries 1000] [--k 5]
+"""
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fleet", "src"))
+
+from shared.utils.geo import haversine_km  # noqa: E402
+from utils.spatial_index import SpatialIndex  # noqa: E402
+
+CITIES = [(55.75, 37.61), (59.93, 30.33), (56.84, 60.60), (55.03, 82.92), (45.04, 38.98)]
+
+
+def random_point(rng: random.Random):
+    if rng.random() < 0.8:
+        latitude, longitude = rng.choice(CITIES)
+        return latitude + rng.gauss(0, 0.3), longitude + rng.gauss(0, 0.5)
+    return rng.uniform(43, 70), rng.uniform(20, 140)
+
+
+def linear_nearest(positions, point, k, predicate):
+    return heapq.nsmallest(k, ((haversine_km(point, coordinates), key) for key, coordinates in positions.items()
+                               if predicate(key)))
+
+
+def run(vehicles: int, queries: int, k: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    positions = {i: random_point(rng) for i in range(vehicles)}
+    points = [random_point(rng) for _ in range(queries)]
+
+    def suitable(key):
+        return key % 2 == 0
+
+    index = SpatialIndex()
+    started = time.perf_counter()
+    index.update_many(positions.items())
+    build = time.perf_counter() - started
+
+    moves = [(rng.randrange(vehicles), random_point(rng)) for _ in range(queries)]
+    started = time.perf_counter()
+    for key, coordinates in moves:
+        index.update(key, coordinates)
+        positions[key] = coordinates
+    move = (time.perf_counter() - started) / len(moves)
+
+    started = time.perf_counter()
+    found = [index.nearest(point, k=k, predicate=suitable) for point in points]
+    indexed = (time.perf_counter() - started) / queries
+
+    # Скан медленный на 100k, для сравнения хватает части запросов
+    sample = points[:max(1, min(queries, 200_000 // vehicles))]
+    started = time.perf_counter()
+    expected = [linear_nearest(positions, point, k, suitable) for point in sample]
+    linear = (time.perf_counter() - started) / len(sample)
+
+    for result, reference in zip(found, expected):
+        assert [round(distance, 9) for _, distance in result] == [round(distance, 9) for distance, _ in reference]
+    print(f"{vehicles:>8} vehicles  build {build * 1000:>8.1f} ms  move {move * 1e6:>6.1f} us  "
+          f"nearest {indexed * 1e6:>8.1f} us  linear {linear * 1e6:>10.1f} us  x{linear / indexed:,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    for vehicles in args.vehicles:
+        run(vehicles, args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Route planning time and quality of the fleet VRP solver.
+
+Generates N stops scattered around a depot (Moscow region, a third of them
+with a delivery deadline) and a mixed fleet of N/10 vehicles, then reports
+the construction time (Clarke-Wright savings and vehicle assignment), the
+full solve time within the budget, the number of routes and the total
+distance before and after local search.
+
+Usage (from the repository root):
+    python -m benchmarks.vrp_benchmark [--stops 500 5000] [--budget 5]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fleet", "src"))
+
+from utils.vrp_solver import VrpSolver, VrpStop, VrpVehicle  # noqa: E402
+
+DEPOT = (55.75, 37.6)
+
+
+def build_solver(count: int, seed: int = 1) -> VrpSolver:
+    rng = random.Random(seed)
+    stops = [
+        VrpStop((DEPOT[0] + rng.uniform(-0.5, 0.5), DEPOT[1] + rng.uniform(-0.8, 0.8)),
+                rng.uniform(50, 500), rng.uniform(0.2, 2),
+                latest=rng.choice([math.inf, 600, 900]), service_minutes=10)
+        for _ in range(count)
+    ]
+    vehicles = [VrpVehicle(rng.choice([3500, 10000, 20000]), rng.choice([20, 40, 80])) for _ in range(count // 10)]
+    return VrpSolver(DEPOT, stops, vehicles, speed_kmh=40, road_factor=1.3, max_route_minutes=720)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stops", type=int, nargs="+", default=[500, 5000])
+    parser.add_argument("--budget", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'stops':>6} {'construct':>10} {'solve':>9} {'routes':>7} {'km before':>10} {'km after':>10} "
+          f"{'unassigned':>10}")
+    for count in args.stops:
+        # Нулевой бюджет: только построение маршрутов и назначение машин, без локального поиска
+        solver = build_solver(count)
+        started = time.perf_counter()
+        constructed = solver.solve(time_budget_seconds=0)
+        construct_elapsed = time.perf_counter() - started
+        before = sum(solver.route_distance(route) for route in constructed.routes)
+
+        solver = build_solver(count)
+        started = time.perf_counter()
+        solution = solver.solve(time_budget_seconds=args.budget)
+        solve_elapsed = time.perf_counter() - started
+        after = sum(solver.route_distance(route) for route in solution.routes)
+        routes = sum(1 for route in solution.routes if route)
+        print(f"{count:>6} {construct_elapsed:>9.2f}s {solve_elapsed:>8.2f}s {routes:>7} "
+              f"{before:>10.0f} {after:>10.0f} {len(solution.unassigned):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,61 @@
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, Session
 from config import get_settings
+from shared.utils.database import (
+    create_database_engine, create_async_database_engine, ReplicaSet, RoutingSession
+)
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
+engine_options = dict(
+    application_name="fleet-service",
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout_seconds,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    statement_timeout_ms=settings.db_statement_timeout_ms,
+    pooler_mode=settings.db_pooler_mode,
     echo=settings.debug
 )
 
+engine = create_database_engine(settings.database_url, **engine_options)
+
+replica_set = ReplicaSet(
+    [create_database_engine(url, **engine_options) for url in settings.database_replica_urls],
+    max_lag_seconds=settings.db_replica_max_lag_seconds,
+    check_interval_seconds=settings.db_replica_check_interval_seconds
+) if settings.database_replica_urls else None
+
+# Методы репозиториев с @replica_read читают с реплики, пока в сессии не было записи
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    replicas=replica_set,
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
 
+# Асинхронный движок для async def эндпоинтов: запросы через asyncpg не блокируют event loop
+# Пул async_engine отдельный: при расчете лимитов соединений БД учитывайте оба пула
+async_engine = create_async_database_engine(settings.database_url, **engine_options)
+
+async_replica_set = ReplicaSet(
+    [create_async_database_engine(url, **engine_options) for url in settings.database_replica_urls],
+    max_lag_seconds=settings.db_replica_max_lag_seconds,
+    check_interval_seconds=settings.db_replica_check_interval_seconds
+) if settings.database_replica_urls else None
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    sync_session_class=RoutingSession,
+    replicas=async_replica_set,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 def get_db() -> Session:
     db = SessionLocal()
     try:
@@ -24,6 +64,11 @@ def get_db() -> Session:
         db.close()
 
 
+async def get_async_db() -> AsyncSession:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     from entities.database_models import Base
     Base.metadata.create_all(bind=engine) 
\ No newline at end of file
@@ -1,7 +1,8 @@
+import asyncio
 import pytest
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from config.database import SessionLocal
+from config.database import SessionLocal, AsyncSessionLocal, async_engine
 from entities.database_models import Base
 from repositories.vehicle_repository import VehicleRepository
 from repositories.driver_repository import DriverRepository
@@ -16,6 +17,21 @@ def f_db_session() -> Session:
         session.close()
 
 
+@pytest.fixture
+def f_run_async():
+    """Run a coroutine function with a fresh AsyncSession"""
+    def run(scenario):
+        async def wrapper():
+            try:
+                async with AsyncSessionLocal() as session:
+                    return await scenario(session)
+            finally:
+                # Соединения asyncpg привязаны к event loop, который закрывает asyncio.run
+                await async_engine.dispose()
+        return asyncio.run(wrapper())
+    return run
+
+
 @pytest.fixture
 def f_vehicle_repository(f_db_session: Session) -> VehicleRepository:
     return VehicleRepository(f_db_session)
@@ -30,7 +46,7 @@ def f_driver_repository(f_db_session: Session) -> DriverRepository:
 def f_clean_db(f_db_session: Session) -> None:
     """Clean database before each test"""
     try:
-        f_db_session.execute(text("TRUNCATE TABLE vehicles, drivers RESTART IDENTITY CASCADE"))
+        f_db_session.execute(text("TRUNCATE TABLE vehicles, drivers, processed_events RESTART IDENTITY CASCADE"))
         f_db_session.commit()
     except Exception:
         # If tables don't exist yet, ignore the error
@@ -1,15 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from config.database import get_db
+from config.database import get_db, get_async_db
+from config.settings import get_settings
 from entities.driver import Driver, DriverCreate, DriverUpdate
 from use_cases.create_driver_use_case import CreateDriverUseCase
-from repositories.driver_repository import DriverRepository
+from repositories.driver_repository import DriverRepository, AsyncDriverRepository
+from shared.utils.mapping import partial_model
+from shared.utils.responses import (
+    cache_headers, etag_matches, fields_parameter, make_etag, not_modified, trusted_response
+)
 from utils.auth_utils import get_current_user, require_any_role
 
 
+settings = get_settings()
 router = APIRouter(prefix="/drivers", tags=["drivers"])
 
 
@@ -17,12 +24,16 @@ def get_driver_repository(db: Session = Depends(get_db)) -> DriverRepository:
     return DriverRepository(db)
 
 
+def get_async_driver_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncDriverRepository:
+    return AsyncDriverRepository(db)
+
+
 def get_create_driver_use_case(driver_repository: DriverRepository = Depends(get_driver_repository)) -> CreateDriverUseCase:
     return CreateDriverUseCase(driver_repository)
 
 
 @router.post("/", response_model=Driver, status_code=status.HTTP_201_CREATED)
-async def create_driver(
+def create_driver(
     driver_data: DriverCreate,
     use_case: CreateDriverUseCase = Depends(get_create_driver_use_case),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
@@ -38,11 +49,18 @@ async def create_driver(
 
 @router.get("/", response_model=List[Driver])
 async def get_all_drivers(
-    driver_repository: DriverRepository = Depends(get_driver_repository),
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(Driver)),
+    if_none_match: Optional[str] = Header(None),
+    driver_repository: AsyncDriverRepository = Depends(get_async_driver_repository),
     current_user: dict = Depends(get_current_user())
 ):
     try:
-        return driver_repository.get_all()
+        etag = make_etag(*await driver_repository.get_list_version())
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.http_cache_max_age_seconds)
+        drivers = await driver_repository.get_all(fields=fields)
+        return trusted_response(List[partial_model(Driver, fields)], drivers,
+                                headers=cache_headers(etag, settings.http_cache_max_age_seconds))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
@@ -50,14 +68,24 @@ async def get_all_drivers(
 @router.get("/{driver_id}", response_model=Driver)
 async def get_driver_by_id(
     driver_id: UUID,
-    driver_repository: DriverRepository = Depends(get_driver_repository),
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(Driver)),
+    if_none_match: Optional[str] = Header(None),
+    driver_repository: AsyncDriverRepository = Depends(get_async_driver_repository),
     current_user: dict = Depends(get_current_user())
 ):
     try:
-        driver = driver_repository.get_by_id(driver_id)
+        # Версия читается по первичному ключу: на 304 сущность не загружается
+        version = await driver_repository.get_version(driver_id)
+        driver = None
+        if version is not None:
+            etag = make_etag(version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, settings.http_cache_max_age_seconds)
+            driver = await driver_repository.get_by_id(driver_id, fields=fields)
         if not driver:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Driver not found")
-        return driver
+        return trusted_response(partial_model(Driver, fields), driver,
+                                headers=cache_headers(etag, settings.http_cache_max_age_seconds))
     except HTTPException:
         raise
     except Exception as e:
@@ -68,11 +96,11 @@ async def get_driver_by_id(
 async def update_driver(
     driver_id: UUID,
     driver_data: DriverUpdate,
-    driver_repository: DriverRepository = Depends(get_driver_repository),
+    driver_repository: AsyncDriverRepository = Depends(get_async_driver_repository),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
 ):
     try:
-        driver = driver_repository.update(driver_id, driver_data)
+        driver = await driver_repository.update(driver_id, driver_data)
         if not driver:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Driver not found")
         return driver
@@ -85,11 +113,11 @@ async def update_driver(
 @router.delete("/{driver_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_driver(
     driver_id: UUID,
-    driver_repository: DriverRepository = Depends(get_driver_repository),
+    driver_repository: AsyncDriverRepository = Depends(get_async_driver_repository),
     current_user: dict = Depends(require_any_role(["admin"]))
 ):
     try:
-        success = driver_repository.delete(driver_id)
+        success = await driver_repository.delete(driver_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Driver not found")
     except HTTPException:
@@ -101,10 +129,10 @@ async def delete_driver(
 @router.get("/by-email/{email}", response_model=Driver)
 async def get_driver_by_email(
     email: str,
-    driver_repository: DriverRepository = Depends(get_driver_repository)
+    driver_repository: AsyncDriverRepository = Depends(get_async_driver_repository)
 ):
     try:
-        driver = driver_repository.get_by_email(email)
+        driver = await driver_repository.get_by_email(email)
         if not driver:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Driver not found")
         return driver
@@ -117,10 +145,10 @@ async def get_driver_by_email(
 @router.get("/by-license/{license_number}", response_model=Driver)
 async def get_driver_by_license_number(
     license_number: str,
-    driver_repository: DriverRepository = Depends(get_driver_repository)
+    driver_repository: AsyncDriverRepository = Depends(get_async_driver_repository)
 ):
     try:
-        driver = driver_repository.get_by_license_number(license_number)
+        driver = await driver_repository.get_by_license_number(license_number)
         if not driver:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Driver not found")
         return driver
@@ -133,19 +161,19 @@ async def get_driver_by_license_number(
 @router.get("/status/{status}", response_model=List[Driver])
 async def get_drivers_by_status(
     status: str,
-    driver_repository: DriverRepository = Depends(get_driver_repository)
+    driver_repository: AsyncDriverRepository = Depends(get_async_driver_repository)
 ):
     try:
-        return driver_repository.get_by_status(status)
+        return trusted_response(List[Driver], await driver_repository.get_by_status(status))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
 @router.get("/available/", response_model=List[Driver])
 async def get_available_drivers(
-    driver_repository: DriverRepository = Depends(get_driver_repository)
+    driver_repository: AsyncDriverRepository = Depends(get_async_driver_repository)
 ):
     try:
-        return driver_repository.get_available_drivers()
+        return trusted_response(List[Driver], await driver_repository.get_available_drivers())
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") 
\ No newline at end of file
@@ -1,24 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from config.database import get_db
-from entities.route_assignment import RouteAssignment, RouteAssignmentCreate, RouteAssignmentUpdate
+from config.database import get_db, get_async_db
+from entities.route_assignment import (
+    FINISHED_STATUSES, ResourceFreeWindows, RouteAssignment, RouteAssignmentCreate, RouteAssignmentUpdate, ScheduleWindow
+)
 from use_cases.assign_route_use_case import AssignRouteUseCase, AssignRouteRequest
-from repositories.route_assignment_repository import RouteAssignmentRepository
+from repositories.route_assignment_repository import RouteAssignmentRepository, AsyncRouteAssignmentRepository
 from repositories.vehicle_repository import VehicleRepository
 from repositories.driver_repository import DriverRepository
+from utils.assignment_schedule import DRIVER, VEHICLE, AssignmentSchedule, ScheduleConflictError, to_utc_naive
+from shared.utils.mapping import partial_model
+from shared.utils.responses import fields_parameter, trusted_response
 from utils.auth_utils import get_current_user, require_any_role
 
 
 router = APIRouter(prefix="/route-assignments", tags=["route-assignments"])
 
+# Ресурсов в одном запросе свободных окон
+MAX_FREE_WINDOW_RESOURCES = 1000
+
 
 def get_route_assignment_repository(db: Session = Depends(get_db)) -> RouteAssignmentRepository:
     return RouteAssignmentRepository(db)
 
 
+def get_async_route_assignment_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncRouteAssignmentRepository:
+    return AsyncRouteAssignmentRepository(db)
+
+
 def get_vehicle_repository(db: Session = Depends(get_db)) -> VehicleRepository:
     return VehicleRepository(db)
 
@@ -27,16 +41,21 @@ def get_driver_repository(db: Session = Depends(get_db)) -> DriverRepository:
     return DriverRepository(db)
 
 
+def get_assignment_schedule(request: Request) -> AssignmentSchedule:
+    return request.app.state.assignment_schedule
+
+
 def get_assign_route_use_case(
     vehicle_repository: VehicleRepository = Depends(get_vehicle_repository),
     driver_repository: DriverRepository = Depends(get_driver_repository),
-    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository)
+    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository),
+    schedule: AssignmentSchedule = Depends(get_assignment_schedule)
 ) -> AssignRouteUseCase:
-    return AssignRouteUseCase(vehicle_repository, driver_repository, route_assignment_repository)
+    return AssignRouteUseCase(vehicle_repository, driver_repository, route_assignment_repository, schedule)
 
 
 @router.post("/", response_model=RouteAssignment, status_code=status.HTTP_201_CREATED)
-async def assign_route(
+def assign_route(
     assignment_data: RouteAssignmentCreate,
     use_case: AssignRouteUseCase = Depends(get_assign_route_use_case),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
@@ -47,10 +66,13 @@ async def assign_route(
             vehicle_id=assignment_data.vehicle_id,
             driver_id=assignment_data.driver_id,
             estimated_duration_hours=assignment_data.estimated_duration_hours,
+            scheduled_start=assignment_data.scheduled_start,
             notes=assignment_data.notes
         )
         result = use_case.execute(request)
         return result
+    except ScheduleConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
@@ -59,26 +81,55 @@ async def assign_route(
 
 @router.get("/", response_model=List[RouteAssignment])
 async def get_all_route_assignments(
-    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository),
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(RouteAssignment)),
+    route_assignment_repository: AsyncRouteAssignmentRepository = Depends(get_async_route_assignment_repository),
     current_user: dict = Depends(get_current_user())
 ):
     try:
-        return route_assignment_repository.get_all()
+        return trusted_response(List[partial_model(RouteAssignment, fields)], await route_assignment_repository.get_all(fields=fields))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
+@router.get("/free-windows", response_model=List[ResourceFreeWindows])
+def get_free_windows(
+    start: datetime,
+    end: datetime,
+    resource: str = Query(VEHICLE, pattern=f"^({VEHICLE}|{DRIVER})$"),
+    ids: List[UUID] = Query(...),
+    min_hours: float = Query(0, ge=0),
+    schedule: AssignmentSchedule = Depends(get_assignment_schedule),
+    current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
+):
+    start, end = to_utc_naive(start), to_utc_naive(end)
+    if end <= start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start")
+    if len(ids) > MAX_FREE_WINDOW_RESOURCES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=f"At most {MAX_FREE_WINDOW_RESOURCES} ids per request")
+    windows = schedule.free_windows(resource, ids, start, end, timedelta(hours=min_hours))
+    return trusted_response(List[ResourceFreeWindows], [
+        ResourceFreeWindows.model_construct(
+            resource_id=resource_id,
+            windows=[ScheduleWindow.model_construct(start=window_start, end=window_end)
+                     for window_start, window_end in resource_windows]
+        )
+        for resource_id, resource_windows in windows.items()
+    ])
+
+
 @router.get("/{assignment_id}", response_model=RouteAssignment)
 async def get_route_assignment_by_id(
     assignment_id: UUID,
-    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository),
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(RouteAssignment)),
+    route_assignment_repository: AsyncRouteAssignmentRepository = Depends(get_async_route_assignment_repository),
     current_user: dict = Depends(get_current_user())
 ):
     try:
-        assignment = route_assignment_repository.get_by_id(assignment_id)
+        assignment = await route_assignment_repository.get_by_id(assignment_id, fields=fields)
         if not assignment:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route assignment not found")
-        return assignment
+        return trusted_response(partial_model(RouteAssignment, fields), assignment)
     except HTTPException:
         raise
     except Exception as e:
@@ -89,16 +140,21 @@ async def get_route_assignment_by_id(
 async def update_route_assignment(
     assignment_id: UUID,
     assignment_data: RouteAssignmentUpdate,
-    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository),
+    route_assignment_repository: AsyncRouteAssignmentRepository = Depends(get_async_route_assignment_repository),
+    schedule: AssignmentSchedule = Depends(get_assignment_schedule),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
 ):
     try:
-        assignment = route_assignment_repository.update(assignment_id, assignment_data)
+        assignment = await route_assignment_repository.update(assignment_id, assignment_data)
         if not assignment:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route assignment not found")
+        if assignment.status in FINISHED_STATUSES:
+            schedule.release(assignment.id)
         return assignment
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
@@ -106,13 +162,15 @@ async def update_route_assignment(
 @router.delete("/{assignment_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_route_assignment(
     assignment_id: UUID,
-    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository),
+    route_assignment_repository: AsyncRouteAssignmentRepository = Depends(get_async_route_assignment_repository),
+    schedule: AssignmentSchedule = Depends(get_assignment_schedule),
     current_user: dict = Depends(require_any_role(["admin"]))
 ):
     try:
-        success = route_assignment_repository.delete(assignment_id)
+        success = await route_assignment_repository.delete(assignment_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route assignment not found")
+        schedule.release(assignment_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -122,10 +180,10 @@ async def delete_route_assignment(
 @router.get("/route/{route_id}", response_model=List[RouteAssignment])
 async def get_route_assignments_by_route_id(
     route_id: UUID,
-    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository)
+    route_assignment_repository: AsyncRouteAssignmentRepository = Depends(get_async_route_assignment_repository)
 ):
     try:
-        return route_assignment_repository.get_by_route_id(route_id)
+        return trusted_response(List[RouteAssignment], await route_assignment_repository.get_by_route_id(route_id))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
@@ -133,10 +191,10 @@ async def get_route_assignments_by_route_id(
 @router.get("/vehicle/{vehicle_id}", response_model=List[RouteAssignment])
 async def get_route_assignments_by_vehicle_id(
     vehicle_id: UUID,
-    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository)
+    route_assignment_repository: AsyncRouteAssignmentRepository = Depends(get_async_route_assignment_repository)
 ):
     try:
-        return route_assignment_repository.get_by_vehicle_id(vehicle_id)
+        return trusted_response(List[RouteAssignment], await route_assignment_repository.get_by_vehicle_id(vehicle_id))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
@@ -144,10 +202,10 @@ async def get_route_assignments_by_vehicle_id(
 @router.get("/driver/{driver_id}", response_model=List[RouteAssignment])
 async def get_route_assignments_by_driver_id(
     driver_id: UUID,
-    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository)
+    route_assignment_repository: AsyncRouteAssignmentRepository = Depends(get_async_route_assignment_repository)
 ):
     try:
-        return route_assignment_repository.get_by_driver_id(driver_id)
+        return trusted_response(List[RouteAssignment], await route_assignment_repository.get_by_driver_id(driver_id))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
@@ -155,9 +213,9 @@ async def get_route_assignments_by_driver_id(
 @router.get("/status/{status}", response_model=List[RouteAssignment])
 async def get_route_assignments_by_status(
     status: str,
-    route_assignment_repository: RouteAssignmentRepository = Depends(get_route_assignment_repository)
+    route_assignment_repository: AsyncRouteAssignmentRepository = Depends(get_async_route_assignment_repository)
 ):
     try:
-        return route_assignment_repository.get_by_status(status)
+        return trusted_response(List[RouteAssignment], await route_assignment_repository.get_by_status(status))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") 
\ No newline at end of file
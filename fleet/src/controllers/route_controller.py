@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
+
+from config.database import get_db
+from entities.route import Route, RoutePlan, RoutePlanRequest, RouteStatus
+from use_cases.plan_routes_use_case import PlanRoutesUseCase
+from repositories.route_repository import RouteRepository
+from repositories.vehicle_repository import VehicleRepository
+from shared.utils.responses import trusted_response
+from utils.auth_utils import get_current_user, require_any_role
+from utils.eta_engine import EtaEngine
+
+
+router = APIRouter(prefix="/routes", tags=["routes"])
+
+
+def get_route_repository(db: Session = Depends(get_db)) -> RouteRepository:
+    return RouteRepository(db)
+
+
+def get_eta_engine(request: Request) -> EtaEngine:
+    return request.app.state.eta_engine
+
+
+def get_plan_routes_use_case(
+    db: Session = Depends(get_db),
+    route_repository: RouteRepository = Depends(get_route_repository),
+    eta_engine: EtaEngine = Depends(get_eta_engine)
+) -> PlanRoutesUseCase:
+    return PlanRoutesUseCase(VehicleRepository(db), route_repository, eta_engine)
+
+
+@router.post("/plan", response_model=RoutePlan, status_code=status.HTTP_201_CREATED)
+def plan_routes(
+    plan_request: RoutePlanRequest,
+    use_case: PlanRoutesUseCase = Depends(get_plan_routes_use_case),
+    current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
+):
+    # Синхронный обработчик: решатель занимает CPU и выполняется в пуле потоков, не блокируя event loop
+    try:
+        return trusted_response(RoutePlan, use_case.execute(plan_request), status_code=status.HTTP_201_CREATED)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+@router.get("/", response_model=List[Route])
+def get_routes(
+    vehicle_id: Optional[UUID] = None,
+    status_filter: Optional[RouteStatus] = Query(None, alias="status"),
+    route_repository: RouteRepository = Depends(get_route_repository),
+    current_user: dict = Depends(get_current_user())
+):
+    try:
+        routes = route_repository.get_all(vehicle_id=vehicle_id, status=status_filter.value if status_filter else None)
+        return trusted_response(List[Route], routes)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+@router.get("/{route_id}", response_model=Route)
+def get_route(
+    route_id: UUID,
+    route_repository: RouteRepository = Depends(get_route_repository),
+    current_user: dict = Depends(get_current_user())
+):
+    route = route_repository.get_by_id(route_id)
+    if not route:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Route not found")
+    return trusted_response(Route, route)
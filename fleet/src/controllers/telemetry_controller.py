@@ -0,0 +1,105 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID
+
+from config.settings import get_settings
+from entities.telemetry import TelemetryIngestResult, TelemetryPing, VehiclePosition
+from repositories.telemetry_repository import TelemetryRepository
+from shared.utils.responses import trusted_response
+from utils import telemetry_codec
+from utils.auth_utils import get_current_user, require_any_role
+from utils.telemetry_buffer import TelemetryBuffer, TelemetryBufferFull
+
+
+router = APIRouter(prefix="/telemetry", tags=["telemetry"])
+
+
+def get_telemetry_buffer(request: Request) -> TelemetryBuffer:
+    return request.app.state.telemetry_buffer
+
+
+def get_telemetry_repository(request: Request) -> TelemetryRepository:
+    return request.app.state.telemetry_repository
+
+
+def to_position(ping: TelemetryPing) -> VehiclePosition:
+    # Пинг уже проверен при приеме, повторная валидация не нужна
+    return VehiclePosition.model_construct(**ping._asdict())
+
+
+@router.post("/", response_model=TelemetryIngestResult, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_telemetry(
+    request: Request,
+    buffer: TelemetryBuffer = Depends(get_telemetry_buffer),
+    current_user: dict = Depends(require_any_role(["admin", "dispatcher", "driver"]))
+):
+    """Accept a batch of pings as JSON, NDJSON or binary records; they are written to the database in the background"""
+    content_type = request.headers.get("content-type", telemetry_codec.JSON_CONTENT_TYPE)
+    if content_type.split(";")[0].strip().lower() not in telemetry_codec.supported_content_types():
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Supported content types: {', '.join(telemetry_codec.supported_content_types())}"
+        )
+    body = await request.body()
+    settings = get_settings()
+    try:
+        pings, rejected = telemetry_codec.decode(body, content_type, settings.telemetry_max_future_seconds,
+                                                 max_age_seconds=settings.telemetry_max_age_seconds)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    try:
+        buffer.add(pings)
+    except TelemetryBufferFull as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+    return trusted_response(TelemetryIngestResult, TelemetryIngestResult(accepted=len(pings), rejected=rejected),
+                            status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get("/positions", response_model=List[VehiclePosition])
+async def get_positions(
+    vehicle_id: Optional[List[UUID]] = Query(None),
+    buffer: TelemetryBuffer = Depends(get_telemetry_buffer),
+    current_user: dict = Depends(get_current_user())
+):
+    """Latest known position of every vehicle (or of the given ones), served from memory"""
+    return trusted_response(List[VehiclePosition], [to_position(ping) for ping in buffer.get_positions(vehicle_id)])
+
+
+@router.get("/positions/{vehicle_id}", response_model=VehiclePosition)
+async def get_position(
+    vehicle_id: UUID,
+    buffer: TelemetryBuffer = Depends(get_telemetry_buffer),
+    current_user: dict = Depends(get_current_user())
+):
+    ping = buffer.get_position(vehicle_id)
+    if ping is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No telemetry for vehicle")
+    return trusted_response(VehiclePosition, to_position(ping))
+
+
+@router.get("/vehicles/{vehicle_id}/track", response_model=List[VehiclePosition])
+def get_track(
+    vehicle_id: UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(10000, ge=1, le=100000),
+    repository: TelemetryRepository = Depends(get_telemetry_repository),
+    current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
+):
+    """Stored pings of a vehicle in time order; by default for the last 24 hours"""
+    until = until or datetime.utcnow()
+    since = since or until - timedelta(hours=24)
+    try:
+        pings = repository.get_track(vehicle_id, since, until, limit)
+        return trusted_response(List[VehiclePosition], [to_position(ping) for ping in pings])
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+@router.get("/stats")
+async def get_telemetry_stats(
+    buffer: TelemetryBuffer = Depends(get_telemetry_buffer),
+    current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
+):
+    return buffer.get_stats()
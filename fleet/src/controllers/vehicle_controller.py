@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from fastapi import status
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from config.database import get_db
+from config.database import get_db, get_async_db
+from config.settings import get_settings
 from entities.vehicle import Vehicle, VehicleCreate, VehicleUpdate
 from use_cases.create_vehicle_use_case import CreateVehicleUseCase
-from repositories.vehicle_repository import VehicleRepository
+from repositories.vehicle_repository import VehicleRepository, AsyncVehicleRepository
+from shared.utils.mapping import partial_model
+from shared.utils.responses import (
+    cache_headers, etag_matches, fields_parameter, make_etag, not_modified, trusted_response
+)
 from utils.auth_utils import get_current_user, require_any_role
 
 
+settings = get_settings()
 router = APIRouter(prefix="/vehicles", tags=["vehicles"])
 
 
@@ -18,12 +25,16 @@ def get_vehicle_repository(db: Session = Depends(get_db)) -> VehicleRepository:
     return VehicleRepository(db)
 
 
+def get_async_vehicle_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncVehicleRepository:
+    return AsyncVehicleRepository(db)
+
+
 def get_create_vehicle_use_case(vehicle_repository: VehicleRepository = Depends(get_vehicle_repository)) -> CreateVehicleUseCase:
     return CreateVehicleUseCase(vehicle_repository)
 
 
 @router.post("/", response_model=Vehicle, status_code=status.HTTP_201_CREATED)
-async def create_vehicle(
+def create_vehicle(
     vehicle_data: VehicleCreate,
     use_case: CreateVehicleUseCase = Depends(get_create_vehicle_use_case),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
@@ -39,11 +50,18 @@ async def create_vehicle(
 
 @router.get("/", response_model=List[Vehicle])
 async def get_all_vehicles(
-    vehicle_repository: VehicleRepository = Depends(get_vehicle_repository),
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(Vehicle)),
+    if_none_match: Optional[str] = Header(None),
+    vehicle_repository: AsyncVehicleRepository = Depends(get_async_vehicle_repository),
     current_user: dict = Depends(get_current_user())
 ):
     try:
-        return vehicle_repository.get_all()
+        etag = make_etag(*await vehicle_repository.get_list_version())
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.http_cache_max_age_seconds)
+        vehicles = await vehicle_repository.get_all(fields=fields)
+        return trusted_response(List[partial_model(Vehicle, fields)], vehicles,
+                                headers=cache_headers(etag, settings.http_cache_max_age_seconds))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
@@ -51,14 +69,24 @@ async def get_all_vehicles(
 @router.get("/{vehicle_id}", response_model=Vehicle)
 async def get_vehicle_by_id(
     vehicle_id: UUID,
-    vehicle_repository: VehicleRepository = Depends(get_vehicle_repository),
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(Vehicle)),
+    if_none_match: Optional[str] = Header(None),
+    vehicle_repository: AsyncVehicleRepository = Depends(get_async_vehicle_repository),
     current_user: dict = Depends(get_current_user())
 ):
     try:
-        vehicle = vehicle_repository.get_by_id(vehicle_id)
+        # Версия читается по первичному ключу: на 304 сущность не загружается
+        version = await vehicle_repository.get_version(vehicle_id)
+        vehicle = None
+        if version is not None:
+            etag = make_etag(version)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag, settings.http_cache_max_age_seconds)
+            vehicle = await vehicle_repository.get_by_id(vehicle_id, fields=fields)
         if not vehicle:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
-        return vehicle
+        return trusted_response(partial_model(Vehicle, fields), vehicle,
+                                headers=cache_headers(etag, settings.http_cache_max_age_seconds))
     except HTTPException:
         raise
     except Exception as e:
@@ -69,11 +97,11 @@ async def get_vehicle_by_id(
 async def update_vehicle(
     vehicle_id: UUID,
     vehicle_data: VehicleUpdate,
-    vehicle_repository: VehicleRepository = Depends(get_vehicle_repository),
+    vehicle_repository: AsyncVehicleRepository = Depends(get_async_vehicle_repository),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
 ):
     try:
-        vehicle = vehicle_repository.update(vehicle_id, vehicle_data)
+        vehicle = await vehicle_repository.update(vehicle_id, vehicle_data)
         if not vehicle:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
         return vehicle
@@ -86,11 +114,11 @@ async def update_vehicle(
 @router.delete("/{vehicle_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_vehicle(
     vehicle_id: UUID,
-    vehicle_repository: VehicleRepository = Depends(get_vehicle_repository),
+    vehicle_repository: AsyncVehicleRepository = Depends(get_async_vehicle_repository),
     current_user: dict = Depends(require_any_role(["admin"]))
 ):
     try:
-        success = vehicle_repository.delete(vehicle_id)
+        success = await vehicle_repository.delete(vehicle_id)
         if not success:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
     except HTTPException:
@@ -102,11 +130,11 @@ async def delete_vehicle(
 @router.get("/by-license/{license_plate}", response_model=Vehicle)
 async def get_vehicle_by_license_plate(
     license_plate: str,
-    vehicle_repository: VehicleRepository = Depends(get_vehicle_repository),
+    vehicle_repository: AsyncVehicleRepository = Depends(get_async_vehicle_repository),
     current_user: dict = Depends(get_current_user())
 ):
     try:
-        vehicle = vehicle_repository.get_by_license_plate(license_plate)
+        vehicle = await vehicle_repository.get_by_license_plate(license_plate)
         if not vehicle:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vehicle not found")
         return vehicle
@@ -119,21 +147,21 @@ async def get_vehicle_by_license_plate(
 @router.get("/status/{status}", response_model=List[Vehicle])
 async def get_vehicles_by_status(
     status: str,
-    vehicle_repository: VehicleRepository = Depends(get_vehicle_repository),
+    vehicle_repository: AsyncVehicleRepository = Depends(get_async_vehicle_repository),
     current_user: dict = Depends(get_current_user())
 ):
     try:
-        return vehicle_repository.get_by_status(status)
+        return trusted_response(List[Vehicle], await vehicle_repository.get_by_status(status))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
 @router.get("/available/", response_model=List[Vehicle])
 async def get_available_vehicles(
-    vehicle_repository: VehicleRepository = Depends(get_vehicle_repository),
+    vehicle_repository: AsyncVehicleRepository = Depends(get_async_vehicle_repository),
     current_user: dict = Depends(get_current_user())
 ):
     try:
-        return vehicle_repository.get_available_vehicles()
+        return trusted_response(List[Vehicle], await vehicle_repository.get_available_vehicles())
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error") 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -63,6 +63,74 @@ class RouteAssignment(Base):
     completed_at = Column(DateTime, nullable=True)
     estimated_duration_hours = Column(Float, nullable=False)
     actual_duration_hours = Column(Float, nullable=True)
+    scheduled_start = Column(DateTime, nullable=True)
+    scheduled_end = Column(DateTime, nullable=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
+
+    # Загрузка расписания при старте читает только незавершенные назначения
+    __table_args__ = (
+        Index("ix_route_assignments_scheduled_end", "scheduled_end"),
+    )
+
+class ProcessedEvent(Base):
+    __tablename__ = "processed_events"
+    
+    event_id = Column(String(36), primary_key=True)
+    event_type = Column(String(50), nullable=False)
+    processed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Route(Base):
+    __tablename__ = "routes"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    vehicle_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    status = Column(String(20), default="planned", nullable=False)
+    depot_address = Column(String(200), nullable=False)
+    planned_start = Column(DateTime, nullable=False)
+    total_distance_km = Column(Float, nullable=False)
+    total_duration_minutes = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    stops = relationship("RouteStop", order_by="RouteStop.sequence", cascade="all, delete-orphan")
+
+
+class RouteStop(Base):
+    __tablename__ = "route_stops"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    route_id = Column(UUID(as_uuid=True), ForeignKey("routes.id", ondelete="CASCADE"), nullable=False, index=True)
+    sequence = Column(Integer, nullable=False)
+    order_id = Column(String(36), nullable=False, index=True)
+    address = Column(String(200), nullable=False)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    earliest_arrival = Column(DateTime, nullable=True)
+    latest_arrival = Column(DateTime, nullable=True)
+    planned_arrival = Column(DateTime, nullable=False)
+    service_minutes = Column(Float, nullable=False)
+    weight = Column(Float, nullable=False)
+    volume = Column(Float, nullable=False)
+
+
+class VehicleTelemetry(Base):
+    __tablename__ = "vehicle_telemetry"
+    
+    vehicle_id = Column(UUID(as_uuid=True), nullable=False)
+    recorded_at = Column(DateTime, nullable=False)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    speed_kmh = Column(Float, nullable=True)
+    heading = Column(Float, nullable=True)
+    odometer_km = Column(Float, nullable=True)
+    
+    # Секции по дням создает TelemetryRepository перед записью. Первичного ключа в таблице нет:
+    # повторно присланный пинг не должен ронять COPY всего пакета
+    __table_args__ = (
+        Index("ix_vehicle_telemetry_vehicle_recorded", "vehicle_id", "recorded_at"),
+        {"postgresql_partition_by": "RANGE (recorded_at)"}
+    )
+    __mapper_args__ = {"primary_key": [vehicle_id, recorded_at]}
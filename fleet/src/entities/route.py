@@ -0,0 +1,72 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+
+
+class RouteStatus(str, Enum):
+    PLANNED = "planned"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class RouteStop(BaseModel):
+    id: UUID
+    route_id: UUID
+    sequence: int
+    order_id: str
+    address: str
+    latitude: float
+    longitude: float
+    earliest_arrival: Optional[datetime] = None
+    latest_arrival: Optional[datetime] = None
+    planned_arrival: datetime
+    service_minutes: float
+    weight: float
+    volume: float
+
+
+class Route(BaseModel):
+    id: UUID
+    vehicle_id: UUID
+    status: RouteStatus = RouteStatus.PLANNED
+    depot_address: str
+    planned_start: datetime
+    total_distance_km: float
+    total_duration_minutes: float
+    stops: List[RouteStop] = []
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class RoutePlanStop(BaseModel):
+    order_id: str = Field(..., min_length=1, max_length=36)
+    address: str = Field(..., min_length=1, max_length=200)
+    weight: float = Field(..., gt=0)
+    volume: float = Field(..., gt=0)
+    earliest_arrival: Optional[datetime] = None
+    latest_arrival: Optional[datetime] = None
+    service_minutes: float = Field(15.0, ge=0)
+
+
+class RoutePlanRequest(BaseModel):
+    depot_address: str = Field(..., min_length=1, max_length=200)
+    planned_start: Optional[datetime] = None
+    stops: List[RoutePlanStop] = Field(..., min_length=1, max_length=10000)
+    # Машины для планирования; по умолчанию - все доступные
+    vehicle_ids: Optional[List[UUID]] = None
+    max_route_hours: Optional[float] = Field(None, gt=0)
+    time_budget_seconds: float = Field(2.0, gt=0, le=60)
+
+
+class UnassignedStop(BaseModel):
+    order_id: str
+    reason: str  # "unknown_address", "no_feasible_route"
+
+
+class RoutePlan(BaseModel):
+    routes: List[Route]
+    unassigned: List[UnassignedStop]
+    total_distance_km: float
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import List, Optional
 from uuid import UUID
 
 
@@ -12,6 +12,10 @@ class RouteAssignmentStatus:
     CANCELLED = "cancelled"
 
 
+# Завершенные и отмененные назначения не занимают машину и водителя
+FINISHED_STATUSES = (RouteAssignmentStatus.COMPLETED, RouteAssignmentStatus.CANCELLED)
+
+
 class RouteAssignment(BaseModel):
     id: UUID
     route_id: UUID
@@ -23,6 +27,9 @@ class RouteAssignment(BaseModel):
     completed_at: Optional[datetime] = None
     estimated_duration_hours: float = Field(..., gt=0)
     actual_duration_hours: Optional[float] = None
+    # Плановое время маршрута: scheduled_end = scheduled_start + estimated_duration_hours
+    scheduled_start: Optional[datetime] = None
+    scheduled_end: Optional[datetime] = None
     notes: Optional[str] = None
     created_at: datetime
     updated_at: datetime
@@ -33,12 +40,28 @@ class RouteAssignmentCreate(BaseModel):
     vehicle_id: UUID
     driver_id: UUID
     estimated_duration_hours: float = Field(..., gt=0)
+    scheduled_start: Optional[datetime] = None
     notes: Optional[str] = None
 
+    def scheduled_end(self) -> Optional[datetime]:
+        if self.scheduled_start is None:
+            return None
+        return self.scheduled_start + timedelta(hours=self.estimated_duration_hours)
+
 
 class RouteAssignmentUpdate(BaseModel):
-    status: Optional[str] = None
+    status: Optional[str] = Field(None, pattern="^(pending|assigned|in_progress|completed|cancelled)$")
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     actual_duration_hours: Optional[float] = Field(None, gt=0)
-    notes: Optional[str] = None 
\ No newline at end of file
+    notes: Optional[str] = None
+
+
+class ScheduleWindow(BaseModel):
+    start: datetime
+    end: datetime
+
+
+class ResourceFreeWindows(BaseModel):
+    resource_id: UUID
+    windows: List[ScheduleWindow]
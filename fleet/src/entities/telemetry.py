@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+
+class TelemetryPing(NamedTuple):
+    # Кортеж, а не модель pydantic: пинги идут десятками тысяч в секунду,
+    # проверка выполняется один раз при разборе пакета
+    vehicle_id: UUID
+    recorded_at: datetime
+    latitude: float
+    longitude: float
+    speed_kmh: Optional[float] = None
+    heading: Optional[float] = None
+    odometer_km: Optional[float] = None
+
+
+class VehiclePosition(BaseModel):
+    vehicle_id: UUID
+    recorded_at: datetime
+    latitude: float
+    longitude: float
+    speed_kmh: Optional[float] = None
+    heading: Optional[float] = None
+    odometer_km: Optional[float] = None
+
+
+class TelemetryIngestResult(BaseModel):
+    accepted: int
+    rejected: int
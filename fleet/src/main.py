@@ -1,19 +1,36 @@
+from datetime import datetime, timedelta
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqladmin import Admin, ModelView
 from config.settings import get_settings
 from config.logging import setup_logging
-from config.database import create_tables, engine
+from config.database import create_tables, engine, async_engine, replica_set
+from shared.utils.compression import CompressionMiddleware
+from shared.utils.database import get_pool_stats
+from shared.utils.geo import DEFAULT_GAZETTEER_PATH, Gazetteer
 from controllers.vehicle_controller import router as vehicle_router
 from controllers.driver_controller import router as driver_router
 from controllers.route_assignment_controller import router as route_assignment_router
+from controllers.route_controller import router as route_router
+from controllers.event_controller import router as event_router
+from controllers.telemetry_controller import router as telemetry_router
 from entities.database_models import Vehicle, Driver, RouteAssignment
 from shared.events.publisher import Publisher
 from shared.events.subscriber import Subscriber
+from shared.events.dedup import EventDeduplicator
 from use_cases.fleet_event_service import FleetEventService
+from utils.eta_engine import EtaEngine
+from utils.assignment_schedule import AssignmentSchedule
+from utils.spatial_index import SpatialIndex
+from utils.telemetry_buffer import TelemetryBuffer
 from repositories.driver_repository import DriverRepository
 from repositories.vehicle_repository import VehicleRepository
+from repositories.processed_event_repository import ProcessedEventRepository
+from repositories.telemetry_repository import TelemetryRepository
+from repositories.route_assignment_repository import RouteAssignmentRepository
 from utils.admin_auth import get_admin_auth
+from utils.auth_utils import revocation_list, jwks_client
 import structlog
 
 settings = get_settings()
@@ -24,7 +41,28 @@ publisher = Publisher(
     port=settings.rabbitmq_port,
     username=settings.rabbitmq_user,
     password=settings.rabbitmq_password,
-    exchange=settings.rabbitmq_exchange
+    exchange=settings.rabbitmq_exchange,
+    content_type=settings.rabbitmq_content_type
+)
+
+event_deduplicator = EventDeduplicator(capacity=settings.event_dedup_cache_size)
+
+eta_engine = EtaEngine(
+    Gazetteer(settings.eta_gazetteer_path or DEFAULT_GAZETTEER_PATH, cache_path=settings.eta_address_cache_path or None),
+    road_factor=settings.eta_road_factor,
+    handling_minutes=settings.eta_handling_minutes
+)
+
+spatial_index = SpatialIndex(cell_degrees=settings.spatial_index_cell_degrees)
+assignment_schedule = AssignmentSchedule()
+telemetry_repository = TelemetryRepository(engine)
+telemetry_buffer = TelemetryBuffer(
+    telemetry_repository.write_many,
+    batch_size=settings.telemetry_batch_size,
+    flush_interval_seconds=settings.telemetry_flush_interval_seconds,
+    max_pending=settings.telemetry_max_pending,
+    spatial_index=spatial_index,
+    max_write_attempts=settings.telemetry_max_write_attempts
 )
 
 subscriber = Subscriber(
@@ -34,18 +72,28 @@ subscriber = Subscriber(
     password=settings.rabbitmq_password,
     exchange=settings.rabbitmq_exchange,
     queue="fleet_queue",
-    routing_keys=["order_created"]
+    routing_keys=["order_created"],
+    deduplicator=event_deduplicator,
+    max_attempts=settings.event_max_attempts,
+    retry_base_delay_ms=settings.event_retry_base_delay_ms
 )
 
 logger = structlog.get_logger()
 
 app = FastAPI(
     title=settings.app_name,
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=ORJSONResponse
 )
 
 app.state.publisher = publisher
 app.state.subscriber = subscriber
+app.state.event_deduplicator = event_deduplicator
+app.state.eta_engine = eta_engine
+app.state.telemetry_repository = telemetry_repository
+app.state.telemetry_buffer = telemetry_buffer
+app.state.spatial_index = spatial_index
+app.state.assignment_schedule = assignment_schedule
 
 app.add_middleware(
     CORSMiddleware,
@@ -55,10 +103,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    encodings=settings.compression_encodings
+)
+
 # Include routers
 app.include_router(vehicle_router)
 app.include_router(driver_router)
 app.include_router(route_assignment_router)
+app.include_router(route_router)
+app.include_router(event_router)
+app.include_router(telemetry_router)
 
 # Setup admin panel with authentication
 admin = Admin(app, engine, authentication_backend=get_admin_auth())
@@ -127,6 +184,16 @@ admin.add_view(RouteAssignmentAdmin)
 async def startup_event():
     logger.info("Fleet service starting up")
     create_tables()
+    revocation_list.start(settings.token_revocation_sync_seconds)
+    if jwks_client is not None:
+        jwks_client.start(settings.jwks_refresh_seconds)
+    
+    try:
+        since = datetime.utcnow() - timedelta(hours=settings.telemetry_warmup_hours)
+        telemetry_buffer.load_latest(telemetry_repository.get_latest_positions(since))
+    except Exception as e:
+        logger.error("Failed to load latest vehicle positions", error=str(e))
+    telemetry_buffer.start()
     
     # Initialize repositories
     from sqlalchemy.orm import sessionmaker
@@ -135,9 +202,20 @@ async def startup_event():
     
     driver_repository = DriverRepository(db_session)
     vehicle_repository = VehicleRepository(db_session)
+    # Отдельная сессия: проверки дубликатов не смешиваются с транзакциями обработчиков
+    event_deduplicator.store = ProcessedEventRepository(SessionLocal())
+    
+    try:
+        assignment_schedule.load(RouteAssignmentRepository(db_session).get_scheduled(datetime.utcnow()))
+        logger.info("Route assignment schedule loaded", assignments=len(assignment_schedule))
+    except Exception as e:
+        logger.error("Failed to load route assignment schedule", error=str(e))
+        db_session.rollback()
     
     # Initialize and start event service
-    fleet_event_service = FleetEventService(publisher, subscriber, driver_repository, vehicle_repository)
+    fleet_event_service = FleetEventService(
+        publisher, subscriber, driver_repository, vehicle_repository, eta_engine, spatial_index
+    )
     app.state.fleet_event_service = fleet_event_service
     
     try:
@@ -150,6 +228,10 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Fleet service shutting down")
+    revocation_list.stop()
+    if jwks_client is not None:
+        jwks_client.stop()
+    telemetry_buffer.stop()
     try:
         subscriber.disconnect()
         publisher.disconnect()
@@ -168,6 +250,16 @@ async def health_check():
     return {"status": "healthy", "service": "fleet"}
 
 
+@app.get("/health/db")
+def database_pool_health():
+    # Загрузка пулов соединений: рост checked_out до capacity - признак исчерпания пула
+    return {
+        "sync": get_pool_stats(engine),
+        "async": get_pool_stats(async_engine),
+        "replicas": replica_set.get_stats() if replica_set else None
+    }
+
+
 @app.get("/admin-login")
 async def admin_login_page():
     """Кастомная страница входа в админ-панель"""
@@ -1,12 +1,22 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.utils.database import replica_read
+from shared.utils.mapping import RowMapper
 from datetime import datetime
 
 from entities.driver import Driver, DriverCreate, DriverUpdate, DriverStatus
 from entities.database_models import Driver as DriverModel
-from repositories.interfaces.driver_repository import IDriverRepository
+from repositories.interfaces.driver_repository import IDriverRepository, IAsyncDriverRepository
+
+
+driver_mapper = RowMapper(Driver)
+# Списки читаются строками колонок: без ORM объектов и identity map
+DRIVER_COLUMNS = driver_mapper.columns(DriverModel)
+# Версия строки для ETag
+DRIVER_VERSION = func.coalesce(DriverModel.updated_at, DriverModel.created_at)
 
 
 class DriverRepository(IDriverRepository):
@@ -29,98 +39,35 @@ class DriverRepository(IDriverRepository):
         )
         
         self.db_session.add(db_driver)
-        self.db_session.commit()
-        self.db_session.refresh(db_driver)
+        self.db_session.flush()
         
-        return Driver(
-            id=db_driver.id,
-            first_name=db_driver.first_name,
-            last_name=db_driver.last_name,
-            email=db_driver.email,
-            phone=db_driver.phone,
-            license_number=db_driver.license_number,
-            license_class=db_driver.license_class,
-            license_expiry=db_driver.license_expiry,
-            medical_certificate_expiry=db_driver.medical_certificate_expiry,
-            experience_years=db_driver.experience_years,
-            status=db_driver.status,
-            emergency_contact_name=db_driver.emergency_contact_name,
-            emergency_contact_phone=db_driver.emergency_contact_phone,
-            created_at=db_driver.created_at,
-            updated_at=db_driver.updated_at
-        )
+        result = driver_mapper.one(db_driver)
+        self.db_session.commit()
+        return result
     
     def get_by_id(self, driver_id: UUID) -> Optional[Driver]:
         db_driver = self.db_session.query(DriverModel).filter(DriverModel.id == driver_id).first()
         if not db_driver:
             return None
         
-        return Driver(
-            id=db_driver.id,
-            first_name=db_driver.first_name,
-            last_name=db_driver.last_name,
-            email=db_driver.email,
-            phone=db_driver.phone,
-            license_number=db_driver.license_number,
-            license_class=db_driver.license_class,
-            license_expiry=db_driver.license_expiry,
-            medical_certificate_expiry=db_driver.medical_certificate_expiry,
-            experience_years=db_driver.experience_years,
-            status=db_driver.status,
-            emergency_contact_name=db_driver.emergency_contact_name,
-            emergency_contact_phone=db_driver.emergency_contact_phone,
-            created_at=db_driver.created_at,
-            updated_at=db_driver.updated_at
-        )
+        return driver_mapper.one(db_driver)
     
     def get_by_email(self, email: str) -> Optional[Driver]:
         db_driver = self.db_session.query(DriverModel).filter(DriverModel.email == email).first()
         if not db_driver:
             return None
         
-        return Driver(
-            id=db_driver.id,
-            first_name=db_driver.first_name,
-            last_name=db_driver.last_name,
-            email=db_driver.email,
-            phone=db_driver.phone,
-            license_number=db_driver.license_number,
-            license_class=db_driver.license_class,
-            license_expiry=db_driver.license_expiry,
-            medical_certificate_expiry=db_driver.medical_certificate_expiry,
-            experience_years=db_driver.experience_years,
-            status=db_driver.status,
-            emergency_contact_name=db_driver.emergency_contact_name,
-            emergency_contact_phone=db_driver.emergency_contact_phone,
-            created_at=db_driver.created_at,
-            updated_at=db_driver.updated_at
-        )
+        return driver_mapper.one(db_driver)
     
     def get_by_license_number(self, license_number: str) -> Optional[Driver]:
         db_driver = self.db_session.query(DriverModel).filter(DriverModel.license_number == license_number).first()
         if not db_driver:
             return None
         
-        return Driver(
-            id=db_driver.id,
-            first_name=db_driver.first_name,
-            last_name=db_driver.last_name,
-            email=db_driver.email,
-            phone=db_driver.phone,
-            license_number=db_driver.license_number,
-            license_class=db_driver.license_class,
-            license_expiry=db_driver.license_expiry,
-            medical_certificate_expiry=db_driver.medical_certificate_expiry,
-            experience_years=db_driver.experience_years,
-            status=db_driver.status,
-            emergency_contact_name=db_driver.emergency_contact_name,
-            emergency_contact_phone=db_driver.emergency_contact_phone,
-            created_at=db_driver.created_at,
-            updated_at=db_driver.updated_at
-        )
+        return driver_mapper.one(db_driver)
     
     def update(self, driver_id: UUID, driver: DriverUpdate) -> Optional[Driver]:
-        db_driver = self.db_session.query(DriverModel).filter(DriverModel.id == driver_id).first()
+        db_driver = self.db_session.get(DriverModel, UUID(str(driver_id)))
         if not db_driver:
             return None
         
@@ -129,29 +76,14 @@ class DriverRepository(IDriverRepository):
             setattr(db_driver, field, value)
         
         db_driver.updated_at = datetime.utcnow()
-        self.db_session.commit()
-        self.db_session.refresh(db_driver)
+        self.db_session.flush()
         
-        return Driver(
-            id=db_driver.id,
-            first_name=db_driver.first_name,
-            last_name=db_driver.last_name,
-            email=db_driver.email,
-            phone=db_driver.phone,
-            license_number=db_driver.license_number,
-            license_class=db_driver.license_class,
-            license_expiry=db_driver.license_expiry,
-            medical_certificate_expiry=db_driver.medical_certificate_expiry,
-            experience_years=db_driver.experience_years,
-            status=db_driver.status,
-            emergency_contact_name=db_driver.emergency_contact_name,
-            emergency_contact_phone=db_driver.emergency_contact_phone,
-            created_at=db_driver.created_at,
-            updated_at=db_driver.updated_at
-        )
+        result = driver_mapper.one(db_driver)
+        self.db_session.commit()
+        return result
     
     def delete(self, driver_id: UUID) -> bool:
-        db_driver = self.db_session.query(DriverModel).filter(DriverModel.id == driver_id).first()
+        db_driver = self.db_session.get(DriverModel, UUID(str(driver_id)))
         if not db_driver:
             return False
         
@@ -160,55 +92,17 @@ class DriverRepository(IDriverRepository):
         return True
     
     def get_all(self) -> List[Driver]:
-        db_drivers = self.db_session.query(DriverModel).all()
-        return [
-            Driver(
-                id=driver.id,
-                first_name=driver.first_name,
-                last_name=driver.last_name,
-                email=driver.email,
-                phone=driver.phone,
-                license_number=driver.license_number,
-                license_class=driver.license_class,
-                license_expiry=driver.license_expiry,
-                medical_certificate_expiry=driver.medical_certificate_expiry,
-                experience_years=driver.experience_years,
-                status=driver.status,
-                emergency_contact_name=driver.emergency_contact_name,
-                emergency_contact_phone=driver.emergency_contact_phone,
-                created_at=driver.created_at,
-                updated_at=driver.updated_at
-            )
-            for driver in db_drivers
-        ]
+        db_drivers = self.db_session.query(*DRIVER_COLUMNS).all()
+        return driver_mapper.many(db_drivers)
     
     def get_by_status(self, status: str) -> List[Driver]:
-        db_drivers = self.db_session.query(DriverModel).filter(DriverModel.status == status).all()
-        return [
-            Driver(
-                id=driver.id,
-                first_name=driver.first_name,
-                last_name=driver.last_name,
-                email=driver.email,
-                phone=driver.phone,
-                license_number=driver.license_number,
-                license_class=driver.license_class,
-                license_expiry=driver.license_expiry,
-                medical_certificate_expiry=driver.medical_certificate_expiry,
-                experience_years=driver.experience_years,
-                status=driver.status,
-                emergency_contact_name=driver.emergency_contact_name,
-                emergency_contact_phone=driver.emergency_contact_phone,
-                created_at=driver.created_at,
-                updated_at=driver.updated_at
-            )
-            for driver in db_drivers
-        ]
+        db_drivers = self.db_session.query(*DRIVER_COLUMNS).filter(DriverModel.status == status).all()
+        return driver_mapper.many(db_drivers)
     
     def get_available_drivers(self) -> List[Driver]:
         # Get active drivers with valid licenses and medical certificates
         current_time = datetime.utcnow()
-        db_drivers = self.db_session.query(DriverModel).filter(
+        db_drivers = self.db_session.query(*DRIVER_COLUMNS).filter(
             and_(
                 DriverModel.status == DriverStatus.ACTIVE,
                 DriverModel.license_expiry > current_time,
@@ -216,23 +110,94 @@ class DriverRepository(IDriverRepository):
             )
         ).all()
         
-        return [
-            Driver(
-                id=driver.id,
-                first_name=driver.first_name,
-                last_name=driver.last_name,
-                email=driver.email,
-                phone=driver.phone,
-                license_number=driver.license_number,
-                license_class=driver.license_class,
-                license_expiry=driver.license_expiry,
-                medical_certificate_expiry=driver.medical_certificate_expiry,
-                experience_years=driver.experience_years,
-                status=driver.status,
-                emergency_contact_name=driver.emergency_contact_name,
-                emergency_contact_phone=driver.emergency_contact_phone,
-                created_at=driver.created_at,
-                updated_at=driver.updated_at
+        return driver_mapper.many(db_drivers)
+
+
+class AsyncDriverRepository(IAsyncDriverRepository):
+    """DriverRepository over AsyncSession; objects are not expired on commit, so no refresh is needed"""
+    
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+    
+    async def create(self, driver: DriverCreate) -> Driver:
+        db_driver = DriverModel(**driver.model_dump())
+        self.db_session.add(db_driver)
+        await self.db_session.commit()
+        return driver_mapper.one(db_driver)
+    
+    async def get_by_id(self, driver_id: UUID, fields: Optional[Sequence[str]] = None) -> Optional[Driver]:
+        if fields:
+            mapper = driver_mapper.project(fields)
+            db_drivers = await self.db_session.execute(
+                select(*mapper.columns(DriverModel)).where(DriverModel.id == driver_id)
+            )
+            return mapper.one(db_drivers.first())
+        db_driver = await self.db_session.get(DriverModel, driver_id)
+        return driver_mapper.one(db_driver)
+    
+    async def get_version(self, driver_id: UUID) -> Optional[datetime]:
+        """Last change time of the driver, None if it does not exist; cheaper than loading it"""
+        return await self.db_session.scalar(select(DRIVER_VERSION).where(DriverModel.id == driver_id))
+    
+    @replica_read("db_session")
+    async def get_list_version(self) -> Tuple[int, Optional[datetime]]:
+        """Row count and last change time: any insert, update or delete changes the pair"""
+        count, changed_at = (await self.db_session.execute(select(func.count(), func.max(DRIVER_VERSION)))).one()
+        return count, changed_at
+    
+    async def get_by_email(self, email: str) -> Optional[Driver]:
+        return await self._get_one(select(DriverModel).where(DriverModel.email == email))
+    
+    async def get_by_license_number(self, license_number: str) -> Optional[Driver]:
+        return await self._get_one(select(DriverModel).where(DriverModel.license_number == license_number))
+    
+    async def update(self, driver_id: UUID, driver: DriverUpdate) -> Optional[Driver]:
+        db_driver = await self.db_session.get(DriverModel, driver_id)
+        if not db_driver:
+            return None
+        
+        update_data = driver.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_driver, field, value)
+        
+        db_driver.updated_at = datetime.utcnow()
+        await self.db_session.commit()
+        return driver_mapper.one(db_driver)
+    
+    async def delete(self, driver_id: UUID) -> bool:
+        db_driver = await self.db_session.get(DriverModel, driver_id)
+        if not db_driver:
+            return False
+        
+        await self.db_session.delete(db_driver)
+        await self.db_session.commit()
+        return True
+    
+    @replica_read("db_session")
+    async def get_all(self, fields: Optional[Sequence[str]] = None) -> List[Driver]:
+        mapper = driver_mapper.project(fields)
+        return await self._get_many(select(*mapper.columns(DriverModel)), mapper)
+    
+    @replica_read("db_session")
+    async def get_by_status(self, status: str) -> List[Driver]:
+        return await self._get_many(select(*DRIVER_COLUMNS).where(DriverModel.status == status))
+    
+    @replica_read("db_session")
+    async def get_available_drivers(self) -> List[Driver]:
+        # Get active drivers with valid licenses and medical certificates
+        current_time = datetime.utcnow()
+        return await self._get_many(select(*DRIVER_COLUMNS).where(
+            and_(
+                DriverModel.status == DriverStatus.ACTIVE,
+                DriverModel.license_expiry > current_time,
+                DriverModel.medical_certificate_expiry > current_time
             )
-            for driver in db_drivers
-        ] 
\ No newline at end of file
+        ))
+    
+    async def _get_one(self, query) -> Optional[Driver]:
+        db_driver = await self.db_session.scalar(query)
+        return driver_mapper.one(db_driver)
+    
+    async def _get_many(self, query, mapper: RowMapper = driver_mapper) -> List[Driver]:
+        db_drivers = await self.db_session.execute(query)
+        return mapper.many(db_drivers)
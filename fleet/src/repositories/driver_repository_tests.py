@@ -2,7 +2,7 @@ import pytest
 from uuid import uuid4
 from datetime import datetime, timedelta
 from entities.driver import Driver, DriverCreate, DriverUpdate, DriverStatus
-from repositories.driver_repository import DriverRepository
+from repositories.driver_repository import DriverRepository, AsyncDriverRepository
 
 
 @pytest.fixture
@@ -230,4 +230,22 @@ def test_get_available_drivers(f_driver_repository, f_valid_driver_data):
     
     available_driver_ids = [driver.id for driver in available_drivers]
     assert available_driver.id in available_driver_ids
-    assert expired_driver.id not in available_driver_ids 
\ No newline at end of file
+    assert expired_driver.id not in available_driver_ids
+
+
+def test_async_get_available_drivers(f_run_async, f_valid_driver_data):
+    async def scenario(session):
+        repository = AsyncDriverRepository(session)
+        created_driver = await repository.create(f_valid_driver_data)
+        return created_driver, await repository.get_available_drivers()
+    
+    created_driver, available_drivers = f_run_async(scenario)
+    
+    assert [driver.id for driver in available_drivers] == [created_driver.id]
+
+
+def test_async_get_by_email_not_found(f_run_async):
+    async def scenario(session):
+        return await AsyncDriverRepository(session).get_by_email("missing@example.com")
+    
+    assert f_run_async(scenario) is None
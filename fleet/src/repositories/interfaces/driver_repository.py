@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime
 from entities.driver import Driver, DriverCreate, DriverUpdate
@@ -40,4 +40,52 @@ class IDriverRepository(ABC):
     
     @abstractmethod
     def get_available_drivers(self) -> List[Driver]:
-        pass 
\ No newline at end of file
+        pass
+
+
+class IAsyncDriverRepository(ABC):
+    """Variant of IDriverRepository for AsyncSession"""
+    
+    @abstractmethod
+    async def create(self, driver: DriverCreate) -> Driver:
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, driver_id: UUID, fields: Optional[Sequence[str]] = None) -> Optional[Driver]:
+        pass
+    
+    @abstractmethod
+    async def get_version(self, driver_id: UUID) -> Optional[datetime]:
+        pass
+    
+    @abstractmethod
+    async def get_list_version(self) -> Tuple[int, Optional[datetime]]:
+        pass
+    
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[Driver]:
+        pass
+    
+    @abstractmethod
+    async def get_by_license_number(self, license_number: str) -> Optional[Driver]:
+        pass
+    
+    @abstractmethod
+    async def update(self, driver_id: UUID, driver: DriverUpdate) -> Optional[Driver]:
+        pass
+    
+    @abstractmethod
+    async def delete(self, driver_id: UUID) -> bool:
+        pass
+    
+    @abstractmethod
+    async def get_all(self, fields: Optional[Sequence[str]] = None) -> List[Driver]:
+        pass
+    
+    @abstractmethod
+    async def get_by_status(self, status: str) -> List[Driver]:
+        pass
+    
+    @abstractmethod
+    async def get_available_drivers(self) -> List[Driver]:
+        pass
\ No newline at end of file
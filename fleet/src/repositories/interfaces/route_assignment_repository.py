@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Sequence
 from uuid import UUID
 from entities.route_assignment import RouteAssignment, RouteAssignmentCreate, RouteAssignmentUpdate
 
@@ -39,4 +40,49 @@ class IRouteAssignmentRepository(ABC):
     
     @abstractmethod
     def get_by_status(self, status: str) -> List[RouteAssignment]:
-        pass 
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def get_scheduled(self, since: datetime) -> List[RouteAssignment]:
+        """Unfinished assignments planned to end after ``since``"""
+        pass
+
+
+class IAsyncRouteAssignmentRepository(ABC):
+    """Variant of IRouteAssignmentRepository for AsyncSession"""
+    
+    @abstractmethod
+    async def create(self, assignment: RouteAssignmentCreate) -> RouteAssignment:
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, assignment_id: UUID, fields: Optional[Sequence[str]] = None) -> Optional[RouteAssignment]:
+        pass
+    
+    @abstractmethod
+    async def get_by_route_id(self, route_id: UUID) -> List[RouteAssignment]:
+        pass
+    
+    @abstractmethod
+    async def get_by_vehicle_id(self, vehicle_id: UUID) -> List[RouteAssignment]:
+        pass
+    
+    @abstractmethod
+    async def get_by_driver_id(self, driver_id: UUID) -> List[RouteAssignment]:
+        pass
+    
+    @abstractmethod
+    async def update(self, assignment_id: UUID, assignment: RouteAssignmentUpdate) -> Optional[RouteAssignment]:
+        pass
+    
+    @abstractmethod
+    async def delete(self, assignment_id: UUID) -> bool:
+        pass
+    
+    @abstractmethod
+    async def get_all(self, fields: Optional[Sequence[str]] = None) -> List[RouteAssignment]:
+        pass
+    
+    @abstractmethod
+    async def get_by_status(self, status: str) -> List[RouteAssignment]:
+        pass
\ No newline at end of file
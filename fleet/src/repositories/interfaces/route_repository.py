@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+from entities.route import Route
+
+
+class IRouteRepository(ABC):
+    @abstractmethod
+    def create_many(self, routes: List[Route]) -> List[Route]:
+        pass
+    
+    @abstractmethod
+    def get_by_id(self, route_id: UUID) -> Optional[Route]:
+        pass
+    
+    @abstractmethod
+    def get_all(self, vehicle_id: Optional[UUID] = None, status: Optional[str] = None) -> List[Route]:
+        pass
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List
+from uuid import UUID
+from entities.telemetry import TelemetryPing
+
+
+class ITelemetryRepository(ABC):
+    @abstractmethod
+    def write_many(self, pings: List[TelemetryPing]) -> None:
+        pass
+
+    @abstractmethod
+    def get_latest_positions(self, since: datetime) -> List[TelemetryPing]:
+        pass
+
+    @abstractmethod
+    def get_track(self, vehicle_id: UUID, since: datetime, until: datetime, limit: int = 10000) -> List[TelemetryPing]:
+        pass
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Sequence, Tuple
 from entities.vehicle import Vehicle, VehicleCreate, VehicleUpdate
 
 
@@ -34,4 +35,48 @@ class IVehicleRepository(ABC):
     
     @abstractmethod
     def delete(self, vehicle_id: str) -> bool:
-        pass 
\ No newline at end of file
+        pass
+
+
+class IAsyncVehicleRepository(ABC):
+    """Variant of IVehicleRepository for AsyncSession"""
+    
+    @abstractmethod
+    async def create(self, vehicle: VehicleCreate) -> Vehicle:
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, vehicle_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Vehicle]:
+        pass
+    
+    @abstractmethod
+    async def get_version(self, vehicle_id: str) -> Optional[datetime]:
+        pass
+    
+    @abstractmethod
+    async def get_list_version(self) -> Tuple[int, Optional[datetime]]:
+        pass
+    
+    @abstractmethod
+    async def get_by_license_plate(self, license_plate: str) -> Optional[Vehicle]:
+        pass
+    
+    @abstractmethod
+    async def get_by_status(self, status: str) -> List[Vehicle]:
+        pass
+    
+    @abstractmethod
+    async def get_available_vehicles(self) -> List[Vehicle]:
+        pass
+    
+    @abstractmethod
+    async def get_all(self, fields: Optional[Sequence[str]] = None) -> List[Vehicle]:
+        pass
+    
+    @abstractmethod
+    async def update(self, vehicle_id: str, vehicle: VehicleUpdate) -> Optional[Vehicle]:
+        pass
+    
+    @abstractmethod
+    async def delete(self, vehicle_id: str) -> bool:
+        pass
\ No newline at end of file
@@ -1,11 +1,27 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.utils.database import replica_read
+from shared.utils.mapping import RowMapper
 from datetime import datetime
 
-from entities.route_assignment import RouteAssignment, RouteAssignmentCreate, RouteAssignmentUpdate, RouteAssignmentStatus
+from entities.route_assignment import RouteAssignment, RouteAssignmentCreate, RouteAssignmentUpdate, RouteAssignmentStatus, FINISHED_STATUSES
 from entities.database_models import RouteAssignment as RouteAssignmentModel
-from repositories.interfaces.route_assignment_repository import IRouteAssignmentRepository
+from repositories.interfaces.route_assignment_repository import IRouteAssignmentRepository, IAsyncRouteAssignmentRepository
+
+
+route_assignment_mapper = RowMapper(RouteAssignment)
+# Списки читаются строками колонок: без ORM объектов и identity map
+ROUTE_ASSIGNMENT_COLUMNS = route_assignment_mapper.columns(RouteAssignmentModel)
+
+
+def _check_not_reopened(current_status: str, new_status: Optional[str]) -> None:
+    # Время завершенного назначения уже освобождено в AssignmentSchedule: возврат в работу
+    # занял бы машину и водителя в обход проверки пересечений
+    if current_status in FINISHED_STATUSES and new_status is not None and new_status not in FINISHED_STATUSES:
+        raise ValueError(f"Cannot reopen a {current_status} route assignment")
 
 
 class RouteAssignmentRepository(IRouteAssignmentRepository):
@@ -18,144 +34,56 @@ class RouteAssignmentRepository(IRouteAssignmentRepository):
             vehicle_id=assignment.vehicle_id,
             driver_id=assignment.driver_id,
             estimated_duration_hours=assignment.estimated_duration_hours,
+            scheduled_start=assignment.scheduled_start,
+            scheduled_end=assignment.scheduled_end(),
             notes=assignment.notes
         )
         
         self.db_session.add(db_assignment)
-        self.db_session.commit()
-        self.db_session.refresh(db_assignment)
+        self.db_session.flush()
         
-        return RouteAssignment(
-            id=db_assignment.id,
-            route_id=db_assignment.route_id,
-            vehicle_id=db_assignment.vehicle_id,
-            driver_id=db_assignment.driver_id,
-            status=db_assignment.status,
-            assigned_at=db_assignment.assigned_at,
-            started_at=db_assignment.started_at,
-            completed_at=db_assignment.completed_at,
-            estimated_duration_hours=db_assignment.estimated_duration_hours,
-            actual_duration_hours=db_assignment.actual_duration_hours,
-            notes=db_assignment.notes,
-            created_at=db_assignment.created_at,
-            updated_at=db_assignment.updated_at
-        )
+        result = route_assignment_mapper.one(db_assignment)
+        self.db_session.commit()
+        return result
     
     def get_by_id(self, assignment_id: UUID) -> Optional[RouteAssignment]:
         db_assignment = self.db_session.query(RouteAssignmentModel).filter(RouteAssignmentModel.id == assignment_id).first()
         if not db_assignment:
             return None
         
-        return RouteAssignment(
-            id=db_assignment.id,
-            route_id=db_assignment.route_id,
-            vehicle_id=db_assignment.vehicle_id,
-            driver_id=db_assignment.driver_id,
-            status=db_assignment.status,
-            assigned_at=db_assignment.assigned_at,
-            started_at=db_assignment.started_at,
-            completed_at=db_assignment.completed_at,
-            estimated_duration_hours=db_assignment.estimated_duration_hours,
-            actual_duration_hours=db_assignment.actual_duration_hours,
-            notes=db_assignment.notes,
-            created_at=db_assignment.created_at,
-            updated_at=db_assignment.updated_at
-        )
+        return route_assignment_mapper.one(db_assignment)
     
     def get_by_route_id(self, route_id: UUID) -> List[RouteAssignment]:
-        db_assignments = self.db_session.query(RouteAssignmentModel).filter(RouteAssignmentModel.route_id == route_id).all()
-        return [
-            RouteAssignment(
-                id=assignment.id,
-                route_id=assignment.route_id,
-                vehicle_id=assignment.vehicle_id,
-                driver_id=assignment.driver_id,
-                status=assignment.status,
-                assigned_at=assignment.assigned_at,
-                started_at=assignment.started_at,
-                completed_at=assignment.completed_at,
-                estimated_duration_hours=assignment.estimated_duration_hours,
-                actual_duration_hours=assignment.actual_duration_hours,
-                notes=assignment.notes,
-                created_at=assignment.created_at,
-                updated_at=assignment.updated_at
-            )
-            for assignment in db_assignments
-        ]
+        db_assignments = self.db_session.query(*ROUTE_ASSIGNMENT_COLUMNS).filter(RouteAssignmentModel.route_id == route_id).all()
+        return route_assignment_mapper.many(db_assignments)
     
     def get_by_vehicle_id(self, vehicle_id: UUID) -> List[RouteAssignment]:
-        db_assignments = self.db_session.query(RouteAssignmentModel).filter(RouteAssignmentModel.vehicle_id == vehicle_id).all()
-        return [
-            RouteAssignment(
-                id=assignment.id,
-                route_id=assignment.route_id,
-                vehicle_id=assignment.vehicle_id,
-                driver_id=assignment.driver_id,
-                status=assignment.status,
-                assigned_at=assignment.assigned_at,
-                started_at=assignment.started_at,
-                completed_at=assignment.completed_at,
-                estimated_duration_hours=assignment.estimated_duration_hours,
-                actual_duration_hours=assignment.actual_duration_hours,
-                notes=assignment.notes,
-                created_at=assignment.created_at,
-                updated_at=assignment.updated_at
-            )
-            for assignment in db_assignments
-        ]
+        db_assignments = self.db_session.query(*ROUTE_ASSIGNMENT_COLUMNS).filter(RouteAssignmentModel.vehicle_id == vehicle_id).all()
+        return route_assignment_mapper.many(db_assignments)
     
     def get_by_driver_id(self, driver_id: UUID) -> List[RouteAssignment]:
-        db_assignments = self.db_session.query(RouteAssignmentModel).filter(RouteAssignmentModel.driver_id == driver_id).all()
-        return [
-            RouteAssignment(
-                id=assignment.id,
-                route_id=assignment.route_id,
-                vehicle_id=assignment.vehicle_id,
-                driver_id=assignment.driver_id,
-                status=assignment.status,
-                assigned_at=assignment.assigned_at,
-                started_at=assignment.started_at,
-                completed_at=assignment.completed_at,
-                estimated_duration_hours=assignment.estimated_duration_hours,
-                actual_duration_hours=assignment.actual_duration_hours,
-                notes=assignment.notes,
-                created_at=assignment.created_at,
-                updated_at=assignment.updated_at
-            )
-            for assignment in db_assignments
-        ]
+        db_assignments = self.db_session.query(*ROUTE_ASSIGNMENT_COLUMNS).filter(RouteAssignmentModel.driver_id == driver_id).all()
+        return route_assignment_mapper.many(db_assignments)
     
     def update(self, assignment_id: UUID, assignment: RouteAssignmentUpdate) -> Optional[RouteAssignment]:
-        db_assignment = self.db_session.query(RouteAssignmentModel).filter(RouteAssignmentModel.id == assignment_id).first()
+        db_assignment = self.db_session.get(RouteAssignmentModel, UUID(str(assignment_id)), with_for_update=True)
         if not db_assignment:
             return None
         
+        _check_not_reopened(db_assignment.status, assignment.status)
         update_data = assignment.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_assignment, field, value)
         
         db_assignment.updated_at = datetime.utcnow()
-        self.db_session.commit()
-        self.db_session.refresh(db_assignment)
+        self.db_session.flush()
         
-        return RouteAssignment(
-            id=db_assignment.id,
-            route_id=db_assignment.route_id,
-            vehicle_id=db_assignment.vehicle_id,
-            driver_id=db_assignment.driver_id,
-            status=db_assignment.status,
-            assigned_at=db_assignment.assigned_at,
-            started_at=db_assignment.started_at,
-            completed_at=db_assignment.completed_at,
-            estimated_duration_hours=db_assignment.estimated_duration_hours,
-            actual_duration_hours=db_assignment.actual_duration_hours,
-            notes=db_assignment.notes,
-            created_at=db_assignment.created_at,
-            updated_at=db_assignment.updated_at
-        )
+        result = route_assignment_mapper.one(db_assignment)
+        self.db_session.commit()
+        return result
     
     def delete(self, assignment_id: UUID) -> bool:
-        db_assignment = self.db_session.query(RouteAssignmentModel).filter(RouteAssignmentModel.id == assignment_id).first()
+        db_assignment = self.db_session.get(RouteAssignmentModel, UUID(str(assignment_id)))
         if not db_assignment:
             return False
         
@@ -164,43 +92,88 @@ class RouteAssignmentRepository(IRouteAssignmentRepository):
         return True
     
     def get_all(self) -> List[RouteAssignment]:
-        db_assignments = self.db_session.query(RouteAssignmentModel).all()
-        return [
-            RouteAssignment(
-                id=assignment.id,
-                route_id=assignment.route_id,
-                vehicle_id=assignment.vehicle_id,
-                driver_id=assignment.driver_id,
-                status=assignment.status,
-                assigned_at=assignment.assigned_at,
-                started_at=assignment.started_at,
-                completed_at=assignment.completed_at,
-                estimated_duration_hours=assignment.estimated_duration_hours,
-                actual_duration_hours=assignment.actual_duration_hours,
-                notes=assignment.notes,
-                created_at=assignment.created_at,
-                updated_at=assignment.updated_at
-            )
-            for assignment in db_assignments
-        ]
+        db_assignments = self.db_session.query(*ROUTE_ASSIGNMENT_COLUMNS).all()
+        return route_assignment_mapper.many(db_assignments)
     
     def get_by_status(self, status: str) -> List[RouteAssignment]:
-        db_assignments = self.db_session.query(RouteAssignmentModel).filter(RouteAssignmentModel.status == status).all()
-        return [
-            RouteAssignment(
-                id=assignment.id,
-                route_id=assignment.route_id,
-                vehicle_id=assignment.vehicle_id,
-                driver_id=assignment.driver_id,
-                status=assignment.status,
-                assigned_at=assignment.assigned_at,
-                started_at=assignment.started_at,
-                completed_at=assignment.completed_at,
-                estimated_duration_hours=assignment.estimated_duration_hours,
-                actual_duration_hours=assignment.actual_duration_hours,
-                notes=assignment.notes,
-                created_at=assignment.created_at,
-                updated_at=assignment.updated_at
+        db_assignments = self.db_session.query(*ROUTE_ASSIGNMENT_COLUMNS).filter(RouteAssignmentModel.status == status).all()
+        return route_assignment_mapper.many(db_assignments)
+    
+    def get_scheduled(self, since: datetime) -> List[RouteAssignment]:
+        db_assignments = self.db_session.query(*ROUTE_ASSIGNMENT_COLUMNS).filter(
+            RouteAssignmentModel.scheduled_end > since,
+            RouteAssignmentModel.status.notin_(FINISHED_STATUSES)
+        ).all()
+        return route_assignment_mapper.many(db_assignments)
+
+
+class AsyncRouteAssignmentRepository(IAsyncRouteAssignmentRepository):
+    """RouteAssignmentRepository over AsyncSession; objects are not expired on commit, so no refresh is needed"""
+    
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+    
+    async def create(self, assignment: RouteAssignmentCreate) -> RouteAssignment:
+        db_assignment = RouteAssignmentModel(**assignment.model_dump(), scheduled_end=assignment.scheduled_end())
+        self.db_session.add(db_assignment)
+        await self.db_session.commit()
+        return route_assignment_mapper.one(db_assignment)
+    
+    async def get_by_id(self, assignment_id: UUID, fields: Optional[Sequence[str]] = None) -> Optional[RouteAssignment]:
+        if fields:
+            mapper = route_assignment_mapper.project(fields)
+            db_assignments = await self.db_session.execute(
+                select(*mapper.columns(RouteAssignmentModel)).where(RouteAssignmentModel.id == assignment_id)
             )
-            for assignment in db_assignments
-        ] 
\ No newline at end of file
+            return mapper.one(db_assignments.first())
+        db_assignment = await self.db_session.get(RouteAssignmentModel, assignment_id)
+        return route_assignment_mapper.one(db_assignment)
+    
+    @replica_read("db_session")
+    async def get_by_route_id(self, route_id: UUID) -> List[RouteAssignment]:
+        return await self._get_many(select(*ROUTE_ASSIGNMENT_COLUMNS).where(RouteAssignmentModel.route_id == route_id))
+    
+    @replica_read("db_session")
+    async def get_by_vehicle_id(self, vehicle_id: UUID) -> List[RouteAssignment]:
+        return await self._get_many(select(*ROUTE_ASSIGNMENT_COLUMNS).where(RouteAssignmentModel.vehicle_id == vehicle_id))
+    
+    @replica_read("db_session")
+    async def get_by_driver_id(self, driver_id: UUID) -> List[RouteAssignment]:
+        return await self._get_many(select(*ROUTE_ASSIGNMENT_COLUMNS).where(RouteAssignmentModel.driver_id == driver_id))
+    
+    async def update(self, assignment_id: UUID, assignment: RouteAssignmentUpdate) -> Optional[RouteAssignment]:
+        # Строка блокируется до commit: параллельная отмена не разойдется с проверкой статуса
+        db_assignment = await self.db_session.get(RouteAssignmentModel, assignment_id, with_for_update=True)
+        if not db_assignment:
+            return None
+        
+        _check_not_reopened(db_assignment.status, assignment.status)
+        update_data = assignment.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_assignment, field, value)
+        
+        db_assignment.updated_at = datetime.utcnow()
+        await self.db_session.commit()
+        return route_assignment_mapper.one(db_assignment)
+    
+    async def delete(self, assignment_id: UUID) -> bool:
+        db_assignment = await self.db_session.get(RouteAssignmentModel, assignment_id)
+        if not db_assignment:
+            return False
+        
+        await self.db_session.delete(db_assignment)
+        await self.db_session.commit()
+        return True
+    
+    @replica_read("db_session")
+    async def get_all(self, fields: Optional[Sequence[str]] = None) -> List[RouteAssignment]:
+        mapper = route_assignment_mapper.project(fields)
+        return await self._get_many(select(*mapper.columns(RouteAssignmentModel)), mapper)
+    
+    @replica_read("db_session")
+    async def get_by_status(self, status: str) -> List[RouteAssignment]:
+        return await self._get_many(select(*ROUTE_ASSIGNMENT_COLUMNS).where(RouteAssignmentModel.status == status))
+    
+    async def _get_many(self, query, mapper: RowMapper = route_assignment_mapper) -> List[RouteAssignment]:
+        db_assignments = await self.db_session.execute(query)
+        return mapper.many(db_assignments)
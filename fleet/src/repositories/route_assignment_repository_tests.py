@@ -1,12 +1,16 @@
+import asyncio
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from entities.route_assignment import RouteAssignment, RouteAssignmentCreate, RouteAssignmentUpdate, RouteAssignmentStatus
 from entities.database_models import RouteAssignment as RouteAssignmentModel
-from repositories.route_assignment_repository import RouteAssignmentRepository
+from repositories.route_assignment_repository import (
+    ROUTE_ASSIGNMENT_COLUMNS, RouteAssignmentRepository, AsyncRouteAssignmentRepository
+)
 
 
 @pytest.fixture
@@ -69,7 +73,6 @@ def test_create_route_assignment_success(f_route_assignment_repository, m_db_ses
     # Mock database session
     m_db_session.add.return_value = None
     m_db_session.commit.return_value = None
-    m_db_session.refresh.return_value = None
     
     # Mock the created assignment
     assignment_id = uuid4()
@@ -91,7 +94,13 @@ def test_create_route_assignment_success(f_route_assignment_repository, m_db_ses
     
     # Mock the query result
     m_db_session.add.side_effect = lambda x: setattr(x, 'id', assignment_id)
-    m_db_session.refresh.side_effect = lambda x: setattr(x, 'status', 'pending') or setattr(x, 'created_at', current_time) or setattr(x, 'updated_at', current_time)
+    # flush заполняет значения по умолчанию
+    def mock_flush():
+        created = m_db_session.add.call_args.args[0]
+        created.status = 'pending'
+        created.created_at = current_time
+        created.updated_at = current_time
+    m_db_session.flush.side_effect = mock_flush
     
     # Execute
     result = f_route_assignment_repository.create(f_route_assignment_create)
@@ -106,8 +115,9 @@ def test_create_route_assignment_success(f_route_assignment_repository, m_db_ses
     assert result.notes == f_route_assignment_create.notes
     
     m_db_session.add.assert_called_once()
+    m_db_session.flush.assert_called_once()
     m_db_session.commit.assert_called_once()
-    m_db_session.refresh.assert_called_once()
+    m_db_session.refresh.assert_not_called()
 
 
 def test_get_by_id_success(f_route_assignment_repository, m_db_session, f_db_route_assignment):
@@ -167,7 +177,7 @@ def test_get_by_route_id_success(f_route_assignment_repository, m_db_session, f_
     assert result[0].id == f_db_route_assignment.id
     assert result[0].route_id == f_db_route_assignment.route_id
     
-    m_db_session.query.assert_called_once_with(RouteAssignmentModel)
+    m_db_session.query.assert_called_once_with(*ROUTE_ASSIGNMENT_COLUMNS)
     mock_query.filter.assert_called_once()
     mock_query.all.assert_called_once()
 
@@ -187,7 +197,7 @@ def test_get_by_vehicle_id_success(f_route_assignment_repository, m_db_session,
     assert result[0].id == f_db_route_assignment.id
     assert result[0].vehicle_id == f_db_route_assignment.vehicle_id
     
-    m_db_session.query.assert_called_once_with(RouteAssignmentModel)
+    m_db_session.query.assert_called_once_with(*ROUTE_ASSIGNMENT_COLUMNS)
     mock_query.filter.assert_called_once()
     mock_query.all.assert_called_once()
 
@@ -207,21 +217,17 @@ def test_get_by_driver_id_success(f_route_assignment_repository, m_db_session, f
     assert result[0].id == f_db_route_assignment.id
     assert result[0].driver_id == f_db_route_assignment.driver_id
     
-    m_db_session.query.assert_called_once_with(RouteAssignmentModel)
+    m_db_session.query.assert_called_once_with(*ROUTE_ASSIGNMENT_COLUMNS)
     mock_query.filter.assert_called_once()
     mock_query.all.assert_called_once()
 
 
 def test_update_success(f_route_assignment_repository, m_db_session, f_db_route_assignment, f_route_assignment_update):
-    # Mock query
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = f_db_route_assignment
-    m_db_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_db_session.get.return_value = f_db_route_assignment
     
-    # Mock commit and refresh
+    # Mock commit
     m_db_session.commit.return_value = None
-    m_db_session.refresh.return_value = None
     
     # Execute
     result = f_route_assignment_repository.update(f_db_route_assignment.id, f_route_assignment_update)
@@ -230,37 +236,27 @@ def test_update_success(f_route_assignment_repository, m_db_session, f_db_route_
     assert result is not None
     assert result.id == f_db_route_assignment.id
     
-    m_db_session.query.assert_called_once_with(RouteAssignmentModel)
-    mock_query.filter.assert_called_once()
-    mock_query.first.assert_called_once()
+    m_db_session.get.assert_called_once_with(RouteAssignmentModel, f_db_route_assignment.id, with_for_update=True)
     m_db_session.commit.assert_called_once()
-    m_db_session.refresh.assert_called_once()
+    m_db_session.refresh.assert_not_called()
 
 
 def test_update_not_found(f_route_assignment_repository, m_db_session, f_route_assignment_update):
-    # Mock query
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = None
-    m_db_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_db_session.get.return_value = None
     
     # Execute
     result = f_route_assignment_repository.update(uuid4(), f_route_assignment_update)
     
     # Verify
     assert result is None
-    m_db_session.query.assert_called_once_with(RouteAssignmentModel)
-    mock_query.filter.assert_called_once()
-    mock_query.first.assert_called_once()
+    m_db_session.get.assert_called_once()
     m_db_session.commit.assert_not_called()
 
 
 def test_delete_success(f_route_assignment_repository, m_db_session, f_db_route_assignment):
-    # Mock query
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = f_db_route_assignment
-    m_db_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_db_session.get.return_value = f_db_route_assignment
     
     # Mock delete and commit
     m_db_session.delete.return_value = None
@@ -271,28 +267,21 @@ def test_delete_success(f_route_assignment_repository, m_db_session, f_db_route_
     
     # Verify
     assert result is True
-    m_db_session.query.assert_called_once_with(RouteAssignmentModel)
-    mock_query.filter.assert_called_once()
-    mock_query.first.assert_called_once()
+    m_db_session.get.assert_called_once()
     m_db_session.delete.assert_called_once_with(f_db_route_assignment)
     m_db_session.commit.assert_called_once()
 
 
 def test_delete_not_found(f_route_assignment_repository, m_db_session):
-    # Mock query
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = None
-    m_db_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_db_session.get.return_value = None
     
     # Execute
     result = f_route_assignment_repository.delete(uuid4())
     
     # Verify
     assert result is False
-    m_db_session.query.assert_called_once_with(RouteAssignmentModel)
-    mock_query.filter.assert_called_once()
-    mock_query.first.assert_called_once()
+    m_db_session.get.assert_called_once()
     m_db_session.delete.assert_not_called()
 
 
@@ -309,7 +298,7 @@ def test_get_all_success(f_route_assignment_repository, m_db_session, f_db_route
     assert len(result) == 1
     assert result[0].id == f_db_route_assignment.id
     
-    m_db_session.query.assert_called_once_with(RouteAssignmentModel)
+    m_db_session.query.assert_called_once_with(*ROUTE_ASSIGNMENT_COLUMNS)
     mock_query.all.assert_called_once()
 
 
@@ -328,6 +317,86 @@ def test_get_by_status_success(f_route_assignment_repository, m_db_session, f_db
     assert result[0].id == f_db_route_assignment.id
     assert result[0].status == f_db_route_assignment.status
     
-    m_db_session.query.assert_called_once_with(RouteAssignmentModel)
+    m_db_session.query.assert_called_once_with(*ROUTE_ASSIGNMENT_COLUMNS)
     mock_query.filter.assert_called_once()
-    mock_query.all.assert_called_once() 
\ No newline at end of file
+    mock_query.all.assert_called_once()
+
+
+@pytest.fixture
+def m_async_db_session():
+    return AsyncMock(spec=AsyncSession)
+
+
+def test_async_get_by_id_success(m_async_db_session, f_db_route_assignment):
+    m_async_db_session.get.return_value = f_db_route_assignment
+    
+    result = asyncio.run(AsyncRouteAssignmentRepository(m_async_db_session).get_by_id(f_db_route_assignment.id))
+    
+    assert result.id == f_db_route_assignment.id
+    assert result.notes == f_db_route_assignment.notes
+    m_async_db_session.get.assert_awaited_once_with(RouteAssignmentModel, f_db_route_assignment.id)
+
+
+def test_async_get_by_id_not_found(m_async_db_session):
+    m_async_db_session.get.return_value = None
+    
+    result = asyncio.run(AsyncRouteAssignmentRepository(m_async_db_session).get_by_id(uuid4()))
+    
+    assert result is None
+
+
+def test_async_update_commits_without_refresh(m_async_db_session, f_db_route_assignment, f_route_assignment_update):
+    m_async_db_session.get.return_value = f_db_route_assignment
+    
+    result = asyncio.run(
+        AsyncRouteAssignmentRepository(m_async_db_session).update(f_db_route_assignment.id, f_route_assignment_update)
+    )
+    
+    assert result.status == RouteAssignmentStatus.IN_PROGRESS
+    assert result.notes == "Updated notes"
+    m_async_db_session.commit.assert_awaited_once()
+    m_async_db_session.refresh.assert_not_called()
+
+
+@pytest.mark.parametrize("current_status", [RouteAssignmentStatus.CANCELLED, RouteAssignmentStatus.COMPLETED])
+def test_async_update_rejects_reopening_finished_assignment(m_async_db_session, f_db_route_assignment, current_status):
+    # Arrange: время отмененного назначения уже освобождено в расписании
+    f_db_route_assignment.status = current_status
+    m_async_db_session.get.return_value = f_db_route_assignment
+    update = RouteAssignmentUpdate(status=RouteAssignmentStatus.PENDING)
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="Cannot reopen"):
+        asyncio.run(AsyncRouteAssignmentRepository(m_async_db_session).update(f_db_route_assignment.id, update))
+    assert f_db_route_assignment.status == current_status
+    m_async_db_session.commit.assert_not_called()
+    m_async_db_session.get.assert_awaited_once_with(RouteAssignmentModel, f_db_route_assignment.id, with_for_update=True)
+
+
+def test_async_update_allows_notes_on_finished_assignment(m_async_db_session, f_db_route_assignment):
+    # Arrange
+    f_db_route_assignment.status = RouteAssignmentStatus.COMPLETED
+    m_async_db_session.get.return_value = f_db_route_assignment
+
+    # Act
+    result = asyncio.run(AsyncRouteAssignmentRepository(m_async_db_session).update(
+        f_db_route_assignment.id, RouteAssignmentUpdate(notes="Late delivery")
+    ))
+
+    # Assert
+    assert result.status == RouteAssignmentStatus.COMPLETED
+    assert result.notes == "Late delivery"
+
+
+def test_update_rejects_unknown_status():
+    with pytest.raises(ValueError):
+        RouteAssignmentUpdate(status="revived")
+
+
+def test_async_delete_not_found(m_async_db_session):
+    m_async_db_session.get.return_value = None
+    
+    result = asyncio.run(AsyncRouteAssignmentRepository(m_async_db_session).delete(uuid4()))
+    
+    assert result is False
+    m_async_db_session.commit.assert_not_called()
@@ -0,0 +1,52 @@
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from shared.utils.mapping import RowMapper
+
+from entities.route import Route, RouteStop
+from entities.database_models import Route as RouteModel, RouteStop as RouteStopModel
+from repositories.interfaces.route_repository import IRouteRepository
+
+
+route_mapper = RowMapper(Route)
+route_stop_mapper = RowMapper(RouteStop)
+
+
+class RouteRepository(IRouteRepository):
+    def __init__(self, db_session: Session):
+        self.db_session = db_session
+    
+    def create_many(self, routes: List[Route]) -> List[Route]:
+        """Store planned routes with their stops in one transaction"""
+        self.db_session.add_all(
+            RouteModel(
+                **route.model_dump(exclude={"stops"}),
+                stops=[RouteStopModel(**stop.model_dump()) for stop in route.stops]
+            )
+            for route in routes
+        )
+        self.db_session.commit()
+        return routes
+    
+    def get_by_id(self, route_id: UUID) -> Optional[Route]:
+        db_route = self.db_session.get(RouteModel, UUID(str(route_id)), options=[selectinload(RouteModel.stops)])
+        if not db_route:
+            return None
+        
+        return self._to_entity(db_route)
+    
+    def get_all(self, vehicle_id: Optional[UUID] = None, status: Optional[str] = None) -> List[Route]:
+        # Остановки всех маршрутов загружаются вторым запросом (selectin), без запроса на маршрут
+        query = select(RouteModel).options(selectinload(RouteModel.stops)).order_by(RouteModel.planned_start)
+        if vehicle_id is not None:
+            query = query.where(RouteModel.vehicle_id == vehicle_id)
+        if status is not None:
+            query = query.where(RouteModel.status == status)
+        return [self._to_entity(db_route) for db_route in self.db_session.scalars(query)]
+    
+    @staticmethod
+    def _to_entity(db_route: RouteModel) -> Route:
+        route = route_mapper.one(db_route)
+        route.stops = route_stop_mapper.many(db_route.stops)
+        return route
@@ -0,0 +1,99 @@
+import io
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Set
+from uuid import UUID
+from sqlalchemy import and_, func, insert, select, text
+from sqlalchemy.engine import Engine
+from entities.database_models import VehicleTelemetry as VehicleTelemetryModel
+from entities.telemetry import TelemetryPing
+from repositories.interfaces.telemetry_repository import ITelemetryRepository
+
+_TABLE = VehicleTelemetryModel.__table__
+_COLUMNS = [_TABLE.c[name] for name in TelemetryPing._fields]
+
+
+def partition_name(day: date) -> str:
+    return f"{_TABLE.name}_{day:%Y%m%d}"
+
+
+class TelemetryRepository(ITelemetryRepository):
+    """Append-only storage of telemetry pings in a table partitioned by day.
+
+    PostgreSQL gets each batch through COPY, other databases through a
+    batched INSERT. Missing daily partitions are created before a batch is
+    written; old days are removed by dropping their partition.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        # Дни, секции которых уже созданы этим процессом
+        self._partitions: Set[date] = set()
+
+    def write_many(self, pings: List[TelemetryPing]) -> None:
+        if not pings:
+            return
+        if self.engine.dialect.name != "postgresql":
+            with self.engine.begin() as connection:
+                connection.execute(insert(_TABLE), [ping._asdict() for ping in pings])
+            return
+
+        self.ensure_partitions({ping.recorded_at.date() for ping in pings})
+        data = io.StringIO()
+        data.writelines(self._copy_line(ping) for ping in pings)
+        data.seek(0)
+        columns = ", ".join(TelemetryPing._fields)
+        try:
+            with self.engine.begin() as connection:
+                with connection.connection.cursor() as cursor:
+                    cursor.copy_expert(f"COPY {_TABLE.name} ({columns}) FROM STDIN", data)
+        except Exception:
+            # Секцию могли удалить (очистка старых дней) - при повторе она будет создана заново
+            self._partitions.clear()
+            raise
+
+    def ensure_partitions(self, days: Iterable[date]) -> None:
+        missing = set(days) - self._partitions
+        if not missing:
+            return
+        with self.engine.begin() as connection:
+            for day in sorted(missing):
+                # IF NOT EXISTS: секцию мог создать другой экземпляр сервиса
+                connection.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF {_TABLE.name} "
+                    f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+                ))
+        self._partitions |= missing
+
+    def get_latest_positions(self, since: datetime) -> List[TelemetryPing]:
+        latest = select(
+            _TABLE.c.vehicle_id, func.max(_TABLE.c.recorded_at).label("recorded_at")
+        ).where(_TABLE.c.recorded_at >= since).group_by(_TABLE.c.vehicle_id).subquery()
+        # Условие на recorded_at и во внешнем запросе: PostgreSQL читает только секции за период
+        statement = select(*_COLUMNS).join(latest, and_(
+            _TABLE.c.vehicle_id == latest.c.vehicle_id,
+            _TABLE.c.recorded_at == latest.c.recorded_at
+        )).where(_TABLE.c.recorded_at >= since)
+        with self.engine.connect() as connection:
+            return [TelemetryPing(*row) for row in connection.execute(statement)]
+
+    def get_track(self, vehicle_id: UUID, since: datetime, until: datetime, limit: int = 10000) -> List[TelemetryPing]:
+        statement = select(*_COLUMNS).where(
+            _TABLE.c.vehicle_id == vehicle_id,
+            _TABLE.c.recorded_at >= since,
+            _TABLE.c.recorded_at < until
+        ).order_by(_TABLE.c.recorded_at).limit(limit)
+        with self.engine.connect() as connection:
+            return [TelemetryPing(*row) for row in connection.execute(statement)]
+
+    @staticmethod
+    def _copy_line(ping: TelemetryPing) -> str:
+        # Текстовый формат COPY: поля через табуляцию, \N - NULL
+        vehicle_id, recorded_at, latitude, longitude, speed_kmh, heading, odometer_km = ping
+        return (
+            f"{vehicle_id}\t{recorded_at.isoformat()}\t{latitude!r}\t{longitude!r}\t"
+            f"{_copy_value(speed_kmh)}\t{_copy_value(heading)}\t{_copy_value(odometer_km)}\n"
+        )
+
+
+def _copy_value(value: Optional[float]) -> str:
+    return "\\N" if value is None else repr(value)
@@ -0,0 +1,64 @@
+import pytest
+from uuid import uuid4
+from datetime import datetime, timedelta
+from sqlalchemy import text
+
+from config.database import engine
+from entities.telemetry import TelemetryPing
+from repositories.telemetry_repository import TelemetryRepository, partition_name
+
+
+@pytest.fixture
+def f_telemetry_repository() -> TelemetryRepository:
+    with engine.begin() as connection:
+        connection.execute(text("TRUNCATE TABLE vehicle_telemetry"))
+    return TelemetryRepository(engine)
+
+
+def test_write_many_creates_daily_partitions(f_telemetry_repository: TelemetryRepository):
+    vehicle_id = uuid4()
+    midnight = datetime(2024, 1, 16)
+    pings = [
+        TelemetryPing(vehicle_id, midnight - timedelta(minutes=1), 55.75, 37.61, 40.0, 180.0, 1000.0),
+        TelemetryPing(vehicle_id, midnight + timedelta(minutes=1), 55.76, 37.62),
+    ]
+
+    f_telemetry_repository.write_many(pings)
+
+    with engine.connect() as connection:
+        for day in (midnight.date() - timedelta(days=1), midnight.date()):
+            count = connection.execute(text(f"SELECT count(*) FROM {partition_name(day)}")).scalar()
+            assert count == 1
+    track = f_telemetry_repository.get_track(vehicle_id, midnight - timedelta(hours=1), midnight + timedelta(hours=1))
+    assert track == pings
+
+
+def test_get_latest_positions(f_telemetry_repository: TelemetryRepository):
+    first, second = uuid4(), uuid4()
+    now = datetime.utcnow().replace(microsecond=0)
+    f_telemetry_repository.write_many([
+        TelemetryPing(first, now - timedelta(minutes=5), 55.75, 37.61),
+        TelemetryPing(first, now - timedelta(minutes=1), 55.80, 37.70),
+        TelemetryPing(second, now - timedelta(minutes=3), 59.93, 30.33),
+        TelemetryPing(second, now - timedelta(days=3), 59.00, 30.00),
+    ])
+
+    positions = f_telemetry_repository.get_latest_positions(since=now - timedelta(hours=1))
+
+    assert {(ping.vehicle_id, ping.latitude) for ping in positions} == {(first, 55.80), (second, 59.93)}
+
+
+def test_write_many_recreates_dropped_partition_after_failure(f_telemetry_repository: TelemetryRepository):
+    day = datetime(2024, 1, 16)
+    ping = TelemetryPing(uuid4(), day, 55.75, 37.61)
+    f_telemetry_repository.write_many([ping])
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP TABLE {partition_name(day.date())}"))
+
+    # Секция удалена в обход репозитория: первая запись падает, повтор создает ее заново
+    with pytest.raises(Exception):
+        f_telemetry_repository.write_many([ping])
+    f_telemetry_repository.write_many([ping])
+
+    with engine.connect() as connection:
+        assert connection.execute(text(f"SELECT count(*) FROM {partition_name(day.date())}")).scalar() == 1
@@ -1,8 +1,21 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.utils.database import replica_read
+from shared.utils.mapping import RowMapper
 from entities.vehicle import Vehicle, VehicleCreate, VehicleUpdate
 from entities.database_models import Vehicle as VehicleModel
-from repositories.interfaces.vehicle_repository import IVehicleRepository
+from repositories.interfaces.vehicle_repository import IVehicleRepository, IAsyncVehicleRepository
+
+
+vehicle_mapper = RowMapper(Vehicle)
+# Списки читаются строками колонок: без ORM объектов и identity map
+VEHICLE_COLUMNS = vehicle_mapper.columns(VehicleModel)
+# Версия строки для ETag
+VEHICLE_VERSION = func.coalesce(VehicleModel.updated_at, VehicleModel.created_at)
 
 
 class VehicleRepository(IVehicleRepository):
@@ -24,125 +37,40 @@ class VehicleRepository(IVehicleRepository):
             registration_expiry=vehicle.registration_expiry
         )
         self.db_session.add(db_vehicle)
-        self.db_session.commit()
-        self.db_session.refresh(db_vehicle)
+        self.db_session.flush()
         
-        return Vehicle(
-            id=db_vehicle.id,
-            license_plate=db_vehicle.license_plate,
-            vehicle_type=db_vehicle.vehicle_type,
-            brand=db_vehicle.brand,
-            model=db_vehicle.model,
-            year=db_vehicle.year,
-            capacity_weight=db_vehicle.capacity_weight,
-            capacity_volume=db_vehicle.capacity_volume,
-            fuel_type=db_vehicle.fuel_type,
-            fuel_efficiency=db_vehicle.fuel_efficiency,
-            status=db_vehicle.status,
-            insurance_expiry=db_vehicle.insurance_expiry,
-            registration_expiry=db_vehicle.registration_expiry,
-            created_at=db_vehicle.created_at,
-            updated_at=db_vehicle.updated_at
-        )
+        result = vehicle_mapper.one(db_vehicle)
+        self.db_session.commit()
+        return result
     
     def get_by_id(self, vehicle_id: str) -> Optional[Vehicle]:
         db_vehicle = self.db_session.query(VehicleModel).filter(VehicleModel.id == vehicle_id).first()
         if not db_vehicle:
             return None
         
-        return Vehicle(
-            id=db_vehicle.id,
-            license_plate=db_vehicle.license_plate,
-            vehicle_type=db_vehicle.vehicle_type,
-            brand=db_vehicle.brand,
-            model=db_vehicle.model,
-            year=db_vehicle.year,
-            capacity_weight=db_vehicle.capacity_weight,
-            capacity_volume=db_vehicle.capacity_volume,
-            fuel_type=db_vehicle.fuel_type,
-            fuel_efficiency=db_vehicle.fuel_efficiency,
-            status=db_vehicle.status,
-            insurance_expiry=db_vehicle.insurance_expiry,
-            registration_expiry=db_vehicle.registration_expiry,
-            created_at=db_vehicle.created_at,
-            updated_at=db_vehicle.updated_at
-        )
+        return vehicle_mapper.one(db_vehicle)
     
     def get_by_license_plate(self, license_plate: str) -> Optional[Vehicle]:
         db_vehicle = self.db_session.query(VehicleModel).filter(VehicleModel.license_plate == license_plate).first()
         if not db_vehicle:
             return None
         
-        return Vehicle(
-            id=db_vehicle.id,
-            license_plate=db_vehicle.license_plate,
-            vehicle_type=db_vehicle.vehicle_type,
-            brand=db_vehicle.brand,
-            model=db_vehicle.model,
-            year=db_vehicle.year,
-            capacity_weight=db_vehicle.capacity_weight,
-            capacity_volume=db_vehicle.capacity_volume,
-            fuel_type=db_vehicle.fuel_type,
-            fuel_efficiency=db_vehicle.fuel_efficiency,
-            status=db_vehicle.status,
-            insurance_expiry=db_vehicle.insurance_expiry,
-            registration_expiry=db_vehicle.registration_expiry,
-            created_at=db_vehicle.created_at,
-            updated_at=db_vehicle.updated_at
-        )
+        return vehicle_mapper.one(db_vehicle)
     
     def get_by_status(self, status: str) -> List[Vehicle]:
-        db_vehicles = self.db_session.query(VehicleModel).filter(VehicleModel.status == status).all()
-        return [
-            Vehicle(
-                id=vehicle.id,
-                license_plate=vehicle.license_plate,
-                vehicle_type=vehicle.vehicle_type,
-                brand=vehicle.brand,
-                model=vehicle.model,
-                year=vehicle.year,
-                capacity_weight=vehicle.capacity_weight,
-                capacity_volume=vehicle.capacity_volume,
-                fuel_type=vehicle.fuel_type,
-                fuel_efficiency=vehicle.fuel_efficiency,
-                status=vehicle.status,
-                insurance_expiry=vehicle.insurance_expiry,
-                registration_expiry=vehicle.registration_expiry,
-                created_at=vehicle.created_at,
-                updated_at=vehicle.updated_at
-            )
-            for vehicle in db_vehicles
-        ]
+        db_vehicles = self.db_session.query(*VEHICLE_COLUMNS).filter(VehicleModel.status == status).all()
+        return vehicle_mapper.many(db_vehicles)
     
     def get_available_vehicles(self) -> List[Vehicle]:
         """Get all vehicles with status 'active'"""
         return self.get_by_status("active")
     
     def get_all(self) -> List[Vehicle]:
-        db_vehicles = self.db_session.query(VehicleModel).all()
-        return [
-            Vehicle(
-                id=db_vehicle.id,
-                license_plate=db_vehicle.license_plate,
-                vehicle_type=db_vehicle.vehicle_type,
-                brand=db_vehicle.brand,
-                model=db_vehicle.model,
-                year=db_vehicle.year,
-                capacity_weight=db_vehicle.capacity_weight,
-                capacity_volume=db_vehicle.capacity_volume,
-                fuel_type=db_vehicle.fuel_type,
-                fuel_efficiency=db_vehicle.fuel_efficiency,
-                status=db_vehicle.status,
-                insurance_expiry=db_vehicle.insurance_expiry,
-                registration_expiry=db_vehicle.registration_expiry,
-                created_at=db_vehicle.created_at,
-                updated_at=db_vehicle.updated_at
-            )
-            for db_vehicle in db_vehicles
-        ]
+        db_vehicles = self.db_session.query(*VEHICLE_COLUMNS).all()
+        return vehicle_mapper.many(db_vehicles)
     
     def update(self, vehicle_id: str, vehicle: VehicleUpdate) -> Optional[Vehicle]:
-        db_vehicle = self.db_session.query(VehicleModel).filter(VehicleModel.id == vehicle_id).first()
+        db_vehicle = self.db_session.get(VehicleModel, UUID(str(vehicle_id)))
         if not db_vehicle:
             return None
         
@@ -150,32 +78,92 @@ class VehicleRepository(IVehicleRepository):
         for field, value in update_data.items():
             setattr(db_vehicle, field, value)
         
-        self.db_session.commit()
-        self.db_session.refresh(db_vehicle)
+        self.db_session.flush()
         
-        return Vehicle(
-            id=db_vehicle.id,
-            license_plate=db_vehicle.license_plate,
-            vehicle_type=db_vehicle.vehicle_type,
-            brand=db_vehicle.brand,
-            model=db_vehicle.model,
-            year=db_vehicle.year,
-            capacity_weight=db_vehicle.capacity_weight,
-            capacity_volume=db_vehicle.capacity_volume,
-            fuel_type=db_vehicle.fuel_type,
-            fuel_efficiency=db_vehicle.fuel_efficiency,
-            status=db_vehicle.status,
-            insurance_expiry=db_vehicle.insurance_expiry,
-            registration_expiry=db_vehicle.registration_expiry,
-            created_at=db_vehicle.created_at,
-            updated_at=db_vehicle.updated_at
-        )
+        result = vehicle_mapper.one(db_vehicle)
+        self.db_session.commit()
+        return result
     
     def delete(self, vehicle_id: str) -> bool:
-        db_vehicle = self.db_session.query(VehicleModel).filter(VehicleModel.id == vehicle_id).first()
+        db_vehicle = self.db_session.get(VehicleModel, UUID(str(vehicle_id)))
         if not db_vehicle:
             return False
         
         self.db_session.delete(db_vehicle)
         self.db_session.commit()
-        return True 
\ No newline at end of file
+        return True
+
+
+class AsyncVehicleRepository(IAsyncVehicleRepository):
+    """VehicleRepository over AsyncSession; objects are not expired on commit, so no refresh is needed"""
+    
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+    
+    async def create(self, vehicle: VehicleCreate) -> Vehicle:
+        db_vehicle = VehicleModel(**vehicle.model_dump())
+        self.db_session.add(db_vehicle)
+        await self.db_session.commit()
+        return vehicle_mapper.one(db_vehicle)
+    
+    async def get_by_id(self, vehicle_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Vehicle]:
+        if fields:
+            mapper = vehicle_mapper.project(fields)
+            db_vehicles = await self.db_session.execute(
+                select(*mapper.columns(VehicleModel)).where(VehicleModel.id == UUID(str(vehicle_id)))
+            )
+            return mapper.one(db_vehicles.first())
+        db_vehicle = await self.db_session.get(VehicleModel, UUID(str(vehicle_id)))
+        return vehicle_mapper.one(db_vehicle)
+    
+    async def get_version(self, vehicle_id: str) -> Optional[datetime]:
+        """Last change time of the vehicle, None if it does not exist; cheaper than loading it"""
+        return await self.db_session.scalar(select(VEHICLE_VERSION).where(VehicleModel.id == UUID(str(vehicle_id))))
+    
+    @replica_read("db_session")
+    async def get_list_version(self) -> Tuple[int, Optional[datetime]]:
+        """Row count and last change time: any insert, update or delete changes the pair"""
+        count, changed_at = (await self.db_session.execute(select(func.count(), func.max(VEHICLE_VERSION)))).one()
+        return count, changed_at
+    
+    async def get_by_license_plate(self, license_plate: str) -> Optional[Vehicle]:
+        db_vehicle = await self.db_session.scalar(
+            select(VehicleModel).where(VehicleModel.license_plate == license_plate)
+        )
+        return vehicle_mapper.one(db_vehicle)
+    
+    @replica_read("db_session")
+    async def get_by_status(self, status: str) -> List[Vehicle]:
+        db_vehicles = await self.db_session.execute(select(*VEHICLE_COLUMNS).where(VehicleModel.status == status))
+        return vehicle_mapper.many(db_vehicles)
+    
+    async def get_available_vehicles(self) -> List[Vehicle]:
+        """Get all vehicles with status 'active'"""
+        return await self.get_by_status("active")
+    
+    @replica_read("db_session")
+    async def get_all(self, fields: Optional[Sequence[str]] = None) -> List[Vehicle]:
+        mapper = vehicle_mapper.project(fields)
+        db_vehicles = await self.db_session.execute(select(*mapper.columns(VehicleModel)))
+        return mapper.many(db_vehicles)
+    
+    async def update(self, vehicle_id: str, vehicle: VehicleUpdate) -> Optional[Vehicle]:
+        db_vehicle = await self.db_session.get(VehicleModel, UUID(str(vehicle_id)))
+        if not db_vehicle:
+            return None
+        
+        update_data = vehicle.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_vehicle, field, value)
+        
+        await self.db_session.commit()
+        return vehicle_mapper.one(db_vehicle)
+    
+    async def delete(self, vehicle_id: str) -> bool:
+        db_vehicle = await self.db_session.get(VehicleModel, UUID(str(vehicle_id)))
+        if not db_vehicle:
+            return False
+        
+        await self.db_session.delete(db_vehicle)
+        await self.db_session.commit()
+        return True
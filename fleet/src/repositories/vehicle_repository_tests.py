@@ -3,7 +3,7 @@ from uuid import uuid4
 from datetime import datetime, timedelta
 
 from entities.vehicle import Vehicle, VehicleCreate, VehicleUpdate, VehicleType, FuelType, VehicleStatus
-from repositories.vehicle_repository import VehicleRepository
+from repositories.vehicle_repository import VehicleRepository, AsyncVehicleRepository
 
 
 @pytest.fixture
@@ -143,4 +143,54 @@ def test_get_all_vehicles(f_vehicle_repository: VehicleRepository):
     f_vehicle_repository.create(vehicle2_data)
     
     vehicles = f_vehicle_repository.get_all()
-    assert len(vehicles) >= 2 
\ No newline at end of file
+    assert len(vehicles) >= 2
+
+
+def test_async_create_and_get_by_id(f_run_async, f_vehicle_create_data: VehicleCreate):
+    async def scenario(session):
+        repository = AsyncVehicleRepository(session)
+        created_vehicle = await repository.create(f_vehicle_create_data)
+        return created_vehicle, await repository.get_by_id(created_vehicle.id)
+    
+    created_vehicle, vehicle = f_run_async(scenario)
+    
+    assert vehicle is not None
+    assert vehicle.id == created_vehicle.id
+    assert vehicle.status == VehicleStatus.ACTIVE
+
+
+def test_async_update_and_get_by_status(f_run_async, f_vehicle_create_data: VehicleCreate, f_vehicle_update_data: VehicleUpdate):
+    async def scenario(session):
+        repository = AsyncVehicleRepository(session)
+        created_vehicle = await repository.create(f_vehicle_create_data)
+        updated_vehicle = await repository.update(str(created_vehicle.id), f_vehicle_update_data)
+        return updated_vehicle, await repository.get_available_vehicles()
+    
+    updated_vehicle, available_vehicles = f_run_async(scenario)
+    
+    assert updated_vehicle.brand == f_vehicle_update_data.brand
+    assert [vehicle.id for vehicle in available_vehicles] == [updated_vehicle.id]
+
+
+def test_async_delete_not_found(f_run_async):
+    async def scenario(session):
+        return await AsyncVehicleRepository(session).delete(str(uuid4()))
+    
+    assert f_run_async(scenario) is False
+
+
+def test_async_get_all_and_get_by_id_with_fields(f_run_async, f_vehicle_create_data: VehicleCreate):
+    async def scenario(session):
+        repository = AsyncVehicleRepository(session)
+        created_vehicle = await repository.create(f_vehicle_create_data)
+        fields = ("id", "license_plate", "status")
+        return created_vehicle, await repository.get_all(fields=fields), await repository.get_by_id(created_vehicle.id, fields=fields)
+    
+    created_vehicle, vehicles, vehicle = f_run_async(scenario)
+    
+    assert {created_vehicle.id} <= {item.id for item in vehicles}
+    assert vehicle.model_dump() == {
+        "id": created_vehicle.id,
+        "license_plate": created_vehicle.license_plate,
+        "status": VehicleStatus.ACTIVE
+    }
@@ -6,6 +6,7 @@ from entities.route_assignment import RouteAssignment, RouteAssignmentCreate, Ro
 from repositories.interfaces.vehicle_repository import IVehicleRepository
 from repositories.interfaces.driver_repository import IDriverRepository
 from repositories.interfaces.route_assignment_repository import IRouteAssignmentRepository
+from utils.assignment_schedule import AssignmentSchedule, to_utc_naive
 
 
 class AssignRouteRequest(BaseModel):
@@ -13,6 +14,7 @@ class AssignRouteRequest(BaseModel):
     vehicle_id: UUID
     driver_id: UUID
     estimated_duration_hours: float = Field(..., gt=0)
+    scheduled_start: Optional[datetime] = None
     notes: Optional[str] = None
 
 
@@ -27,16 +29,19 @@ class AssignRouteResponse(BaseModel):
     completed_at: Optional[datetime] = None
     estimated_duration_hours: float
     actual_duration_hours: Optional[float] = None
+    scheduled_start: Optional[datetime] = None
+    scheduled_end: Optional[datetime] = None
     notes: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
 
 class AssignRouteUseCase:
-    def __init__(self, vehicle_repository: IVehicleRepository, driver_repository: IDriverRepository, route_assignment_repository: IRouteAssignmentRepository):
+    def __init__(self, vehicle_repository: IVehicleRepository, driver_repository: IDriverRepository, route_assignment_repository: IRouteAssignmentRepository, schedule: Optional[AssignmentSchedule] = None):
         self.vehicle_repository = vehicle_repository
         self.driver_repository = driver_repository
         self.route_assignment_repository = route_assignment_repository
+        self.schedule = schedule
     
     def execute(self, request: AssignRouteRequest) -> AssignRouteResponse:
         # Check if vehicle exists and is available
@@ -67,17 +72,27 @@ class AssignRouteUseCase:
         if request.estimated_duration_hours <= 0:
             raise ValueError("Estimated duration must be positive")
         
+        # Без планового начала маршрут начинается сейчас
+        scheduled_start = to_utc_naive(request.scheduled_start) if request.scheduled_start else datetime.utcnow()
+        
         # Create route assignment
         assignment_data = RouteAssignmentCreate(
             route_id=request.route_id,
             vehicle_id=request.vehicle_id,
             driver_id=request.driver_id,
             estimated_duration_hours=request.estimated_duration_hours,
+            scheduled_start=scheduled_start,
             notes=request.notes
         )
         
-        # Create route assignment
-        assignment = self.route_assignment_repository.create(assignment_data)
+        # Create route assignment; with a schedule the vehicle and driver must be free for the planned time
+        if self.schedule is not None:
+            assignment = self.schedule.book(
+                request.vehicle_id, request.driver_id, scheduled_start, assignment_data.scheduled_end(),
+                lambda: self.route_assignment_repository.create(assignment_data)
+            )
+        else:
+            assignment = self.route_assignment_repository.create(assignment_data)
         
         return AssignRouteResponse(
             id=str(assignment.id),
@@ -90,6 +105,8 @@ class AssignRouteUseCase:
             completed_at=assignment.completed_at,
             estimated_duration_hours=assignment.estimated_duration_hours,
             actual_duration_hours=assignment.actual_duration_hours,
+            scheduled_start=assignment.scheduled_start,
+            scheduled_end=assignment.scheduled_end,
             notes=assignment.notes,
             created_at=assignment.created_at,
             updated_at=assignment.updated_at
@@ -236,4 +236,31 @@ def test_assign_route_invalid_duration(f_assign_route_use_case, m_vehicle_reposi
     # Verify repository calls
     m_vehicle_repository.get_by_id.assert_called_once_with(f_valid_assign_route_request.vehicle_id)
     m_driver_repository.get_by_id.assert_called_once_with(f_valid_assign_route_request.driver_id)
-    m_route_assignment_repository.create.assert_not_called() 
\ No newline at end of file
+    m_route_assignment_repository.create.assert_not_called() 
+
+def test_assign_route_rejects_double_booking(m_vehicle_repository, m_driver_repository, m_route_assignment_repository, f_valid_assign_route_request, f_mock_vehicle, f_mock_driver):
+    from entities.route_assignment import RouteAssignment
+    from utils.assignment_schedule import AssignmentSchedule, ScheduleConflictError
+
+    # Arrange
+    use_case = AssignRouteUseCase(m_vehicle_repository, m_driver_repository, m_route_assignment_repository, AssignmentSchedule())
+    m_vehicle_repository.get_by_id.return_value = f_mock_vehicle
+    m_driver_repository.get_by_id.return_value = f_mock_driver
+    m_route_assignment_repository.create.side_effect = lambda data: RouteAssignment(
+        id=uuid4(), route_id=data.route_id, vehicle_id=data.vehicle_id, driver_id=data.driver_id,
+        estimated_duration_hours=data.estimated_duration_hours, scheduled_start=data.scheduled_start,
+        scheduled_end=data.scheduled_end(), created_at=datetime.now(), updated_at=datetime.now()
+    )
+    f_valid_assign_route_request.scheduled_start = datetime(2030, 1, 1, 8)
+    first = use_case.execute(f_valid_assign_route_request)
+
+    # Act: та же машина с другим водителем через два часа
+    overlapping = f_valid_assign_route_request.model_copy(update={"driver_id": uuid4(), "scheduled_start": datetime(2030, 1, 1, 10)})
+    with pytest.raises(ScheduleConflictError, match="Vehicle"):
+        use_case.execute(overlapping)
+    after = use_case.execute(f_valid_assign_route_request.model_copy(update={"scheduled_start": first.scheduled_end}))
+
+    # Assert
+    assert first.scheduled_end == datetime(2030, 1, 1, 16, 30)
+    assert after.scheduled_start == first.scheduled_end
+    assert m_route_assignment_repository.create.call_count == 2
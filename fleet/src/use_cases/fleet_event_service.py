@@ -1,20 +1,25 @@
-from typing import Dict, Any, List, Optional
 from datetime import datetime
-from uuid import uuid4
+from typing import Dict, Any, List, Optional
 import structlog
+from shared.events.models import VehicleAssignedEvent, NoVehicleAvailableEvent
 from shared.events.publisher import Publisher
 from shared.events.subscriber import Subscriber
 from repositories.interfaces.driver_repository import IDriverRepository
 from repositories.interfaces.vehicle_repository import IVehicleRepository
+from utils.eta_engine import EtaEngine
+from utils.spatial_index import SpatialIndex
 
 
 class FleetEventService:
     def __init__(self, publisher: Publisher, subscriber: Subscriber, 
-                 driver_repository: IDriverRepository, vehicle_repository: IVehicleRepository):
+                 driver_repository: IDriverRepository, vehicle_repository: IVehicleRepository,
+                 eta_engine: Optional[EtaEngine] = None, spatial_index: Optional[SpatialIndex] = None):
         self.publisher = publisher
         self.subscriber = subscriber
         self.driver_repository = driver_repository
         self.vehicle_repository = vehicle_repository
+        self.eta_engine = eta_engine
+        self.spatial_index = spatial_index
         self.logger = structlog.get_logger(self.__class__.__name__)
     
     def handle_order_created(self, event_data: Dict[str, Any]) -> None:
@@ -47,32 +52,55 @@ class FleetEventService:
                 self._publish_no_vehicle_available(order_id, "capacity_mismatch")
                 return
             
-            # Assign the first available driver and suitable vehicle
+            # Assign the first available driver and the suitable vehicle closest to pickup
             selected_driver = available_drivers[0]
-            selected_vehicle = suitable_vehicles[0]
+            selected_vehicle = self._select_vehicle(event_data, suitable_vehicles)
             
-            self._publish_vehicle_assigned(order_id, selected_vehicle, selected_driver)
+            estimated_delivery_time = self._estimate_delivery_time(event_data, selected_vehicle)
+            self._publish_vehicle_assigned(order_id, selected_vehicle, selected_driver, estimated_delivery_time)
             
         except Exception as e:
             self.logger.error("Failed to handle OrderCreated event", error=str(e), order_id=event_data.get("order_id"))
             raise
     
-    def _publish_vehicle_assigned(self, order_id: str, vehicle, driver) -> None:
+    def _select_vehicle(self, event_data: Dict[str, Any], suitable_vehicles: List):
+        # Без телеметрии или координат адреса погрузки - первая подходящая машина, как раньше
+        if self.spatial_index is None or self.eta_engine is None or not event_data.get("pickup_address"):
+            return suitable_vehicles[0]
+        pickup = self.eta_engine.gazetteer.resolve(event_data["pickup_address"])
+        if pickup is None:
+            return suitable_vehicles[0]
+        by_id = {vehicle.id: vehicle for vehicle in suitable_vehicles}
+        nearest = self.spatial_index.nearest(pickup, k=1, predicate=by_id.__contains__)
+        if not nearest:
+            return suitable_vehicles[0]
+        vehicle_id, distance_km = nearest[0]
+        self.logger.info("Nearest suitable vehicle selected", vehicle_id=str(vehicle_id),
+                         distance_km=round(distance_km, 1))
+        return by_id[vehicle_id]
+    
+    def _estimate_delivery_time(self, event_data: Dict[str, Any], vehicle) -> Optional[datetime]:
+        # Без справочника адресов или для неизвестного адреса время доставки не передается
+        if self.eta_engine is None or not event_data.get("pickup_address") or not event_data.get("delivery_address"):
+            return None
+        return self.eta_engine.estimate(event_data["pickup_address"], event_data["delivery_address"],
+                                        vehicle.vehicle_type)
+    
+    def _publish_vehicle_assigned(self, order_id: str, vehicle, driver,
+                                  estimated_delivery_time: Optional[datetime] = None) -> None:
         """Publish VehicleAssigned event"""
         try:
-            event_data = {
-                "event_id": str(uuid4()),
-                "timestamp": datetime.utcnow().isoformat(),
-                "source_service": "fleet",
-                "order_id": order_id,
-                "vehicle_id": str(vehicle.id),
-                "driver_id": str(driver.id),
-                "vehicle_license_plate": vehicle.license_plate,
-                "driver_name": f"{driver.first_name} {driver.last_name}",
-                "estimated_delivery_time": None  # TODO: Calculate based on distance
-            }
+            event = VehicleAssignedEvent(
+                source_service="fleet",
+                order_id=order_id,
+                vehicle_id=str(vehicle.id),
+                driver_id=str(driver.id),
+                vehicle_license_plate=vehicle.license_plate,
+                driver_name=f"{driver.first_name} {driver.last_name}",
+                estimated_delivery_time=estimated_delivery_time
+            )
             
-            self.publisher.publish("vehicle_assigned", event_data)
+            self.publisher.publish(event.event_type, event)
             self.logger.info("VehicleAssigned event published", 
                            order_id=order_id, 
                            vehicle_id=str(vehicle.id), 
@@ -84,15 +112,13 @@ class FleetEventService:
     def _publish_no_vehicle_available(self, order_id: str, reason: str) -> None:
         """Publish NoVehicleAvailable event"""
         try:
-            event_data = {
-                "event_id": str(uuid4()),
-                "timestamp": datetime.utcnow().isoformat(),
-                "source_service": "fleet",
-                "order_id": order_id,
-                "reason": reason
-            }
+            event = NoVehicleAvailableEvent(
+                source_service="fleet",
+                order_id=order_id,
+                reason=reason
+            )
             
-            self.publisher.publish("no_vehicle_available", event_data)
+            self.publisher.publish(event.event_type, event)
             self.logger.info("NoVehicleAvailable event published", order_id=order_id, reason=reason)
         except Exception as e:
             self.logger.error("Failed to publish NoVehicleAvailable event", error=str(e), order_id=order_id)
@@ -5,6 +5,7 @@ from uuid import uuid4
 from use_cases.fleet_event_service import FleetEventService
 from entities.vehicle import Vehicle, VehicleType, FuelType, VehicleStatus
 from entities.driver import Driver, DriverStatus
+from utils.spatial_index import SpatialIndex
 
 
 class TestFleetEventService:
@@ -97,11 +98,78 @@ class TestFleetEventService:
         m_publisher.publish.assert_called_once()
         call_args = m_publisher.publish.call_args
         assert call_args[0][0] == "vehicle_assigned"
-        event_data = call_args[0][1]
-        assert event_data["order_id"] == sample_order_event_data["order_id"]
-        assert event_data["vehicle_id"] == str(sample_available_vehicle.id)
-        assert event_data["driver_id"] == str(sample_available_driver.id)
+        event = call_args[0][1]
+        assert event.order_id == sample_order_event_data["order_id"]
+        assert event.vehicle_id == str(sample_available_vehicle.id)
+        assert event.driver_id == str(sample_available_driver.id)
     
+    def test_handle_order_created_publishes_eta(self, m_publisher, m_subscriber, m_driver_repository,
+                                                m_vehicle_repository, sample_order_event_data,
+                                                sample_available_driver, sample_available_vehicle):
+        # Arrange
+        m_eta_engine = Mock()
+        m_eta_engine.estimate.return_value = datetime(2024, 1, 1, 18)
+        m_driver_repository.get_available_drivers.return_value = [sample_available_driver]
+        m_vehicle_repository.get_available_vehicles.return_value = [sample_available_vehicle]
+        service = FleetEventService(m_publisher, m_subscriber, m_driver_repository, m_vehicle_repository, m_eta_engine)
+        
+        # Act
+        service.handle_order_created(sample_order_event_data)
+        
+        # Assert
+        m_eta_engine.estimate.assert_called_once_with("123 Pickup St", "456 Delivery Ave", VehicleType.TRUCK)
+        event = m_publisher.publish.call_args[0][1]
+        assert event.estimated_delivery_time == datetime(2024, 1, 1, 18)
+
+    def test_handle_order_created_picks_nearest_suitable_vehicle(self, m_publisher, m_subscriber, m_driver_repository,
+                                                                m_vehicle_repository, sample_order_event_data,
+                                                                sample_available_driver, sample_available_vehicle):
+        # Arrange
+        far_vehicle = sample_available_vehicle.model_copy(update={"id": uuid4()})
+        near_vehicle = sample_available_vehicle.model_copy(update={"id": uuid4()})
+        small_vehicle = sample_available_vehicle.model_copy(update={"id": uuid4(), "capacity_weight": 50.0})
+        spatial_index = SpatialIndex()
+        spatial_index.update(far_vehicle.id, (59.93, 30.33))
+        spatial_index.update(near_vehicle.id, (55.80, 37.70))
+        # Ближе всех, но груз не помещается
+        spatial_index.update(small_vehicle.id, (55.75, 37.61))
+        m_eta_engine = Mock()
+        m_eta_engine.gazetteer.resolve.return_value = (55.75, 37.62)
+        m_eta_engine.estimate.return_value = None
+        m_driver_repository.get_available_drivers.return_value = [sample_available_driver]
+        m_vehicle_repository.get_available_vehicles.return_value = [far_vehicle, small_vehicle, near_vehicle]
+        service = FleetEventService(m_publisher, m_subscriber, m_driver_repository, m_vehicle_repository,
+                                    m_eta_engine, spatial_index)
+
+        # Act
+        service.handle_order_created(sample_order_event_data)
+
+        # Assert
+        m_eta_engine.gazetteer.resolve.assert_called_once_with("123 Pickup St")
+        event = m_publisher.publish.call_args[0][1]
+        assert event.vehicle_id == str(near_vehicle.id)
+
+    def test_handle_order_created_without_positions_picks_first_vehicle(self, m_publisher, m_subscriber,
+                                                                       m_driver_repository, m_vehicle_repository,
+                                                                       sample_order_event_data, sample_available_driver,
+                                                                       sample_available_vehicle):
+        # Arrange: положений машин в индексе нет
+        other_vehicle = sample_available_vehicle.model_copy(update={"id": uuid4()})
+        m_eta_engine = Mock()
+        m_eta_engine.gazetteer.resolve.return_value = (55.75, 37.62)
+        m_eta_engine.estimate.return_value = None
+        m_driver_repository.get_available_drivers.return_value = [sample_available_driver]
+        m_vehicle_repository.get_available_vehicles.return_value = [sample_available_vehicle, other_vehicle]
+        service = FleetEventService(m_publisher, m_subscriber, m_driver_repository, m_vehicle_repository,
+                                    m_eta_engine, SpatialIndex())
+
+        # Act
+        service.handle_order_created(sample_order_event_data)
+
+        # Assert
+        event = m_publisher.publish.call_args[0][1]
+        assert event.vehicle_id == str(sample_available_vehicle.id)
+
     def test_handle_order_created_no_available_drivers(self, fleet_event_service, m_publisher, 
                                                      sample_order_event_data, sample_available_vehicle):
         # Arrange
@@ -115,9 +183,9 @@ class TestFleetEventService:
         m_publisher.publish.assert_called_once()
         call_args = m_publisher.publish.call_args
         assert call_args[0][0] == "no_vehicle_available"
-        event_data = call_args[0][1]
-        assert event_data["order_id"] == sample_order_event_data["order_id"]
-        assert event_data["reason"] == "no_drivers"
+        event = call_args[0][1]
+        assert event.order_id == sample_order_event_data["order_id"]
+        assert event.reason == "no_drivers"
     
     def test_handle_order_created_no_available_vehicles(self, fleet_event_service, m_publisher, 
                                                       sample_order_event_data, sample_available_driver):
@@ -132,9 +200,9 @@ class TestFleetEventService:
         m_publisher.publish.assert_called_once()
         call_args = m_publisher.publish.call_args
         assert call_args[0][0] == "no_vehicle_available"
-        event_data = call_args[0][1]
-        assert event_data["order_id"] == sample_order_event_data["order_id"]
-        assert event_data["reason"] == "no_vehicles"
+        event = call_args[0][1]
+        assert event.order_id == sample_order_event_data["order_id"]
+        assert event.reason == "no_vehicles"
     
     def test_handle_order_created_capacity_mismatch(self, fleet_event_service, m_publisher, 
                                                   sample_order_event_data, sample_available_driver):
@@ -166,9 +234,9 @@ class TestFleetEventService:
         m_publisher.publish.assert_called_once()
         call_args = m_publisher.publish.call_args
         assert call_args[0][0] == "no_vehicle_available"
-        event_data = call_args[0][1]
-        assert event_data["order_id"] == sample_order_event_data["order_id"]
-        assert event_data["reason"] == "capacity_mismatch"
+        event = call_args[0][1]
+        assert event.order_id == sample_order_event_data["order_id"]
+        assert event.reason == "capacity_mismatch"
     
     def test_start_listening(self, fleet_event_service, m_subscriber):
         # Act
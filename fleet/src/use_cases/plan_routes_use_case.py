@@ -0,0 +1,132 @@
+import math
+from datetime import datetime, timedelta
+from typing import List, Optional
+from uuid import UUID, uuid4
+from entities.route import Route, RoutePlan, RoutePlanRequest, RouteStop, UnassignedStop
+from entities.vehicle import Vehicle
+from repositories.interfaces.route_repository import IRouteRepository
+from repositories.interfaces.vehicle_repository import IVehicleRepository
+from utils.assignment_schedule import to_utc_naive
+from utils.eta_engine import EtaEngine
+from utils.vrp_solver import VrpSolver, VrpStop, VrpVehicle
+
+
+class PlanRoutesUseCase:
+    """Groups delivery stops into multi-stop routes, one per vehicle, and stores them"""
+    
+    def __init__(self, vehicle_repository: IVehicleRepository, route_repository: IRouteRepository,
+                 eta_engine: EtaEngine):
+        self.vehicle_repository = vehicle_repository
+        self.route_repository = route_repository
+        self.eta_engine = eta_engine
+    
+    def execute(self, request: RoutePlanRequest) -> RoutePlan:
+        # Время в сервисе - наивное UTC; значения с часовым поясом приводятся к нему
+        planned_start = to_utc_naive(request.planned_start) if request.planned_start else datetime.utcnow()
+        gazetteer = self.eta_engine.gazetteer
+        depot = gazetteer.resolve(request.depot_address)
+        if depot is None:
+            raise ValueError("Depot address not found")
+        
+        vehicles = self._get_vehicles(request.vehicle_ids)
+        if not vehicles:
+            raise ValueError("No available vehicles")
+        
+        unassigned: List[UnassignedStop] = []
+        plan_stops, solver_stops = [], []
+        for stop in request.stops:
+            stop = stop.model_copy(update={
+                "earliest_arrival": stop.earliest_arrival and to_utc_naive(stop.earliest_arrival),
+                "latest_arrival": stop.latest_arrival and to_utc_naive(stop.latest_arrival)
+            })
+            if stop.earliest_arrival and stop.latest_arrival and stop.earliest_arrival > stop.latest_arrival:
+                raise ValueError(f"Stop {stop.order_id}: earliest_arrival is after latest_arrival")
+            coordinates = gazetteer.resolve(stop.address)
+            if coordinates is None:
+                unassigned.append(UnassignedStop(order_id=stop.order_id, reason="unknown_address"))
+                continue
+            plan_stops.append((stop, coordinates))
+            solver_stops.append(VrpStop(
+                coordinates, stop.weight, stop.volume,
+                earliest=self._minutes(stop.earliest_arrival, planned_start, 0.0),
+                latest=self._minutes(stop.latest_arrival, planned_start, math.inf),
+                service_minutes=stop.service_minutes
+            ))
+        
+        routes: List[Route] = []
+        if solver_stops:
+            # Одна скорость для всех маршрутов - самого медленного типа машин: план выполним любой из них
+            solver = VrpSolver(
+                depot, solver_stops, [VrpVehicle(v.capacity_weight, v.capacity_volume) for v in vehicles],
+                speed_kmh=min(self.eta_engine.speed_profiles[v.vehicle_type] for v in vehicles),
+                road_factor=self.eta_engine.road_factor,
+                max_route_minutes=request.max_route_hours * 60 if request.max_route_hours else math.inf
+            )
+            solution = solver.solve(request.time_budget_seconds)
+            now = datetime.utcnow()
+            for vehicle, route in zip(vehicles, solution.routes):
+                if route:
+                    routes.append(self._build_route(solver, route, plan_stops, vehicle, request, planned_start, now))
+            unassigned.extend(
+                UnassignedStop(order_id=plan_stops[index][0].order_id, reason="no_feasible_route")
+                for index in solution.unassigned
+            )
+            self.route_repository.create_many(routes)
+        
+        return RoutePlan(
+            routes=routes,
+            unassigned=unassigned,
+            total_distance_km=round(sum(route.total_distance_km for route in routes), 3)
+        )
+    
+    def _get_vehicles(self, vehicle_ids: Optional[List[UUID]]) -> List[Vehicle]:
+        if vehicle_ids is None:
+            return self.vehicle_repository.get_available_vehicles()
+        vehicles = []
+        for vehicle_id in vehicle_ids:
+            vehicle = self.vehicle_repository.get_by_id(vehicle_id)
+            if not vehicle:
+                raise ValueError(f"Vehicle {vehicle_id} not found")
+            if vehicle.status != "active":
+                raise ValueError(f"Vehicle {vehicle_id} is not available for assignment")
+            vehicles.append(vehicle)
+        return vehicles
+    
+    @staticmethod
+    def _minutes(moment: Optional[datetime], planned_start: datetime, default: float) -> float:
+        return default if moment is None else (moment - planned_start).total_seconds() / 60
+    
+    @staticmethod
+    def _build_route(solver: VrpSolver, route: List[int], plan_stops, vehicle: Vehicle,
+                     request: RoutePlanRequest, planned_start: datetime, now: datetime) -> Route:
+        arrivals, finish = solver.schedule(route)
+        route_id = uuid4()
+        stops = []
+        for sequence, (index, arrival) in enumerate(zip(route, arrivals), start=1):
+            stop, (latitude, longitude) = plan_stops[index]
+            stops.append(RouteStop(
+                id=uuid4(),
+                route_id=route_id,
+                sequence=sequence,
+                order_id=stop.order_id,
+                address=stop.address,
+                latitude=latitude,
+                longitude=longitude,
+                earliest_arrival=stop.earliest_arrival,
+                latest_arrival=stop.latest_arrival,
+                planned_arrival=planned_start + timedelta(minutes=arrival),
+                service_minutes=stop.service_minutes,
+                weight=stop.weight,
+                volume=stop.volume
+            ))
+        return Route(
+            id=route_id,
+            vehicle_id=vehicle.id,
+            depot_address=request.depot_address,
+            planned_start=planned_start,
+            total_distance_km=round(solver.route_distance(route), 3),
+            total_duration_minutes=round(finish, 1),
+            stops=stops,
+            created_at=now,
+            updated_at=now
+        )
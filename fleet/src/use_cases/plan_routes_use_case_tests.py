@@ -0,0 +1,169 @@
+import pytest
+from unittest.mock import MagicMock
+from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+from entities.vehicle import Vehicle, VehicleStatus
+from entities.route import RoutePlanRequest, RoutePlanStop
+from shared.utils.geo import Gazetteer
+from use_cases.plan_routes_use_case import PlanRoutesUseCase
+from utils.eta_engine import EtaEngine
+
+PLANNED_START = datetime(2024, 1, 15, 8, 0)
+
+
+@pytest.fixture
+def m_vehicle_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def m_route_repository():
+    return MagicMock()
+
+
+@pytest.fixture
+def f_eta_engine():
+    return EtaEngine(Gazetteer())
+
+
+@pytest.fixture
+def f_plan_routes_use_case(m_vehicle_repository, m_route_repository, f_eta_engine):
+    return PlanRoutesUseCase(m_vehicle_repository, m_route_repository, f_eta_engine)
+
+
+@pytest.fixture
+def f_mock_vehicle():
+    return Vehicle(
+        id=uuid4(),
+        license_plate="ABC123",
+        vehicle_type="truck",
+        brand="Volvo",
+        model="FH16",
+        year=2020,
+        capacity_weight=20000.0,
+        capacity_volume=80.0,
+        fuel_type="diesel",
+        fuel_efficiency=2.5,
+        status=VehicleStatus.ACTIVE,
+        insurance_expiry=datetime.now() + timedelta(days=365),
+        registration_expiry=datetime.now() + timedelta(days=365),
+        created_at=datetime.now(),
+        updated_at=datetime.now()
+    )
+
+
+def make_request(*stops, **kwargs):
+    return RoutePlanRequest(depot_address="Москва, склад 1", planned_start=PLANNED_START, stops=list(stops),
+                            time_budget_seconds=0.5, **kwargs)
+
+
+def make_stop(order_id, address, **kwargs):
+    return RoutePlanStop(order_id=order_id, address=address, weight=500.0, volume=2.0, **kwargs)
+
+
+def test_execute_success(f_plan_routes_use_case, m_vehicle_repository, m_route_repository, f_mock_vehicle):
+    # Arrange
+    m_vehicle_repository.get_available_vehicles.return_value = [f_mock_vehicle]
+    request = make_request(make_stop("order-1", "Тула, ул. Ленина 1"), make_stop("order-2", "Tver, Sovetskaya 5"))
+
+    # Act
+    result = f_plan_routes_use_case.execute(request)
+
+    # Assert
+    assert len(result.routes) == 1
+    route = result.routes[0]
+    assert route.vehicle_id == f_mock_vehicle.id
+    assert {stop.order_id for stop in route.stops} == {"order-1", "order-2"}
+    assert [stop.sequence for stop in route.stops] == [1, 2]
+    assert all(stop.planned_arrival > PLANNED_START for stop in route.stops)
+    assert result.unassigned == []
+    assert result.total_distance_km == route.total_distance_km > 0
+    m_route_repository.create_many.assert_called_once_with(result.routes)
+
+
+def test_execute_unknown_address(f_plan_routes_use_case, m_vehicle_repository, m_route_repository, f_mock_vehicle):
+    # Arrange
+    m_vehicle_repository.get_available_vehicles.return_value = [f_mock_vehicle]
+    request = make_request(make_stop("order-1", "Тула"), make_stop("order-2", "Нигде, д. 1"))
+
+    # Act
+    result = f_plan_routes_use_case.execute(request)
+
+    # Assert
+    assert [stop.order_id for stop in result.routes[0].stops] == ["order-1"]
+    assert [(stop.order_id, stop.reason) for stop in result.unassigned] == [("order-2", "unknown_address")]
+
+
+def test_execute_infeasible_time_window(f_plan_routes_use_case, m_vehicle_repository, f_mock_vehicle):
+    # Arrange: до Казани больше 10 часов пути
+    m_vehicle_repository.get_available_vehicles.return_value = [f_mock_vehicle]
+    request = make_request(
+        make_stop("order-1", "Тула"),
+        make_stop("order-2", "Казань", latest_arrival=PLANNED_START + timedelta(hours=2))
+    )
+
+    # Act
+    result = f_plan_routes_use_case.execute(request)
+
+    # Assert
+    assert [(stop.order_id, stop.reason) for stop in result.unassigned] == [("order-2", "no_feasible_route")]
+
+
+def test_execute_accepts_timezone_aware_windows(f_plan_routes_use_case, m_vehicle_repository, f_mock_vehicle):
+    # Arrange: окна с часовым поясом при плане без planned_start (наивное UTC "сейчас")
+    m_vehicle_repository.get_available_vehicles.return_value = [f_mock_vehicle]
+    now = datetime.now(timezone.utc)
+    request = RoutePlanRequest(depot_address="Москва, склад 1", time_budget_seconds=0.5, stops=[
+        make_stop("order-1", "Тула", earliest_arrival=now, latest_arrival=now + timedelta(days=1)),
+        make_stop("order-2", "Казань", latest_arrival=(now + timedelta(hours=2)).astimezone(timezone(timedelta(hours=3))))
+    ])
+
+    # Act
+    result = f_plan_routes_use_case.execute(request)
+
+    # Assert: окна сравниваются в UTC и сохраняются без часового пояса
+    stop = result.routes[0].stops[0]
+    assert stop.order_id == "order-1"
+    assert stop.earliest_arrival.tzinfo is None
+    assert stop.earliest_arrival == now.replace(tzinfo=None)
+    assert [(stop.order_id, stop.reason) for stop in result.unassigned] == [("order-2", "no_feasible_route")]
+
+
+def test_execute_depot_not_found(f_plan_routes_use_case, m_route_repository):
+    # Arrange
+    request = RoutePlanRequest(depot_address="Нигде", stops=[make_stop("order-1", "Тула")])
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="Depot address not found"):
+        f_plan_routes_use_case.execute(request)
+    m_route_repository.create_many.assert_not_called()
+
+
+def test_execute_no_vehicles(f_plan_routes_use_case, m_vehicle_repository):
+    # Arrange
+    m_vehicle_repository.get_available_vehicles.return_value = []
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="No available vehicles"):
+        f_plan_routes_use_case.execute(make_request(make_stop("order-1", "Тула")))
+
+
+def test_execute_inverted_time_window(f_plan_routes_use_case, m_vehicle_repository, f_mock_vehicle):
+    # Arrange
+    m_vehicle_repository.get_available_vehicles.return_value = [f_mock_vehicle]
+    stop = make_stop("order-1", "Тула", earliest_arrival=PLANNED_START + timedelta(hours=5),
+                     latest_arrival=PLANNED_START + timedelta(hours=3))
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="earliest_arrival is after latest_arrival"):
+        f_plan_routes_use_case.execute(make_request(stop))
+
+
+def test_execute_inactive_vehicle(f_plan_routes_use_case, m_vehicle_repository, f_mock_vehicle):
+    # Arrange
+    f_mock_vehicle.status = VehicleStatus.MAINTENANCE
+    m_vehicle_repository.get_by_id.return_value = f_mock_vehicle
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="is not available for assignment"):
+        f_plan_routes_use_case.execute(make_request(make_stop("order-1", "Тула"), vehicle_ids=[f_mock_vehicle.id]))
@@ -0,0 +1,142 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+from entities.route_assignment import RouteAssignment
+from utils.interval_tree import IntervalTree
+
+VEHICLE = "vehicle"
+DRIVER = "driver"
+
+TimeWindow = Tuple[datetime, datetime]
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Dates in the service are naive UTC; aware ones are converted"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+class Booking(NamedTuple):
+    vehicle_id: UUID
+    driver_id: UUID
+    start: datetime
+    end: datetime
+
+
+class ScheduleConflictError(Exception):
+    """Raised when a vehicle or driver is already booked for part of the requested time"""
+
+    def __init__(self, resource: str, resource_id: UUID, assignment_id: UUID, start: datetime, end: datetime):
+        super().__init__(
+            f"{resource.capitalize()} {resource_id} is already assigned from {start.isoformat()} "
+            f"to {end.isoformat()} (route assignment {assignment_id})"
+        )
+        self.resource = resource
+        self.resource_id = resource_id
+        self.assignment_id = assignment_id
+
+
+class AssignmentSchedule:
+    """Planned route assignments per vehicle and per driver.
+
+    Each vehicle and driver has an IntervalTree of its bookings, so a
+    double-booking check is O(log n) in the number of its assignments and
+    free windows come from the bookings inside the asked period only.
+    ``book`` checks both resources and stores the assignment under one lock;
+    completed and cancelled assignments are released.
+    """
+
+    def __init__(self):
+        self._trees: Dict[str, Dict[UUID, IntervalTree]] = {VEHICLE: {}, DRIVER: {}}
+        self._bookings: Dict[UUID, Booking] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._bookings)
+
+    def load(self, assignments: Iterable[RouteAssignment]) -> None:
+        """Fill from stored assignments; overlaps made before the check existed are kept as is"""
+        with self._lock:
+            for assignment in assignments:
+                if assignment.scheduled_start is None or assignment.scheduled_end is None:
+                    continue
+                if assignment.id not in self._bookings:
+                    self._add(assignment.id, Booking(assignment.vehicle_id, assignment.driver_id,
+                                                     assignment.scheduled_start, assignment.scheduled_end))
+
+    def find_conflict(self, vehicle_id: UUID, driver_id: UUID, start: datetime,
+                      end: datetime) -> Optional[ScheduleConflictError]:
+        with self._lock:
+            return self._find_conflict(vehicle_id, driver_id, start, end)
+
+    def _find_conflict(self, vehicle_id: UUID, driver_id: UUID, start: datetime,
+                       end: datetime) -> Optional[ScheduleConflictError]:
+        for resource, resource_id in ((VEHICLE, vehicle_id), (DRIVER, driver_id)):
+            tree = self._trees[resource].get(resource_id)
+            overlap = tree.find_overlap(start, end) if tree is not None else None
+            if overlap is not None:
+                booked_start, booked_end, assignment_id = overlap
+                return ScheduleConflictError(resource, resource_id, assignment_id, booked_start, booked_end)
+        return None
+
+    def book(self, vehicle_id: UUID, driver_id: UUID, start: datetime, end: datetime,
+             create: Callable[[], RouteAssignment]) -> RouteAssignment:
+        """Store the assignment made by ``create`` if neither resource is busy, else raise ScheduleConflictError"""
+        # create (запись в БД) выполняется под блокировкой: между проверкой и записью
+        # параллельный запрос не займет то же время
+        with self._lock:
+            conflict = self._find_conflict(vehicle_id, driver_id, start, end)
+            if conflict is not None:
+                raise conflict
+            assignment = create()
+            self._add(assignment.id, Booking(vehicle_id, driver_id, start, end))
+            return assignment
+
+    def release(self, assignment_id: UUID) -> bool:
+        with self._lock:
+            booking = self._bookings.pop(assignment_id, None)
+            if booking is None:
+                return False
+            for resource, resource_id in ((VEHICLE, booking.vehicle_id), (DRIVER, booking.driver_id)):
+                trees = self._trees[resource]
+                tree = trees[resource_id]
+                tree.remove(booking.start, booking.end, assignment_id)
+                if not len(tree):
+                    del trees[resource_id]
+            return True
+
+    def get_bookings(self, resource: str, resource_id: UUID, start: datetime,
+                     end: datetime) -> List[Tuple[datetime, datetime, UUID]]:
+        with self._lock:
+            tree = self._trees[resource].get(resource_id)
+            return tree.overlapping(start, end) if tree is not None else []
+
+    def free_windows(self, resource: str, resource_ids: Iterable[UUID], start: datetime, end: datetime,
+                     min_duration: timedelta = timedelta(0)) -> Dict[UUID, List[TimeWindow]]:
+        """Free periods of at least ``min_duration`` within [start, end) for each resource"""
+        trees = self._trees[resource]
+        windows: Dict[UUID, List[TimeWindow]] = {}
+        with self._lock:
+            busy = {resource_id: trees[resource_id].overlapping(start, end) if resource_id in trees else []
+                    for resource_id in resource_ids}
+        for resource_id, bookings in busy.items():
+            free: List[TimeWindow] = []
+            cursor = start
+            # Брони отсортированы по началу и могут пересекаться (загружены из БД до проверки)
+            for booked_start, booked_end, _ in bookings:
+                if booked_start > cursor and booked_start - cursor >= min_duration:
+                    free.append((cursor, booked_start))
+                if booked_end > cursor:
+                    cursor = booked_end
+            if end > cursor and end - cursor >= min_duration:
+                free.append((cursor, end))
+            windows[resource_id] = free
+        return windows
+
+    def _add(self, assignment_id: UUID, booking: Booking) -> None:
+        self._bookings[assignment_id] = booking
+        for resource, resource_id in ((VEHICLE, booking.vehicle_id), (DRIVER, booking.driver_id)):
+            tree = self._trees[resource].get(resource_id)
+            if tree is None:
+                tree = self._trees[resource][resource_id] = IntervalTree()
+            tree.add(booking.start, booking.end, assignment_id)
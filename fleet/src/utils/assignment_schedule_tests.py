@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+import pytest
+from entities.route_assignment import RouteAssignment
+from utils.assignment_schedule import DRIVER, VEHICLE, AssignmentSchedule, ScheduleConflictError
+
+DAY = datetime(2030, 1, 1)
+
+
+def make_assignment(vehicle_id, driver_id, start_hour, hours):
+    start = DAY + timedelta(hours=start_hour)
+    return RouteAssignment(
+        id=uuid4(), route_id=uuid4(), vehicle_id=vehicle_id, driver_id=driver_id,
+        estimated_duration_hours=hours, scheduled_start=start, scheduled_end=start + timedelta(hours=hours),
+        created_at=DAY, updated_at=DAY
+    )
+
+
+class TestAssignmentSchedule:
+
+    @pytest.fixture
+    def f_schedule(self):
+        return AssignmentSchedule()
+
+    def book(self, schedule, vehicle_id, driver_id, start_hour, hours):
+        assignment = make_assignment(vehicle_id, driver_id, start_hour, hours)
+        return schedule.book(vehicle_id, driver_id, assignment.scheduled_start, assignment.scheduled_end,
+                             lambda: assignment)
+
+    def test_book_rejects_busy_vehicle_and_driver(self, f_schedule):
+        # Arrange
+        vehicle_id, driver_id = uuid4(), uuid4()
+        first = self.book(f_schedule, vehicle_id, driver_id, 8, 8)
+
+        # Act / Assert
+        with pytest.raises(ScheduleConflictError) as error:
+            self.book(f_schedule, vehicle_id, uuid4(), 12, 2)
+        assert (error.value.resource, error.value.assignment_id) == (VEHICLE, first.id)
+        with pytest.raises(ScheduleConflictError) as error:
+            self.book(f_schedule, uuid4(), driver_id, 6, 3)
+        assert error.value.resource == DRIVER
+        # Сразу после окончания маршрута машина свободна
+        self.book(f_schedule, vehicle_id, driver_id, 16, 2)
+        assert len(f_schedule) == 2
+
+    def test_conflict_does_not_create_assignment(self, f_schedule):
+        # Arrange
+        vehicle_id = uuid4()
+        self.book(f_schedule, vehicle_id, uuid4(), 8, 8)
+        created = []
+
+        # Act
+        with pytest.raises(ScheduleConflictError):
+            f_schedule.book(vehicle_id, uuid4(), DAY + timedelta(hours=9), DAY + timedelta(hours=10),
+                            lambda: created.append(1))
+
+        # Assert
+        assert created == []
+
+    def test_release_frees_time(self, f_schedule):
+        # Arrange
+        vehicle_id, driver_id = uuid4(), uuid4()
+        first = self.book(f_schedule, vehicle_id, driver_id, 8, 8)
+
+        # Act
+        released = f_schedule.release(first.id)
+
+        # Assert
+        assert released and not f_schedule.release(first.id)
+        assert f_schedule.find_conflict(vehicle_id, driver_id, DAY, DAY + timedelta(days=1)) is None
+
+    def test_free_windows(self, f_schedule):
+        # Arrange
+        vehicle_id, idle_vehicle_id = uuid4(), uuid4()
+        self.book(f_schedule, vehicle_id, uuid4(), 8, 4)
+        self.book(f_schedule, vehicle_id, uuid4(), 12.5, 3)
+        self.book(f_schedule, vehicle_id, uuid4(), 20, 6)
+
+        # Act
+        windows = f_schedule.free_windows(VEHICLE, [vehicle_id, idle_vehicle_id], DAY, DAY + timedelta(days=1),
+                                          min_duration=timedelta(hours=1))
+
+        # Assert: получасовой перерыв между маршрутами короче min_duration
+        hour = lambda value: DAY + timedelta(hours=value)
+        assert windows[vehicle_id] == [(hour(0), hour(8)), (hour(15.5), hour(20))]
+        assert windows[idle_vehicle_id] == [(hour(0), hour(24))]
+
+    def test_load_keeps_existing_overlaps(self, f_schedule):
+        # Arrange: двойное назначение, сделанное до проверки
+        vehicle_id = uuid4()
+        stored = [make_assignment(vehicle_id, uuid4(), 8, 8), make_assignment(vehicle_id, uuid4(), 10, 8)]
+
+        # Act
+        f_schedule.load(stored + stored[:1])
+
+        # Assert
+        assert len(f_schedule) == 2
+        assert f_schedule.free_windows(VEHICLE, [vehicle_id], DAY, DAY + timedelta(days=1))[vehicle_id] == [
+            (DAY, DAY + timedelta(hours=8)), (DAY + timedelta(hours=18), DAY + timedelta(days=1))
+        ]
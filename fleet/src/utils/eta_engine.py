@@ -0,0 +1,68 @@
+import functools
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from entities.vehicle import VehicleType
+from shared.utils.geo import Gazetteer, road_distance_km
+
+# Средняя скорость с учетом городов и ограничений для грузового транспорта, км/ч
+SPEED_PROFILES_KMH: Dict[VehicleType, float] = {
+    VehicleType.VAN: 70.0,
+    VehicleType.TRUCK: 60.0,
+    VehicleType.TRAILER: 55.0,
+}
+# Обязательный перерыв водителя: 45 минут после каждых 4.5 часов за рулем
+DRIVING_HOURS_BEFORE_BREAK = 4.5
+BREAK_MINUTES = 45
+
+
+class EtaRequest(NamedTuple):
+    origin: str
+    destination: str
+    vehicle_type: VehicleType
+    departure: datetime
+
+
+class EtaEngine:
+    """Offline delivery time estimates from pickup and delivery addresses.
+
+    Road distance is the great-circle distance between gazetteer coordinates
+    times ``road_factor``; travel time follows the speed profile of the
+    vehicle type plus handling time and driver breaks. Distances are memoized
+    per address pair, so repeated routes cost a dictionary lookup.
+    """
+
+    def __init__(self, gazetteer: Gazetteer, road_factor: float = 1.3, handling_minutes: int = 60,
+                 speed_profiles: Optional[Dict[VehicleType, float]] = None, cache_size: int = 100_000):
+        self.gazetteer = gazetteer
+        self.road_factor = road_factor
+        self.handling = timedelta(minutes=handling_minutes)
+        self.speed_profiles = {**SPEED_PROFILES_KMH, **(speed_profiles or {})}
+        self._distance = functools.lru_cache(maxsize=cache_size)(self._road_distance_km)
+
+    def distance_km(self, origin: str, destination: str) -> Optional[float]:
+        """Road distance estimate, None if either address is not in the gazetteer"""
+        return self._distance(origin, destination)
+
+    def travel_time(self, distance_km: float, vehicle_type: VehicleType) -> timedelta:
+        driving_hours = distance_km / self.speed_profiles[vehicle_type]
+        breaks = int(driving_hours // DRIVING_HOURS_BEFORE_BREAK)
+        return self.handling + timedelta(hours=driving_hours, minutes=breaks * BREAK_MINUTES)
+
+    def estimate(self, origin: str, destination: str, vehicle_type: VehicleType,
+                 departure: Optional[datetime] = None) -> Optional[datetime]:
+        distance = self._distance(origin, destination)
+        if distance is None:
+            return None
+        return (departure or datetime.utcnow()) + self.travel_time(distance, vehicle_type)
+
+    def estimate_many(self, requests: Iterable[EtaRequest]) -> List[Optional[datetime]]:
+        """ETAs in request order; None where an address could not be resolved"""
+        distance_of, travel_time = self._distance, self.travel_time
+        estimates: List[Optional[datetime]] = []
+        for origin, destination, vehicle_type, departure in requests:
+            distance = distance_of(origin, destination)
+            estimates.append(None if distance is None else departure + travel_time(distance, vehicle_type))
+        return estimates
+
+    def _road_distance_km(self, origin: str, destination: str) -> Optional[float]:
+        return road_distance_km(self.gazetteer, origin, destination, self.road_factor)
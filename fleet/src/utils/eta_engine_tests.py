@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+import pytest
+from entities.vehicle import VehicleType
+from utils.eta_engine import EtaEngine, EtaRequest
+
+MOSCOW, TVER = (55.7558, 37.6173), (56.8587, 35.9176)
+
+
+class TestEtaEngine:
+
+    @pytest.fixture
+    def m_gazetteer(self):
+        gazetteer = Mock()
+        gazetteer.resolve.side_effect = lambda address: {"Moscow": MOSCOW, "Tver": TVER}.get(address)
+        return gazetteer
+
+    @pytest.fixture
+    def f_engine(self, m_gazetteer):
+        return EtaEngine(m_gazetteer, road_factor=1.0, handling_minutes=30)
+
+    def test_estimate_uses_vehicle_speed(self, f_engine):
+        # Arrange
+        departure = datetime(2024, 1, 1, 8)
+        distance = f_engine.distance_km("Moscow", "Tver")
+
+        # Act
+        eta = f_engine.estimate("Moscow", "Tver", VehicleType.TRUCK, departure)
+
+        # Assert
+        assert distance == pytest.approx(162, abs=2)
+        assert eta == departure + timedelta(minutes=30, hours=distance / 60.0)
+
+    def test_long_haul_includes_driver_breaks(self, f_engine):
+        # Act: 600 км на грузовике - 10 часов за рулем, два перерыва
+        travel_time = f_engine.travel_time(600, VehicleType.TRUCK)
+
+        # Assert
+        assert travel_time == timedelta(hours=10, minutes=30 + 2 * 45)
+
+    def test_unknown_address_has_no_estimate(self, f_engine):
+        # Act / Assert
+        assert f_engine.estimate("123 Pickup St", "Tver", VehicleType.VAN) is None
+
+    def test_estimate_many_memoizes_pairs(self, f_engine, m_gazetteer):
+        # Arrange
+        departure = datetime(2024, 1, 1, 8)
+        requests = [EtaRequest("Moscow", "Tver", vehicle_type, departure) for vehicle_type in VehicleType] * 100
+        requests.append(EtaRequest("Moscow", "Nowhere", VehicleType.VAN, departure))
+
+        # Act
+        estimates = f_engine.estimate_many(requests)
+
+        # Assert
+        assert estimates[:3] == [f_engine.estimate("Moscow", "Tver", vehicle_type, departure)
+                                 for vehicle_type in VehicleType]
+        assert estimates[1] < estimates[0] < estimates[2]  # van, truck, trailer
+        assert estimates[-1] is None
+        assert m_gazetteer.resolve.call_count == 4
@@ -0,0 +1,140 @@
+import random
+from typing import Any, Hashable, Iterator, List, Optional, Tuple
+
+Interval = Tuple[Any, Any, Hashable]
+
+
+class _Node:
+    __slots__ = ("start", "end", "key", "priority", "max_end", "left", "right")
+
+    def __init__(self, start: Any, end: Any, key: Hashable, priority: float):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.priority = priority
+        self.max_end = end
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+
+def _update(node: _Node) -> _Node:
+    max_end = node.end
+    if node.left is not None and node.left.max_end > max_end:
+        max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > max_end:
+        max_end = node.right.max_end
+    node.max_end = max_end
+    return node
+
+
+class IntervalTree:
+    """Half-open intervals [start, end) with a key each, for overlap queries.
+
+    A treap ordered by (start, end, key), where every node also keeps the
+    largest end in its subtree: insert and remove take O(log n) expected,
+    ``find_overlap`` O(log n) and ``overlapping`` O(log n + k). Bounds may be
+    anything ordered (numbers, datetimes); keys must be comparable among
+    intervals with equal bounds.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self._root: Optional[_Node] = None
+        self._size = 0
+        self._random = random.Random(seed).random
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Interval]:
+        """Intervals in (start, end, key) order"""
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.start, node.end, node.key
+            node = node.right
+
+    def add(self, start: Any, end: Any, key: Hashable) -> None:
+        if not start < end:
+            raise ValueError("Interval start must be before its end")
+        left, right = self._split(self._root, (start, end, key))
+        self._root = self._merge(self._merge(left, _Node(start, end, key, self._random())), right)
+        self._size += 1
+
+    def remove(self, start: Any, end: Any, key: Hashable) -> bool:
+        removed, self._root = self._remove(self._root, (start, end, key))
+        if removed:
+            self._size -= 1
+        return removed
+
+    def find_overlap(self, start: Any, end: Any) -> Optional[Interval]:
+        """Some interval overlapping [start, end), None if there is none"""
+        node = self._root
+        while node is not None:
+            if node.start < end and start < node.end:
+                return node.start, node.end, node.key
+            # Если слева есть интервал, заканчивающийся после start, а пересечения там нет,
+            # то он начинается не раньше end - и все интервалы справа тоже
+            if node.left is not None and node.left.max_end > start:
+                node = node.left
+            elif node.start < end:
+                node = node.right
+            else:
+                return None
+        return None
+
+    def overlapping(self, start: Any, end: Any) -> List[Interval]:
+        """All intervals overlapping [start, end), ordered by start"""
+        found: List[Interval] = []
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            # Поддеревья, где все интервалы заканчиваются до start, пропускаются целиком
+            while node is not None and node.max_end > start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if not node.start < end:
+                break
+            if start < node.end:
+                found.append((node.start, node.end, node.key))
+            node = node.right
+        return found
+
+    def _split(self, node: Optional[_Node], bound: tuple) -> Tuple[Optional[_Node], Optional[_Node]]:
+        """Nodes ordered before ``bound`` and the rest"""
+        if node is None:
+            return None, None
+        if (node.start, node.end, node.key) < bound:
+            node.right, right = self._split(node.right, bound)
+            return _update(node), right
+        left, node.left = self._split(node.left, bound)
+        return left, _update(node)
+
+    def _merge(self, left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            return _update(left)
+        right.left = self._merge(left, right.left)
+        return _update(right)
+
+    def _remove(self, node: Optional[_Node], bound: tuple) -> Tuple[bool, Optional[_Node]]:
+        if node is None:
+            return False, None
+        current = (node.start, node.end, node.key)
+        if current == bound:
+            return True, self._merge(node.left, node.right)
+        if bound < current:
+            removed, node.left = self._remove(node.left, bound)
+        else:
+            removed, node.right = self._remove(node.right, bound)
+        return removed, _update(node)
@@ -0,0 +1,57 @@
+import random
+import pytest
+from utils.interval_tree import IntervalTree
+
+
+class TestIntervalTree:
+
+    def test_queries_match_brute_force(self):
+        # Arrange
+        rng = random.Random(5)
+        tree, intervals = IntervalTree(seed=1), []
+
+        for step in range(3000):
+            # Act: вставки, удаления и запросы вперемешку
+            if rng.random() < 0.6 or not intervals:
+                start = rng.uniform(0, 500)
+                interval = (start, start + rng.uniform(0.1, 20), step)
+                tree.add(*interval)
+                intervals.append(interval)
+            elif rng.random() < 0.5:
+                assert tree.remove(*intervals.pop(rng.randrange(len(intervals))))
+            else:
+                start = rng.uniform(-10, 510)
+                end = start + rng.uniform(0.01, 30)
+                expected = sorted(item for item in intervals if item[0] < end and start < item[1])
+
+                # Assert
+                assert tree.overlapping(start, end) == expected
+                found = tree.find_overlap(start, end)
+                assert (found in expected) if expected else found is None
+
+        assert len(tree) == len(intervals)
+        assert list(tree) == sorted(intervals)
+
+    def test_touching_intervals_do_not_overlap(self):
+        # Arrange
+        tree = IntervalTree()
+        tree.add(8, 16, "morning")
+
+        # Act / Assert
+        assert tree.find_overlap(16, 18) is None
+        assert tree.find_overlap(6, 8) is None
+        assert tree.find_overlap(15, 17) == (8, 16, "morning")
+
+    def test_remove_missing_interval(self):
+        # Arrange
+        tree = IntervalTree()
+        tree.add(1, 2, "a")
+
+        # Act / Assert
+        assert not tree.remove(1, 2, "b")
+        assert len(tree) == 1
+
+    def test_empty_interval_is_rejected(self):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            IntervalTree().add(5, 5, "a")
@@ -0,0 +1,181 @@
+import heapq
+import math
+import threading
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from shared.utils.geo import EARTH_RADIUS_KM, Coordinates, haversine_km
+
+Cell = Tuple[int, int]
+Predicate = Optional[Callable[[Hashable], bool]]
+
+
+class _Grid:
+    """Points bucketed into square cells of ``cell_degrees``, with a ring-by-ring nearest search"""
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self.cells: Dict[Cell, Set[Hashable]] = {}
+        # row_min, row_max, column_min, column_max занятых ячеек. Только расширяются:
+        # после удаления точек границы остаются с запасом, это лишь удлиняет перебор колец
+        self.bounds: Optional[List[int]] = None
+
+    def cell(self, coordinates: Coordinates) -> Cell:
+        return math.floor(coordinates[0] / self.cell_degrees), math.floor(coordinates[1] / self.cell_degrees)
+
+    def add(self, key: Hashable, cell: Cell) -> None:
+        self.cells.setdefault(cell, set()).add(key)
+        row, column = cell
+        if self.bounds is None:
+            self.bounds = [row, row, column, column]
+            return
+        bounds = self.bounds
+        bounds[0], bounds[1] = min(bounds[0], row), max(bounds[1], row)
+        bounds[2], bounds[3] = min(bounds[2], column), max(bounds[3], column)
+
+    def discard(self, key: Hashable, cell: Cell) -> None:
+        keys = self.cells.get(cell)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.cells[cell]
+
+    def search(self, point: Coordinates, k: int, predicate: Predicate, max_distance_km: float,
+               positions: Dict[Hashable, Coordinates], cell_limit: int) -> Optional[List[Tuple[float, Hashable]]]:
+        """k nearest as (distance, key), nearest first; None once more than ``cell_limit`` cells would be read"""
+        center_row, center_column = self.cell(point)
+        row_min, row_max, column_min, column_max = self.bounds
+        # Дальше этого кольца занятых ячеек нет
+        last_ring = max(center_row - row_min, row_max - center_row, center_column - column_min,
+                        column_max - center_column, 0)
+        cells = self.cells
+        best: List[Tuple[float, int, Hashable]] = []  # куча по -distance: сверху k-й по удаленности
+        order = scanned = 0
+        for ring in range(last_ring + 1):
+            bound = self._ring_distance_km(point, center_row, center_column, ring)
+            if bound > max_distance_km or (len(best) == k and bound >= -best[0][0]):
+                break
+            ring_cells = self._ring_cells(center_row, center_column, ring)
+            scanned += len(ring_cells)
+            if scanned > cell_limit:
+                return None
+            for cell in ring_cells:
+                keys = cells.get(cell)
+                if not keys:
+                    continue
+                for key in keys:
+                    if predicate is not None and not predicate(key):
+                        continue
+                    distance = haversine_km(point, positions[key])
+                    if distance > max_distance_km:
+                        continue
+                    order += 1
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, order, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, order, key))
+        return [(-distance, key) for distance, _, key in sorted(best, reverse=True)]
+
+    def _ring_distance_km(self, point: Coordinates, center_row: int, center_column: int, ring: int) -> float:
+        """Lower bound of the distance from ``point`` to anything outside the rings before ``ring``"""
+        if ring == 0:
+            return 0.0
+        size = self.cell_degrees
+        latitude, longitude = point
+        # Кольца 0..ring-1 покрывают прямоугольник; точка кольца ring лежит за одной из его сторон
+        latitude_gap = min(latitude - (center_row - ring + 1) * size, (center_row + ring) * size - latitude)
+        longitude_gap = min(longitude - (center_column - ring + 1) * size, (center_column + ring) * size - longitude)
+        # По долготе расстояние сокращается к полюсу: берется самая высокая широта кольца
+        highest = min(90.0, max(abs((center_row - ring) * size), abs((center_row + ring + 1) * size)))
+        across = 2 * EARTH_RADIUS_KM * math.asin(
+            min(1.0, math.cos(math.radians(highest)) * math.sin(math.radians(longitude_gap) / 2))
+        )
+        return min(EARTH_RADIUS_KM * math.radians(latitude_gap), across)
+
+    @staticmethod
+    def _ring_cells(row: int, column: int, ring: int) -> List[Cell]:
+        if ring == 0:
+            return [(row, column)]
+        cells = [(row + d, column + side) for side in (-ring, ring) for d in range(-ring, ring + 1)]
+        cells.extend((row + side, column + d) for side in (-ring, ring) for d in range(-ring + 1, ring))
+        return cells
+
+
+class SpatialIndex:
+    """Index of moving points (vehicle positions) for k-nearest queries.
+
+    Points are kept in two grids, of ``cell_degrees`` and ``coarse_factor``
+    times larger cells; moving a point touches at most two cells of each,
+    so the index follows position updates without rebuilds. ``nearest``
+    scans rings of cells around the query point and stops once the next
+    ring cannot hold anything closer than the k-th candidate: in the fine
+    grid where the coarse cell of the point holds ``dense_cell_points`` or
+    more points, otherwise in the coarse one. If the rings would read more
+    cells than there are points, the points are scanned directly. The
+    antimeridian is not wrapped.
+    """
+
+    def __init__(self, cell_degrees: float = 0.1, coarse_factor: int = 10, dense_cell_points: int = 32):
+        self._fine = _Grid(cell_degrees)
+        self._coarse = _Grid(cell_degrees * coarse_factor)
+        self.dense_cell_points = dense_cell_points
+        self._positions: Dict[Hashable, Coordinates] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def get(self, key: Hashable) -> Optional[Coordinates]:
+        return self._positions.get(key)
+
+    def update(self, key: Hashable, coordinates: Coordinates) -> None:
+        with self._lock:
+            previous = self._positions.get(key)
+            self._positions[key] = coordinates
+            for grid in (self._fine, self._coarse):
+                cell = grid.cell(coordinates)
+                if previous is not None:
+                    previous_cell = grid.cell(previous)
+                    if previous_cell == cell:
+                        continue
+                    grid.discard(key, previous_cell)
+                grid.add(key, cell)
+
+    def update_many(self, points: Iterable[Tuple[Hashable, Coordinates]]) -> None:
+        for key, coordinates in points:
+            self.update(key, coordinates)
+
+    def remove(self, key: Hashable) -> None:
+        with self._lock:
+            previous = self._positions.pop(key, None)
+            if previous is not None:
+                self._fine.discard(key, self._fine.cell(previous))
+                self._coarse.discard(key, self._coarse.cell(previous))
+
+    def nearest(self, point: Coordinates, k: int = 1, predicate: Predicate = None,
+                max_distance_km: float = math.inf) -> List[Tuple[Hashable, float]]:
+        """Up to ``k`` (key, distance in km) pairs closest to ``point``, nearest first.
+
+        Only keys accepted by ``predicate`` are returned, e.g. vehicles that
+        are available and fit the cargo.
+        """
+        with self._lock:
+            if not self._positions or k <= 0:
+                return []
+            coarse_cell = self._coarse.cells.get(self._coarse.cell(point), ())
+            grid = self._fine if len(coarse_cell) >= self.dense_cell_points else self._coarse
+            found = grid.search(point, k, predicate, max_distance_km, self._positions, len(self._positions))
+            if found is None:
+                found = self._scan(point, k, predicate, max_distance_km)
+            return [(key, distance) for distance, key in found]
+
+    def _scan(self, point: Coordinates, k: int, predicate: Predicate,
+              max_distance_km: float) -> List[Tuple[float, Hashable]]:
+        candidates = (
+            (haversine_km(point, coordinates), key)
+            for key, coordinates in self._positions.items()
+            if predicate is None or predicate(key)
+        )
+        return heapq.nsmallest(k, (item for item in candidates if item[0] <= max_distance_km),
+                               key=lambda item: item[0])
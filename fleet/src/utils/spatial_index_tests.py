@@ -0,0 +1,79 @@
+import random
+import pytest
+from shared.utils.geo import haversine_km
+from utils.spatial_index import SpatialIndex
+
+
+def brute_force(points, point, k, predicate=None, max_distance_km=float("inf")):
+    distances = sorted(
+        (haversine_km(point, coordinates), key) for key, coordinates in points.items()
+        if (predicate is None or predicate(key)) and haversine_km(point, coordinates) <= max_distance_km
+    )
+    return [distance for distance, _ in distances[:k]]
+
+
+class TestSpatialIndex:
+
+    @pytest.fixture
+    def f_points(self):
+        rng = random.Random(7)
+        # Плотное облако вокруг Москвы и редкие точки по всей стране
+        points = {i: (55.75 + rng.gauss(0, 0.2), 37.61 + rng.gauss(0, 0.3)) for i in range(2000)}
+        points.update({i: (rng.uniform(43, 70), rng.uniform(20, 140)) for i in range(2000, 2300)})
+        return points
+
+    @pytest.fixture
+    def f_index(self, f_points):
+        index = SpatialIndex()
+        index.update_many(f_points.items())
+        return index
+
+    def test_nearest_matches_brute_force(self, f_index, f_points):
+        # Arrange
+        rng = random.Random(11)
+        queries = [(55.75 + rng.gauss(0, 0.3), 37.61 + rng.gauss(0, 0.3)) for _ in range(30)]
+        queries += [(rng.uniform(40, 72), rng.uniform(15, 150)) for _ in range(30)]
+
+        for query in queries:
+            for k in (1, 5):
+                # Act
+                found = f_index.nearest(query, k=k)
+
+                # Assert
+                assert [distance for _, distance in found] == pytest.approx(brute_force(f_points, query, k))
+                assert all(haversine_km(query, f_points[key]) == pytest.approx(distance) for key, distance in found)
+
+    def test_nearest_with_predicate_and_max_distance(self, f_index, f_points):
+        # Arrange
+        query = (55.75, 37.61)
+
+        def even(key):
+            return key % 2 == 0
+
+        # Act
+        found = f_index.nearest(query, k=10, predicate=even, max_distance_km=15)
+
+        # Assert
+        assert all(key % 2 == 0 for key, _ in found)
+        assert [distance for _, distance in found] == pytest.approx(brute_force(f_points, query, 10, even, 15))
+
+    def test_moved_and_removed_points(self):
+        # Arrange
+        index = SpatialIndex()
+        index.update("near", (55.75, 37.61))
+        index.update("far", (59.93, 30.33))
+
+        # Act
+        index.update("near", (43.10, 131.90))
+        index.update("far", (55.76, 37.62))
+        index.remove("gone")
+        index.remove("near")
+
+        # Assert
+        assert [key for key, _ in index.nearest((55.75, 37.61), k=5)] == ["far"]
+        assert "near" not in index
+        assert len(index) == 1
+
+    def test_empty_index(self):
+        # Act / Assert
+        assert SpatialIndex().nearest((55.75, 37.61), k=3) == []
@@ -0,0 +1,196 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+from uuid import UUID
+import psycopg2
+import structlog
+from sqlalchemy.exc import DataError, IntegrityError
+from entities.telemetry import TelemetryPing
+from utils.spatial_index import SpatialIndex
+
+
+# Ошибки в данных самого пакета: повтор их не исправит. Недоступность БД сюда не входит -
+# такой пакет ждет в очереди, пока буфер не переполнится
+POISON_ERRORS = (ValueError, DataError, IntegrityError, psycopg2.DataError, psycopg2.IntegrityError)
+
+
+class TelemetryBufferFull(Exception):
+    """Raised when more pings wait for the database than the buffer holds"""
+    pass
+
+
+class TelemetryBuffer:
+    """Write-behind buffer for telemetry with the latest position of every vehicle.
+
+    Requests only append pings to memory. A background thread hands them to
+    ``writer`` in batches of up to ``batch_size`` every
+    ``flush_interval_seconds``, or as soon as a full batch has gathered. The
+    newest ping of each vehicle is kept in a dict, so position reads never go
+    to the database, and mirrored into ``spatial_index`` for nearest-vehicle
+    queries. With more than ``max_pending`` pings waiting, ``add``
+    raises TelemetryBufferFull; a failed batch goes back to the queue and
+    the oldest pings are dropped if it no longer fits. A batch rejected for
+    its data (POISON_ERRORS) ``max_write_attempts`` times is dropped, so one
+    bad batch does not block the writes behind it; connection errors never
+    drop a batch.
+    """
+
+    def __init__(self, writer: Callable[[List[TelemetryPing]], None], batch_size: int = 5000,
+                 flush_interval_seconds: float = 1.0, max_pending: int = 200_000,
+                 spatial_index: Optional[SpatialIndex] = None, max_write_attempts: int = 5):
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self.spatial_index = spatial_index
+        self.max_write_attempts = max_write_attempts
+        # Отказы из-за данных для пакета в голове очереди
+        self._failed_attempts = 0
+        self._pending: List[TelemetryPing] = []
+        self._latest: Dict[UUID, TelemetryPing] = {}
+        self._lock = threading.Lock()
+        # Запись пакетов по одному: фоновый поток и flush при остановке не пересекаются
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.accepted_count = 0
+        self.written_count = 0
+        self.dropped_count = 0
+        self.flush_count = 0
+        self.flush_error_count = 0
+        self.last_flush_ms: Optional[float] = None
+        self.last_flushed_at: Optional[datetime] = None
+        self.logger = structlog.get_logger(self.__class__.__name__)
+
+    def add(self, pings: Sequence[TelemetryPing]) -> None:
+        if not pings:
+            return
+        with self._lock:
+            if len(self._pending) + len(pings) > self.max_pending:
+                raise TelemetryBufferFull(f"Telemetry buffer is full: {len(self._pending)} pings are waiting")
+            self._pending.extend(pings)
+            self._update_latest(pings)
+            self.accepted_count += len(pings)
+            full_batch = len(self._pending) >= self.batch_size
+        if full_batch:
+            self._wake.set()
+
+    def load_latest(self, pings: Iterable[TelemetryPing]) -> None:
+        """Fill latest positions from stored pings without writing them again"""
+        with self._lock:
+            self._update_latest(pings)
+
+    def get_position(self, vehicle_id: UUID) -> Optional[TelemetryPing]:
+        return self._latest.get(vehicle_id)
+
+    def get_positions(self, vehicle_ids: Optional[Iterable[UUID]] = None) -> List[TelemetryPing]:
+        if vehicle_ids is not None:
+            latest = self._latest
+            return [latest[vehicle_id] for vehicle_id in vehicle_ids if vehicle_id in latest]
+        with self._lock:
+            return list(self._latest.values())
+
+    def flush(self) -> int:
+        """Write all pending pings now; returns how many were written"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            started = time.perf_counter()
+            written = 0
+            try:
+                for start in range(0, len(batch), self.batch_size):
+                    chunk = batch[start:start + self.batch_size]
+                    self.writer(chunk)
+                    written += len(chunk)
+                    self._failed_attempts = 0
+            except Exception as e:
+                rest = batch[written:]
+                if isinstance(e, POISON_ERRORS):
+                    self._failed_attempts += 1
+                if self._failed_attempts >= self.max_write_attempts:
+                    # Пакет, который не записывается раз за разом, иначе навсегда блокировал бы очередь
+                    failed, rest = rest[:self.batch_size], rest[self.batch_size:]
+                    self.dropped_count += len(failed)
+                    self._failed_attempts = 0
+                    self.logger.error("Dropped telemetry batch after failed writes", error=str(e),
+                                      pings=len(failed), attempts=self.max_write_attempts)
+                self._requeue(rest)
+                raise
+            finally:
+                self.written_count += written
+            self.flush_count += 1
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+            self.last_flushed_at = datetime.utcnow()
+            return written
+
+    def start(self) -> None:
+        """Start periodic background writes"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background writes and write what is left"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            self.logger.error("Failed to write telemetry on shutdown", error=str(e), pending=len(self._pending))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "vehicles": len(self._latest),
+            "accepted": self.accepted_count,
+            "written": self.written_count,
+            "dropped": self.dropped_count,
+            "flushes": self.flush_count,
+            "flush_errors": self.flush_error_count,
+            "last_flush_ms": round(self.last_flush_ms, 2) if self.last_flush_ms is not None else None,
+            "last_flushed_at": self.last_flushed_at.isoformat() if self.last_flushed_at else None
+        }
+
+    def _update_latest(self, pings: Iterable[TelemetryPing]) -> None:
+        # Пинги приходят не по порядку (буфер на борту после потери связи): старый не затирает новый
+        latest = self._latest
+        moved: Dict[UUID, TelemetryPing] = {}
+        for ping in pings:
+            current = latest.get(ping.vehicle_id)
+            if current is None or ping.recorded_at >= current.recorded_at:
+                latest[ping.vehicle_id] = moved[ping.vehicle_id] = ping
+        if self.spatial_index is not None:
+            # В индекс - одно положение на машину за пакет, а не каждый пинг
+            self.spatial_index.update_many((vehicle_id, (ping.latitude, ping.longitude))
+                                           for vehicle_id, ping in moved.items())
+
+    def _requeue(self, batch: List[TelemetryPing]) -> None:
+        with self._lock:
+            pending = batch + self._pending
+            overflow = len(pending) - self.max_pending
+            if overflow > 0:
+                # Отбрасываются самые старые пинги: последние положения машин уже в памяти
+                pending = pending[overflow:]
+                self.dropped_count += overflow
+            self._pending = pending
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.flush_error_count += 1
+                self.logger.warning("Failed to write telemetry", error=str(e), pending=len(self._pending))
+                # Без паузы полный буфер повторял бы запись в недоступную БД без перерыва
+                self._stop.wait(self.flush_interval_seconds)
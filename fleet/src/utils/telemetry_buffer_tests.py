@@ -0,0 +1,188 @@
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from uuid import uuid4
+import pytest
+from sqlalchemy.exc import OperationalError
+from entities.telemetry import TelemetryPing
+from utils.spatial_index import SpatialIndex
+from utils.telemetry_buffer import TelemetryBuffer, TelemetryBufferFull
+
+START = datetime(2024, 1, 15, 12, 0)
+
+
+def make_pings(vehicle_id, count, start=START):
+    return [TelemetryPing(vehicle_id, start + timedelta(seconds=i), 55.0 + i / 1000, 37.0) for i in range(count)]
+
+
+class TestTelemetryBuffer:
+
+    @pytest.fixture
+    def m_writer(self):
+        return Mock()
+
+    @pytest.fixture
+    def f_buffer(self, m_writer):
+        return TelemetryBuffer(m_writer, batch_size=3, flush_interval_seconds=0.05, max_pending=10)
+
+    def test_add_keeps_newest_position(self, f_buffer):
+        # Arrange
+        vehicle_id = uuid4()
+        pings = make_pings(vehicle_id, 5)
+
+        # Act: последний пинг пришел раньше остальных
+        f_buffer.add(pings[4:])
+        f_buffer.add(pings[:4])
+
+        # Assert
+        assert f_buffer.get_position(vehicle_id) == pings[4]
+        assert f_buffer.get_positions() == [pings[4]]
+        assert f_buffer.get_positions([vehicle_id, uuid4()]) == [pings[4]]
+
+    def test_flush_writes_in_batches(self, f_buffer, m_writer):
+        # Arrange
+        pings = make_pings(uuid4(), 7)
+        f_buffer.add(pings)
+
+        # Act
+        written = f_buffer.flush()
+
+        # Assert
+        assert written == 7
+        assert [call.args[0] for call in m_writer.call_args_list] == [pings[:3], pings[3:6], pings[6:]]
+        assert f_buffer.get_stats()["pending"] == 0
+        assert f_buffer.get_stats()["written"] == 7
+
+    def test_failed_batch_is_requeued(self, f_buffer, m_writer):
+        # Arrange
+        pings = make_pings(uuid4(), 7)
+        f_buffer.add(pings)
+        m_writer.side_effect = [None, ConnectionError("database is down")]
+
+        # Act
+        with pytest.raises(ConnectionError):
+            f_buffer.flush()
+        m_writer.side_effect = None
+        f_buffer.flush()
+
+        # Assert: первый пакет записан один раз, остальное - при повторе
+        assert [call.args[0] for call in m_writer.call_args_list][2:] == [pings[3:6], pings[6:]]
+        assert f_buffer.get_stats()["written"] == 7
+
+    def test_batch_is_dropped_after_max_write_attempts(self, m_writer):
+        # Arrange: первый пакет не записывается никогда, остальные - без ошибок
+        pings = make_pings(uuid4(), 5)
+        buffer = TelemetryBuffer(m_writer, batch_size=3, max_pending=10, max_write_attempts=2)
+        buffer.add(pings)
+
+        def write(batch):
+            if batch == pings[:3]:
+                raise ValueError("bad row")
+
+        m_writer.side_effect = write
+
+        # Act
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                buffer.flush()
+        written = buffer.flush()
+
+        # Assert
+        assert written == 2
+        assert m_writer.call_args_list[-1].args[0] == pings[3:]
+        assert buffer.get_stats()["dropped"] == 3
+        assert buffer.get_stats()["pending"] == 0
+
+    def test_database_outage_does_not_drop_batches(self, m_writer):
+        # Arrange
+        pings = make_pings(uuid4(), 5)
+        buffer = TelemetryBuffer(m_writer, batch_size=3, max_pending=10, max_write_attempts=2)
+        buffer.add(pings)
+        m_writer.side_effect = OperationalError("COPY", {}, ConnectionRefusedError("connection refused"))
+
+        # Act: БД недоступна дольше max_write_attempts попыток
+        for _ in range(5):
+            with pytest.raises(OperationalError):
+                buffer.flush()
+        m_writer.side_effect = None
+        written = buffer.flush()
+
+        # Assert
+        assert written == 5
+        assert buffer.get_stats()["dropped"] == 0
+
+    def test_full_buffer_rejects_new_pings(self, f_buffer):
+        # Arrange
+        pings = make_pings(uuid4(), 12)
+        f_buffer.add(pings[:8])
+
+        # Act / Assert
+        with pytest.raises(TelemetryBufferFull):
+            f_buffer.add(pings[8:])
+        assert f_buffer.get_stats()["pending"] == 8
+
+    def test_requeue_drops_oldest_on_overflow(self):
+        # Arrange
+        old, new = make_pings(uuid4(), 3), make_pings(uuid4(), 4)
+
+        def writer(batch):
+            # Пока шла запись, пришли новые пинги, а затем запись не удалась
+            buffer.add(new)
+            raise ConnectionError("database is down")
+
+        buffer = TelemetryBuffer(writer, batch_size=100, max_pending=5)
+        buffer.add(old)
+
+        # Act
+        with pytest.raises(ConnectionError):
+            buffer.flush()
+
+        # Assert
+        assert buffer._pending == old[2:] + new
+        assert buffer.get_stats()["dropped"] == 2
+
+    def test_background_thread_flushes_and_stop_writes_rest(self, f_buffer, m_writer):
+        # Arrange
+        pings = make_pings(uuid4(), 4)
+        f_buffer.start()
+
+        # Act
+        f_buffer.add(pings[:3])
+        for _ in range(100):
+            if m_writer.call_count:
+                break
+            time.sleep(0.01)
+        f_buffer.add(pings[3:])
+        f_buffer.stop()
+
+        # Assert
+        written = [ping for call in m_writer.call_args_list for ping in call.args[0]]
+        assert written == pings
+
+    def test_load_latest_does_not_write(self, f_buffer, m_writer):
+        # Arrange
+        vehicle_id = uuid4()
+        stored = make_pings(vehicle_id, 2)
+
+        # Act
+        f_buffer.load_latest(stored)
+        f_buffer.add(make_pings(vehicle_id, 1, start=START - timedelta(hours=1)))
+
+        # Assert
+        assert f_buffer.get_position(vehicle_id) == stored[1]
+        assert f_buffer.flush() == 1
+
+    def test_spatial_index_follows_latest_position(self, m_writer):
+        # Arrange
+        spatial_index = SpatialIndex()
+        buffer = TelemetryBuffer(m_writer, spatial_index=spatial_index)
+        vehicle_id = uuid4()
+        pings = make_pings(vehicle_id, 3)
+
+        # Act: опоздавший пинг не сдвигает машину назад
+        buffer.add(pings[2:])
+        buffer.add(pings[:2])
+
+        # Assert
+        assert spatial_index.get(vehicle_id) == (pings[2].latitude, pings[2].longitude)
+        assert spatial_index.nearest((55.0, 37.0)) == [(vehicle_id, pytest.approx(0.222, abs=0.001))]
@@ -0,0 +1,156 @@
+import math
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+import orjson
+from entities.telemetry import TelemetryPing
+
+JSON_CONTENT_TYPE = "application/json"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+BINARY_CONTENT_TYPE = "application/vnd.cargo-track.telemetry"
+
+# Бинарная запись, little-endian, 56 байт: UUID машины, время в мс от эпохи (UTC), широта, долгота,
+# скорость км/ч, курс в градусах, одометр км. NaN в последних трех полях - значение не передано
+RECORD = struct.Struct("<16sqddffd")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def supported_content_types() -> List[str]:
+    return [JSON_CONTENT_TYPE, NDJSON_CONTENT_TYPE, BINARY_CONTENT_TYPE]
+
+
+def encode_binary(pings: Iterable[TelemetryPing]) -> bytes:
+    """Pings in the binary format, as sent by the on-board units"""
+    nan = math.nan
+    return b"".join(
+        RECORD.pack(
+            ping.vehicle_id.bytes,
+            (ping.recorded_at - _EPOCH) // timedelta(milliseconds=1),
+            ping.latitude,
+            ping.longitude,
+            nan if ping.speed_kmh is None else ping.speed_kmh,
+            nan if ping.heading is None else ping.heading,
+            nan if ping.odometer_km is None else ping.odometer_km
+        )
+        for ping in pings
+    )
+
+
+def decode(body: bytes, content_type: Optional[str], max_future_seconds: float = 300.0,
+           now: Optional[datetime] = None, max_age_seconds: float = 7 * 24 * 3600.0) -> Tuple[List[TelemetryPing], int]:
+    """Valid pings of a batch and the number of rejected ones.
+
+    A ping is rejected for a bad vehicle id or time, coordinates out of range,
+    a negative or infinite speed or odometer, or a time more than
+    ``max_future_seconds`` ahead of ``now`` or more than ``max_age_seconds``
+    behind it. A body that cannot be parsed at all raises ValueError.
+    """
+    key = (content_type or JSON_CONTENT_TYPE).split(";")[0].strip().lower()
+    now = now or datetime.utcnow()
+    window = (now - timedelta(seconds=max_age_seconds), now + timedelta(seconds=max_future_seconds))
+    if key == BINARY_CONTENT_TYPE:
+        return _decode_binary(body, window)
+    if key == NDJSON_CONTENT_TYPE:
+        try:
+            items = [orjson.loads(line) for line in body.splitlines() if line.strip()]
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Malformed NDJSON telemetry: {e}")
+        return _decode_items(items, window)
+    if key == JSON_CONTENT_TYPE:
+        try:
+            items = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            raise ValueError(f"Malformed JSON telemetry: {e}")
+        if isinstance(items, dict):
+            items = items.get("pings")
+        if not isinstance(items, list):
+            raise ValueError("Telemetry JSON must be a list of pings or an object with a \"pings\" list")
+        return _decode_items(items, window)
+    raise ValueError(f"Unsupported telemetry content type: {content_type}")
+
+
+def _decode_items(items: List[Any], window: Tuple[datetime, datetime]) -> Tuple[List[TelemetryPing], int]:
+    pings: List[TelemetryPing] = []
+    vehicle_ids: Dict[str, UUID] = {}
+    for item in items:
+        try:
+            raw_id = item["vehicle_id"]
+            # Машины повторяются в пакете: строка разбирается в UUID один раз
+            vehicle_id = vehicle_ids.get(raw_id)
+            if vehicle_id is None:
+                vehicle_id = vehicle_ids[raw_id] = UUID(raw_id)
+            ping = _validated(
+                vehicle_id, _parse_time(item["recorded_at"]), float(item["latitude"]), float(item["longitude"]),
+                _optional(item.get("speed_kmh")), _optional(item.get("heading")), _optional(item.get("odometer_km")),
+                window
+            )
+        except (AttributeError, KeyError, TypeError, ValueError, OverflowError):
+            ping = None
+        if ping is not None:
+            pings.append(ping)
+    return pings, len(items) - len(pings)
+
+
+def _decode_binary(body: bytes, window: Tuple[datetime, datetime]) -> Tuple[List[TelemetryPing], int]:
+    if len(body) % RECORD.size:
+        raise ValueError(f"Binary telemetry length must be a multiple of {RECORD.size} bytes")
+    pings: List[TelemetryPing] = []
+    vehicle_ids: Dict[bytes, UUID] = {}
+    count = 0
+    for raw_id, milliseconds, latitude, longitude, speed, heading, odometer in RECORD.iter_unpack(body):
+        count += 1
+        vehicle_id = vehicle_ids.get(raw_id)
+        if vehicle_id is None:
+            vehicle_id = vehicle_ids[raw_id] = UUID(bytes=raw_id)
+        try:
+            recorded_at = _EPOCH + timedelta(milliseconds=milliseconds)
+        except OverflowError:
+            continue
+        ping = _validated(
+            vehicle_id, recorded_at, latitude, longitude,
+            None if speed != speed else speed,
+            None if heading != heading else heading,
+            None if odometer != odometer else odometer,
+            window
+        )
+        if ping is not None:
+            pings.append(ping)
+    return pings, count - len(pings)
+
+
+def _validated(vehicle_id: UUID, recorded_at: datetime, latitude: float, longitude: float,
+               speed_kmh: Optional[float], heading: Optional[float], odometer_km: Optional[float],
+               window: Tuple[datetime, datetime]) -> Optional[TelemetryPing]:
+    # Сравнения с NaN ложны, поэтому NaN в координатах тоже отбрасывается
+    if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+        return None
+    # Слишком старые пинги тоже отбрасываются: каждый новый день - новая секция таблицы
+    if not window[0] <= recorded_at <= window[1]:
+        return None
+    if speed_kmh is not None and not 0.0 <= speed_kmh < math.inf:
+        return None
+    if odometer_km is not None and not 0.0 <= odometer_km < math.inf:
+        return None
+    if heading is not None:
+        if not math.isfinite(heading):
+            return None
+        heading %= 360.0
+    return TelemetryPing(vehicle_id, recorded_at, latitude, longitude, speed_kmh, heading, odometer_km)
+
+
+def _parse_time(value: Any) -> datetime:
+    # Время - строка ISO 8601 или миллисекунды от эпохи; хранится в UTC без часового пояса
+    if isinstance(value, str):
+        moment = datetime.fromisoformat(value)
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return _EPOCH + timedelta(milliseconds=value)
+    raise TypeError("recorded_at must be an ISO 8601 string or epoch milliseconds")
+
+
+def _optional(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
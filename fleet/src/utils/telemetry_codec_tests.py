@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+import orjson
+import pytest
+from entities.telemetry import TelemetryPing
+from utils import telemetry_codec
+
+NOW = datetime(2024, 1, 15, 12, 0)
+
+
+class TestTelemetryCodec:
+
+    @pytest.fixture
+    def f_pings(self):
+        vehicle_id = uuid4()
+        return [
+            TelemetryPing(vehicle_id, NOW - timedelta(seconds=10), 55.7558, 37.6173, 62.5, 90.0, 120345.5),
+            TelemetryPing(vehicle_id, NOW - timedelta(seconds=5), 55.7601, 37.6201),
+            TelemetryPing(uuid4(), NOW, 59.9343, 30.3351, 0.0, None, 5000.0),
+        ]
+
+    @staticmethod
+    def as_json(ping, recorded_at=None):
+        item = {key: value for key, value in ping._asdict().items() if value is not None}
+        item["vehicle_id"] = str(ping.vehicle_id)
+        item["recorded_at"] = recorded_at or ping.recorded_at.isoformat()
+        return item
+
+    def test_binary_round_trip(self, f_pings):
+        # Arrange
+        body = telemetry_codec.encode_binary(f_pings)
+
+        # Act
+        pings, rejected = telemetry_codec.decode(body, telemetry_codec.BINARY_CONTENT_TYPE, now=NOW)
+
+        # Assert
+        assert len(body) == len(f_pings) * telemetry_codec.RECORD.size
+        assert rejected == 0
+        # Скорость и курс в записи - float32
+        assert [(p.vehicle_id, p.recorded_at, p.latitude, p.longitude, p.odometer_km) for p in pings] == \
+            [(p.vehicle_id, p.recorded_at, p.latitude, p.longitude, p.odometer_km) for p in f_pings]
+        assert [p.speed_kmh for p in pings] == [62.5, None, 0.0]
+        assert [p.heading for p in pings] == [90.0, None, None]
+
+    def test_json_list_and_object(self, f_pings):
+        # Arrange
+        items = [self.as_json(ping) for ping in f_pings]
+
+        # Act
+        from_list = telemetry_codec.decode(orjson.dumps(items), "application/json", now=NOW)
+        from_object = telemetry_codec.decode(orjson.dumps({"pings": items}), "application/json; charset=utf-8", now=NOW)
+
+        # Assert
+        assert from_list == from_object == (f_pings, 0)
+
+    def test_ndjson_with_epoch_and_timezone(self, f_pings):
+        # Arrange
+        first, second, third = f_pings
+        lines = [
+            self.as_json(first, recorded_at=int((first.recorded_at - datetime(1970, 1, 1)).total_seconds() * 1000)),
+            self.as_json(second, recorded_at=(second.recorded_at + timedelta(hours=3)).isoformat() + "+03:00"),
+            self.as_json(third, recorded_at=third.recorded_at.isoformat() + "Z"),
+        ]
+        body = b"\n".join(orjson.dumps(line) for line in lines) + b"\n"
+
+        # Act
+        pings, rejected = telemetry_codec.decode(body, telemetry_codec.NDJSON_CONTENT_TYPE, now=NOW)
+
+        # Assert
+        assert (pings, rejected) == (f_pings, 0)
+
+    def test_invalid_pings_are_rejected(self, f_pings):
+        # Arrange
+        valid = self.as_json(f_pings[0])
+        items = [
+            valid,
+            {**valid, "vehicle_id": "not-a-uuid"},
+            {**valid, "latitude": 91.0},
+            {**valid, "speed_kmh": -5},
+            {**valid, "recorded_at": (NOW + timedelta(hours=1)).isoformat()},
+            {**valid, "recorded_at": (NOW - timedelta(days=30)).isoformat()},
+            {**valid, "recorded_at": "yesterday"},
+            {"vehicle_id": valid["vehicle_id"]},
+            "garbage",
+        ]
+
+        # Act
+        pings, rejected = telemetry_codec.decode(orjson.dumps(items), "application/json", now=NOW)
+
+        # Assert
+        assert pings == [f_pings[0]]
+        assert rejected == 8
+
+    def test_binary_older_than_max_age_is_rejected(self, f_pings):
+        # Arrange: пинг за 1970 год иначе создал бы секцию на каждый день с эпохи
+        stale = f_pings[0]._replace(recorded_at=NOW - timedelta(hours=2))
+        body = telemetry_codec.encode_binary([stale, f_pings[2]])
+
+        # Act
+        pings, rejected = telemetry_codec.decode(body, telemetry_codec.BINARY_CONTENT_TYPE, now=NOW,
+                                                 max_age_seconds=3600.0)
+
+        # Assert
+        assert pings == [f_pings[2]]
+        assert rejected == 1
+
+    def test_binary_out_of_range_is_rejected(self, f_pings):
+        # Arrange
+        bad = f_pings[0]._replace(longitude=200.0)
+        body = telemetry_codec.encode_binary([bad, f_pings[2]])
+
+        # Act
+        pings, rejected = telemetry_codec.decode(body, telemetry_codec.BINARY_CONTENT_TYPE, now=NOW)
+
+        # Assert
+        assert [ping.vehicle_id for ping in pings] == [f_pings[2].vehicle_id]
+        assert rejected == 1
+
+    @pytest.mark.parametrize("body, content_type", [
+        (b"{not json", "application/json"),
+        (b'{"items": []}', "application/json"),
+        (b"\x00" * 10, telemetry_codec.BINARY_CONTENT_TYPE),
+        (b"[]", "text/csv"),
+    ])
+    def test_malformed_body_raises(self, body, content_type):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            telemetry_codec.decode(body, content_type, now=NOW)
@@ -0,0 +1,321 @@
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from shared.utils.geo import Coordinates, haversine_km
+
+DEPOT = 0
+
+
+class VrpStop(NamedTuple):
+    coordinates: Coordinates
+    weight: float
+    volume: float
+    # Окно прибытия в минутах от начала плана; math.inf - без ограничения
+    earliest: float = 0.0
+    latest: float = math.inf
+    service_minutes: float = 0.0
+
+
+class VrpVehicle(NamedTuple):
+    capacity_weight: float
+    capacity_volume: float
+
+
+class VrpSolution(NamedTuple):
+    # routes[k] - индексы остановок в порядке объезда для машины k (пустой список - машина не нужна)
+    routes: List[List[int]]
+    unassigned: List[int]
+
+
+class DistanceMatrix:
+    """Road distances between the depot (node 0) and stops (nodes 1..n), cached.
+
+    Up to ``precompute_limit`` nodes the full matrix is built up front; for
+    larger problems a pair is computed on first use, so memory follows the
+    pairs the solver actually looks at rather than n².
+    """
+
+    def __init__(self, points: Sequence[Coordinates], road_factor: float = 1.0, precompute_limit: int = 1000):
+        self.points = list(points)
+        self.road_factor = road_factor
+        self._size = len(self.points)
+        self._cache: Dict[int, float] = {}
+        self._full: Optional[List[List[float]]] = None
+        if self._size <= precompute_limit:
+            self._full = [[self._compute(i, j) for j in range(self._size)] for i in range(self._size)]
+
+    def __call__(self, i: int, j: int) -> float:
+        if self._full is not None:
+            return self._full[i][j]
+        if i == j:
+            return 0.0
+        key = i * self._size + j if i < j else j * self._size + i
+        distance = self._cache.get(key)
+        if distance is None:
+            distance = self._cache[key] = self._compute(i, j)
+        return distance
+
+    def _compute(self, i: int, j: int) -> float:
+        return haversine_km(self.points[i], self.points[j]) * self.road_factor
+
+
+class VrpSolver:
+    """Capacitated VRP with time windows for one depot and a heterogeneous fleet.
+
+    Routes are built by Clarke-Wright savings (for large problems only over
+    the ``neighbours`` nearest stops of each stop), sized for the largest
+    vehicle, given to vehicles best-fit by load, then shortened by 2-opt and
+    or-opt moves while the time budget lasts. Every move keeps capacity, time
+    windows and ``max_route_minutes``. Stops that fit no route are returned
+    as unassigned.
+    """
+
+    def __init__(self, depot: Coordinates, stops: Sequence[VrpStop], vehicles: Sequence[VrpVehicle],
+                 speed_kmh: float, road_factor: float = 1.0, max_route_minutes: float = math.inf,
+                 neighbours: int = 30, all_pairs_limit: int = 1000):
+        self.stops = list(stops)
+        self.vehicles = list(vehicles)
+        self.matrix = DistanceMatrix([depot] + [stop.coordinates for stop in self.stops], road_factor,
+                                     precompute_limit=all_pairs_limit)
+        self.minutes_per_km = 60.0 / speed_kmh
+        self.max_route_minutes = max_route_minutes
+        self.neighbours = neighbours
+        self.all_pairs_limit = all_pairs_limit
+
+    def solve(self, time_budget_seconds: float = 2.0) -> VrpSolution:
+        deadline = time.monotonic() + time_budget_seconds
+        solution = self._assign(*self._savings())
+        # Улучшаются уже назначенные маршруты, включая части разрезанных под меньшие машины.
+        # Маршруты без улучшения тоже допустимы: бюджет ограничивает только локальный поиск
+        routes = [self._improve(route, deadline) if route and time.monotonic() < deadline else route
+                  for route in solution.routes]
+        return VrpSolution(routes, solution.unassigned)
+
+    def schedule(self, route: Sequence[int]) -> Optional[Tuple[List[float], float]]:
+        """Arrival minute at each stop of ``route`` and the return to depot, None if infeasible"""
+        return self._schedule([index + 1 for index in route])
+
+    def route_distance(self, route: Sequence[int]) -> float:
+        nodes = [DEPOT, *(index + 1 for index in route), DEPOT]
+        return sum(self.matrix(a, b) for a, b in zip(nodes, nodes[1:]))
+
+    def _schedule(self, nodes: Iterable[int]) -> Optional[Tuple[List[float], float]]:
+        # Снаружи остановки нумеруются с 0, в матрице 0 - депо
+        arrivals = []
+        elapsed, previous = 0.0, DEPOT
+        for node in nodes:
+            stop = self.stops[node - 1]
+            elapsed += self.matrix(previous, node) * self.minutes_per_km
+            if elapsed < stop.earliest:
+                elapsed = stop.earliest
+            if elapsed > stop.latest:
+                return None
+            arrivals.append(elapsed)
+            elapsed += stop.service_minutes
+            previous = node
+        elapsed += self.matrix(previous, DEPOT) * self.minutes_per_km
+        if elapsed > self.max_route_minutes:
+            return None
+        return arrivals, elapsed
+
+    def _feasible(self, nodes: List[int]) -> bool:
+        return self._schedule(nodes) is not None
+
+    def _savings(self) -> Tuple[List[List[int]], List[int]]:
+        capacity_weight = max(vehicle.capacity_weight for vehicle in self.vehicles)
+        capacity_volume = max(vehicle.capacity_volume for vehicle in self.vehicles)
+        routes: Dict[int, List[int]] = {}
+        route_of: Dict[int, int] = {}
+        loads: Dict[int, Tuple[float, float]] = {}
+        unassigned = []
+        for node, stop in enumerate(self.stops, start=1):
+            if stop.weight > capacity_weight or stop.volume > capacity_volume or not self._feasible([node]):
+                unassigned.append(node - 1)
+                continue
+            routes[node], route_of[node], loads[node] = [node], node, (stop.weight, stop.volume)
+
+        d = self.matrix
+        savings = sorted(
+            ((d(DEPOT, i) + d(DEPOT, j) - d(i, j), i, j) for i, j in self._candidate_pairs() if i in route_of and j in route_of),
+            reverse=True
+        )
+        for saving, i, j in savings:
+            if saving <= 0:
+                break
+            first, second = route_of[i], route_of[j]
+            if first == second:
+                continue
+            weight, volume = loads[first][0] + loads[second][0], loads[first][1] + loads[second][1]
+            if weight > capacity_weight or volume > capacity_volume:
+                continue
+            merged = self._merge(routes[first], routes[second], i, j)
+            if merged is None:
+                continue
+            for node in routes.pop(second):
+                route_of[node] = first
+            del loads[second]
+            routes[first], loads[first] = merged, (weight, volume)
+        return [[node - 1 for node in route] for route in routes.values()], unassigned
+
+    def _merge(self, first: List[int], second: List[int], i: int, j: int) -> Optional[List[int]]:
+        # i и j должны оказаться соседями: оба на концах своих маршрутов
+        candidates = []
+        if first[-1] == i and second[0] == j:
+            candidates.append(first + second)
+        if first[0] == i and second[-1] == j:
+            candidates.append(second + first)
+        if first[-1] == i and second[-1] == j:
+            candidates.append(first + second[::-1])
+        if first[0] == i and second[0] == j:
+            candidates.append(second[::-1] + first)
+        for merged in candidates:
+            if self._feasible(merged):
+                return merged
+        return None
+
+    def _candidate_pairs(self) -> Iterable[Tuple[int, int]]:
+        count = len(self.stops)
+        if count <= self.all_pairs_limit:
+            return itertools.combinations(range(1, count + 1), 2)
+        return self._neighbour_pairs()
+
+    def _neighbour_pairs(self) -> Set[Tuple[int, int]]:
+        """Pairs of each stop with its nearest stops, found through a uniform grid"""
+        points = self.matrix.points
+        latitudes = [points[node][0] for node in range(1, len(points))]
+        scale = math.cos(math.radians(sum(latitudes) / len(latitudes)))
+        coordinates = [(point[0], point[1] * scale) for point in points]
+        min_x = min(x for x, _ in coordinates[1:])
+        min_y = min(y for _, y in coordinates[1:])
+        span = max(max(x for x, _ in coordinates[1:]) - min_x, max(y for _, y in coordinates[1:]) - min_y, 1e-9)
+        # Около четырех остановок на ячейку
+        cells_per_side = max(1, int(math.sqrt(len(self.stops) / 4)))
+        cell = span / cells_per_side
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for node in range(1, len(points)):
+            x, y = coordinates[node]
+            grid.setdefault((int((x - min_x) / cell), int((y - min_y) / cell)), []).append(node)
+
+        pairs: Set[Tuple[int, int]] = set()
+        for node in range(1, len(points)):
+            x, y = coordinates[node]
+            cx, cy = int((x - min_x) / cell), int((y - min_y) / cell)
+            found: List[int] = []
+            ring = 0
+            while len(found) <= self.neighbours and ring <= cells_per_side:
+                found.extend(self._ring(grid, cx, cy, ring))
+                ring += 1
+            # Еще одно кольцо: ближайшие соседи могут лежать сразу за границей уже просмотренных ячеек
+            found.extend(self._ring(grid, cx, cy, ring))
+            nearest = heapq.nsmallest(self.neighbours, (other for other in found if other != node),
+                                      key=lambda other: self.matrix(node, other))
+            pairs.update((min(node, other), max(node, other)) for other in nearest)
+        return pairs
+
+    @staticmethod
+    def _ring(grid: Dict[Tuple[int, int], List[int]], cx: int, cy: int, ring: int) -> List[int]:
+        if ring == 0:
+            return list(grid.get((cx, cy), ()))
+        nodes = []
+        for dx in range(-ring, ring + 1):
+            for dy in (-ring, ring) if abs(dx) != ring else range(-ring, ring + 1):
+                nodes.extend(grid.get((cx + dx, cy + dy), ()))
+        return nodes
+
+    def _improve(self, route: List[int], deadline: float) -> List[int]:
+        nodes = [index + 1 for index in route]
+        while time.monotonic() < deadline:
+            candidate = self._two_opt(nodes, deadline) or self._or_opt(nodes, deadline)
+            if candidate is None:
+                break
+            nodes = candidate
+        return [node - 1 for node in nodes]
+
+    def _two_opt(self, nodes: List[int], deadline: float) -> Optional[List[int]]:
+        """First improving feasible reversal of a segment"""
+        d = self.matrix
+        size = len(nodes)
+        for i in range(size - 1):
+            if time.monotonic() >= deadline:
+                return None
+            before = nodes[i - 1] if i > 0 else DEPOT
+            for j in range(i + 1, size):
+                after = nodes[j + 1] if j + 1 < size else DEPOT
+                delta = d(before, nodes[j]) + d(nodes[i], after) - d(before, nodes[i]) - d(nodes[j], after)
+                if delta < -1e-9:
+                    candidate = nodes[:i] + nodes[i:j + 1][::-1] + nodes[j + 1:]
+                    if self._feasible(candidate):
+                        return candidate
+        return None
+
+    def _or_opt(self, nodes: List[int], deadline: float) -> Optional[List[int]]:
+        """First improving feasible move of a segment of 1-3 stops to another position"""
+        d = self.matrix
+        size = len(nodes)
+        for length in (1, 2, 3):
+            for i in range(size - length + 1):
+                if time.monotonic() >= deadline:
+                    return None
+                segment = nodes[i:i + length]
+                before = nodes[i - 1] if i > 0 else DEPOT
+                after = nodes[i + length] if i + length < size else DEPOT
+                gain = d(before, segment[0]) + d(segment[-1], after) - d(before, after)
+                rest = nodes[:i] + nodes[i + length:]
+                for position in range(len(rest) + 1):
+                    if position == i:
+                        continue
+                    left = rest[position - 1] if position > 0 else DEPOT
+                    right = rest[position] if position < len(rest) else DEPOT
+                    if d(left, segment[0]) + d(segment[-1], right) - d(left, right) < gain - 1e-9:
+                        candidate = rest[:position] + segment + rest[position:]
+                        if self._feasible(candidate):
+                            return candidate
+        return None
+
+    def _assign(self, routes: List[List[int]], unassigned: List[int]) -> VrpSolution:
+        """Best fit: heaviest routes first, each to the smallest free vehicle that carries it.
+
+        Routes were sized for the largest vehicle; those left without one are
+        cut into consecutive pieces for the remaining vehicles, largest first.
+        A piece of a feasible route stays feasible: skipping stops never makes
+        later arrivals later.
+        """
+        def load(route: List[int]) -> Tuple[float, float]:
+            return sum(self.stops[i].weight for i in route), sum(self.stops[i].volume for i in route)
+
+        free = sorted(range(len(self.vehicles)),
+                      key=lambda k: (self.vehicles[k].capacity_weight, self.vehicles[k].capacity_volume))
+        assigned: List[List[int]] = [[] for _ in self.vehicles]
+        leftovers = []
+        for route in sorted(routes, key=load, reverse=True):
+            weight, volume = load(route)
+            vehicle = next((k for k in free if self.vehicles[k].capacity_weight >= weight
+                            and self.vehicles[k].capacity_volume >= volume), None)
+            if vehicle is None:
+                leftovers.append(route)
+                continue
+            free.remove(vehicle)
+            assigned[vehicle] = route
+
+        for route in leftovers:
+            position = 0
+            while position < len(route) and free:
+                vehicle = free.pop()
+                capacity = self.vehicles[vehicle]
+                weight = volume = 0.0
+                end = position
+                while end < len(route):
+                    stop = self.stops[route[end]]
+                    if weight + stop.weight > capacity.capacity_weight or volume + stop.volume > capacity.capacity_volume:
+                        break
+                    weight, volume, end = weight + stop.weight, volume + stop.volume, end + 1
+                if end == position:
+                    # Даже первая остановка не помещается в самую большую свободную машину
+                    free.append(vehicle)
+                    break
+                assigned[vehicle] = route[position:end]
+                position = end
+            unassigned.extend(route[position:])
+        return VrpSolution(assigned, sorted(unassigned))
@@ -0,0 +1,116 @@
+import math
+import random
+import pytest
+from utils.vrp_solver import DistanceMatrix, VrpSolver, VrpStop, VrpVehicle
+
+DEPOT = (55.0, 37.0)
+
+
+def stop(lat, lon, weight=1.0, **kwargs):
+    return VrpStop((lat, lon), weight, 1.0, **kwargs)
+
+
+def served(solution):
+    return sorted(index for route in solution.routes for index in route)
+
+
+class TestDistanceMatrix:
+
+    @pytest.mark.parametrize("precompute_limit", [0, 10])
+    def test_symmetric_with_zero_diagonal(self, precompute_limit):
+        # Arrange
+        matrix = DistanceMatrix([(55.0, 37.0), (55.1, 37.2), (54.9, 36.8)], road_factor=1.3,
+                                precompute_limit=precompute_limit)
+
+        # Act / Assert
+        assert matrix(1, 1) == 0
+        assert matrix(1, 2) == matrix(2, 1) > 0
+        assert matrix(0, 1) == pytest.approx(DistanceMatrix([(55.0, 37.0), (55.1, 37.2)])(0, 1) * 1.3)
+
+
+class TestVrpSolver:
+
+    def test_capacity_splits_routes(self):
+        # Arrange: четыре остановки по 6 т, машины по 12 т
+        stops = [stop(55.1, 37.0, 6000), stop(55.1, 37.1, 6000), stop(54.9, 37.0, 6000), stop(54.9, 36.9, 6000)]
+        solver = VrpSolver(DEPOT, stops, [VrpVehicle(12000, 80)] * 3, speed_kmh=60)
+
+        # Act
+        solution = solver.solve(time_budget_seconds=1)
+
+        # Assert
+        routes = [route for route in solution.routes if route]
+        assert len(routes) == 2
+        assert sorted(sorted(route) for route in routes) == [[0, 1], [2, 3]]
+        assert solution.unassigned == []
+
+    def test_time_windows_are_kept(self):
+        # Arrange: дальняя остановка должна быть посещена первой
+        stops = [stop(55.05, 37.3), stop(55.5, 37.0, latest=40)]
+        solver = VrpSolver(DEPOT, stops, [VrpVehicle(1000, 10)], speed_kmh=100)
+
+        # Act
+        solution = solver.solve(time_budget_seconds=1)
+
+        # Assert
+        assert solution.routes == [[1, 0]]
+        arrivals, _ = solver.schedule([1, 0])
+        assert arrivals[0] <= 40
+
+    def test_local_search_finds_circle_tour(self):
+        # Arrange: точки на окружности вокруг склада в случайном порядке
+        rng = random.Random(3)
+        angles = [i * 2 * math.pi / 12 for i in range(12)]
+        rng.shuffle(angles)
+        stops = [stop(55 + 0.3 * math.cos(angle), 37 + 0.5 * math.sin(angle)) for angle in angles]
+        solver = VrpSolver(DEPOT, stops, [VrpVehicle(1000, 100)], speed_kmh=60)
+        around = sorted(range(12), key=lambda i: angles[i])
+        best = min(solver.route_distance(around[k:] + around[:k]) for k in range(12))
+
+        # Act
+        route = solver.solve(time_budget_seconds=1).routes[0]
+
+        # Assert: объезд по кругу без пересечений
+        assert solver.route_distance(route) == pytest.approx(best, rel=1e-3)
+
+    def test_unfit_stops_are_unassigned(self):
+        # Arrange
+        stops = [stop(55.1, 37.0, 500), stop(55.2, 37.0, 50000), stop(55.3, 37.0, latest=1)]
+        solver = VrpSolver(DEPOT, stops, [VrpVehicle(1000, 10)], speed_kmh=60)
+
+        # Act
+        solution = solver.solve(time_budget_seconds=1)
+
+        # Assert
+        assert solution.routes == [[0]]
+        assert solution.unassigned == [1, 2]
+
+    def test_routes_are_split_for_smaller_vehicles(self):
+        # Arrange: маршрут рассчитан на 20 т, но такая машина одна
+        stops = [stop(55.1 + 0.01 * i, 37.0, 2500) for i in range(12)]
+        vehicles = [VrpVehicle(20000, 80), VrpVehicle(5000, 20), VrpVehicle(5000, 20), VrpVehicle(5000, 20)]
+        solver = VrpSolver(DEPOT, stops, vehicles, speed_kmh=60)
+
+        # Act
+        solution = solver.solve(time_budget_seconds=1)
+
+        # Assert
+        assert served(solution) == list(range(12))
+        for vehicle, route in zip(vehicles, solution.routes):
+            assert sum(stops[i].weight for i in route) <= vehicle.capacity_weight
+
+    def test_neighbour_savings_on_large_problem(self):
+        # Arrange: all_pairs_limit ниже числа остановок - кандидаты берутся из сетки соседей
+        rng = random.Random(7)
+        stops = [stop(55 + rng.uniform(-0.3, 0.3), 37 + rng.uniform(-0.5, 0.5), 100, service_minutes=5)
+                 for _ in range(300)]
+        solver = VrpSolver(DEPOT, stops, [VrpVehicle(3000, 100)] * 20, speed_kmh=40, max_route_minutes=600,
+                           neighbours=10, all_pairs_limit=50)
+
+        # Act
+        solution = solver.solve(time_budget_seconds=2)
+
+        # Assert
+        assert sorted(served(solution) + solution.unassigned) == list(range(300))
+        assert all(solver.schedule(route) is not None for route in solution.routes if route)
+        assert len([route for route in solution.routes if route]) <= 20
@@ -1,9 +1,10 @@
 import pytest
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from config.database import SessionLocal, create_tables
+from config.database import SessionLocal, create_tables, engine
 from entities.database_models import Base
 from repositories.order_repository import OrderRepository
+from shared.utils.query_counter import QueryCounter
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -20,6 +21,12 @@ def f_db_session() -> Session:
         session.close()
 
 
+@pytest.fixture
+def f_query_counter() -> QueryCounter:
+    """SQL statements sent to the database; enter it around the code under test"""
+    return QueryCounter(engine)
+
+
 @pytest.fixture
 def f_order_repository(f_db_session: Session) -> OrderRepository:
     return OrderRepository(f_db_session)
@@ -29,7 +36,7 @@ def f_order_repository(f_db_session: Session) -> OrderRepository:
 def f_clean_db(f_db_session: Session) -> None:
     """Clean database before each test"""
     try:
-        f_db_session.execute(text("TRUNCATE TABLE orders RESTART IDENTITY CASCADE"))
+        f_db_session.execute(text("TRUNCATE TABLE orders, processed_events, order_counters RESTART IDENTITY CASCADE"))
         f_db_session.commit()
     except Exception:
         # If tables don't exist yet, ignore the error
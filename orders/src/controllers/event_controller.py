@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from typing import Optional
+
+from shared.events.dead_letters import DeadLetterReplayer
+from shared.events.dedup import EventDeduplicator
+from shared.events.subscriber import Subscriber
+from config.settings import get_settings
+from utils.auth_utils import require_any_role
+from utils.order_status_hub import OrderStatusHub
+
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def get_subscriber(request: Request) -> Subscriber:
+    return request.app.state.subscriber
+
+
+def get_event_deduplicator(request: Request) -> EventDeduplicator:
+    return request.app.state.event_deduplicator
+
+
+def get_order_status_hub(request: Request) -> OrderStatusHub:
+    return request.app.state.order_status_hub
+
+
+def get_dead_letter_replayer() -> DeadLetterReplayer:
+    settings = get_settings()
+    return DeadLetterReplayer(
+        host=settings.rabbitmq_host,
+        port=settings.rabbitmq_port,
+        username=settings.rabbitmq_user,
+        password=settings.rabbitmq_password
+    )
+
+
+@router.get("/stats")
+def get_event_stats(
+    subscriber: Subscriber = Depends(get_subscriber),
+    deduplicator: EventDeduplicator = Depends(get_event_deduplicator),
+    hub: OrderStatusHub = Depends(get_order_status_hub),
+    current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
+):
+    return {
+        "deduplication": deduplicator.get_stats(),
+        "delivery": subscriber.get_stats(),
+        "status_stream": hub.get_stats()
+    }
+
+
+@router.get("/dead-letters/{event_type}")
+def get_dead_letters_count(
+    event_type: str,
+    subscriber: Subscriber = Depends(get_subscriber),
+    replayer: DeadLetterReplayer = Depends(get_dead_letter_replayer),
+    current_user: dict = Depends(require_any_role(["admin"]))
+):
+    if event_type not in subscriber.handlers:
+        raise HTTPException(status_code=404, detail="Event type is not consumed by this service")
+    try:
+        return {"event_type": event_type, "count": replayer.count(event_type)}
+    finally:
+        replayer.disconnect()
+
+
+@router.post("/dead-letters/{event_type}/replay")
+def replay_dead_letters(
+    event_type: str,
+    limit: Optional[int] = Query(None, ge=1),
+    subscriber: Subscriber = Depends(get_subscriber),
+    replayer: DeadLetterReplayer = Depends(get_dead_letter_replayer),
+    current_user: dict = Depends(require_any_role(["admin"]))
+):
+    if event_type not in subscriber.handlers:
+        raise HTTPException(status_code=404, detail="Event type is not consumed by this service")
+    try:
+        return {"event_type": event_type, "replayed": replayer.replay(event_type, limit)}
+    finally:
+        replayer.disconnect()
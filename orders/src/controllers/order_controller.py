@@ -1,8 +1,15 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Request
-from typing import List
-from entities.order import Order, OrderCreate, OrderUpdate, OrderStatus
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Tuple
+import asyncio
+import math
+from entities.order import Order, OrderCreate, OrderUpdate, OrderStatus, OrderStats
+from entities.quote import Quote, QuoteRequest, QuoteResponse
+from repositories.interfaces.order_repository import OrderConflictError
 from repositories.order_repository import OrderRepository
-from config.database import get_db
+from repositories.order_stats_repository import OrderStatsRepository
+from config.database import get_db, SessionLocal
 from sqlalchemy.orm import Session
 from use_cases.create_order_use_case import CreateOrderUseCase, CreateOrderRequest
 from use_cases.assign_vehicle_use_case import AssignVehicleUseCase, AssignVehicleRequest
@@ -10,7 +17,11 @@ from use_cases.change_order_status_use_case import ChangeOrderStatusUseCase, Cha
 from use_cases.order_event_service import OrderEventService
 from utils.fleet_service_client import FleetServiceClient
 from utils.warehouse_service_client import WarehouseServiceClient
+from utils.order_status_hub import OrderStatusHub
+from utils.pricing_engine import CargoQuote, PricingEngine, VehicleQuote
 from shared.events.publisher import Publisher
+from shared.utils.mapping import partial_model
+from shared.utils.responses import fields_parameter, trusted_response
 from config.settings import get_settings
 from utils.auth_utils import get_current_user, require_any_role
 
@@ -19,6 +30,9 @@ router = APIRouter()
 def get_order_repository(db: Session = Depends(get_db)) -> OrderRepository:
     return OrderRepository(db)
 
+def get_order_stats_repository(db: Session = Depends(get_db)) -> OrderStatsRepository:
+    return OrderStatsRepository(db)
+
 def get_fleet_service_client() -> FleetServiceClient:
     return FleetServiceClient()
 
@@ -32,37 +46,128 @@ def get_publisher(request: Request) -> Publisher:
 def get_order_event_service(request: Request) -> OrderEventService:
     return request.app.state.order_event_service
 
+def get_order_status_hub(request: Request) -> OrderStatusHub:
+    return request.app.state.order_status_hub
+
+def get_pricing_engine(request: Request) -> PricingEngine:
+    return request.app.state.pricing_engine
+
+def _execute_status_change(use_case: ChangeOrderStatusUseCase, request: ChangeOrderStatusRequest) -> Order:
+    try:
+        return use_case.execute(request)
+    except OrderConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+def _get_order_customer_email(order_id: str) -> Optional[str]:
+    # Короткая сессия: соединение не должно удерживаться на время всего стрима
+    with SessionLocal() as db:
+        order = OrderRepository(db).get_by_id(order_id)
+        return order.customer_email if order else None
+
 @router.post("/orders", response_model=Order, status_code=status.HTTP_201_CREATED)
 def create_order(
     request: dict, 
     repo: OrderRepository = Depends(get_order_repository), 
     warehouse_client: WarehouseServiceClient = Depends(get_warehouse_service_client), 
     order_event_service: OrderEventService = Depends(get_order_event_service),
+    pricing_engine: PricingEngine = Depends(get_pricing_engine),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher", "driver"]))
 ):
-    use_case = CreateOrderUseCase(repo, order_event_service, warehouse_client)
+    use_case = CreateOrderUseCase(repo, order_event_service, warehouse_client, pricing_engine)
     try:
         return use_case.execute(CreateOrderRequest(**request))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/orders/stats", response_model=OrderStats)
+def get_order_stats(
+    customers_limit: int = 100,
+    stats_repo: OrderStatsRepository = Depends(get_order_stats_repository),
+    current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
+):
+    return stats_repo.get_stats(customers_limit)
+
+@router.post("/orders/quotes", response_model=QuoteResponse)
+def quote_orders(
+    request: QuoteRequest,
+    pricing_engine: PricingEngine = Depends(get_pricing_engine),
+    current_user: dict = Depends(require_any_role(["admin", "dispatcher", "client"]))
+):
+    pairs = len(request.orders) * max(len(request.vehicles), 1)
+    if pairs > get_settings().pricing_max_quote_pairs:
+        raise HTTPException(status_code=400, detail=f"Too many order/vehicle pairs: {pairs}")
+    matrix = pricing_engine.quote_many(
+        [CargoQuote(item.pickup_address, item.delivery_address, item.cargo_type, item.cargo_weight, item.cargo_volume)
+         for item in request.orders],
+        [VehicleQuote(vehicle.fuel_efficiency, vehicle.capacity_weight or math.inf, vehicle.capacity_volume or math.inf)
+         for vehicle in request.vehicles]
+    )
+    quotes = [
+        Quote.model_construct(distance_km=distance, estimated_cost=cost, vehicle_costs=vehicle_costs)
+        for distance, cost, vehicle_costs in zip(*matrix)
+    ]
+    return trusted_response(QuoteResponse, QuoteResponse.model_construct(quotes=quotes))
+
+@router.get("/orders/status-stream")
+async def stream_order_statuses(
+    request: Request,
+    order_id: Optional[str] = None,
+    customer_email: Optional[str] = None,
+    hub: OrderStatusHub = Depends(get_order_status_hub),
+    current_user: dict = Depends(require_any_role(["admin", "dispatcher", "driver", "client"]))
+):
+    """Server-Sent Events stream of order status changes"""
+    if current_user.get("role") == "client":
+        # Клиент видит только свои заказы
+        own_email = current_user.get("email")
+        if customer_email and customer_email != own_email:
+            raise HTTPException(status_code=403, detail="Not enough permissions")
+        if order_id:
+            if await run_in_threadpool(_get_order_customer_email, order_id) != own_email:
+                raise HTTPException(status_code=404, detail="Order not found")
+        else:
+            customer_email = own_email
+
+    settings = get_settings()
+    subscription = hub.subscribe(order_id=order_id, customer_email=customer_email)
+
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(),
+                                                     timeout=settings.status_stream_keepalive_seconds)
+                    yield b"event: status_changed\ndata: " + message + b"\n\n"
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/orders/{order_id}", response_model=Order)
 def get_order(
     order_id: str, 
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(Order)),
     repo: OrderRepository = Depends(get_order_repository),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher", "driver", "client"]))
 ):
-    order = repo.get_by_id(order_id)
+    order = repo.get_by_id(order_id, fields=fields)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return order
+    return trusted_response(partial_model(Order, fields), order)
 
 @router.get("/orders", response_model=List[Order])
 def list_orders(
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(Order)),
     repo: OrderRepository = Depends(get_order_repository),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher", "driver"]))
 ):
-    return repo.get_all()
+    return trusted_response(List[partial_model(Order, fields)], repo.get_all(fields=fields))
 
 @router.put("/orders/{order_id}", response_model=Order)
 def update_order(
@@ -71,7 +176,10 @@ def update_order(
     repo: OrderRepository = Depends(get_order_repository),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
 ):
-    order = repo.update(order_id, update)
+    try:
+        order = repo.update(order_id, update)
+    except OrderConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
@@ -96,11 +204,15 @@ def assign_vehicle(
     fleet_client: FleetServiceClient = Depends(get_fleet_service_client), 
     warehouse_client: WarehouseServiceClient = Depends(get_warehouse_service_client), 
     publisher: Publisher = Depends(get_publisher),
+    pricing_engine: PricingEngine = Depends(get_pricing_engine),
     current_user: dict = Depends(require_any_role(["admin", "dispatcher"]))
 ):
-    use_case = AssignVehicleUseCase(repo, fleet_client, warehouse_client, publisher)
+    use_case = AssignVehicleUseCase(repo, fleet_client, warehouse_client, publisher, pricing_engine)
     req = AssignVehicleRequest(order_id=order_id, vehicle_id=data["vehicle_id"], cargo_id=data.get("cargo_id"))
-    return use_case.execute(req)
+    try:
+        return use_case.execute(req)
+    except OrderConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 # --- Status Management ---
 @router.put("/orders/{order_id}/status", response_model=Order)
@@ -114,7 +226,7 @@ def change_status(
 ):
     use_case = ChangeOrderStatusUseCase(repo, warehouse_client, publisher)
     req = ChangeOrderStatusRequest(order_id=order_id, new_status=data["new_status"], cargo_id=data.get("cargo_id"))
-    return use_case.execute(req)
+    return _execute_status_change(use_case, req)
 
 @router.post("/orders/{order_id}/complete-delivery", response_model=Order)
 def complete_delivery(
@@ -128,7 +240,7 @@ def complete_delivery(
     use_case = ChangeOrderStatusUseCase(repo, warehouse_client, publisher)
     cargo_id = data["cargo_id"] if data and "cargo_id" in data else None
     req = ChangeOrderStatusRequest(order_id=order_id, new_status=OrderStatus.DELIVERED, cargo_id=cargo_id)
-    return use_case.execute(req)
+    return _execute_status_change(use_case, req)
 
 @router.post("/orders/{order_id}/cancel", response_model=Order)
 def cancel_order(
@@ -139,4 +251,4 @@ def cancel_order(
 ):
     use_case = ChangeOrderStatusUseCase(repo, publisher=publisher)
     req = ChangeOrderStatusRequest(order_id=order_id, new_status=OrderStatus.CANCELLED)
-    return use_case.execute(req) 
\ No newline at end of file
+    return _execute_status_change(use_case, req) 
\ No newline at end of file
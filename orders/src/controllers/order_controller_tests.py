@@ -0,0 +1,92 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from config.settings import get_settings
+from controllers.order_controller import (
+    router, get_publisher, get_order_event_service, get_warehouse_service_client
+)
+from entities.order import OrderCreate, OrderStatus
+from repositories.order_repository import OrderRepository
+
+
+# Бюджет запросов к БД на эндпоинт: рост числа запросов ломает эти тесты
+
+
+@pytest.fixture
+def f_test_client():
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_publisher] = lambda: Mock()
+    app.dependency_overrides[get_order_event_service] = lambda: Mock()
+    app.dependency_overrides[get_warehouse_service_client] = lambda: Mock()
+    return TestClient(app)
+
+
+@pytest.fixture
+def f_headers():
+    settings = get_settings()
+    payload = {"sub": "test-user", "role": "admin", "exp": datetime.utcnow() + timedelta(hours=1)}
+    return {"Authorization": f"Bearer {jwt.encode(payload, settings.secret_key, algorithm='HS256')}"}
+
+
+@pytest.fixture
+def f_order(f_order_repository: OrderRepository):
+    return f_order_repository.create(OrderCreate(
+        customer_name="John Doe",
+        customer_email="john@example.com",
+        customer_phone="+1234567890",
+        pickup_address="123 Pickup St, City",
+        delivery_address="456 Delivery Ave, City",
+        cargo_type="electronics",
+        cargo_weight=100.0,
+        cargo_volume=2.0
+    ))
+
+
+def test_create_order_query_budget(f_test_client, f_headers, f_query_counter):
+    # Act
+    with f_query_counter:
+        response = f_test_client.post("/orders", headers=f_headers, json={
+            "customer_name": "John Doe",
+            "customer_email": "john@example.com",
+            "customer_phone": "+1234567890",
+            "pickup_address": "123 Pickup St, City",
+            "delivery_address": "456 Delivery Ave, City",
+            "cargo_type": "electronics",
+            "cargo_weight": 100.0,
+            "cargo_volume": 2.0
+        })
+
+    # Assert: заказ и счетчики, без SELECT после commit
+    assert response.status_code == 201
+    assert f_query_counter.count_of("SELECT") == 0
+    assert f_query_counter.count == 2
+
+
+def test_change_status_query_budget(f_test_client, f_headers, f_query_counter, f_order):
+    # Act
+    with f_query_counter:
+        response = f_test_client.put(
+            f"/orders/{f_order.id}/status", headers=f_headers, json={"new_status": OrderStatus.ASSIGNED.value}
+        )
+
+    # Assert: одно чтение заказа и один условный UPDATE по статусу и версии
+    assert response.status_code == 200
+    assert response.json()["status"] == OrderStatus.ASSIGNED.value
+    assert f_query_counter.count_of("SELECT") == 1
+    assert f_query_counter.count_of("UPDATE") == 1
+    assert f_query_counter.count == 3
+
+
+def test_update_order_query_budget(f_test_client, f_headers, f_query_counter, f_order):
+    # Act
+    with f_query_counter:
+        response = f_test_client.put(f"/orders/{f_order.id}", headers=f_headers, json={"notes": "Leave at the door"})
+
+    # Assert
+    assert response.status_code == 200
+    assert f_query_counter.count_of("SELECT") == 1
+    assert f_query_counter.count_of("UPDATE") == 1
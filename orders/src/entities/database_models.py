@@ -31,4 +31,25 @@ class Order(Base):
     delivery_date = Column(DateTime, nullable=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = Column(Integer, default=1, nullable=False)
+
+    # Каждое изменение через ORM увеличивает version и проверяет его в WHERE,
+    # поэтому условные переходы статуса замечают и обычные обновления заказа
+    __mapper_args__ = {"version_id_col": version}
+
+class ProcessedEvent(Base):
+    __tablename__ = "processed_events"
+    
+    event_id = Column(String(36), primary_key=True)
+    event_type = Column(String(50), nullable=False)
+    processed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class OrderCounter(Base):
+    """Incrementally maintained counters for dashboards"""
+    __tablename__ = "order_counters"
+    
+    dimension = Column(String(20), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
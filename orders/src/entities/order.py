@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 from enum import Enum
 from uuid import UUID, uuid4
 from datetime import datetime
@@ -39,6 +39,7 @@ class Order(BaseEntity):
     pickup_date: Optional[datetime] = None
     delivery_date: Optional[datetime] = None
     notes: Optional[str] = None
+    version: int = 1
 
 
 class OrderCreate(BaseModel):
@@ -50,6 +51,7 @@ class OrderCreate(BaseModel):
     cargo_type: str = Field(..., min_length=1, max_length=50)
     cargo_weight: float = Field(..., gt=0)
     cargo_volume: float = Field(..., gt=0)
+    estimated_cost: Optional[float] = Field(None, gt=0)
     notes: Optional[str] = None
 
 
@@ -91,4 +93,10 @@ class OrderResponse(BaseModel):
     delivery_date: Optional[datetime]
     notes: Optional[str]
     created_at: datetime
-    updated_at: Optional[datetime] 
\ No newline at end of file
+    updated_at: Optional[datetime] 
+
+class OrderStats(BaseModel):
+    status_counts: Dict[str, int]
+    active_by_vehicle: Dict[str, int]
+    active_by_driver: Dict[str, int]
+    orders_by_customer: Dict[str, int]
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+
+class QuoteCargo(BaseModel):
+    pickup_address: str = Field(..., min_length=1)
+    delivery_address: str = Field(..., min_length=1)
+    cargo_type: str = Field(..., min_length=1, max_length=50)
+    cargo_weight: float = Field(..., gt=0)
+    cargo_volume: float = Field(..., gt=0)
+
+
+class QuoteVehicle(BaseModel):
+    id: Optional[str] = None
+    fuel_efficiency: float = Field(..., gt=0)
+    capacity_weight: Optional[float] = Field(None, gt=0)
+    capacity_volume: Optional[float] = Field(None, gt=0)
+
+
+class QuoteRequest(BaseModel):
+    orders: List[QuoteCargo] = Field(..., min_length=1)
+    vehicles: List[QuoteVehicle] = []
+
+
+class Quote(BaseModel):
+    distance_km: Optional[float]
+    estimated_cost: Optional[float]
+    # Цены по машинам в порядке запроса; None - груз не помещается или адрес не найден
+    vehicle_costs: List[Optional[float]]
+
+
+class QuoteResponse(BaseModel):
+    quotes: List[Quote]
@@ -1,18 +1,28 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqladmin import Admin, ModelView
 from config.settings import get_settings
 from config.logging import setup_logging
-from config.database import create_tables, engine
+from config.database import create_tables, engine, async_engine, replica_set
+from shared.utils.compression import CompressionMiddleware
+from shared.utils.database import get_pool_stats
+from shared.utils.geo import DEFAULT_GAZETTEER_PATH, Gazetteer
 import structlog
 from controllers.order_controller import router as order_router
+from controllers.event_controller import router as event_router
 from entities.database_models import Order as OrderModel
 from shared.events.publisher import Publisher
 from shared.events.subscriber import Subscriber
+from shared.events.dedup import EventDeduplicator
 from use_cases.order_event_service import OrderEventService
-from repositories.order_repository import OrderRepository
+from repositories.processed_event_repository import ProcessedEventRepository
+from repositories.order_stats_repository import OrderStatsRepository
 from sqlalchemy.orm import sessionmaker
 from utils.admin_auth import get_admin_auth
+from utils.auth_utils import revocation_list, jwks_client
+from utils.order_status_hub import OrderStatusHub
+from utils.pricing_engine import PricingEngine, load_tariff
 
 settings = get_settings()
 setup_logging(settings.log_level)
@@ -22,7 +32,17 @@ publisher = Publisher(
     port=settings.rabbitmq_port,
     username=settings.rabbitmq_user,
     password=settings.rabbitmq_password,
-    exchange=settings.rabbitmq_exchange
+    exchange=settings.rabbitmq_exchange,
+    content_type=settings.rabbitmq_content_type
+)
+
+# Create database session and repository
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+db_session = SessionLocal()
+event_deduplicator = EventDeduplicator(
+    # Отдельная сессия: проверки дубликатов не смешиваются с другими транзакциями
+    ProcessedEventRepository(SessionLocal()),
+    capacity=settings.event_dedup_cache_size
 )
 
 subscriber = Subscriber(
@@ -32,27 +52,37 @@ subscriber = Subscriber(
     password=settings.rabbitmq_password,
     exchange=settings.rabbitmq_exchange,
     queue="orders_queue",
-    routing_keys=["vehicle_assigned", "no_vehicle_available"]
+    routing_keys=["vehicle_assigned", "no_vehicle_available"],
+    deduplicator=event_deduplicator,
+    max_attempts=settings.event_max_attempts,
+    retry_base_delay_ms=settings.event_retry_base_delay_ms
 )
 
-# Create database session and repository
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-db_session = SessionLocal()
-order_repository = OrderRepository(db_session)
+order_status_hub = OrderStatusHub(queue_size=settings.status_stream_queue_size)
 
-order_event_service = OrderEventService(publisher, subscriber, order_repository)
+order_event_service = OrderEventService(publisher, subscriber, SessionLocal, order_status_hub)
+
+pricing_engine = PricingEngine(
+    Gazetteer(settings.pricing_gazetteer_path or DEFAULT_GAZETTEER_PATH,
+              cache_path=settings.pricing_address_cache_path or None),
+    tariff=load_tariff(settings.pricing_tariff_path),
+    road_factor=settings.pricing_road_factor
+)
 
 logger = structlog.get_logger()
 
 app = FastAPI(
     title=settings.app_name,
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=ORJSONResponse
 )
 
 app.state.publisher = publisher
 app.state.subscriber = subscriber
+app.state.event_deduplicator = event_deduplicator
 app.state.order_event_service = order_event_service
-app.state.order_repository = order_repository
+app.state.order_status_hub = order_status_hub
+app.state.pricing_engine = pricing_engine
 
 app.add_middleware(
     CORSMiddleware,
@@ -62,7 +92,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    encodings=settings.compression_encodings
+)
+
 app.include_router(order_router)
+app.include_router(event_router)
 
 class OrderAdmin(ModelView, model=OrderModel):
     name = "Order"
@@ -92,6 +129,14 @@ def startup_event():
     logger.info("Orders service starting up")
     create_tables()
     setup_admin(app, engine)
+    revocation_list.start(settings.token_revocation_sync_seconds)
+    if jwks_client is not None:
+        jwks_client.start(settings.jwks_refresh_seconds)
+    
+    # Заполняем счетчики дашборда, если таблица только что создана
+    order_stats_repository = OrderStatsRepository(db_session)
+    if order_stats_repository.is_empty():
+        order_stats_repository.rebuild()
     
     # Start event service
     try:
@@ -107,6 +152,9 @@ def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Orders Service")
+    revocation_list.stop()
+    if jwks_client is not None:
+        jwks_client.stop()
     try:
         subscriber.disconnect()
         publisher.disconnect()
@@ -123,4 +171,14 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "orders"} 
\ No newline at end of file
+    return {"status": "healthy", "service": "orders"}
+
+
+@app.get("/health/db")
+def database_pool_health():
+    # Загрузка пулов соединений: рост checked_out до capacity - признак исчерпания пула
+    return {
+        "sync": get_pool_stats(engine),
+        "async": get_pool_stats(async_engine),
+        "replicas": replica_set.get_stats() if replica_set else None
+    } 
\ No newline at end of file
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
 from uuid import UUID
-from entities.order import Order, OrderCreate, OrderUpdate
+from entities.order import Order, OrderCreate, OrderStatus, OrderUpdate
+
+
+class OrderConflictError(Exception):
+    """Raised when the order was changed by another writer since it was read"""
+    pass
 
 
 class OrderRepository(ABC):
@@ -10,11 +15,11 @@ class OrderRepository(ABC):
         pass
     
     @abstractmethod
-    def get_by_id(self, order_id: str) -> Optional[Order]:
+    def get_by_id(self, order_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Order]:
         pass
     
     @abstractmethod
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Order]:
+    def get_all(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Order]:
         pass
     
     @abstractmethod
@@ -31,4 +36,12 @@ class OrderRepository(ABC):
     
     @abstractmethod
     def get_by_customer_email(self, email: str) -> List[Order]:
-        pass 
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def transition_status(self, order: Order, new_status: OrderStatus, **values: Any) -> Optional[Order]:
+        """Move the order to new_status only if its status and version still match ``order``.
+
+        Returns None when the order is gone or was changed concurrently.
+        """
+        pass
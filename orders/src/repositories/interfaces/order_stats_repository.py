@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Tuple
+from entities.order import OrderStats
+
+
+class OrderStatsRepository(ABC):
+    @abstractmethod
+    def apply(self, deltas: Dict[Tuple[str, str], int]) -> None:
+        pass
+    
+    @abstractmethod
+    def get_stats(self, customers_limit: int = 100) -> OrderStats:
+        pass
+    
+    @abstractmethod
+    def is_empty(self) -> bool:
+        pass
+    
+    @abstractmethod
+    def rebuild(self) -> None:
+        pass
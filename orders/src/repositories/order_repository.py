@@ -1,13 +1,24 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
 from uuid import UUID
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from shared.utils.database import replica_read
+from shared.utils.mapping import RowMapper
 from entities.order import Order, OrderCreate, OrderUpdate, OrderStatus
-from repositories.interfaces.order_repository import OrderRepository as OrderRepositoryInterface
+from repositories.interfaces.order_repository import OrderConflictError, OrderRepository as OrderRepositoryInterface
+from repositories.order_stats_repository import OrderStatsRepository, counter_deltas, counter_keys, order_counter_keys
 from entities.database_models import Order as OrderModel
 
+order_mapper = RowMapper(Order)
+# Списки читаются строками колонок: без ORM объектов и identity map
+ORDER_COLUMNS = order_mapper.columns(OrderModel)
+
 class OrderRepository(OrderRepositoryInterface):
     def __init__(self, db: Session):
         self.db = db
+        self.stats_repository = OrderStatsRepository(db)
 
     def create(self, order_data: OrderCreate) -> Order:
         db_order = OrderModel(
@@ -19,67 +30,97 @@ class OrderRepository(OrderRepositoryInterface):
             cargo_type=order_data.cargo_type,
             cargo_weight=order_data.cargo_weight,
             cargo_volume=order_data.cargo_volume,
+            estimated_cost=order_data.estimated_cost,
             notes=order_data.notes,
             status=OrderStatus.PENDING.value
         )
         self.db.add(db_order)
+        self.stats_repository.apply(counter_deltas([], order_counter_keys(db_order)))
+        # Сущность собирается после flush: после commit объект истекает и потребовал бы повторный SELECT
+        self.db.flush()
+        order = order_mapper.one(db_order)
         self.db.commit()
-        self.db.refresh(db_order)
-        return self._to_entity(db_order)
+        return order
 
-    def get_by_id(self, order_id: str) -> Optional[Order]:
-        db_order = self.db.query(OrderModel).filter(OrderModel.id == order_id).first()
-        return self._to_entity(db_order) if db_order else None
+    def get_by_id(self, order_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Order]:
+        if fields:
+            # Проекция читает только нужные колонки, минуя identity map
+            try:
+                key = UUID(str(order_id))
+            except ValueError:
+                return None
+            mapper = order_mapper.project(fields)
+            return mapper.one(self.db.query(*mapper.columns(OrderModel)).filter(OrderModel.id == key).first())
+        return order_mapper.one(self._get_model(order_id))
 
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Order]:
-        db_orders = self.db.query(OrderModel).offset(skip).limit(limit).all()
-        return [self._to_entity(o) for o in db_orders]
+    @replica_read("db")
+    def get_all(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Order]:
+        mapper = order_mapper.project(fields)
+        return mapper.many(self.db.query(*mapper.columns(OrderModel)).offset(skip).limit(limit).all())
 
     def update(self, order_id: str, order_data: OrderUpdate) -> Optional[Order]:
-        db_order = self.db.query(OrderModel).filter(OrderModel.id == order_id).first()
+        db_order = self._get_model(order_id)
         if not db_order:
             return None
-        for field, value in order_data.dict(exclude_unset=True).items():
+        counters_before = order_counter_keys(db_order)
+        # version ведет ORM, значение из переданной сущности не применяется
+        for field, value in order_data.dict(exclude_unset=True, exclude={"version"}).items():
             setattr(db_order, field, value)
+        self.stats_repository.apply(counter_deltas(counters_before, order_counter_keys(db_order)))
+        try:
+            self.db.flush()
+        except StaleDataError:
+            self.db.rollback()
+            raise OrderConflictError("Order was modified concurrently")
+        order = order_mapper.one(db_order)
+        self.db.commit()
+        return order
+
+    def transition_status(self, order: Order, new_status: OrderStatus, **values: Any) -> Optional[Order]:
+        # Один UPDATE вместо SELECT FOR UPDATE: проверка статуса и версии в WHERE
+        statement = (
+            update(OrderModel)
+            .where(
+                OrderModel.id == order.id,
+                OrderModel.status == OrderStatus(order.status).value,
+                OrderModel.version == order.version
+            )
+            .values(status=new_status.value, version=OrderModel.version + 1, updated_at=datetime.utcnow(), **values)
+            .returning(OrderModel)
+            .execution_options(synchronize_session="fetch")
+        )
+        db_order = self.db.scalars(statement).one_or_none()
+        if db_order is None:
+            # Следующее чтение должно увидеть актуальную строку, а не копию из identity map
+            self.db.rollback()
+            return None
+        # Строка до изменения совпадает с order: это гарантирует условие на version
+        counters_before = counter_keys(order.status, order.vehicle_id, order.driver_id, order.customer_email)
+        self.stats_repository.apply(counter_deltas(counters_before, order_counter_keys(db_order)))
+        result = order_mapper.one(db_order)
         self.db.commit()
-        self.db.refresh(db_order)
-        return self._to_entity(db_order)
+        return result
 
     def delete(self, order_id: str) -> bool:
-        db_order = self.db.query(OrderModel).filter(OrderModel.id == order_id).first()
+        db_order = self._get_model(order_id)
         if not db_order:
             return False
+        self.stats_repository.apply(counter_deltas(order_counter_keys(db_order), []))
         self.db.delete(db_order)
         self.db.commit()
         return True
 
+    @replica_read("db")
     def get_by_status(self, status: str) -> List[Order]:
-        db_orders = self.db.query(OrderModel).filter(OrderModel.status == status).all()
-        return [self._to_entity(o) for o in db_orders]
+        return order_mapper.many(self.db.query(*ORDER_COLUMNS).filter(OrderModel.status == status).all())
 
+    @replica_read("db")
     def get_by_customer_email(self, email: str) -> List[Order]:
-        db_orders = self.db.query(OrderModel).filter(OrderModel.customer_email == email).all()
-        return [self._to_entity(o) for o in db_orders]
+        return order_mapper.many(self.db.query(*ORDER_COLUMNS).filter(OrderModel.customer_email == email).all())
 
-    def _to_entity(self, db_order: OrderModel) -> Order:
-        return Order(
-            id=db_order.id,
-            customer_name=db_order.customer_name,
-            customer_email=db_order.customer_email,
-            customer_phone=db_order.customer_phone,
-            pickup_address=db_order.pickup_address,
-            delivery_address=db_order.delivery_address,
-            cargo_type=db_order.cargo_type,
-            cargo_weight=db_order.cargo_weight,
-            cargo_volume=db_order.cargo_volume,
-            status=OrderStatus(db_order.status),
-            vehicle_id=db_order.vehicle_id,
-            driver_id=db_order.driver_id,
-            estimated_cost=db_order.estimated_cost,
-            actual_cost=db_order.actual_cost,
-            pickup_date=db_order.pickup_date,
-            delivery_date=db_order.delivery_date,
-            notes=db_order.notes,
-            created_at=db_order.created_at,
-            updated_at=db_order.updated_at
-        ) 
\ No newline at end of file
+    def _get_model(self, order_id: str) -> Optional[OrderModel]:
+        try:
+            key = UUID(str(order_id))
+        except ValueError:
+            return None
+        return self.db.get(OrderModel, key)
@@ -2,7 +2,9 @@ import pytest
 from uuid import uuid4
 from datetime import datetime
 
+from config.database import SessionLocal
 from entities.order import Order, OrderCreate, OrderUpdate, OrderStatus
+from repositories.interfaces.order_repository import OrderConflictError
 from repositories.order_repository import OrderRepository
 
 
@@ -141,4 +143,36 @@ def test_get_by_customer_email(f_order_repository: OrderRepository, f_order_crea
     
     customer_orders = f_order_repository.get_by_customer_email(f_order_create_data.customer_email)
     assert len(customer_orders) >= 1
-    assert customer_orders[0].customer_email == f_order_create_data.customer_email 
\ No newline at end of file
+    assert customer_orders[0].customer_email == f_order_create_data.customer_email
+
+
+def test_transition_status(f_order_repository: OrderRepository, f_order_create_data: OrderCreate):
+    created_order = f_order_repository.create(f_order_create_data)
+    vehicle_id = uuid4()
+    
+    order = f_order_repository.transition_status(created_order, OrderStatus.ASSIGNED, vehicle_id=vehicle_id)
+    
+    assert order is not None
+    assert order.status == OrderStatus.ASSIGNED
+    assert order.vehicle_id == vehicle_id
+    assert order.version == created_order.version + 1
+
+
+def test_transition_status_with_stale_version(f_order_repository: OrderRepository, f_order_create_data: OrderCreate):
+    created_order = f_order_repository.create(f_order_create_data)
+    f_order_repository.update(str(created_order.id), OrderUpdate(notes="Changed meanwhile"))
+    
+    order = f_order_repository.transition_status(created_order, OrderStatus.CANCELLED)
+    
+    assert order is None
+    assert f_order_repository.get_by_id(str(created_order.id)).status == OrderStatus.PENDING
+
+
+def test_update_order_modified_concurrently(f_order_repository: OrderRepository, f_order_create_data: OrderCreate):
+    created_order = f_order_repository.create(f_order_create_data)
+    f_order_repository.get_by_id(str(created_order.id))
+    with SessionLocal() as other_session:
+        OrderRepository(other_session).update(str(created_order.id), OrderUpdate(notes="Other writer"))
+    
+    with pytest.raises(OrderConflictError):
+        f_order_repository.update(str(created_order.id), OrderUpdate(notes="Stale writer"))
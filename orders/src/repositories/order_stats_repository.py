@@ -0,0 +1,113 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from shared.utils.database import replica_read
+from entities.order import OrderStats, OrderStatus
+from repositories.interfaces.order_stats_repository import OrderStatsRepository as OrderStatsRepositoryInterface
+from entities.database_models import Order as OrderModel, OrderCounter as OrderCounterModel
+
+STATUS = "status"
+VEHICLE = "vehicle"
+DRIVER = "driver"
+CUSTOMER = "customer"
+
+# Заказы, которые занимают транспорт и водителя
+ACTIVE_STATUSES = (OrderStatus.ASSIGNED.value, OrderStatus.IN_TRANSIT.value)
+
+
+def counter_keys(status: str, vehicle_id, driver_id, customer_email: str) -> List[Tuple[str, str]]:
+    """Counters that a single order contributes to"""
+    status = OrderStatus(status).value
+    keys = [(STATUS, status), (CUSTOMER, customer_email)]
+    if status in ACTIVE_STATUSES:
+        if vehicle_id:
+            keys.append((VEHICLE, str(vehicle_id)))
+        if driver_id:
+            keys.append((DRIVER, str(driver_id)))
+    return keys
+
+
+def order_counter_keys(db_order: Optional[OrderModel]) -> List[Tuple[str, str]]:
+    if db_order is None:
+        return []
+    return counter_keys(db_order.status, db_order.vehicle_id, db_order.driver_id, db_order.customer_email)
+
+
+def counter_deltas(before: List[Tuple[str, str]], after: List[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+    """Counter changes needed to move an order from one state to another"""
+    deltas = Counter(after)
+    deltas.subtract(before)
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+class OrderStatsRepository(OrderStatsRepositoryInterface):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, deltas: Dict[Tuple[str, str], int]) -> None:
+        """Apply counter deltas in the current transaction; caller commits"""
+        if not deltas:
+            return
+        # Сортировка задает одинаковый порядок блокировок строк в конкурентных транзакциях
+        rows = [
+            {"dimension": dimension, "key": key, "count": delta}
+            for (dimension, key), delta in sorted(deltas.items())
+        ]
+        statement = insert(OrderCounterModel).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[OrderCounterModel.dimension, OrderCounterModel.key],
+            set_={"count": OrderCounterModel.count + statement.excluded.count}
+        )
+        self.db.execute(statement)
+
+    @replica_read("db")
+    def get_stats(self, customers_limit: int = 100) -> OrderStats:
+        rows = self.db.query(OrderCounterModel.dimension, OrderCounterModel.key, OrderCounterModel.count).filter(
+            OrderCounterModel.dimension != CUSTOMER,
+            OrderCounterModel.count > 0
+        ).all()
+        customers = self.db.query(OrderCounterModel.key, OrderCounterModel.count).filter(
+            OrderCounterModel.dimension == CUSTOMER,
+            OrderCounterModel.count > 0
+        ).order_by(OrderCounterModel.count.desc()).limit(customers_limit).all()
+
+        counters: Dict[str, Dict[str, int]] = {STATUS: {}, VEHICLE: {}, DRIVER: {}}
+        for dimension, key, count in rows:
+            counters.setdefault(dimension, {})[key] = count
+
+        return OrderStats(
+            status_counts={status.value: counters[STATUS].get(status.value, 0) for status in OrderStatus},
+            active_by_vehicle=counters[VEHICLE],
+            active_by_driver=counters[DRIVER],
+            orders_by_customer={key: count for key, count in customers}
+        )
+
+    def is_empty(self) -> bool:
+        return self.db.query(OrderCounterModel.key).first() is None
+
+    def rebuild(self) -> None:
+        """Recalculate all counters from the orders table"""
+        active = OrderModel.status.in_(ACTIVE_STATUSES)
+        sources = [
+            (STATUS, OrderModel.status, None),
+            (CUSTOMER, OrderModel.customer_email, None),
+            (VEHICLE, OrderModel.vehicle_id, active),
+            (DRIVER, OrderModel.driver_id, active),
+        ]
+        deltas: Dict[Tuple[str, str], int] = {}
+        for dimension, column, condition in sources:
+            query = self.db.query(column, func.count(OrderModel.id)).filter(column.isnot(None))
+            if condition is not None:
+                query = query.filter(condition)
+            for key, count in query.group_by(column).all():
+                deltas[(dimension, str(key))] = count
+
+        try:
+            self.db.query(OrderCounterModel).delete()
+            self.apply(deltas)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
@@ -0,0 +1,91 @@
+import pytest
+from uuid import uuid4
+
+from entities.order import OrderCreate, OrderUpdate, OrderStatus
+from repositories.order_stats_repository import OrderStatsRepository, counter_keys, counter_deltas
+
+
+@pytest.fixture
+def f_order_stats_repository(f_db_session):
+    return OrderStatsRepository(f_db_session)
+
+
+@pytest.fixture
+def f_order_create_data():
+    return OrderCreate(
+        customer_name="John Doe",
+        customer_email="john@example.com",
+        customer_phone="+1234567890",
+        pickup_address="123 Pickup St, City",
+        delivery_address="456 Delivery Ave, City",
+        cargo_type="electronics",
+        cargo_weight=100.0,
+        cargo_volume=2.0
+    )
+
+
+def test_counter_keys_for_pending_order():
+    keys = counter_keys("pending", uuid4(), uuid4(), "john@example.com")
+
+    assert keys == [("status", "pending"), ("customer", "john@example.com")]
+
+
+def test_counter_keys_for_active_order():
+    vehicle_id, driver_id = uuid4(), uuid4()
+
+    keys = counter_keys(OrderStatus.IN_TRANSIT, vehicle_id, driver_id, "john@example.com")
+
+    assert ("status", "in_transit") in keys
+    assert ("vehicle", str(vehicle_id)) in keys
+    assert ("driver", str(driver_id)) in keys
+
+
+def test_counter_deltas_on_status_change():
+    vehicle_id = uuid4()
+    before = counter_keys("pending", None, None, "john@example.com")
+    after = counter_keys("assigned", vehicle_id, None, "john@example.com")
+
+    deltas = counter_deltas(before, after)
+
+    assert deltas == {
+        ("status", "pending"): -1,
+        ("status", "assigned"): 1,
+        ("vehicle", str(vehicle_id)): 1
+    }
+
+
+def test_counter_deltas_without_changes():
+    keys = counter_keys("pending", None, None, "john@example.com")
+
+    assert counter_deltas(keys, keys) == {}
+
+
+def test_stats_follow_order_lifecycle(f_order_repository, f_order_stats_repository, f_order_create_data):
+    order = f_order_repository.create(f_order_create_data)
+    vehicle_id = uuid4()
+
+    stats = f_order_stats_repository.get_stats()
+    assert stats.status_counts["pending"] == 1
+    assert stats.orders_by_customer == {"john@example.com": 1}
+
+    f_order_repository.update(str(order.id), OrderUpdate(status=OrderStatus.ASSIGNED, vehicle_id=vehicle_id))
+    stats = f_order_stats_repository.get_stats()
+    assert stats.status_counts["pending"] == 0
+    assert stats.status_counts["assigned"] == 1
+    assert stats.active_by_vehicle == {str(vehicle_id): 1}
+
+    f_order_repository.delete(str(order.id))
+    stats = f_order_stats_repository.get_stats()
+    assert stats.status_counts["assigned"] == 0
+    assert stats.active_by_vehicle == {}
+    assert stats.orders_by_customer == {}
+
+
+def test_rebuild_matches_incremental_counters(f_order_repository, f_order_stats_repository, f_order_create_data):
+    f_order_repository.create(f_order_create_data)
+    f_order_repository.create(f_order_create_data)
+    expected = f_order_stats_repository.get_stats()
+
+    f_order_stats_repository.rebuild()
+
+    assert f_order_stats_repository.get_stats() == expected
@@ -0,0 +1,34 @@
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from shared.events.dedup import ProcessedEventStore
+from entities.database_models import ProcessedEvent as ProcessedEventModel
+
+
+class ProcessedEventRepository(ProcessedEventStore):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_processed(self, event_id: str) -> bool:
+        # Проверка - отдельная единица работы, как и mark_processed: для дубликата записи не будет,
+        # и транзакция не должна остаться открытой до следующего сообщения
+        try:
+            return self.db.query(
+                self.db.query(ProcessedEventModel).filter(ProcessedEventModel.event_id == event_id).exists()
+            ).scalar()
+        finally:
+            self.db.rollback()
+
+    def mark_processed(self, event_id: str, event_type: str) -> bool:
+        statement = insert(ProcessedEventModel).values(
+            event_id=event_id,
+            event_type=event_type,
+            processed_at=datetime.utcnow()
+        ).on_conflict_do_nothing(index_elements=[ProcessedEventModel.event_id])
+        try:
+            result = self.db.execute(statement)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return result.rowcount == 1
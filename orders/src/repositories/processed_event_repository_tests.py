@@ -0,0 +1,23 @@
+import pytest
+from uuid import uuid4
+from repositories.processed_event_repository import ProcessedEventRepository
+
+
+@pytest.fixture
+def f_processed_event_repository(f_db_session):
+    return ProcessedEventRepository(f_db_session)
+
+
+def test_mark_new_event(f_processed_event_repository):
+    event_id = str(uuid4())
+
+    assert f_processed_event_repository.is_processed(event_id) is False
+    assert f_processed_event_repository.mark_processed(event_id, "vehicle_assigned") is True
+    assert f_processed_event_repository.is_processed(event_id) is True
+
+
+def test_mark_duplicate_event(f_processed_event_repository):
+    event_id = str(uuid4())
+    f_processed_event_repository.mark_processed(event_id, "vehicle_assigned")
+
+    assert f_processed_event_repository.mark_processed(event_id, "vehicle_assigned") is False
@@ -1,10 +1,13 @@
 from entities.order import Order, OrderStatus
-from repositories.interfaces.order_repository import OrderRepository
+from repositories.interfaces.order_repository import OrderConflictError, OrderRepository
 from pydantic import BaseModel
 from typing import Optional
+from uuid import UUID
 from utils.fleet_service_client import FleetServiceClient
 from utils.warehouse_service_client import WarehouseServiceClient
 from shared.events.publisher import Publisher
+from utils.pricing_engine import CargoQuote, PricingEngine
+from use_cases.change_order_status_use_case import publish_status_changed
 
 class AssignVehicleRequest(BaseModel):
     order_id: str
@@ -12,11 +15,13 @@ class AssignVehicleRequest(BaseModel):
     cargo_id: Optional[str] = None
 
 class AssignVehicleUseCase:
-    def __init__(self, order_repository: OrderRepository, fleet_service_client: FleetServiceClient, warehouse_service_client: Optional[WarehouseServiceClient] = None, publisher: Publisher = None):
+    def __init__(self, order_repository: OrderRepository, fleet_service_client: FleetServiceClient, warehouse_service_client: Optional[WarehouseServiceClient] = None, publisher: Publisher = None, pricing_engine: Optional[PricingEngine] = None, max_attempts: int = 3):
         self.order_repository = order_repository
         self.fleet_service_client = fleet_service_client
         self.warehouse_service_client = warehouse_service_client or WarehouseServiceClient()
         self.publisher = publisher
+        self.pricing_engine = pricing_engine
+        self.max_attempts = max_attempts
 
     def execute(self, request: AssignVehicleRequest) -> Order:
         order = self.order_repository.get_by_id(request.order_id)
@@ -39,12 +44,35 @@ class AssignVehicleUseCase:
             raise ValueError("Vehicle is not available")
         if vehicle["capacity_weight"] < order.cargo_weight or vehicle["capacity_volume"] < order.cargo_volume:
             raise ValueError("Insufficient vehicle capacity")
-        # Назначение транспорта
-        order.vehicle_id = request.vehicle_id
-        order.status = OrderStatus.ASSIGNED
-        updated_order = self.order_repository.update(request.order_id, order)
-        # Event-driven: publish order.vehicle_assigned
+        # Назначение транспорта условным UPDATE по статусу и версии уже прочитанного заказа;
+        # при конкурентном изменении заказ перечитывается
+        for attempt in range(self.max_attempts):
+            if attempt:
+                order = self.order_repository.get_by_id(request.order_id)
+                if not order:
+                    raise ValueError("Order not found")
+                if order.status == OrderStatus.CANCELLED:
+                    raise ValueError("Cannot assign vehicle to cancelled order")
+            values = {"vehicle_id": UUID(str(request.vehicle_id))}
+            # Оценка уточняется расходом топлива назначенной машины
+            if self.pricing_engine is not None:
+                estimated_cost = self.pricing_engine.quote(
+                    CargoQuote(order.pickup_address, order.delivery_address, order.cargo_type,
+                               order.cargo_weight, order.cargo_volume),
+                    vehicle.get("fuel_efficiency")
+                )
+                if estimated_cost is not None:
+                    values["estimated_cost"] = estimated_cost
+            old_status = order.status
+            updated_order = self.order_repository.transition_status(order, OrderStatus.ASSIGNED, **values)
+            if updated_order:
+                break
+        else:
+            raise OrderConflictError("Order was modified concurrently")
+        # Event-driven: publish order.vehicle_assigned and, if the status changed, order.status_changed
         if self.publisher:
+            if OrderStatus(old_status) != OrderStatus.ASSIGNED:
+                publish_status_changed(self.publisher, old_status, updated_order)
             self.publisher.publish("order.vehicle_assigned", {
                 "order_id": str(updated_order.id),
                 "vehicle_id": str(updated_order.vehicle_id),
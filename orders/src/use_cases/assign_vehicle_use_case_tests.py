@@ -71,7 +71,7 @@ def test_assign_vehicle_success(f_assign_vehicle_use_case, m_order_repository, m
         status=OrderStatus.ASSIGNED,
         vehicle_id=uuid4()
     )
-    m_order_repository.update.return_value = updated_order
+    m_order_repository.transition_status.return_value = updated_order
     m_fleet_service_client.get_vehicle.return_value = {
         "id": f_valid_assign_vehicle_request.vehicle_id,
         "capacity_weight": 20000.0,
@@ -95,7 +95,7 @@ def test_assign_vehicle_order_not_found(f_assign_vehicle_use_case, m_order_repos
     
     # Verify repository calls
     m_order_repository.get_by_id.assert_called_once_with(f_valid_assign_vehicle_request.order_id)
-    m_order_repository.update.assert_not_called()
+    m_order_repository.transition_status.assert_not_called()
 
 
 def test_assign_vehicle_order_already_cancelled(f_assign_vehicle_use_case, m_order_repository, f_valid_assign_vehicle_request):
@@ -119,7 +119,7 @@ def test_assign_vehicle_order_already_cancelled(f_assign_vehicle_use_case, m_ord
     
     # Verify repository calls
     m_order_repository.get_by_id.assert_called_once_with(f_valid_assign_vehicle_request.order_id)
-    m_order_repository.update.assert_not_called()
+    m_order_repository.transition_status.assert_not_called()
 
 
 def test_assign_vehicle_vehicle_not_found(f_assign_vehicle_use_case, m_order_repository, m_fleet_service_client, m_warehouse_service_client, f_valid_assign_vehicle_request, f_existing_order):
@@ -167,4 +167,72 @@ def test_assign_vehicle_cargo_not_ready(f_assign_vehicle_use_case, m_order_repos
     m_order_repository.get_by_id.return_value = f_existing_order
     m_warehouse_service_client.get_cargo.return_value = {"id": f_valid_assign_vehicle_request.cargo_id, "status": "damaged"}
     with pytest.raises(ValueError, match="Cargo is not ready for shipping"):
-        f_assign_vehicle_use_case.execute(f_valid_assign_vehicle_request) 
\ No newline at end of file
+        f_assign_vehicle_use_case.execute(f_valid_assign_vehicle_request)
+
+
+def test_assign_vehicle_reprices_with_vehicle_fuel_efficiency(m_order_repository, m_fleet_service_client, m_warehouse_service_client, m_publisher, f_valid_assign_vehicle_request, f_existing_order):
+    # Arrange
+    m_pricing_engine = MagicMock()
+    m_pricing_engine.quote.return_value = 30000.0
+    m_order_repository.get_by_id.return_value = f_existing_order
+    m_order_repository.transition_status.return_value = f_existing_order
+    m_warehouse_service_client.get_cargo.return_value = {"id": f_valid_assign_vehicle_request.cargo_id, "status": "stored"}
+    m_fleet_service_client.get_vehicle.return_value = {
+        "id": f_valid_assign_vehicle_request.vehicle_id,
+        "capacity_weight": 20000.0,
+        "capacity_volume": 80.0,
+        "fuel_efficiency": 2.5,
+        "status": "active"
+    }
+    use_case = AssignVehicleUseCase(m_order_repository, m_fleet_service_client, m_warehouse_service_client, m_publisher, m_pricing_engine)
+    # Act
+    use_case.execute(f_valid_assign_vehicle_request)
+    # Assert
+    assert m_pricing_engine.quote.call_args[0][1] == 2.5
+    assert m_order_repository.transition_status.call_args.kwargs["estimated_cost"] == 30000.0
+
+
+def test_assign_vehicle_retries_after_concurrent_change(f_assign_vehicle_use_case, m_order_repository, m_fleet_service_client, m_warehouse_service_client, f_valid_assign_vehicle_request, f_existing_order):
+    # Arrange: первый условный UPDATE проигрывает конкурентному изменению заказа
+    m_order_repository.get_by_id.return_value = f_existing_order
+    m_order_repository.transition_status.side_effect = [None, f_existing_order]
+    m_warehouse_service_client.get_cargo.return_value = {"id": f_valid_assign_vehicle_request.cargo_id, "status": "stored"}
+    m_fleet_service_client.get_vehicle.return_value = {
+        "id": f_valid_assign_vehicle_request.vehicle_id,
+        "capacity_weight": 20000.0,
+        "capacity_volume": 80.0,
+        "status": "active"
+    }
+
+    # Act
+    f_assign_vehicle_use_case.execute(f_valid_assign_vehicle_request)
+
+    # Assert: заказ перечитан, машина запрошена один раз, update с перечитыванием строки не используется
+    assert m_order_repository.get_by_id.call_count == 2
+    m_fleet_service_client.get_vehicle.assert_called_once()
+    args, kwargs = m_order_repository.transition_status.call_args
+    assert args == (f_existing_order, OrderStatus.ASSIGNED)
+    assert str(kwargs["vehicle_id"]) == f_valid_assign_vehicle_request.vehicle_id
+    m_order_repository.update.assert_not_called()
+
+
+def test_assign_vehicle_publishes_status_change(f_assign_vehicle_use_case, m_order_repository, m_fleet_service_client, m_warehouse_service_client, m_publisher, f_valid_assign_vehicle_request, f_existing_order):
+    # Arrange
+    m_order_repository.get_by_id.return_value = f_existing_order
+    m_order_repository.transition_status.return_value = Order(**{**f_existing_order.dict(), "status": OrderStatus.ASSIGNED})
+    m_warehouse_service_client.get_cargo.return_value = {"id": f_valid_assign_vehicle_request.cargo_id, "status": "stored"}
+    m_fleet_service_client.get_vehicle.return_value = {
+        "id": f_valid_assign_vehicle_request.vehicle_id,
+        "capacity_weight": 20000.0,
+        "capacity_volume": 80.0,
+        "status": "active"
+    }
+
+    # Act
+    f_assign_vehicle_use_case.execute(f_valid_assign_vehicle_request)
+
+    # Assert
+    published = {call[0][0]: call[0][1] for call in m_publisher.publish.call_args_list}
+    assert set(published) == {"order.status_changed", "order.vehicle_assigned"}
+    event = published["order.status_changed"]
+    assert (event.old_status, event.new_status) == (OrderStatus.PENDING.value, OrderStatus.ASSIGNED.value)
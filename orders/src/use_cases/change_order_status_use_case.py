@@ -1,50 +1,68 @@
 from entities.order import Order, OrderStatus
-from repositories.interfaces.order_repository import OrderRepository
+from repositories.interfaces.order_repository import OrderConflictError, OrderRepository
 from pydantic import BaseModel
 from typing import Optional
 from utils.warehouse_service_client import WarehouseServiceClient
+from shared.events.models import OrderStatusChangedEvent
 from shared.events.publisher import Publisher
 import httpx
 
+# Допустимые переходы статуса заказа
+VALID_TRANSITIONS = {
+    OrderStatus.PENDING: [OrderStatus.ASSIGNED, OrderStatus.CANCELLED],
+    OrderStatus.ASSIGNED: [OrderStatus.IN_TRANSIT, OrderStatus.CANCELLED],
+    OrderStatus.IN_TRANSIT: [OrderStatus.DELIVERED, OrderStatus.CANCELLED],
+    OrderStatus.DELIVERED: [],
+    OrderStatus.CANCELLED: []
+}
+
+def publish_status_changed(publisher: Publisher, old_status: OrderStatus, order: Order) -> None:
+    """Publish order.status_changed; every path that changes an order status calls it"""
+    event = OrderStatusChangedEvent(
+        source_service="orders",
+        order_id=str(order.id),
+        old_status=OrderStatus(old_status).value,
+        new_status=OrderStatus(order.status).value,
+        customer_email=order.customer_email
+    )
+    publisher.publish(event.event_type, event)
+
 class ChangeOrderStatusRequest(BaseModel):
     order_id: str
     new_status: OrderStatus
     cargo_id: Optional[str] = None
 
 class ChangeOrderStatusUseCase:
-    def __init__(self, order_repository: OrderRepository, warehouse_service_client: Optional[WarehouseServiceClient] = None, publisher: Publisher = None):
+    def __init__(self, order_repository: OrderRepository, warehouse_service_client: Optional[WarehouseServiceClient] = None, publisher: Publisher = None, max_attempts: int = 3):
         self.order_repository = order_repository
         self.warehouse_service_client = warehouse_service_client or WarehouseServiceClient()
         self.publisher = publisher
+        self.max_attempts = max_attempts
 
     def execute(self, request: ChangeOrderStatusRequest) -> Order:
-        order = self.order_repository.get_by_id(request.order_id)
-        if not order:
-            raise ValueError("Order not found")
-        # Проверка валидности перехода статуса
-        valid_transitions = {
-            OrderStatus.PENDING: [OrderStatus.ASSIGNED, OrderStatus.CANCELLED],
-            OrderStatus.ASSIGNED: [OrderStatus.IN_TRANSIT, OrderStatus.CANCELLED],
-            OrderStatus.IN_TRANSIT: [OrderStatus.DELIVERED, OrderStatus.CANCELLED],
-            OrderStatus.DELIVERED: [],
-            OrderStatus.CANCELLED: []
-        }
-        if request.new_status not in valid_transitions.get(order.status, []):
-            raise ValueError("Invalid status transition")
-        # Обновление статуса заказа
-        order.status = request.new_status
-        updated_order = self.order_repository.update(request.order_id, order)
+        # Переход применяется условным UPDATE; при конкурентном изменении заказ перечитывается
+        for _ in range(self.max_attempts):
+            order = self.order_repository.get_by_id(request.order_id)
+            if not order:
+                raise ValueError("Order not found")
+            if request.new_status not in VALID_TRANSITIONS.get(order.status, []):
+                raise ValueError("Invalid status transition")
+            old_status = order.status
+            # При доставке заказ оплачивается по последней оценке: она фиксируется как фактическая цена
+            values = {}
+            if request.new_status == OrderStatus.DELIVERED and order.actual_cost is None and order.estimated_cost:
+                values["actual_cost"] = order.estimated_cost
+            updated_order = self.order_repository.transition_status(order, request.new_status, **values)
+            if updated_order:
+                break
+        else:
+            raise OrderConflictError("Order was modified concurrently")
         # Обновление статуса груза в warehouse service
         if request.cargo_id and self.warehouse_service_client:
             self._update_cargo_status(request.cargo_id, request.new_status)
         # Event-driven: publish order.status_changed
         if self.publisher:
-            self.publisher.publish("order.status_changed", {
-                "order_id": str(updated_order.id),
-                "old_status": order.status,
-                "new_status": str(updated_order.status),
-                "customer_email": updated_order.customer_email
-            })
+            publish_status_changed(self.publisher, old_status, updated_order)
         return updated_order
 
     def _update_cargo_status(self, cargo_id: str, order_status: OrderStatus):
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock
 from uuid import uuid4
 from entities.order import Order, OrderStatus
+from repositories.interfaces.order_repository import OrderConflictError
 from repositories.order_repository import OrderRepository
 from use_cases.change_order_status_use_case import ChangeOrderStatusUseCase, ChangeOrderStatusRequest
 from shared.events.publisher import Publisher
@@ -57,14 +58,14 @@ def test_change_order_status_success(f_change_order_status_use_case, m_order_rep
         cargo_volume=f_existing_order.cargo_volume,
         status=f_valid_change_status_request.new_status
     )
-    m_order_repository.update.return_value = updated_order
+    m_order_repository.transition_status.return_value = updated_order
     result = f_change_order_status_use_case.execute(f_valid_change_status_request)
     m_warehouse_service_client.base_url  # just to ensure it's used
     assert result.status == f_valid_change_status_request.new_status
 
 def test_change_order_status_to_in_transit_updates_cargo(f_change_order_status_use_case, m_order_repository, m_warehouse_service_client, f_valid_change_status_request, f_existing_order):
     m_order_repository.get_by_id.return_value = f_existing_order
-    m_order_repository.update.return_value = f_existing_order
+    m_order_repository.transition_status.return_value = f_existing_order
     req = ChangeOrderStatusRequest(order_id=f_valid_change_status_request.order_id, new_status=OrderStatus.IN_TRANSIT, cargo_id=f_valid_change_status_request.cargo_id)
     f_change_order_status_use_case.execute(req)
     # Проверяем, что warehouse_service_client был вызван для обновления статуса груза
@@ -73,7 +74,7 @@ def test_change_order_status_to_in_transit_updates_cargo(f_change_order_status_u
 
 def test_change_order_status_to_delivered_updates_cargo(f_change_order_status_use_case, m_order_repository, m_warehouse_service_client, f_valid_change_status_request, f_existing_order):
     m_order_repository.get_by_id.return_value = f_existing_order
-    m_order_repository.update.return_value = f_existing_order
+    m_order_repository.transition_status.return_value = f_existing_order
     # Сначала переводим заказ в IN_TRANSIT
     req_in_transit = ChangeOrderStatusRequest(order_id=f_valid_change_status_request.order_id, new_status=OrderStatus.IN_TRANSIT, cargo_id=f_valid_change_status_request.cargo_id)
     f_change_order_status_use_case.execute(req_in_transit)
@@ -85,4 +86,46 @@ def test_change_order_status_to_delivered_updates_cargo(f_change_order_status_us
     m_order_repository.get_by_id.return_value = in_transit_order
     req_delivered = ChangeOrderStatusRequest(order_id=f_valid_change_status_request.order_id, new_status=OrderStatus.DELIVERED, cargo_id=f_valid_change_status_request.cargo_id)
     f_change_order_status_use_case.execute(req_delivered)
-    m_warehouse_service_client.base_url 
\ No newline at end of file
+    m_warehouse_service_client.base_url
+
+def test_change_order_status_retries_on_conflict(f_change_order_status_use_case, m_order_repository, f_valid_change_status_request, f_existing_order):
+    # Arrange: первая попытка проигрывает конкурентному изменению
+    updated_order = Order(**{**f_existing_order.dict(), "status": OrderStatus.IN_TRANSIT, "version": 3})
+    m_order_repository.get_by_id.return_value = f_existing_order
+    m_order_repository.transition_status.side_effect = [None, updated_order]
+    # Act
+    result = f_change_order_status_use_case.execute(f_valid_change_status_request)
+    # Assert
+    assert result == updated_order
+    assert m_order_repository.get_by_id.call_count == 2
+    m_order_repository.transition_status.assert_called_with(f_existing_order, OrderStatus.IN_TRANSIT)
+    m_order_repository.update.assert_not_called()
+
+def test_change_order_status_gives_up_after_max_attempts(f_change_order_status_use_case, m_order_repository, m_publisher, f_valid_change_status_request, f_existing_order):
+    # Arrange
+    m_order_repository.get_by_id.return_value = f_existing_order
+    m_order_repository.transition_status.return_value = None
+    # Act & Assert
+    with pytest.raises(OrderConflictError):
+        f_change_order_status_use_case.execute(f_valid_change_status_request)
+    assert m_order_repository.transition_status.call_count == f_change_order_status_use_case.max_attempts
+    m_publisher.publish.assert_not_called()
+
+def test_change_order_status_rejects_transition_made_meanwhile(f_change_order_status_use_case, m_order_repository, f_valid_change_status_request, f_existing_order):
+    # Arrange: после конфликта заказ уже отменен
+    cancelled_order = Order(**{**f_existing_order.dict(), "status": OrderStatus.CANCELLED, "version": 2})
+    m_order_repository.get_by_id.side_effect = [f_existing_order, cancelled_order]
+    m_order_repository.transition_status.return_value = None
+    # Act & Assert
+    with pytest.raises(ValueError, match="Invalid status transition"):
+        f_change_order_status_use_case.execute(f_valid_change_status_request)
+
+def test_change_order_status_to_delivered_fixes_actual_cost(f_change_order_status_use_case, m_order_repository, f_existing_order):
+    # Arrange
+    order = f_existing_order.model_copy(update={"status": OrderStatus.IN_TRANSIT, "estimated_cost": 25000.0})
+    m_order_repository.get_by_id.return_value = order
+    m_order_repository.transition_status.return_value = order
+    # Act
+    f_change_order_status_use_case.execute(ChangeOrderStatusRequest(order_id=str(order.id), new_status=OrderStatus.DELIVERED))
+    # Assert
+    m_order_repository.transition_status.assert_called_once_with(order, OrderStatus.DELIVERED, actual_cost=25000.0)
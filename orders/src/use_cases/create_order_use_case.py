@@ -5,6 +5,7 @@ from typing import Optional
 from utils.warehouse_service_client import WarehouseServiceClient
 from shared.events.publisher import Publisher
 from use_cases.order_event_service import OrderEventService
+from utils.pricing_engine import CargoQuote, PricingEngine
 
 class CreateOrderRequest(BaseModel):
     customer_name: str = Field(..., min_length=1, max_length=100)
@@ -19,10 +20,11 @@ class CreateOrderRequest(BaseModel):
     warehouse_id: Optional[str] = None
 
 class CreateOrderUseCase:
-    def __init__(self, order_repository: OrderRepository, order_event_service: OrderEventService, warehouse_service_client: Optional[WarehouseServiceClient] = None):
+    def __init__(self, order_repository: OrderRepository, order_event_service: OrderEventService, warehouse_service_client: Optional[WarehouseServiceClient] = None, pricing_engine: Optional[PricingEngine] = None):
         self.order_repository = order_repository
         self.order_event_service = order_event_service
         self.warehouse_service_client = warehouse_service_client or WarehouseServiceClient()
+        self.pricing_engine = pricing_engine
 
     def execute(self, request: CreateOrderRequest) -> Order:
         if not request.customer_name:
@@ -49,6 +51,7 @@ class CreateOrderUseCase:
             cargo_type=request.cargo_type,
             cargo_weight=request.cargo_weight,
             cargo_volume=request.cargo_volume,
+            estimated_cost=self._estimate_cost(request),
             notes=request.notes
         )
         order = self.order_repository.create(order_data)
@@ -67,4 +70,13 @@ class CreateOrderUseCase:
         }
         self.order_event_service.publish_order_created(order_dict)
         
-        return order 
\ No newline at end of file
+        return order
+
+    def _estimate_cost(self, request: CreateOrderRequest) -> Optional[float]:
+        # Машина еще не назначена: цена с расходом топлива по умолчанию
+        if self.pricing_engine is None:
+            return None
+        return self.pricing_engine.quote(CargoQuote(
+            request.pickup_address, request.delivery_address, request.cargo_type,
+            request.cargo_weight, request.cargo_volume
+        ))
@@ -117,4 +117,22 @@ def test_create_order_invalid_email(f_create_order_use_case, f_valid_order_reque
     with pytest.raises(ValidationError, match="customer_email"):
         CreateOrderRequest(
             **{**f_valid_order_request.dict(), "customer_email": "invalid-email"}
-        ) 
\ No newline at end of file
+        )
+
+def test_create_order_fills_estimated_cost(m_order_repository, m_warehouse_service_client, f_valid_order_request):
+    # Arrange
+    m_pricing_engine = MagicMock()
+    m_pricing_engine.quote.return_value = 12345.67
+    m_warehouse_service_client.get_warehouse.return_value = {
+        "id": f_valid_order_request.warehouse_id,
+        "status": "active",
+        "available_capacity_weight": 1000.0,
+        "available_capacity_volume": 100.0
+    }
+    use_case = CreateOrderUseCase(m_order_repository, MagicMock(), m_warehouse_service_client, m_pricing_engine)
+    # Act
+    use_case.execute(f_valid_order_request)
+    # Assert
+    cargo = m_pricing_engine.quote.call_args[0][0]
+    assert (cargo.pickup_address, cargo.cargo_weight) == (f_valid_order_request.pickup_address, 100.0)
+    assert m_order_repository.create.call_args[0][0].estimated_cost == 12345.67
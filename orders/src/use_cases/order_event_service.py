@@ -1,39 +1,49 @@
-from typing import Dict, Any
 from datetime import datetime
-from uuid import uuid4
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
 import structlog
+from entities.order import Order, OrderStatus
+from shared.events.models import OrderCreatedEvent
 from shared.events.publisher import Publisher
 from shared.events.subscriber import Subscriber
 from repositories.order_repository import OrderRepository
+from use_cases.change_order_status_use_case import publish_status_changed
+from utils.order_status_hub import OrderStatusHub
 from sqlalchemy.orm import Session
 
 
 class OrderEventService:
-    def __init__(self, publisher: Publisher, subscriber: Subscriber, order_repository: OrderRepository):
+    MAX_TRANSITION_ATTEMPTS = 3
+    # Причины, по которым заказ отменяется
+    CANCEL_REASONS = ("no_drivers", "no_vehicles")
+
+    def __init__(self, publisher: Publisher, subscriber: Subscriber, session_factory: Callable[[], Session],
+                 status_hub: Optional[OrderStatusHub] = None,
+                 repository_factory: Callable[[Session], OrderRepository] = OrderRepository):
         self.publisher = publisher
         self.subscriber = subscriber
-        self.order_repository = order_repository
+        self.session_factory = session_factory
+        self.repository_factory = repository_factory
+        self.status_hub = status_hub
         self.logger = structlog.get_logger(self.__class__.__name__)
     
     def publish_order_created(self, order_data: Dict[str, Any]) -> None:
         """Publish OrderCreated event when a new order is created"""
         try:
-            event_data = {
-                "event_id": str(uuid4()),
-                "timestamp": datetime.utcnow().isoformat(),
-                "source_service": "orders",
-                "order_id": order_data["id"],
-                "customer_name": order_data["customer_name"],
-                "customer_email": order_data["customer_email"],
-                "pickup_address": order_data["pickup_address"],
-                "delivery_address": order_data["delivery_address"],
-                "cargo_type": order_data["cargo_type"],
-                "cargo_weight": order_data["cargo_weight"],
-                "cargo_volume": order_data["cargo_volume"],
-                "notes": order_data.get("notes")
-            }
+            event = OrderCreatedEvent(
+                source_service="orders",
+                order_id=str(order_data["id"]),
+                customer_name=order_data["customer_name"],
+                customer_email=order_data["customer_email"],
+                pickup_address=order_data["pickup_address"],
+                delivery_address=order_data["delivery_address"],
+                cargo_type=order_data["cargo_type"],
+                cargo_weight=order_data["cargo_weight"],
+                cargo_volume=order_data["cargo_volume"],
+                notes=order_data.get("notes")
+            )
             
-            self.publisher.publish("order_created", event_data)
+            self.publisher.publish(event.event_type, event)
             self.logger.info("OrderCreated event published", order_id=order_data["id"])
         except Exception as e:
             self.logger.error("Failed to publish OrderCreated event", error=str(e), order_id=order_data["id"])
@@ -45,23 +55,21 @@ class OrderEventService:
             order_id = event_data["order_id"]
             vehicle_id = event_data["vehicle_id"]
             driver_id = event_data["driver_id"]
+            # Оценка fleet сервиса; отсутствует, если адрес не найден в справочнике
+            estimated_delivery_time = event_data.get("estimated_delivery_time")
+            if isinstance(estimated_delivery_time, str):
+                estimated_delivery_time = datetime.fromisoformat(estimated_delivery_time)
+            values = {"delivery_date": estimated_delivery_time} if estimated_delivery_time else {}
             
-            # Update order with vehicle and driver assignment
-            from entities.order import OrderUpdate
-            update_data = OrderUpdate(
-                vehicle_id=vehicle_id,
-                driver_id=driver_id,
-                status="assigned"
+            updated_order = self._transition_pending(
+                order_id, OrderStatus.ASSIGNED, vehicle_id=UUID(str(vehicle_id)), driver_id=UUID(str(driver_id)),
+                **values
             )
-            
-            updated_order = self.order_repository.update(order_id, update_data)
             if updated_order:
                 self.logger.info("Order updated with vehicle assignment", 
                                order_id=order_id, 
                                vehicle_id=vehicle_id, 
                                driver_id=driver_id)
-            else:
-                self.logger.error("Failed to update order with vehicle assignment", order_id=order_id)
         except Exception as e:
             self.logger.error("Failed to handle VehicleAssigned event", error=str(e))
             raise
@@ -72,23 +80,53 @@ class OrderEventService:
             order_id = event_data["order_id"]
             reason = event_data["reason"]
             
-            # Update order status based on reason
-            from entities.order import OrderUpdate
-            status = "cancelled" if reason in ["no_drivers", "no_vehicles"] else "pending"
-            update_data = OrderUpdate(status=status)
+            if reason not in self.CANCEL_REASONS:
+                # Прочие причины временные: заказ остается в ожидании
+                self.logger.info("Order stays pending", order_id=order_id, reason=reason)
+                return
             
-            updated_order = self.order_repository.update(order_id, update_data)
+            # Отменяется только ожидающий заказ: запоздавшее или повторное событие
+            # не отменит уже назначенный или находящийся в пути заказ
+            updated_order = self._transition_pending(order_id, OrderStatus.CANCELLED)
             if updated_order:
-                self.logger.info("Order status updated", 
-                               order_id=order_id, 
-                               reason=reason,
-                               status=status)
-            else:
-                self.logger.error("Failed to update order status", order_id=order_id)
+                self.logger.info("Order cancelled, no vehicle available", order_id=order_id, reason=reason)
         except Exception as e:
             self.logger.error("Failed to handle NoVehicleAvailable event", error=str(e))
             raise
     
+    def _transition_pending(self, order_id: str, new_status: OrderStatus, **values: Any) -> Optional[Order]:
+        """Move a pending order to new_status; None if it is missing or no longer pending"""
+        # Своя сессия на каждое событие: транзакция и соединение не переживают обработку сообщения,
+        # и следующее событие читает актуальные строки
+        with self.session_factory() as db:
+            order_repository = self.repository_factory(db)
+            # Условный UPDATE по статусу и версии не перезапишет конкурентное изменение (например, отмену)
+            for _ in range(self.MAX_TRANSITION_ATTEMPTS):
+                order = order_repository.get_by_id(order_id)
+                if not order or order.status != OrderStatus.PENDING:
+                    self.logger.warning("Order is not pending, transition skipped",
+                                        order_id=order_id,
+                                        status=order.status if order else None,
+                                        new_status=new_status.value)
+                    return None
+                updated_order = order_repository.transition_status(order, new_status, **values)
+                if updated_order:
+                    self._publish_status_changed(updated_order)
+                    return updated_order
+        self.logger.error("Failed to change order status", order_id=order_id, new_status=new_status.value)
+        return None
+    
+    def _publish_status_changed(self, order: Order) -> None:
+        # Статус уже сохранен: ошибка публикации не должна приводить к повторной обработке события
+        try:
+            publish_status_changed(self.publisher, OrderStatus.PENDING, order)
+        except Exception as e:
+            self.logger.error("Failed to publish OrderStatusChanged event", error=str(e), order_id=str(order.id))
+    
+    def handle_order_status_changed(self, event_data: Dict[str, Any]) -> None:
+        """Forward order status change to stream subscribers of this instance"""
+        self.status_hub.publish(event_data)
+    
     def start_listening(self) -> None:
         """Start listening for events from other services"""
         try:
@@ -96,6 +134,10 @@ class OrderEventService:
             self.subscriber.subscribe("vehicle_assigned", self.handle_vehicle_assigned)
             self.subscriber.subscribe("no_vehicle_available", self.handle_no_vehicle_available)
             
+            # Каждый экземпляр получает все изменения статусов для своих stream-клиентов
+            if self.status_hub:
+                self.subscriber.subscribe("order.status_changed", self.handle_order_status_changed, broadcast=True)
+            
             # Start listening
             self.subscriber.start_listening()
             self.logger.info("Started listening for events")
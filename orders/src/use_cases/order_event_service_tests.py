@@ -1,9 +1,10 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from datetime import datetime
 from uuid import uuid4
+from entities.order import Order, OrderStatus
 from use_cases.order_event_service import OrderEventService
-from shared.events.models import OrderCreatedEvent, VehicleAssignedEvent, NoVehicleAvailableEvent
+from shared.events.models import OrderCreatedEvent, OrderStatusChangedEvent, VehicleAssignedEvent, NoVehicleAvailableEvent
 
 
 class TestOrderEventService:
@@ -17,8 +18,17 @@ class TestOrderEventService:
         return Mock()
     
     @pytest.fixture
-    def order_event_service(self, m_publisher, m_subscriber):
-        return OrderEventService(m_publisher, m_subscriber)
+    def m_order_repository(self):
+        return Mock()
+    
+    @pytest.fixture
+    def m_session_factory(self):
+        return MagicMock()
+    
+    @pytest.fixture
+    def order_event_service(self, m_publisher, m_subscriber, m_session_factory, m_order_repository):
+        return OrderEventService(m_publisher, m_subscriber, m_session_factory,
+                                 repository_factory=lambda db: m_order_repository)
     
     @pytest.fixture
     def sample_order_data(self):
@@ -34,6 +44,19 @@ class TestOrderEventService:
             "notes": "Handle with care"
         }
     
+    @pytest.fixture
+    def pending_order(self):
+        return Order(
+            customer_name="John Doe",
+            customer_email="john@example.com",
+            customer_phone="+1234567890",
+            pickup_address="123 Pickup St",
+            delivery_address="456 Delivery Ave",
+            cargo_type="electronics",
+            cargo_weight=100.0,
+            cargo_volume=2.0
+        )
+    
     def test_publish_order_created_event(self, order_event_service, m_publisher, sample_order_data):
         # Arrange
         order_data = sample_order_data
@@ -45,10 +68,11 @@ class TestOrderEventService:
         m_publisher.publish.assert_called_once()
         call_args = m_publisher.publish.call_args
         assert call_args[0][0] == "order_created"
-        event_data = call_args[0][1]
-        assert event_data["order_id"] == order_data["id"]
-        assert event_data["customer_name"] == order_data["customer_name"]
-        assert event_data["customer_email"] == order_data["customer_email"]
+        event = call_args[0][1]
+        assert isinstance(event, OrderCreatedEvent)
+        assert event.order_id == order_data["id"]
+        assert event.customer_name == order_data["customer_name"]
+        assert event.customer_email == order_data["customer_email"]
     
     def test_handle_vehicle_assigned_event(self, order_event_service, m_subscriber):
         # Arrange
@@ -69,6 +93,74 @@ class TestOrderEventService:
         # Пока просто проверяем, что метод не падает
         assert True
     
+    def test_handle_vehicle_assigned_transitions_pending_order(self, order_event_service, m_order_repository, pending_order):
+        # Arrange
+        vehicle_id, driver_id = uuid4(), uuid4()
+        m_order_repository.get_by_id.return_value = pending_order
+        m_order_repository.transition_status.side_effect = [None, pending_order]
+        
+        # Act
+        order_event_service.handle_vehicle_assigned(
+            {"order_id": str(pending_order.id), "vehicle_id": str(vehicle_id), "driver_id": str(driver_id)}
+        )
+        
+        # Assert: после конфликта заказ перечитан и переход повторен
+        assert m_order_repository.transition_status.call_count == 2
+        m_order_repository.transition_status.assert_called_with(
+            pending_order, OrderStatus.ASSIGNED, vehicle_id=vehicle_id, driver_id=driver_id
+        )
+        m_order_repository.update.assert_not_called()
+    
+    def test_each_event_uses_own_session(self, m_publisher, m_subscriber, m_order_repository, pending_order):
+        # Arrange
+        m_session_factory = MagicMock()
+        sessions = []
+        service = OrderEventService(m_publisher, m_subscriber, m_session_factory,
+                                    repository_factory=lambda db: sessions.append(db) or m_order_repository)
+        m_order_repository.get_by_id.return_value = pending_order
+        m_order_repository.transition_status.return_value = pending_order
+        event_data = {"order_id": str(pending_order.id), "reason": "no_vehicles"}
+        
+        # Act
+        service.handle_no_vehicle_available(event_data)
+        service.handle_no_vehicle_available(event_data)
+        
+        # Assert: сессия открывается на событие и закрывается после обработки
+        assert m_session_factory.call_count == 2
+        assert sessions == [m_session_factory.return_value.__enter__.return_value] * 2
+        assert m_session_factory.return_value.__exit__.call_count == 2
+    
+    def test_handle_vehicle_assigned_stores_estimated_delivery(self, order_event_service, m_order_repository,
+                                                               pending_order):
+        # Arrange
+        vehicle_id, driver_id = uuid4(), uuid4()
+        m_order_repository.get_by_id.return_value = pending_order
+        m_order_repository.transition_status.return_value = pending_order
+        
+        # Act
+        order_event_service.handle_vehicle_assigned({
+            "order_id": str(pending_order.id), "vehicle_id": str(vehicle_id), "driver_id": str(driver_id),
+            "estimated_delivery_time": "2024-01-01T18:30:00"
+        })
+        
+        # Assert
+        m_order_repository.transition_status.assert_called_once_with(
+            pending_order, OrderStatus.ASSIGNED, vehicle_id=vehicle_id, driver_id=driver_id,
+            delivery_date=datetime(2024, 1, 1, 18, 30)
+        )
+    
+    def test_handle_vehicle_assigned_skips_cancelled_order(self, order_event_service, m_order_repository, pending_order):
+        # Arrange
+        m_order_repository.get_by_id.return_value = Order(**{**pending_order.dict(), "status": OrderStatus.CANCELLED})
+        
+        # Act
+        order_event_service.handle_vehicle_assigned(
+            {"order_id": str(pending_order.id), "vehicle_id": str(uuid4()), "driver_id": str(uuid4())}
+        )
+        
+        # Assert
+        m_order_repository.transition_status.assert_not_called()
+    
     def test_handle_no_vehicle_available_event(self, order_event_service, m_subscriber):
         # Arrange
         event_data = {
@@ -84,6 +176,74 @@ class TestOrderEventService:
         # Пока просто проверяем, что метод не падает
         assert True
     
+    def test_handle_no_vehicle_available_cancels_pending_order(self, order_event_service, m_order_repository,
+                                                               pending_order):
+        # Arrange
+        m_order_repository.get_by_id.return_value = pending_order
+        m_order_repository.transition_status.side_effect = [None, pending_order]
+        
+        # Act
+        order_event_service.handle_no_vehicle_available({"order_id": str(pending_order.id), "reason": "no_vehicles"})
+        
+        # Assert
+        assert m_order_repository.transition_status.call_count == 2
+        m_order_repository.transition_status.assert_called_with(pending_order, OrderStatus.CANCELLED)
+        m_order_repository.update.assert_not_called()
+    
+    @pytest.mark.parametrize("status", [OrderStatus.ASSIGNED, OrderStatus.IN_TRANSIT])
+    def test_late_no_vehicle_available_keeps_assigned_order(self, order_event_service, m_order_repository,
+                                                            pending_order, status):
+        # Arrange
+        m_order_repository.get_by_id.return_value = Order(**{**pending_order.dict(), "status": status})
+        
+        # Act
+        order_event_service.handle_no_vehicle_available({"order_id": str(pending_order.id), "reason": "no_drivers"})
+        
+        # Assert
+        m_order_repository.transition_status.assert_not_called()
+        m_order_repository.update.assert_not_called()
+    
+    def test_no_vehicle_available_for_other_reason_keeps_order_pending(self, order_event_service, m_order_repository):
+        # Act
+        order_event_service.handle_no_vehicle_available({"order_id": str(uuid4()), "reason": "capacity_exceeded"})
+        
+        # Assert
+        m_order_repository.get_by_id.assert_not_called()
+        m_order_repository.transition_status.assert_not_called()
+    
+    @pytest.mark.parametrize("event_type, event_data, new_status", [
+        ("vehicle_assigned", {"vehicle_id": str(uuid4()), "driver_id": str(uuid4())}, OrderStatus.ASSIGNED),
+        ("no_vehicle_available", {"reason": "no_vehicles"}, OrderStatus.CANCELLED)
+    ])
+    def test_status_change_is_published(self, order_event_service, m_order_repository, m_publisher, pending_order,
+                                        event_type, event_data, new_status):
+        # Arrange
+        m_order_repository.get_by_id.return_value = pending_order
+        m_order_repository.transition_status.return_value = Order(**{**pending_order.dict(), "status": new_status})
+        handler = getattr(order_event_service, f"handle_{event_type}")
+        
+        # Act
+        handler({"order_id": str(pending_order.id), **event_data})
+        
+        # Assert
+        event_type, event = m_publisher.publish.call_args[0]
+        assert event_type == "order.status_changed"
+        assert isinstance(event, OrderStatusChangedEvent)
+        assert (event.order_id, event.old_status, event.new_status) == (
+            str(pending_order.id), OrderStatus.PENDING.value, new_status.value
+        )
+    
+    def test_skipped_transition_is_not_published(self, order_event_service, m_order_repository, m_publisher,
+                                                 pending_order):
+        # Arrange
+        m_order_repository.get_by_id.return_value = Order(**{**pending_order.dict(), "status": OrderStatus.ASSIGNED})
+        
+        # Act
+        order_event_service.handle_no_vehicle_available({"order_id": str(pending_order.id), "reason": "no_drivers"})
+        
+        # Assert
+        m_publisher.publish.assert_not_called()
+    
     def test_start_listening(self, order_event_service, m_subscriber):
         # Act
         order_event_service.start_listening()
@@ -94,4 +254,29 @@ class TestOrderEventService:
         calls = m_subscriber.subscribe.call_args_list
         event_types = [call[0][0] for call in calls]
         assert "vehicle_assigned" in event_types
-        assert "no_vehicle_available" in event_types 
\ No newline at end of file
+        assert "no_vehicle_available" in event_types
+    
+    def test_start_listening_broadcasts_status_changes_to_hub(self, m_publisher, m_subscriber):
+        # Arrange
+        m_status_hub = Mock()
+        service = OrderEventService(m_publisher, m_subscriber, MagicMock(), m_status_hub)
+        
+        # Act
+        service.start_listening()
+        
+        # Assert
+        m_subscriber.subscribe.assert_any_call(
+            "order.status_changed", service.handle_order_status_changed, broadcast=True
+        )
+    
+    def test_handle_order_status_changed_publishes_to_hub(self, m_publisher, m_subscriber):
+        # Arrange
+        m_status_hub = Mock()
+        service = OrderEventService(m_publisher, m_subscriber, MagicMock(), m_status_hub)
+        event_data = {"order_id": str(uuid4()), "old_status": "assigned", "new_status": "in_transit"}
+        
+        # Act
+        service.handle_order_status_changed(event_data)
+        
+        # Assert
+        m_status_hub.publish.assert_called_once_with(event_data)
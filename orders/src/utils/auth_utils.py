@@ -2,27 +2,42 @@ from shared.utils.auth_utils import (
     get_current_user as shared_get_current_user,
     require_role as shared_require_role,
     require_any_role as shared_require_any_role,
-    AuthServiceClient as SharedAuthServiceClient
+    AuthServiceClient as SharedAuthServiceClient,
+    JWKSClient,
+    ASYMMETRIC_ALGORITHMS
 )
+from shared.utils.revocation import RevocationList
 from config.settings import get_settings
 import structlog
 
 settings = get_settings()
+# Отозванные токены; синхронизируется с auth сервисом в фоне после старта
+revocation_list = RevocationList(settings.auth_service_url)
+# Открытые ключи auth сервиса для RS256/ES256; при HS256 используется secret_key
+jwks_client = (
+    JWKSClient(f"{settings.auth_service_url}/.well-known/jwks.json")
+    if settings.algorithm in ASYMMETRIC_ALGORITHMS else None
+)
 logger = structlog.get_logger(__name__)
 
 # Создаем функции с настройками orders сервиса
 def get_current_user():
     logger.info("Creating get_current_user function", secret_key=settings.secret_key[:10] + "...", algorithm=settings.algorithm)
-    return shared_get_current_user(settings.secret_key, settings.algorithm)
+    return shared_get_current_user(settings.secret_key, settings.algorithm, revocation_list, jwks_client)
 
 def require_role(required_role: str):
     logger.info("Creating require_role function", required_role=required_role, secret_key=settings.secret_key[:10] + "...", algorithm=settings.algorithm)
-    return shared_require_role(required_role, settings.secret_key, settings.algorithm)
+    return shared_require_role(required_role, settings.secret_key, settings.algorithm, revocation_list, jwks_client)
 
 def require_any_role(required_roles: list[str]):
     logger.info("Creating require_any_role function", required_roles=required_roles, secret_key=settings.secret_key[:10] + "...", algorithm=settings.algorithm)
-    return shared_require_any_role(required_roles, settings.secret_key, settings.algorithm)
+    return shared_require_any_role(required_roles, settings.secret_key, settings.algorithm, revocation_list, jwks_client)
+
+# Один клиент на процесс: кэш пользователей и объединение запросов работают между вызовами
+auth_service_client = SharedAuthServiceClient(
+    settings.auth_service_url,
+    cache_ttl_seconds=settings.auth_user_cache_ttl_seconds
+)
 
-# Создаем клиент для auth сервиса
 def get_auth_service_client() -> SharedAuthServiceClient:
-    return SharedAuthServiceClient(settings.auth_service_url) 
\ No newline at end of file
+    return auth_service_client 
\ No newline at end of file
@@ -1,8 +1,12 @@
 import httpx
 from typing import Optional, Dict, Any
 import os
+from shared.utils.http_cache import ConditionalCache
 
 class FleetServiceClient:
+    # Общий для всех экземпляров: клиент создается на каждый запрос
+    cache = ConditionalCache()
+
     def __init__(self, base_url: str = "http://localhost:8001"):
         self.base_url = base_url
         # Проверяем, находимся ли мы в тестовом режиме
@@ -28,9 +32,7 @@ class FleetServiceClient:
             }
         
         try:
-            response = httpx.get(f"{self.base_url}/vehicles/{vehicle_id}")
-            response.raise_for_status()
-            return response.json()
+            return self.cache.get(f"{self.base_url}/vehicles/{vehicle_id}")
         except Exception:
             return None
 
@@ -49,8 +51,6 @@ class FleetServiceClient:
             }
         
         try:
-            response = httpx.get(f"{self.base_url}/drivers/{driver_id}")
-            response.raise_for_status()
-            return response.json()
+            return self.cache.get(f"{self.base_url}/drivers/{driver_id}")
         except Exception:
             return None 
\ No newline at end of file
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Set
+import orjson
+import structlog
+
+
+class OrderStatusSubscription:
+    """Queue of encoded status events for one stream client"""
+
+    def __init__(self, order_id: Optional[str], customer_email: Optional[str], max_size: int):
+        self.order_id = order_id
+        self.customer_email = customer_email
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.dropped_count = 0
+
+    def put(self, message: bytes) -> None:
+        if self.queue.full():
+            # Медленный клиент: отбрасываем самое старое событие, чтобы не блокировать остальных
+            self.queue.get_nowait()
+            self.dropped_count += 1
+        self.queue.put_nowait(message)
+
+
+class OrderStatusHub:
+    """In-process fan-out of order status changes to stream subscribers.
+
+    Events arrive from the broker consumer thread; each event is encoded once
+    and handed to matching subscriptions on the event loop.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._by_order: Dict[str, Set[OrderStatusSubscription]] = {}
+        self._by_customer: Dict[str, Set[OrderStatusSubscription]] = {}
+        self._all: Set[OrderStatusSubscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self.published_count = 0
+        self.logger = structlog.get_logger(self.__class__.__name__)
+
+    def subscribe(self, order_id: Optional[str] = None, customer_email: Optional[str] = None) -> OrderStatusSubscription:
+        """Register a stream client; must be called from the event loop"""
+        self._loop = asyncio.get_running_loop()
+        subscription = OrderStatusSubscription(order_id, customer_email, self.queue_size)
+        with self._lock:
+            if order_id:
+                self._by_order.setdefault(order_id, set()).add(subscription)
+            elif customer_email:
+                self._by_customer.setdefault(customer_email, set()).add(subscription)
+            else:
+                self._all.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: OrderStatusSubscription) -> None:
+        with self._lock:
+            for index, key in ((self._by_order, subscription.order_id),
+                               (self._by_customer, subscription.customer_email)):
+                subscribers = index.get(key)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del index[key]
+            self._all.discard(subscription)
+
+    def publish(self, event_data: Dict[str, Any]) -> None:
+        """Fan out a status change; safe to call from any thread"""
+        with self._lock:
+            subscriptions = (
+                self._by_order.get(event_data.get("order_id"), set())
+                | self._by_customer.get(event_data.get("customer_email"), set())
+                | self._all
+            )
+        self.published_count += 1
+        if not subscriptions or self._loop is None:
+            return
+
+        message = orjson.dumps({
+            "order_id": event_data.get("order_id"),
+            "old_status": event_data.get("old_status"),
+            "new_status": event_data.get("new_status"),
+            "timestamp": event_data.get("timestamp")
+        })
+        self._loop.call_soon_threadsafe(self._deliver, subscriptions, message)
+
+    def _deliver(self, subscriptions: Set[OrderStatusSubscription], message: bytes) -> None:
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "order_subscriptions": sum(len(s) for s in self._by_order.values()),
+                "customer_subscriptions": sum(len(s) for s in self._by_customer.values()),
+                "global_subscriptions": len(self._all),
+                "published": self.published_count
+            }
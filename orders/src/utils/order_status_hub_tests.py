@@ -0,0 +1,73 @@
+import asyncio
+import orjson
+import threading
+from utils.order_status_hub import OrderStatusHub
+
+
+def _status_event(order_id="order-1", customer_email="john@example.com"):
+    return {
+        "order_id": order_id,
+        "customer_email": customer_email,
+        "old_status": "assigned",
+        "new_status": "in_transit",
+        "timestamp": "2025-01-01T00:00:00"
+    }
+
+
+def test_event_is_delivered_to_matching_subscriptions():
+    async def scenario():
+        hub = OrderStatusHub()
+        by_order = hub.subscribe(order_id="order-1")
+        by_customer = hub.subscribe(customer_email="john@example.com")
+        other = hub.subscribe(order_id="order-2")
+
+        hub.publish(_status_event())
+        await asyncio.sleep(0)
+
+        assert orjson.loads(by_order.queue.get_nowait())["new_status"] == "in_transit"
+        assert by_customer.queue.qsize() == 1
+        assert other.queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_publish_from_consumer_thread():
+    async def scenario():
+        hub = OrderStatusHub()
+        subscription = hub.subscribe()
+
+        thread = threading.Thread(target=hub.publish, args=(_status_event(),))
+        thread.start()
+        thread.join()
+
+        message = await asyncio.wait_for(subscription.queue.get(), timeout=1)
+        assert orjson.loads(message)["order_id"] == "order-1"
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_drops_oldest_events():
+    async def scenario():
+        hub = OrderStatusHub(queue_size=2)
+        subscription = hub.subscribe(order_id="order-1")
+
+        for new_status in ["assigned", "in_transit", "delivered"]:
+            hub.publish({**_status_event(), "new_status": new_status})
+        await asyncio.sleep(0)
+
+        assert subscription.dropped_count == 1
+        assert orjson.loads(subscription.queue.get_nowait())["new_status"] == "in_transit"
+
+    asyncio.run(scenario())
+
+
+def test_unsubscribe_removes_subscription():
+    async def scenario():
+        hub = OrderStatusHub()
+        subscription = hub.subscribe(order_id="order-1")
+
+        hub.unsubscribe(subscription)
+
+        assert hub.get_stats()["order_subscriptions"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,135 @@
+import bisect
+import functools
+import json
+import math
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from shared.utils.geo import Gazetteer, road_distance_km
+
+
+class Tariff(NamedTuple):
+    """Price list; money in rubles, tiers as (lower bound, multiplier) sorted by bound"""
+    base_fare: float = 1500.0
+    per_km: float = 25.0
+    # Ступени по весу (кг) и объему (м3): применяется большая из двух надбавок
+    weight_tiers: Tuple[Tuple[float, float], ...] = ((0, 1.0), (1000, 1.2), (5000, 1.5), (10000, 1.8), (20000, 2.2))
+    volume_tiers: Tuple[Tuple[float, float], ...] = ((0, 1.0), (10, 1.1), (30, 1.3), (60, 1.6))
+    # Надбавка за тип груза как доля от тарифа; прочие типы - без надбавки
+    cargo_surcharges: Tuple[Tuple[str, float], ...] = (
+        ("electronics", 0.15), ("fragile", 0.2), ("refrigerated", 0.3), ("oversized", 0.4), ("hazardous", 0.5)
+    )
+    fuel_price_per_liter: float = 65.0
+    # Расход, если машина еще не известна, км на литр
+    default_fuel_efficiency: float = 3.0
+
+
+@functools.lru_cache(maxsize=16)
+def load_tariff(path: str = "") -> Tariff:
+    """Tariff from a JSON file with any of the Tariff fields; the default one for an empty path"""
+    if not path:
+        return Tariff()
+    with open(path, encoding="utf-8") as file:
+        values = json.load(file)
+    for field in ("weight_tiers", "volume_tiers"):
+        if field in values:
+            values[field] = tuple(sorted((float(bound), float(multiplier)) for bound, multiplier in values[field]))
+    if "cargo_surcharges" in values:
+        values["cargo_surcharges"] = tuple((str(name), float(rate)) for name, rate in values["cargo_surcharges"].items())
+    return Tariff(**values)
+
+
+class CargoQuote(NamedTuple):
+    pickup_address: str
+    delivery_address: str
+    cargo_type: str
+    cargo_weight: float
+    cargo_volume: float
+
+
+class VehicleQuote(NamedTuple):
+    fuel_efficiency: float
+    capacity_weight: float = math.inf
+    capacity_volume: float = math.inf
+
+
+class QuoteMatrix(NamedTuple):
+    distances_km: List[Optional[float]]
+    # Цена с расходом по умолчанию - для заказа без машины
+    costs: List[Optional[float]]
+    # costs_by_vehicle[i][j] - цена заказа i на машине j; None, если груз не помещается
+    costs_by_vehicle: List[List[Optional[float]]]
+
+
+class PricingEngine:
+    """Offline order prices from addresses, cargo and vehicle fuel efficiency.
+
+    price = (base_fare + per_km * distance) * tier multiplier * (1 + cargo
+    surcharge) + fuel for the distance at the vehicle's km per liter. Road
+    distance is the great-circle distance between gazetteer coordinates
+    times ``road_factor``. Distances and per-cargo multipliers are memoized,
+    and a batch is priced as two columns: the vehicle-independent part per
+    order and the fuel price per km per vehicle, combined in one pass.
+    """
+
+    def __init__(self, gazetteer: Gazetteer, tariff: Optional[Tariff] = None, road_factor: float = 1.3,
+                 cache_size: int = 100_000):
+        self.gazetteer = gazetteer
+        self.tariff = tariff or Tariff()
+        self.road_factor = road_factor
+        self._weight_bounds = [bound for bound, _ in self.tariff.weight_tiers]
+        self._weight_multipliers = [multiplier for _, multiplier in self.tariff.weight_tiers]
+        self._volume_bounds = [bound for bound, _ in self.tariff.volume_tiers]
+        self._volume_multipliers = [multiplier for _, multiplier in self.tariff.volume_tiers]
+        self._surcharges: Dict[str, float] = {name.lower(): rate for name, rate in self.tariff.cargo_surcharges}
+        self._distance = functools.lru_cache(maxsize=cache_size)(self._road_distance_km)
+        self._cargo_factor = functools.lru_cache(maxsize=cache_size)(self._multiplier)
+
+    def distance_km(self, origin: str, destination: str) -> Optional[float]:
+        """Road distance estimate, None if either address is not in the gazetteer"""
+        return self._distance(origin, destination)
+
+    def quote(self, cargo: CargoQuote, fuel_efficiency: Optional[float] = None) -> Optional[float]:
+        """Price of one order, None if an address could not be resolved"""
+        distance = self._distance(cargo.pickup_address, cargo.delivery_address)
+        if distance is None:
+            return None
+        tariff = self.tariff
+        fixed = (tariff.base_fare + tariff.per_km * distance) * self._cargo_factor(
+            cargo.cargo_type, cargo.cargo_weight, cargo.cargo_volume
+        )
+        fuel = tariff.fuel_price_per_liter / (fuel_efficiency or tariff.default_fuel_efficiency)
+        return round(fixed + fuel * distance, 2)
+
+    def quote_many(self, cargo: Sequence[CargoQuote], vehicles: Sequence[VehicleQuote] = ()) -> QuoteMatrix:
+        """Prices of every order alone and on every vehicle, in request order"""
+        tariff = self.tariff
+        base_fare, per_km = tariff.base_fare, tariff.per_km
+        default_fuel = tariff.fuel_price_per_liter / tariff.default_fuel_efficiency
+        # Столбец машин считается один раз на весь пакет
+        columns = [(tariff.fuel_price_per_liter / vehicle.fuel_efficiency, vehicle.capacity_weight,
+                    vehicle.capacity_volume) for vehicle in vehicles]
+        distance_of, factor_of = self._distance, self._cargo_factor
+        distances: List[Optional[float]] = []
+        costs: List[Optional[float]] = []
+        costs_by_vehicle: List[List[Optional[float]]] = []
+        for pickup_address, delivery_address, cargo_type, weight, volume in cargo:
+            distance = distance_of(pickup_address, delivery_address)
+            distances.append(distance)
+            if distance is None:
+                costs.append(None)
+                costs_by_vehicle.append([None] * len(columns))
+                continue
+            fixed = (base_fare + per_km * distance) * factor_of(cargo_type, weight, volume)
+            costs.append(round(fixed + default_fuel * distance, 2))
+            costs_by_vehicle.append([
+                round(fixed + fuel * distance, 2) if weight <= capacity_weight and volume <= capacity_volume else None
+                for fuel, capacity_weight, capacity_volume in columns
+            ])
+        return QuoteMatrix(distances, costs, costs_by_vehicle)
+
+    def _multiplier(self, cargo_type: str, weight: float, volume: float) -> float:
+        weight_multiplier = self._weight_multipliers[max(bisect.bisect_right(self._weight_bounds, weight) - 1, 0)]
+        volume_multiplier = self._volume_multipliers[max(bisect.bisect_right(self._volume_bounds, volume) - 1, 0)]
+        return max(weight_multiplier, volume_multiplier) * (1 + self._surcharges.get(cargo_type.lower(), 0.0))
+
+    def _road_distance_km(self, origin: str, destination: str) -> Optional[float]:
+        return road_distance_km(self.gazetteer, origin, destination, self.road_factor)
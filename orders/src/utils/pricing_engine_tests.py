@@ -0,0 +1,86 @@
+import json
+from unittest.mock import Mock
+import pytest
+from utils.pricing_engine import CargoQuote, PricingEngine, Tariff, VehicleQuote, load_tariff
+
+MOSCOW, TVER = (55.7558, 37.6173), (56.8587, 35.9176)
+
+
+class TestPricingEngine:
+
+    @pytest.fixture
+    def m_gazetteer(self):
+        gazetteer = Mock()
+        gazetteer.resolve.side_effect = lambda address: {"Moscow": MOSCOW, "Tver": TVER}.get(address)
+        return gazetteer
+
+    @pytest.fixture
+    def f_engine(self, m_gazetteer):
+        return PricingEngine(m_gazetteer, road_factor=1.0)
+
+    def test_quote_combines_distance_tiers_surcharge_and_fuel(self, f_engine):
+        # Arrange: 6 т попадает в ступень 1.5, 20 м3 - в 1.1, хрупкий груз +20%
+        cargo = CargoQuote("Moscow", "Tver", "Fragile", 6000, 20)
+        distance = f_engine.distance_km("Moscow", "Tver")
+
+        # Act
+        cost = f_engine.quote(cargo, fuel_efficiency=2.5)
+
+        # Assert
+        expected = (1500 + 25 * distance) * 1.5 * 1.2 + 65 / 2.5 * distance
+        assert cost == pytest.approx(expected, abs=0.01)
+
+    def test_quote_without_vehicle_uses_default_efficiency(self, f_engine):
+        # Arrange
+        cargo = CargoQuote("Moscow", "Tver", "general", 100, 1)
+        distance = f_engine.distance_km("Moscow", "Tver")
+
+        # Act
+        cost = f_engine.quote(cargo)
+
+        # Assert
+        assert cost == pytest.approx(1500 + 25 * distance + 65 / 3.0 * distance, abs=0.01)
+
+    def test_unknown_address_has_no_price(self, f_engine):
+        # Act / Assert
+        assert f_engine.quote(CargoQuote("Moscow", "Atlantis", "general", 100, 1)) is None
+
+    def test_quote_many_matches_single_quotes(self, f_engine, m_gazetteer):
+        # Arrange
+        cargo = [
+            CargoQuote("Moscow", "Tver", "electronics", 800, 5),
+            CargoQuote("Tver", "Moscow", "hazardous", 12000, 70),
+            CargoQuote("Moscow", "Atlantis", "general", 100, 1),
+        ]
+        vehicles = [VehicleQuote(2.5), VehicleQuote(4.0, capacity_weight=1000, capacity_volume=10)]
+
+        # Act
+        matrix = f_engine.quote_many(cargo, vehicles)
+
+        # Assert
+        assert matrix.costs == [f_engine.quote(item) for item in cargo]
+        assert matrix.costs_by_vehicle[0] == [f_engine.quote(cargo[0], 2.5), f_engine.quote(cargo[0], 4.0)]
+        # Второй груз не помещается во вторую машину
+        assert matrix.costs_by_vehicle[1] == [f_engine.quote(cargo[1], 2.5), None]
+        assert matrix.distances_km[2] is None and matrix.costs_by_vehicle[2] == [None, None]
+        # Расстояние по паре адресов считается один раз
+        assert m_gazetteer.resolve.call_count == 6
+
+    def test_load_tariff_from_json(self, tmp_path):
+        # Arrange
+        path = tmp_path / "tariff.json"
+        path.write_text(json.dumps({
+            "per_km": 30,
+            "weight_tiers": [[5000, 2.0], [0, 1.0]],
+            "cargo_surcharges": {"fragile": 0.5}
+        }))
+
+        # Act
+        tariff = load_tariff(str(path))
+
+        # Assert
+        assert tariff.per_km == 30
+        assert tariff.weight_tiers == ((0.0, 1.0), (5000.0, 2.0))
+        assert tariff.cargo_surcharges == (("fragile", 0.5),)
+        assert tariff.base_fare == Tariff().base_fare
+        assert load_tariff(str(path)) is tariff
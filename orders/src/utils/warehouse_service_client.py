@@ -1,16 +1,18 @@
 import httpx
 from config.settings import get_settings
 from typing import Optional
+from shared.utils.http_cache import ConditionalCache
 
 class WarehouseServiceClient:
+    # Общий для всех экземпляров: клиент создается на каждый запрос
+    cache = ConditionalCache()
+
     def __init__(self, base_url: str = "http://localhost:8002"):
         self.base_url = base_url
 
     def get_warehouse(self, warehouse_id: str) -> Optional[dict]:
         try:
-            response = httpx.get(f"{self.base_url}/warehouses/{warehouse_id}")
-            response.raise_for_status()
-            return response.json()
+            return self.cache.get(f"{self.base_url}/warehouses/{warehouse_id}")
         except Exception:
             return None
 
@@ -0,0 +1,74 @@
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+import msgpack
+import orjson
+
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types that are not natively supported by the codec"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def _encode_json(payload: Dict[str, Any]) -> bytes:
+    return orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _decode_json(body: bytes) -> Dict[str, Any]:
+    return orjson.loads(body)
+
+
+def _encode_msgpack(payload: Dict[str, Any]) -> bytes:
+    return msgpack.packb(payload, default=_default, use_bin_type=True)
+
+
+def _decode_msgpack(body: bytes) -> Dict[str, Any]:
+    return msgpack.unpackb(body, raw=False)
+
+
+_CODECS: Dict[str, Tuple[Callable[[Dict[str, Any]], bytes], Callable[[bytes], Dict[str, Any]]]] = {
+    JSON_CONTENT_TYPE: (_encode_json, _decode_json),
+    MSGPACK_CONTENT_TYPE: (_encode_msgpack, _decode_msgpack),
+    # Часто встречающиеся синонимы msgpack
+    "application/x-msgpack": (_encode_msgpack, _decode_msgpack),
+    "application/vnd.msgpack": (_encode_msgpack, _decode_msgpack),
+}
+
+
+def supported_content_types() -> list[str]:
+    return list(_CODECS.keys())
+
+
+def _get_codec(content_type: Optional[str]):
+    # Сообщения без content_type публиковались старыми версиями сервисов в JSON
+    key = (content_type or JSON_CONTENT_TYPE).split(";")[0].strip().lower()
+    if key not in _CODECS:
+        raise ValueError(f"Unsupported content type: {content_type}")
+    return _CODECS[key]
+
+
+def encode(payload: Dict[str, Any], content_type: str = JSON_CONTENT_TYPE) -> bytes:
+    """Serialize message payload using codec selected by content type"""
+    encoder, _ = _get_codec(content_type)
+    return encoder(payload)
+
+
+def decode(body: bytes, content_type: Optional[str] = JSON_CONTENT_TYPE) -> Dict[str, Any]:
+    """Deserialize message body using codec selected by content type"""
+    _, decoder = _get_codec(content_type)
+    return decoder(body)
@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime
+from uuid import uuid4
+from shared.events import codec
+from shared.events.models import OrderCreatedEvent
+
+
+class TestCodec:
+
+    @pytest.fixture
+    def sample_event(self):
+        return OrderCreatedEvent(
+            source_service="orders",
+            order_id=str(uuid4()),
+            customer_name="John Doe",
+            customer_email="john@example.com",
+            pickup_address="123 Pickup St",
+            delivery_address="456 Delivery Ave",
+            cargo_type="electronics",
+            cargo_weight=100.0,
+            cargo_volume=2.0
+        )
+
+    @pytest.mark.parametrize("content_type", [codec.JSON_CONTENT_TYPE, codec.MSGPACK_CONTENT_TYPE])
+    def test_roundtrip(self, sample_event, content_type):
+        # Act
+        body = codec.encode(sample_event.model_dump(), content_type)
+        decoded = codec.decode(body, content_type)
+
+        # Assert
+        restored = OrderCreatedEvent.model_validate(decoded)
+        assert restored == sample_event
+
+    def test_msgpack_is_smaller_than_json(self, sample_event):
+        # Act
+        json_body = codec.encode(sample_event.model_dump(), codec.JSON_CONTENT_TYPE)
+        msgpack_body = codec.encode(sample_event.model_dump(), codec.MSGPACK_CONTENT_TYPE)
+
+        # Assert
+        assert len(msgpack_body) < len(json_body)
+
+    def test_decode_without_content_type_falls_back_to_json(self):
+        # Act
+        decoded = codec.decode(b'{"event_type": "order_created"}', None)
+
+        # Assert
+        assert decoded == {"event_type": "order_created"}
+
+    def test_content_type_parameters_are_ignored(self):
+        # Act
+        decoded = codec.decode(b'{"a": 1}', "application/json; charset=utf-8")
+
+        # Assert
+        assert decoded == {"a": 1}
+
+    def test_encode_unsupported_types(self):
+        # Act
+        body = codec.encode({"id": uuid4(), "at": datetime(2025, 1, 1)}, codec.JSON_CONTENT_TYPE)
+
+        # Assert
+        assert codec.decode(body)["at"] == "2025-01-01T00:00:00"
+
+    def test_unsupported_content_type(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="Unsupported content type"):
+            codec.decode(b"<xml/>", "application/xml")
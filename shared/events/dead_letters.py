@@ -0,0 +1,140 @@
+"""Retry and dead-letter topology for event queues.
+
+Usage (from a service src directory):
+    python -m shared.events.dead_letters count vehicle_assigned
+    python -m shared.events.dead_letters replay vehicle_assigned --limit 100
+
+Connection settings are taken from RABBITMQ_* environment variables.
+"""
+import argparse
+import os
+from typing import Optional
+import pika
+import structlog
+
+
+ATTEMPTS_HEADER = "x-attempts"
+ERROR_HEADER = "x-error"
+
+
+def event_queue(event_type: str) -> str:
+    return f"{event_type}_queue"
+
+
+def retry_queue(event_type: str, delay_ms: int) -> str:
+    # Задержка входит в имя: TTL очереди нельзя изменить после объявления
+    return f"{event_queue(event_type)}.retry.{delay_ms}ms"
+
+
+def dead_letter_exchange(exchange: str) -> str:
+    return f"{exchange}.dlx"
+
+
+def dead_letter_queue(event_type: str) -> str:
+    return f"{event_queue(event_type)}.dead"
+
+
+def retry_delays(max_attempts: int, base_delay_ms: int) -> list[int]:
+    """Delays before each retry, growing exponentially"""
+    return [base_delay_ms * 2 ** level for level in range(max_attempts - 1)]
+
+
+class DeadLetterReplayer:
+    """Moves quarantined messages back to the event queue"""
+
+    def __init__(self, host: str, port: int, username: str, password: str):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.connection = None
+        self.channel = None
+        self.logger = structlog.get_logger(self.__class__.__name__)
+
+    def connect(self) -> None:
+        """Connect to RabbitMQ"""
+        credentials = pika.PlainCredentials(self.username, self.password)
+        parameters = pika.ConnectionParameters(
+            host=self.host,
+            port=self.port,
+            credentials=credentials
+        )
+        self.connection = pika.BlockingConnection(parameters)
+        self.channel = self.connection.channel()
+
+    def disconnect(self) -> None:
+        """Disconnect from RabbitMQ"""
+        if self.connection and not self.connection.is_closed:
+            self.connection.close()
+
+    def count(self, event_type: str) -> int:
+        """Number of messages waiting in the dead-letter queue"""
+        if not self.connection or self.connection.is_closed:
+            self.connect()
+
+        result = self.channel.queue_declare(queue=dead_letter_queue(event_type), passive=True)
+        return result.method.message_count
+
+    def replay(self, event_type: str, limit: Optional[int] = None) -> int:
+        """Republish dead-lettered messages to the event queue with a fresh attempt counter.
+
+        At most the messages queued when the call starts are replayed.
+        """
+        # Только сообщения, лежавшие в очереди на момент вызова: событие, которое подписчик
+        # сразу вернет в карантин, иначе будет пересылаться по кругу
+        pending = self.count(event_type)
+        if limit is not None:
+            pending = min(pending, limit)
+
+        replayed = 0
+        while replayed < pending:
+            method, properties, body = self.channel.basic_get(queue=dead_letter_queue(event_type))
+            if method is None:
+                break
+
+            headers = dict(properties.headers or {})
+            headers.pop(ATTEMPTS_HEADER, None)
+            headers.pop(ERROR_HEADER, None)
+
+            # Публикуем напрямую в очередь сервиса, чтобы не доставить событие другим подписчикам
+            self.channel.basic_publish(
+                exchange='',
+                routing_key=event_queue(event_type),
+                body=body,
+                properties=pika.BasicProperties(
+                    delivery_mode=2,
+                    content_type=properties.content_type,
+                    headers=headers
+                )
+            )
+            self.channel.basic_ack(delivery_tag=method.delivery_tag)
+            replayed += 1
+
+        self.logger.info("Dead-lettered events replayed", event_type=event_type, count=replayed)
+        return replayed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect and replay dead-lettered events")
+    parser.add_argument("command", choices=["count", "replay"])
+    parser.add_argument("event_type")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    replayer = DeadLetterReplayer(
+        host=os.getenv("RABBITMQ_HOST", "rabbitmq"),
+        port=int(os.getenv("RABBITMQ_PORT", "5672")),
+        username=os.getenv("RABBITMQ_USER", "guest"),
+        password=os.getenv("RABBITMQ_PASSWORD", "guest")
+    )
+    try:
+        if args.command == "count":
+            print(replayer.count(args.event_type))
+        else:
+            print(replayer.replay(args.event_type, args.limit))
+    finally:
+        replayer.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from unittest.mock import Mock
+from shared.events.dead_letters import DeadLetterReplayer, retry_delays
+
+
+def test_retry_delays_grow_exponentially():
+    assert retry_delays(5, 1000) == [1000, 2000, 4000, 8000]
+
+
+def test_single_attempt_has_no_retries():
+    assert retry_delays(1, 1000) == []
+
+
+def test_replay_moves_messages_to_event_queue():
+    # Arrange
+    replayer = DeadLetterReplayer("localhost", 5672, "guest", "guest")
+    replayer.connection = Mock(is_closed=False)
+    replayer.channel = Mock()
+    replayer.channel.queue_declare.return_value.method.message_count = 3
+    properties = Mock(content_type="application/json", headers={"x-attempts": 5, "x-error": "boom"})
+    replayer.channel.basic_get.side_effect = [
+        (Mock(delivery_tag=1), properties, b"{}"),
+        (Mock(delivery_tag=2), properties, b"{}"),
+        (None, None, None)
+    ]
+
+    # Act
+    replayed = replayer.replay("vehicle_assigned")
+
+    # Assert
+    assert replayed == 2
+    publish_kwargs = replayer.channel.basic_publish.call_args.kwargs
+    assert publish_kwargs["routing_key"] == "vehicle_assigned_queue"
+    assert publish_kwargs["properties"].headers == {}
+    assert replayer.channel.basic_ack.call_count == 2
+
+
+def test_replay_respects_limit():
+    # Arrange
+    replayer = DeadLetterReplayer("localhost", 5672, "guest", "guest")
+    replayer.connection = Mock(is_closed=False)
+    replayer.channel = Mock()
+    replayer.channel.queue_declare.return_value.method.message_count = 10
+    replayer.channel.basic_get.return_value = (Mock(delivery_tag=1), Mock(headers=None), b"{}")
+
+    # Act & Assert
+    assert replayer.replay("vehicle_assigned", limit=3) == 3
+
+
+def test_replay_stops_at_queued_count():
+    # Arrange: каждое отправленное сообщение сразу возвращается в карантин
+    replayer = DeadLetterReplayer("localhost", 5672, "guest", "guest")
+    replayer.connection = Mock(is_closed=False)
+    replayer.channel = Mock()
+    replayer.channel.queue_declare.return_value.method.message_count = 2
+    replayer.channel.basic_get.return_value = (Mock(delivery_tag=1), Mock(headers=None), b"{}")
+
+    # Act
+    replayed = replayer.replay("vehicle_assigned")
+
+    # Assert
+    assert replayed == 2
+    replayer.channel.queue_declare.assert_called_once_with(queue="vehicle_assigned_queue.dead", passive=True)
@@ -0,0 +1,93 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional
+import structlog
+
+
+class ProcessedEventStore(ABC):
+    """Persistent store of processed event ids"""
+
+    @abstractmethod
+    def is_processed(self, event_id: str) -> bool:
+        """Returns True if the event was already recorded as handled"""
+        pass
+
+    @abstractmethod
+    def mark_processed(self, event_id: str, event_type: str) -> bool:
+        """Record the event as handled. Returns False if it was already recorded"""
+        pass
+
+
+class EventDeduplicator:
+    """Skips events that were already handled.
+
+    Recently seen event ids are kept in a bounded LRU cache so redeliveries
+    are dropped without a database round trip; the persistent store catches
+    duplicates that fell out of the cache or were handled by another instance.
+    An event is recorded only after its handler succeeded, so a crash in
+    between leads to one more delivery rather than a lost event.
+    """
+
+    def __init__(self, store: Optional[ProcessedEventStore] = None, capacity: int = 10000):
+        self.store = store
+        self.capacity = capacity
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = Lock()
+        self.processed_count = 0
+        self.duplicate_count = 0
+        self.cache_hit_count = 0
+        self.logger = structlog.get_logger(self.__class__.__name__)
+
+    def is_duplicate(self, event_id: Optional[str], event_type: str) -> bool:
+        """Returns True if the event was already handled and should be skipped"""
+        if not event_id:
+            # Без идентификатора дубликат распознать невозможно
+            return False
+
+        with self._lock:
+            if event_id in self._recent:
+                self._recent.move_to_end(event_id)
+                self.cache_hit_count += 1
+                self._register_duplicate(event_id, event_type)
+                return True
+
+        if self.store is not None and self.store.is_processed(event_id):
+            with self._lock:
+                self._remember(event_id)
+                self._register_duplicate(event_id, event_type)
+            return True
+        return False
+
+    def mark_processed(self, event_id: Optional[str], event_type: str) -> None:
+        """Record the event after its handler succeeded"""
+        if not event_id:
+            return
+
+        with self._lock:
+            self._remember(event_id)
+            self.processed_count += 1
+
+        if self.store is not None:
+            self.store.mark_processed(event_id, event_type)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.processed_count + self.duplicate_count
+            return {
+                "processed": self.processed_count,
+                "duplicates": self.duplicate_count,
+                "duplicate_cache_hits": self.cache_hit_count,
+                "duplicate_rate": self.duplicate_count / total if total else 0.0,
+                "cached_event_ids": len(self._recent)
+            }
+
+    def _remember(self, event_id: str) -> None:
+        self._recent[event_id] = None
+        self._recent.move_to_end(event_id)
+        if len(self._recent) > self.capacity:
+            self._recent.popitem(last=False)
+
+    def _register_duplicate(self, event_id: str, event_type: str) -> None:
+        self.duplicate_count += 1
+        self.logger.info("Duplicate event skipped", event_id=event_id, event_type=event_type)
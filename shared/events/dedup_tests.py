@@ -0,0 +1,82 @@
+import pytest
+from unittest.mock import Mock
+from uuid import uuid4
+from shared.events.dedup import EventDeduplicator
+
+
+class TestEventDeduplicator:
+
+    @pytest.fixture
+    def m_store(self):
+        store = Mock()
+        store.is_processed.return_value = False
+        return store
+
+    @pytest.fixture
+    def deduplicator(self, m_store):
+        return EventDeduplicator(m_store, capacity=2)
+
+    def test_first_delivery_is_handled(self, deduplicator, m_store):
+        # Act & Assert
+        assert deduplicator.is_duplicate("event-1", "order_created") is False
+        m_store.is_processed.assert_called_once_with("event-1")
+        m_store.mark_processed.assert_not_called()
+
+    def test_recent_duplicate_skips_store(self, deduplicator, m_store):
+        # Arrange
+        deduplicator.mark_processed("event-1", "order_created")
+
+        # Act & Assert
+        assert deduplicator.is_duplicate("event-1", "order_created") is True
+        m_store.is_processed.assert_not_called()
+        m_store.mark_processed.assert_called_once_with("event-1", "order_created")
+        assert deduplicator.get_stats()["duplicate_cache_hits"] == 1
+
+    def test_duplicate_detected_by_store(self, deduplicator, m_store):
+        # Arrange
+        m_store.is_processed.return_value = True
+
+        # Act & Assert
+        assert deduplicator.is_duplicate("event-1", "order_created") is True
+        assert deduplicator.get_stats()["duplicates"] == 1
+        # Повтор отсекается кэшем без обращения к БД
+        assert deduplicator.is_duplicate("event-1", "order_created") is True
+        assert m_store.is_processed.call_count == 1
+
+    def test_cache_is_bounded(self, deduplicator, m_store):
+        # Act
+        for _ in range(5):
+            deduplicator.mark_processed(str(uuid4()), "order_created")
+
+        # Assert
+        assert deduplicator.get_stats()["cached_event_ids"] == 2
+
+    def test_unmarked_event_is_handled_again(self, deduplicator, m_store):
+        # Arrange: обработчик упал до отметки
+        deduplicator.is_duplicate("event-1", "order_created")
+
+        # Act & Assert
+        assert deduplicator.is_duplicate("event-1", "order_created") is False
+        assert deduplicator.get_stats()["processed"] == 0
+
+    def test_event_without_id_is_always_handled(self, deduplicator, m_store):
+        # Act
+        deduplicator.mark_processed(None, "order_created")
+
+        # Assert
+        assert deduplicator.is_duplicate(None, "order_created") is False
+        m_store.is_processed.assert_not_called()
+        m_store.mark_processed.assert_not_called()
+
+    def test_duplicate_rate(self):
+        # Arrange
+        deduplicator = EventDeduplicator()
+        deduplicator.mark_processed("event-1", "order_created")
+        deduplicator.is_duplicate("event-1", "order_created")
+
+        # Act
+        stats = deduplicator.get_stats()
+
+        # Assert
+        assert stats["processed"] == 1
+        assert stats["duplicate_rate"] == 0.5
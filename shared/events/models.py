@@ -1,15 +1,21 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, Type
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
+
+
+# Версия схемы событий. Увеличивается при несовместимых изменениях полей;
+# добавление необязательных полей версию не меняет.
+SCHEMA_VERSION = 1
 
 
 class BaseEvent(BaseModel):
-    event_id: str
+    event_id: str = Field(default_factory=lambda: str(uuid4()))
     event_type: str
-    timestamp: datetime
+    schema_version: int = SCHEMA_VERSION
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
     source_service: str
-    data: Dict[str, Any]
+    data: Dict[str, Any] = Field(default_factory=dict)
 
 
 class OrderCreatedEvent(BaseEvent):
@@ -45,4 +51,26 @@ class OrderStatusUpdatedEvent(BaseEvent):
     event_type: str = "order_status_updated"
     order_id: str
     status: str  # "pending", "assigned", "in_transit", "delivered", "cancelled"
-    updated_at: datetime 
\ No newline at end of file
+    updated_at: datetime
+
+
+class OrderStatusChangedEvent(BaseEvent):
+    event_type: str = "order.status_changed"
+    order_id: str
+    old_status: str
+    new_status: str
+    customer_email: str
+
+
+EVENT_MODELS: Dict[str, Type[BaseEvent]] = {
+    "order_created": OrderCreatedEvent,
+    "vehicle_assigned": VehicleAssignedEvent,
+    "no_vehicle_available": NoVehicleAvailableEvent,
+    "order_status_updated": OrderStatusUpdatedEvent,
+    "order.status_changed": OrderStatusChangedEvent,
+}
+
+
+def get_event_model(event_type: str) -> Optional[Type[BaseEvent]]:
+    """Get event model registered for the event type"""
+    return EVENT_MODELS.get(event_type)
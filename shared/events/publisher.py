@@ -1,16 +1,21 @@
-import json
 import pika
-from typing import Any, Dict
+from typing import Any, Dict, Union
 import structlog
+from shared.events import codec
+from shared.events.models import BaseEvent, SCHEMA_VERSION
 
 
 class Publisher:
-    def __init__(self, host: str, port: int, username: str, password: str, exchange: str):
+    def __init__(self, host: str, port: int, username: str, password: str, exchange: str,
+                 content_type: str = codec.JSON_CONTENT_TYPE):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.exchange = exchange
+        if content_type not in codec.supported_content_types():
+            raise ValueError(f"Unsupported content type: {content_type}")
+        self.content_type = content_type
         self.connection = None
         self.channel = None
         self.logger = structlog.get_logger(self.__class__.__name__)
@@ -37,7 +42,7 @@ class Publisher:
             self.connection.close()
             self.logger.info("Disconnected from RabbitMQ")
     
-    def publish(self, event_type: str, event_data: Dict[str, Any]) -> None:
+    def publish(self, event_type: str, event_data: Union[BaseEvent, Dict[str, Any]]) -> None:
         """Publish an event to RabbitMQ"""
         if not self.connection or self.connection.is_closed:
             self.connect()
@@ -51,24 +56,38 @@ class Publisher:
             )
             
             # Prepare message
-            message = {
-                'event_type': event_type,
-                'event_data': event_data,
-                'timestamp': str(event_data.get('timestamp', ''))
-            }
+            message = self._build_message(event_type, event_data)
             
             # Publish message
             self.channel.basic_publish(
                 exchange='cargo_track_events',
                 routing_key=event_type,
-                body=json.dumps(message),
+                body=codec.encode(message, self.content_type),
                 properties=pika.BasicProperties(
                     delivery_mode=2,  # make message persistent
-                    content_type='application/json'
+                    content_type=self.content_type,
+                    headers={'schema_version': message['schema_version']}
                 )
             )
             
             self.logger.info("Event published", event_type=event_type)
         except Exception as e:
             self.logger.error("Failed to publish event", event_type=event_type, error=str(e))
-            raise 
\ No newline at end of file
+            raise
+    
+    def _build_message(self, event_type: str, event_data: Union[BaseEvent, Dict[str, Any]]) -> Dict[str, Any]:
+        """Wrap event data into the message envelope"""
+        if isinstance(event_data, BaseEvent):
+            schema_version = event_data.schema_version
+            timestamp = event_data.timestamp.isoformat()
+            event_data = event_data.model_dump()
+        else:
+            schema_version = event_data.get('schema_version', SCHEMA_VERSION)
+            timestamp = str(event_data.get('timestamp', ''))
+        
+        return {
+            'event_type': event_type,
+            'schema_version': schema_version,
+            'event_data': event_data,
+            'timestamp': timestamp
+        }
@@ -1,12 +1,26 @@
-import json
 import pika
 import threading
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Callable, Optional
 import structlog
+from pydantic import ValidationError
+from shared.events import codec
+from shared.events.dead_letters import (
+    ATTEMPTS_HEADER,
+    ERROR_HEADER,
+    event_queue,
+    retry_queue,
+    retry_delays,
+    dead_letter_exchange,
+    dead_letter_queue
+)
+from shared.events.dedup import EventDeduplicator
+from shared.events.models import SCHEMA_VERSION, get_event_model
 
 
 class Subscriber:
-    def __init__(self, host: str, port: int, username: str, password: str, exchange: str, queue: str, routing_keys: list[str]):
+    def __init__(self, host: str, port: int, username: str, password: str, exchange: str, queue: str, routing_keys: list[str],
+                 deduplicator: Optional[EventDeduplicator] = None,
+                 max_attempts: int = 5, retry_base_delay_ms: int = 1000):
         self.host = host
         self.port = port
         self.username = username
@@ -20,6 +34,13 @@ class Subscriber:
         self._thread = None
         self.handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
         self.is_listening = False
+        self.deduplicator = deduplicator
+        self.max_attempts = max_attempts
+        self.retry_delays = retry_delays(max_attempts, retry_base_delay_ms)
+        self.delivery_stats: Dict[str, Dict[str, int]] = {}
+        self._consumer_event_types: Dict[str, str] = {}
+        self._queues: Dict[str, str] = {}
+        self._broadcast_event_types: set[str] = set()
         self.logger = structlog.get_logger(self.__class__.__name__)
     
     def connect(self) -> None:
@@ -52,15 +73,25 @@ class Subscriber:
             self.connection.close()
             self.logger.info("Disconnected from RabbitMQ")
     
-    def subscribe(self, event_type: str, handler: Callable[[Dict[str, Any]], None]) -> None:
-        """Subscribe to an event type with a handler function"""
+    def subscribe(self, event_type: str, handler: Callable[[Dict[str, Any]], None], broadcast: bool = False) -> None:
+        """Subscribe to an event type with a handler function.
+        
+        Regular subscriptions share a durable queue, so each event is handled by
+        one instance of the service. Broadcast subscriptions get an exclusive
+        queue per connection, so every instance receives every event.
+        """
         if not self.connection or self.connection.is_closed:
             self.connect()
         
         try:
             # Declare queue
-            queue_name = f"{event_type}_queue"
-            self.channel.queue_declare(queue=queue_name, durable=True)
+            if broadcast:
+                result = self.channel.queue_declare(queue='', exclusive=True, auto_delete=True)
+                queue_name = result.method.queue
+                self._broadcast_event_types.add(event_type)
+            else:
+                queue_name = event_queue(event_type)
+                self.channel.queue_declare(queue=queue_name, durable=True)
             
             # Bind queue to exchange
             self.channel.queue_bind(
@@ -69,7 +100,11 @@ class Subscriber:
                 routing_key=event_type
             )
             
+            if not broadcast:
+                self._declare_retry_topology(event_type)
+            
             # Store handler
+            self._queues[event_type] = queue_name
             self.handlers[event_type] = handler
             
             self.logger.info("Subscribed to event", event_type=event_type)
@@ -83,24 +118,174 @@ class Subscriber:
             del self.handlers[event_type]
             self.logger.info("Unsubscribed from event", event_type=event_type)
     
+    def _declare_retry_topology(self, event_type: str) -> None:
+        """Declare retry queues with growing TTL and a dead-letter queue for the event type"""
+        for delay_ms in self.retry_delays:
+            # По истечении TTL сообщение возвращается в основную очередь через default exchange
+            self.channel.queue_declare(
+                queue=retry_queue(event_type, delay_ms),
+                durable=True,
+                arguments={
+                    'x-message-ttl': delay_ms,
+                    'x-dead-letter-exchange': '',
+                    'x-dead-letter-routing-key': event_queue(event_type)
+                }
+            )
+        
+        dlx = dead_letter_exchange(self.exchange)
+        self.channel.exchange_declare(exchange=dlx, exchange_type='direct', durable=True)
+        self.channel.queue_declare(queue=dead_letter_queue(event_type), durable=True)
+        self.channel.queue_bind(exchange=dlx, queue=dead_letter_queue(event_type), routing_key=event_type)
+    
     def _message_handler(self, ch, method, properties, body) -> None:
         """Handle incoming messages"""
+        event_type = self._consumer_event_types.get(method.consumer_tag)
         try:
-            message = json.loads(body)
-            event_type = message.get('event_type')
-            event_data = message.get('event_data', {})
-            
-            if event_type in self.handlers:
-                self.handlers[event_type](event_data)
+            message = codec.decode(body, getattr(properties, 'content_type', None))
+            if not isinstance(message, dict):
+                raise ValueError("Event message must be an object")
+            event_type = event_type or message.get('event_type')
+            event_data = self._validate_event(event_type, message)
+        except (ValueError, ValidationError) as e:
+            # Сообщение невозможно разобрать - повторная доставка не поможет
+            self.logger.error("Invalid message rejected", error=str(e))
+            self._dead_letter(ch, method, properties, body, event_type or "unknown", str(e))
+            return
+        
+        if event_type not in self.handlers:
+            self.logger.warning("No handler found for event", event_type=event_type)
+            self._dead_letter(ch, method, properties, body, event_type, "no handler")
+            return
+        
+        if event_type in self._broadcast_event_types:
+            self._handle_broadcast(ch, method, event_type, event_data)
+            return
+        
+        event_id = event_data.get('event_id')
+        if self.deduplicator:
+            try:
+                duplicate = self.deduplicator.is_duplicate(event_id, event_type)
+            except Exception as e:
+                # Хранилище недоступно - сообщение повторяется позже, а не обрабатывается вслепую
+                self.logger.error("Deduplication check failed", event_type=event_type, error=str(e))
+                self._retry(ch, method, properties, body, event_type, f"deduplication check failed: {e}")
+                return
+            if duplicate:
                 ch.basic_ack(delivery_tag=method.delivery_tag)
-                self.logger.info("Message processed", event_type=event_type)
-            else:
-                self.logger.warning("No handler found for event", event_type=event_type)
-                ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+                return
+        
+        try:
+            self.handlers[event_type](event_data)
+        except Exception as e:
+            self.logger.error("Error processing message", event_type=event_type, error=str(e))
+            self._retry(ch, method, properties, body, event_type, str(e))
+            return
+        
+        # Событие отмечается только после успешной обработки: если процесс упадет раньше,
+        # сообщение будет доставлено и обработано еще раз, но не потеряется
+        if self.deduplicator:
+            try:
+                self.deduplicator.mark_processed(event_id, event_type)
+            except Exception as e:
+                # Событие уже обработано; без отметки в БД возможна лишь повторная обработка дубликата
+                self.logger.error("Failed to record processed event", event_type=event_type, error=str(e))
+        ch.basic_ack(delivery_tag=method.delivery_tag)
+        self._count(event_type, "processed")
+        self.logger.info("Message processed", event_type=event_type)
+    
+    def _handle_broadcast(self, ch, method, event_type: str, event_data: Dict[str, Any]) -> None:
+        """Handle event from an exclusive queue: no deduplication and no retries"""
+        try:
+            self.handlers[event_type](event_data)
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            self._count(event_type, "processed")
+        except Exception as e:
+            # Очередь принадлежит только этому экземпляру, повторять доставку некуда
+            self.logger.error("Error processing broadcast message", event_type=event_type, error=str(e))
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+    
+    def _retry(self, ch, method, properties, body, event_type: str, error: str) -> None:
+        """Schedule redelivery with exponential backoff or quarantine after max attempts"""
+        headers = dict(getattr(properties, 'headers', None) or {})
+        attempt = int(headers.get(ATTEMPTS_HEADER, 1))
+        if attempt >= self.max_attempts:
+            self._dead_letter(ch, method, properties, body, event_type, error)
+            return
+        
+        delay_ms = self.retry_delays[attempt - 1]
+        headers[ATTEMPTS_HEADER] = attempt + 1
+        headers[ERROR_HEADER] = error
+        try:
+            ch.basic_publish(
+                exchange='',
+                routing_key=retry_queue(event_type, delay_ms),
+                body=body,
+                properties=pika.BasicProperties(
+                    delivery_mode=2,
+                    content_type=getattr(properties, 'content_type', None),
+                    headers=headers
+                )
+            )
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            self._count(event_type, "retried")
+            self.logger.warning("Message scheduled for retry",
+                                event_type=event_type, attempt=attempt, delay_ms=delay_ms)
         except Exception as e:
-            self.logger.error("Error processing message", error=str(e))
+            self.logger.error("Failed to schedule retry", event_type=event_type, error=str(e))
             ch.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
     
+    def _dead_letter(self, ch, method, properties, body, event_type: str, error: str) -> None:
+        """Move message to the dead-letter exchange"""
+        headers = dict(getattr(properties, 'headers', None) or {})
+        headers[ERROR_HEADER] = error
+        try:
+            ch.basic_publish(
+                exchange=dead_letter_exchange(self.exchange),
+                routing_key=event_type,
+                body=body,
+                properties=pika.BasicProperties(
+                    delivery_mode=2,
+                    content_type=getattr(properties, 'content_type', None),
+                    headers=headers
+                )
+            )
+            ch.basic_ack(delivery_tag=method.delivery_tag)
+            self._count(event_type, "dead_lettered")
+            self.logger.error("Message moved to dead-letter queue", event_type=event_type, error=error)
+        except Exception as e:
+            self.logger.error("Failed to dead-letter message", event_type=event_type, error=str(e))
+            ch.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+    
+    def _count(self, event_type: str, outcome: str) -> None:
+        stats = self.delivery_stats.setdefault(event_type, {"processed": 0, "retried": 0, "dead_lettered": 0})
+        stats[outcome] += 1
+    
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Delivery outcome counters per event type"""
+        return {event_type: dict(stats) for event_type, stats in self.delivery_stats.items()}
+    
+    def _validate_event(self, event_type: str, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate event data against the registered event model"""
+        event_data = message.get('event_data', {})
+        if not isinstance(event_data, dict):
+            raise ValueError("Event data must be an object")
+        model = get_event_model(event_type)
+        if model is None:
+            return event_data
+        
+        schema_version = message.get('schema_version', event_data.get('schema_version', SCHEMA_VERSION))
+        # bool - подкласс int, но версией схемы не является
+        if not isinstance(schema_version, int) or isinstance(schema_version, bool):
+            raise ValueError(f"Invalid schema version: {schema_version!r}")
+        if schema_version > SCHEMA_VERSION:
+            # Новые необязательные поля игнорируются, обязательные проверит модель
+            self.logger.warning("Event schema is newer than supported",
+                                event_type=event_type,
+                                schema_version=schema_version,
+                                supported_version=SCHEMA_VERSION)
+        
+        return model.model_validate(event_data).model_dump()
+    
     def start_listening(self) -> None:
         """Start listening for events"""
         if not self.connection or self.connection.is_closed:
@@ -115,12 +300,12 @@ class Subscriber:
             
             # Set up consumers for all subscribed events
             for event_type in self.handlers.keys():
-                queue_name = f"{event_type}_queue"
-                self.channel.basic_consume(
-                    queue=queue_name,
+                consumer_tag = self.channel.basic_consume(
+                    queue=self._queues.get(event_type, event_queue(event_type)),
                     on_message_callback=self._message_handler,
                     auto_ack=False
                 )
+                self._consumer_event_types[consumer_tag] = event_type
             
             self.logger.info("Started listening for events")
             
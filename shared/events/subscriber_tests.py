@@ -0,0 +1,264 @@
+import pytest
+from unittest.mock import Mock
+from uuid import uuid4
+from shared.events import codec
+from shared.events.dedup import EventDeduplicator
+from shared.events.models import SCHEMA_VERSION
+from shared.events.publisher import Publisher
+from shared.events.subscriber import Subscriber
+
+
+class TestSubscriber:
+
+    @pytest.fixture
+    def subscriber(self):
+        return Subscriber("localhost", 5672, "guest", "guest", "cargo_track_events",
+                          "test_queue", ["no_vehicle_available"])
+
+    @pytest.fixture
+    def m_channel(self):
+        return Mock()
+
+    @pytest.fixture
+    def m_method(self):
+        return Mock(delivery_tag=1)
+
+    def _build_body(self, event_data, content_type=codec.JSON_CONTENT_TYPE, schema_version=SCHEMA_VERSION):
+        message = {
+            "event_type": "no_vehicle_available",
+            "schema_version": schema_version,
+            "event_data": event_data,
+            "timestamp": ""
+        }
+        return codec.encode(message, content_type)
+
+    @pytest.mark.parametrize("content_type", [codec.JSON_CONTENT_TYPE, codec.MSGPACK_CONTENT_TYPE])
+    def test_valid_event_is_dispatched(self, subscriber, m_channel, m_method, content_type):
+        # Arrange
+        handler = Mock()
+        subscriber.handlers["no_vehicle_available"] = handler
+        order_id = str(uuid4())
+        body = self._build_body({"source_service": "fleet", "order_id": order_id, "reason": "no_drivers"},
+                                content_type)
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, Mock(content_type=content_type), body)
+
+        # Assert
+        handler.assert_called_once()
+        event_data = handler.call_args[0][0]
+        assert event_data["order_id"] == order_id
+        assert event_data["reason"] == "no_drivers"
+        assert event_data["schema_version"] == SCHEMA_VERSION
+        m_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+    def test_invalid_event_is_dead_lettered(self, subscriber, m_channel, m_method):
+        # Arrange
+        handler = Mock()
+        subscriber.handlers["no_vehicle_available"] = handler
+        body = self._build_body({"source_service": "fleet", "reason": "no_drivers"})
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, Mock(content_type=codec.JSON_CONTENT_TYPE, headers=None), body)
+
+        # Assert
+        handler.assert_not_called()
+        publish_kwargs = m_channel.basic_publish.call_args.kwargs
+        assert publish_kwargs["exchange"] == "cargo_track_events.dlx"
+        assert publish_kwargs["routing_key"] == "no_vehicle_available"
+        m_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+        assert subscriber.get_stats()["no_vehicle_available"]["dead_lettered"] == 1
+
+    @pytest.mark.parametrize("message", [
+        {"event_type": "no_vehicle_available", "schema_version": "2", "event_data": {}},
+        {"event_type": "no_vehicle_available", "schema_version": SCHEMA_VERSION, "event_data": ["order"]},
+        ["no_vehicle_available"]
+    ])
+    def test_malformed_message_is_dead_lettered(self, subscriber, m_channel, m_method, message):
+        # Arrange
+        handler = Mock()
+        subscriber.handlers["no_vehicle_available"] = handler
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, Mock(content_type=codec.JSON_CONTENT_TYPE, headers=None),
+                                    codec.encode(message))
+
+        # Assert
+        handler.assert_not_called()
+        assert m_channel.basic_publish.call_args.kwargs["exchange"] == "cargo_track_events.dlx"
+        m_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+    def test_failed_event_is_scheduled_for_retry(self, subscriber, m_channel, m_method):
+        # Arrange
+        subscriber.handlers["no_vehicle_available"] = Mock(side_effect=RuntimeError("db is down"))
+        body = self._build_body({"source_service": "fleet", "order_id": str(uuid4()), "reason": "no_drivers"})
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, Mock(content_type=codec.JSON_CONTENT_TYPE, headers={}), body)
+
+        # Assert
+        publish_kwargs = m_channel.basic_publish.call_args.kwargs
+        assert publish_kwargs["exchange"] == ""
+        assert publish_kwargs["routing_key"] == "no_vehicle_available_queue.retry.1000ms"
+        assert publish_kwargs["properties"].headers["x-attempts"] == 2
+        m_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+        m_channel.basic_nack.assert_not_called()
+
+    def test_retry_backoff_grows_exponentially(self, subscriber, m_channel, m_method):
+        # Arrange
+        subscriber.handlers["no_vehicle_available"] = Mock(side_effect=RuntimeError("db is down"))
+        body = self._build_body({"source_service": "fleet", "order_id": str(uuid4()), "reason": "no_drivers"})
+
+        # Act
+        subscriber._message_handler(m_channel, m_method,
+                                    Mock(content_type=codec.JSON_CONTENT_TYPE, headers={"x-attempts": 3}), body)
+
+        # Assert
+        assert m_channel.basic_publish.call_args.kwargs["routing_key"] == "no_vehicle_available_queue.retry.4000ms"
+
+    def test_event_is_dead_lettered_after_max_attempts(self, subscriber, m_channel, m_method):
+        # Arrange
+        subscriber.handlers["no_vehicle_available"] = Mock(side_effect=RuntimeError("db is down"))
+        body = self._build_body({"source_service": "fleet", "order_id": str(uuid4()), "reason": "no_drivers"})
+        headers = {"x-attempts": subscriber.max_attempts}
+
+        # Act
+        subscriber._message_handler(m_channel, m_method,
+                                    Mock(content_type=codec.JSON_CONTENT_TYPE, headers=headers), body)
+
+        # Assert
+        publish_kwargs = m_channel.basic_publish.call_args.kwargs
+        assert publish_kwargs["exchange"] == "cargo_track_events.dlx"
+        assert publish_kwargs["properties"].headers["x-error"] == "db is down"
+        m_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+    def test_newer_schema_with_extra_fields_is_accepted(self, subscriber, m_channel, m_method):
+        # Arrange
+        handler = Mock()
+        subscriber.handlers["no_vehicle_available"] = handler
+        body = self._build_body({"source_service": "fleet", "order_id": str(uuid4()),
+                                 "reason": "no_drivers", "new_field": 1},
+                                schema_version=SCHEMA_VERSION + 1)
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, Mock(content_type=codec.JSON_CONTENT_TYPE), body)
+
+        # Assert
+        handler.assert_called_once()
+        m_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+    def test_duplicate_event_is_acked_without_handling(self, subscriber, m_channel, m_method):
+        # Arrange
+        handler = Mock()
+        subscriber.handlers["no_vehicle_available"] = handler
+        subscriber.deduplicator = EventDeduplicator()
+        body = self._build_body({"event_id": str(uuid4()), "source_service": "fleet",
+                                 "order_id": str(uuid4()), "reason": "no_drivers"})
+        properties = Mock(content_type=codec.JSON_CONTENT_TYPE, headers={})
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, properties, body)
+        subscriber._message_handler(m_channel, m_method, properties, body)
+
+        # Assert
+        handler.assert_called_once()
+        assert m_channel.basic_ack.call_count == 2
+
+    def test_failed_event_is_not_marked_processed(self, subscriber, m_channel, m_method):
+        # Arrange
+        handler = Mock(side_effect=[RuntimeError("db is down"), None])
+        subscriber.handlers["no_vehicle_available"] = handler
+        m_store = Mock()
+        m_store.is_processed.return_value = False
+        subscriber.deduplicator = EventDeduplicator(m_store)
+        event_id = str(uuid4())
+        body = self._build_body({"event_id": event_id, "source_service": "fleet",
+                                 "order_id": str(uuid4()), "reason": "no_drivers"})
+        properties = Mock(content_type=codec.JSON_CONTENT_TYPE, headers={})
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, properties, body)
+        m_store.mark_processed.assert_not_called()
+        subscriber._message_handler(m_channel, m_method, properties, body)
+
+        # Assert
+        assert handler.call_count == 2
+        m_store.mark_processed.assert_called_once_with(event_id, "no_vehicle_available")
+        assert m_channel.basic_ack.call_count == 2
+        assert subscriber.get_stats()["no_vehicle_available"] == {"processed": 1, "retried": 1, "dead_lettered": 0}
+
+    def test_dedup_store_failure_schedules_retry(self, subscriber, m_channel, m_method):
+        # Arrange
+        handler = Mock()
+        subscriber.handlers["no_vehicle_available"] = handler
+        m_store = Mock()
+        m_store.is_processed.side_effect = RuntimeError("db is down")
+        subscriber.deduplicator = EventDeduplicator(m_store)
+        body = self._build_body({"event_id": str(uuid4()), "source_service": "fleet",
+                                 "order_id": str(uuid4()), "reason": "no_drivers"})
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, Mock(content_type=codec.JSON_CONTENT_TYPE, headers={}), body)
+
+        # Assert
+        handler.assert_not_called()
+        assert m_channel.basic_publish.call_args.kwargs["routing_key"] == "no_vehicle_available_queue.retry.1000ms"
+        m_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+    def test_mark_failure_still_acks_handled_event(self, subscriber, m_channel, m_method):
+        # Arrange
+        handler = Mock()
+        subscriber.handlers["no_vehicle_available"] = handler
+        m_store = Mock()
+        m_store.is_processed.return_value = False
+        m_store.mark_processed.side_effect = RuntimeError("db is down")
+        subscriber.deduplicator = EventDeduplicator(m_store)
+        body = self._build_body({"event_id": str(uuid4()), "source_service": "fleet",
+                                 "order_id": str(uuid4()), "reason": "no_drivers"})
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, Mock(content_type=codec.JSON_CONTENT_TYPE, headers={}), body)
+
+        # Assert
+        handler.assert_called_once()
+        m_channel.basic_publish.assert_not_called()
+        m_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+    def test_broadcast_subscription_uses_exclusive_queue(self, subscriber):
+        # Arrange
+        subscriber.connection = Mock(is_closed=False)
+        subscriber.channel = Mock()
+        subscriber.channel.queue_declare.return_value.method.queue = "amq.gen-1"
+        subscriber.deduplicator = EventDeduplicator()
+        handler = Mock()
+
+        # Act
+        subscriber.subscribe("no_vehicle_available", handler, broadcast=True)
+
+        # Assert
+        subscriber.channel.queue_declare.assert_called_once_with(queue='', exclusive=True, auto_delete=True)
+        subscriber.channel.queue_bind.assert_called_once_with(
+            exchange="cargo_track_events", queue="amq.gen-1", routing_key="no_vehicle_available"
+        )
+
+    def test_broadcast_event_skips_deduplication(self, subscriber, m_channel, m_method):
+        # Arrange
+        handler = Mock()
+        subscriber.handlers["no_vehicle_available"] = handler
+        subscriber._broadcast_event_types.add("no_vehicle_available")
+        subscriber.deduplicator = Mock()
+        body = self._build_body({"event_id": str(uuid4()), "source_service": "fleet",
+                                 "order_id": str(uuid4()), "reason": "no_drivers"})
+
+        # Act
+        subscriber._message_handler(m_channel, m_method, Mock(content_type=codec.JSON_CONTENT_TYPE, headers={}), body)
+
+        # Assert
+        handler.assert_called_once()
+        subscriber.deduplicator.is_duplicate.assert_not_called()
+        m_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+    def test_publisher_rejects_unsupported_content_type(self):
+        # Act & Assert
+        with pytest.raises(ValueError):
+            Publisher("localhost", 5672, "guest", "guest", "cargo_track_events", content_type="text/plain")
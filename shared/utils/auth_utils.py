@@ -1,16 +1,91 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+from typing import Optional, Dict, Any, List, Tuple
+from jose import JWTError, jwk, jwt
 from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi import Depends
 import httpx
 import os
 import structlog
+from shared.utils.revocation import RevocationList
 
 logger = structlog.get_logger(__name__)
 security = HTTPBearer()
 
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+
+class JWKSClient:
+    """Cache of auth service public keys keyed by kid.
+
+    Keys are refreshed in the background; an unknown kid (key rotation)
+    triggers an immediate refresh, rate limited so forged kids cannot flood
+    the auth service.
+    """
+
+    def __init__(self, jwks_url: str, min_refresh_interval: float = 30.0, timeout: float = 5.0):
+        self.jwks_url = jwks_url
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._keys: Dict[str, Any] = {}
+        self._last_refresh = 0.0
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refresh_count = 0
+
+    def get_key(self, kid: Optional[str]):
+        if not kid:
+            return None
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._last_refresh >= self.min_refresh_interval:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Failed to fetch JWKS", error=str(e), jwks_url=self.jwks_url)
+            key = self._keys.get(kid)
+        return key
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            self._last_refresh = time.monotonic()
+            response = httpx.get(self.jwks_url, timeout=self.timeout)
+            response.raise_for_status()
+            # Ключи разбираются один раз здесь, а не при каждой проверке токена
+            keys = {}
+            for key_data in response.json().get("keys", []):
+                if key_data.get("kid") and key_data.get("alg") in ASYMMETRIC_ALGORITHMS:
+                    keys[key_data["kid"]] = jwk.construct(key_data, key_data["alg"])
+            # Удаленные из JWKS ключи перестают приниматься после следующего обновления
+            self._keys = keys
+            self.refresh_count += 1
+
+    def start(self, interval_seconds: float) -> None:
+        """Start periodic background refresh"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval_seconds,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout)
+            self._thread = None
+
+    def _run(self, interval_seconds: float) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning("Failed to refresh JWKS", error=str(e), jwks_url=self.jwks_url)
+            self._stop.wait(interval_seconds)
+
 
 def create_access_token(data: Dict[str, Any], secret_key: str, algorithm: str = "HS256", expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -24,10 +99,22 @@ def create_access_token(data: Dict[str, Any], secret_key: str, algorithm: str =
     return encoded_jwt
 
 
-def verify_token(token: str, secret_key: str, algorithm: str = "HS256") -> Optional[Dict[str, Any]]:
+def verify_token(token: str, secret_key: str, algorithm: str = "HS256",
+                 jwks_client: Optional[JWKSClient] = None) -> Optional[Dict[str, Any]]:
     try:
-        logger.info("Attempting to verify token", token_length=len(token), secret_key_length=len(secret_key), algorithm=algorithm)
-        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+        logger.info("Attempting to verify token", token_length=len(token), algorithm=algorithm)
+        key = secret_key
+        if algorithm in ASYMMETRIC_ALGORITHMS:
+            if jwks_client is None:
+                logger.error("JWKS client is required for asymmetric tokens", algorithm=algorithm)
+                return None
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = jwks_client.get_key(kid)
+            if key is None:
+                logger.error("Unknown signing key", kid=kid)
+                return None
+        # Алгоритм фиксирован настройками, заголовок alg токена не влияет на выбор проверки
+        payload = jwt.decode(token, key, algorithms=[algorithm])
         logger.info("Token verified successfully", payload_keys=list(payload.keys()))
         return payload
     except JWTError as e:
@@ -53,11 +140,12 @@ async def get_user_from_auth_service(user_id: str, auth_service_url: str) -> Opt
     return None
 
 
-def get_current_user(secret_key: str, algorithm: str = "HS256"):
+def get_current_user(secret_key: str, algorithm: str = "HS256", revocation_list: Optional[RevocationList] = None,
+                     jwks_client: Optional[JWKSClient] = None):
     def _get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
         token = credentials.credentials
         logger.info("Processing token in get_current_user", token_length=len(token))
-        payload = verify_token(token, secret_key, algorithm)
+        payload = verify_token(token, secret_key, algorithm, jwks_client)
         if payload is None or payload.get("role") is None:
             logger.error("Token validation failed", has_payload=payload is not None, has_role=payload.get("role") if payload else None)
             raise HTTPException(
@@ -65,13 +153,21 @@ def get_current_user(secret_key: str, algorithm: str = "HS256"):
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        if revocation_list is not None and revocation_list.is_revoked(payload.get("jti")):
+            logger.error("Revoked token rejected", jti=payload.get("jti"))
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
         logger.info("Token validated successfully", user_role=payload.get("role"))
         return payload
     return _get_current_user
 
 
-def require_role(required_role: str, secret_key: str, algorithm: str = "HS256"):
-    def role_checker(current_user: Dict[str, Any] = Depends(get_current_user(secret_key, algorithm))) -> Dict[str, Any]:
+def require_role(required_role: str, secret_key: str, algorithm: str = "HS256",
+                 revocation_list: Optional[RevocationList] = None, jwks_client: Optional[JWKSClient] = None):
+    def role_checker(current_user: Dict[str, Any] = Depends(get_current_user(secret_key, algorithm, revocation_list, jwks_client))) -> Dict[str, Any]:
         user_role = current_user.get("role")
         logger.info("Checking role requirement", user_role=user_role, required_role=required_role)
         if user_role != required_role:
@@ -84,8 +180,9 @@ def require_role(required_role: str, secret_key: str, algorithm: str = "HS256"):
     return role_checker
 
 
-def require_any_role(required_roles: list[str], secret_key: str, algorithm: str = "HS256"):
-    def role_checker(current_user: Dict[str, Any] = Depends(get_current_user(secret_key, algorithm))) -> Dict[str, Any]:
+def require_any_role(required_roles: list[str], secret_key: str, algorithm: str = "HS256",
+                     revocation_list: Optional[RevocationList] = None, jwks_client: Optional[JWKSClient] = None):
+    def role_checker(current_user: Dict[str, Any] = Depends(get_current_user(secret_key, algorithm, revocation_list, jwks_client))) -> Dict[str, Any]:
         user_role = current_user.get("role")
         logger.info("Checking any role requirement", user_role=user_role, required_roles=required_roles)
         if user_role not in required_roles:
@@ -99,14 +196,102 @@ def require_any_role(required_roles: list[str], secret_key: str, algorithm: str
 
 
 class AuthServiceClient:
-    """Клиент для взаимодействия с auth сервисом"""
+    """Клиент для взаимодействия с auth сервисом.
+
+    Одиночные запросы пользователей, сделанные в одной итерации event loop,
+    объединяются в один POST /users/batch; результаты кэшируются на cache_ttl_seconds.
+    """
     
-    def __init__(self, auth_service_url: str):
+    def __init__(self, auth_service_url: str, cache_ttl_seconds: float = 60.0,
+                 cache_size: int = 10000, max_batch_size: int = 100, timeout: float = 5.0):
         self.auth_service_url = auth_service_url
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_size = cache_size
+        self.max_batch_size = max_batch_size
+        self.timeout = timeout
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._queued: List[str] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self.cache_hit_count = 0
+        self.batch_count = 0
+        self.requested_count = 0
     
     async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Получает информацию о пользователе"""
-        return await get_user_from_auth_service(user_id, self.auth_service_url)
+        user_id = str(user_id)
+        self.requested_count += 1
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            self._cache.move_to_end(user_id)
+            self.cache_hit_count += 1
+            return cached[1]
+        
+        self._bind_loop()
+        future = self._pending.get(user_id)
+        if future is None:
+            future = self._loop.create_future()
+            self._pending[user_id] = future
+            if not self._queued:
+                # Отправка откладывается до конца текущей итерации loop, чтобы собрать пачку
+                self._loop.call_soon(self._dispatch)
+            self._queued.append(user_id)
+        return await future
+    
+    async def get_users(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Получает пользователей пачкой; ненайденные отсутствуют в результате"""
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        users = await asyncio.gather(*(self.get_user(user_id) for user_id in user_ids))
+        return {user_id: user for user_id, user in zip(user_ids, users) if user is not None}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requested": self.requested_count,
+            "cache_hits": self.cache_hit_count,
+            "batches": self.batch_count,
+            "cached_users": len(self._cache)
+        }
+    
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Клиент и ожидающие future привязаны к loop (например, asyncio.run на каждый вызов)
+            self._loop = loop
+            self._client = None
+            self._pending = {}
+            self._queued = []
+    
+    def _dispatch(self) -> None:
+        queued, self._queued = self._queued, []
+        for start in range(0, len(queued), self.max_batch_size):
+            self._loop.create_task(self._load_batch(queued[start:start + self.max_batch_size]))
+    
+    async def _load_batch(self, user_ids: List[str]) -> None:
+        users: Dict[str, Dict[str, Any]] = {}
+        try:
+            if self._client is None:
+                self._client = httpx.AsyncClient(timeout=self.timeout)
+            response = await self._client.post(f"{self.auth_service_url}/users/batch", json={"ids": user_ids})
+            self.batch_count += 1
+            if response.status_code == 200:
+                users = {str(user["id"]): user for user in response.json()}
+                expires_at = time.monotonic() + self.cache_ttl_seconds
+                for user_id, user in users.items():
+                    self._remember(user_id, user, expires_at)
+        except Exception as e:
+            logger.error("Failed to fetch users from auth service", error=str(e), batch_size=len(user_ids))
+        
+        for user_id in user_ids:
+            future = self._pending.pop(user_id, None)
+            if future is not None and not future.done():
+                future.set_result(users.get(user_id))
+    
+    def _remember(self, user_id: str, user: Dict[str, Any], expires_at: float) -> None:
+        self._cache[user_id] = (expires_at, user)
+        self._cache.move_to_end(user_id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
     
     async def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Проверяет токен через auth сервис"""
@@ -0,0 +1,172 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from shared.utils.auth_utils import AuthServiceClient, JWKSClient, verify_token
+
+
+JWKS_URL = "http://auth-service:8000/.well-known/jwks.json"
+
+
+def _generate_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    public_jwk = jwk.construct(pem, "RS256").public_key().to_dict()
+    public_jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return pem, public_jwk
+
+
+def _jwks_response(*public_jwks):
+    response = Mock()
+    response.json.return_value = {"keys": list(public_jwks)}
+    return response
+
+
+class TestJWKSClient:
+
+    @pytest.fixture(scope="class")
+    def first_key(self):
+        return _generate_key("key-1")
+
+    @pytest.fixture(scope="class")
+    def second_key(self):
+        return _generate_key("key-2")
+
+    def test_token_is_verified_with_cached_key(self, first_key):
+        # Arrange
+        pem, public_jwk = first_key
+        client = JWKSClient(JWKS_URL)
+        token = jwt.encode({"sub": "1", "role": "client"}, pem, algorithm="RS256", headers={"kid": "key-1"})
+
+        # Act
+        with patch("shared.utils.auth_utils.httpx.get", return_value=_jwks_response(public_jwk)) as m_get:
+            first = verify_token(token, "", "RS256", client)
+            second = verify_token(token, "", "RS256", client)
+
+        # Assert
+        assert first["sub"] == "1"
+        assert second["sub"] == "1"
+        m_get.assert_called_once_with(JWKS_URL, timeout=5.0)
+
+    def test_unknown_kid_triggers_refresh(self, first_key, second_key):
+        # Arrange
+        client = JWKSClient(JWKS_URL, min_refresh_interval=0)
+        pem, _ = second_key
+        token = jwt.encode({"sub": "1", "role": "client"}, pem, algorithm="RS256", headers={"kid": "key-2"})
+        responses = [_jwks_response(first_key[1]), _jwks_response(first_key[1], second_key[1])]
+
+        # Act
+        with patch("shared.utils.auth_utils.httpx.get", side_effect=responses):
+            client.refresh()
+            payload = verify_token(token, "", "RS256", client)
+
+        # Assert
+        assert payload["sub"] == "1"
+        assert client.refresh_count == 2
+
+    def test_unknown_kid_refresh_is_rate_limited(self, first_key):
+        # Arrange
+        client = JWKSClient(JWKS_URL, min_refresh_interval=60)
+
+        # Act
+        with patch("shared.utils.auth_utils.httpx.get", return_value=_jwks_response(first_key[1])) as m_get:
+            client.refresh()
+            key = client.get_key("forged-kid")
+
+        # Assert
+        assert key is None
+        m_get.assert_called_once()
+
+    def test_hs256_token_signed_with_public_key_is_rejected(self, first_key):
+        # Arrange
+        _, public_jwk = first_key
+        client = JWKSClient(JWKS_URL)
+        token = jwt.encode({"sub": "1", "role": "admin"}, "forged", algorithm="HS256", headers={"kid": "key-1"})
+
+        # Act
+        with patch("shared.utils.auth_utils.httpx.get", return_value=_jwks_response(public_jwk)):
+            payload = verify_token(token, "", "RS256", client)
+
+        # Assert
+        assert payload is None
+
+
+class TestAuthServiceClient:
+
+    @pytest.fixture
+    def m_http_client(self):
+        m_http_client = Mock()
+        m_http_client.post = AsyncMock(side_effect=self._batch_response)
+        return m_http_client
+
+    @staticmethod
+    async def _batch_response(url, json):
+        # Возвращаем всех запрошенных, кроме "missing"
+        return Mock(status_code=200, json=Mock(return_value=[
+            {"id": user_id, "email": f"{user_id}@example.com"} for user_id in json["ids"] if user_id != "missing"
+        ]))
+
+    def test_concurrent_lookups_are_batched(self, m_http_client):
+        # Arrange
+        client = AuthServiceClient("http://auth-service:8000")
+
+        async def lookup():
+            return await asyncio.gather(client.get_user("u1"), client.get_user("u2"),
+                                        client.get_user("u1"), client.get_user("missing"))
+
+        # Act
+        with patch("shared.utils.auth_utils.httpx.AsyncClient", return_value=m_http_client):
+            users = asyncio.run(lookup())
+
+        # Assert
+        assert [user["email"] if user else None for user in users] == \
+            ["u1@example.com", "u2@example.com", "u1@example.com", None]
+        m_http_client.post.assert_awaited_once()
+        assert m_http_client.post.call_args.kwargs["json"] == {"ids": ["u1", "u2", "missing"]}
+
+    def test_cached_user_is_not_requested_again(self, m_http_client):
+        # Arrange
+        client = AuthServiceClient("http://auth-service:8000")
+
+        async def lookup():
+            await client.get_user("u1")
+            return await client.get_users(["u1"])
+
+        # Act
+        with patch("shared.utils.auth_utils.httpx.AsyncClient", return_value=m_http_client):
+            users = asyncio.run(lookup())
+
+        # Assert
+        assert users["u1"]["email"] == "u1@example.com"
+        m_http_client.post.assert_awaited_once()
+        assert client.get_stats()["cache_hits"] == 1
+
+    def test_batches_are_split_by_max_size(self, m_http_client):
+        # Arrange
+        client = AuthServiceClient("http://auth-service:8000", max_batch_size=2)
+
+        # Act
+        with patch("shared.utils.auth_utils.httpx.AsyncClient", return_value=m_http_client):
+            users = asyncio.run(client.get_users(["u1", "u2", "u3"]))
+
+        # Assert
+        assert set(users) == {"u1", "u2", "u3"}
+        assert m_http_client.post.await_count == 2
+
+    def test_failed_batch_resolves_to_none(self, m_http_client):
+        # Arrange
+        client = AuthServiceClient("http://auth-service:8000")
+        m_http_client.post.side_effect = RuntimeError("connection refused")
+
+        # Act
+        with patch("shared.utils.auth_utils.httpx.AsyncClient", return_value=m_http_client):
+            user = asyncio.run(client.get_user("u1"))
+
+        # Assert
+        assert user is None
@@ -0,0 +1,201 @@
+import zlib
+from typing import Callable, Dict, Optional, Sequence
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Без пакета brotli/zstandard кодировка просто не предлагается клиентам
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Уровни выбраны по benchmarks/compression_benchmark.py: дальше рост степени сжатия
+# не окупает процессорное время даже на медленных каналах
+DEFAULT_LEVELS: Dict[str, int] = {"zstd": 3, "br": 4, "gzip": 5}
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/xml",
+                       "application/javascript", "application/csv")
+
+
+class _GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        # Z_SYNC_FLUSH: каждый фрагмент потока сразу доходит до клиента (SSE, выгрузки)
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+_CODECS: Dict[str, Callable[[int], object]] = {"gzip": _GzipCompressor}
+if brotli is not None:
+    _CODECS["br"] = _BrotliCompressor
+if zstandard is not None:
+    _CODECS["zstd"] = _ZstdCompressor
+
+
+def supported_encodings() -> list[str]:
+    return list(_CODECS.keys())
+
+
+def compressor(encoding: str, level: Optional[int] = None):
+    """Incremental compressor for a Content-Encoding: ``compress(chunk)`` flushes, ``finish(chunk)`` ends the stream"""
+    if encoding not in _CODECS:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+    return _CODECS[encoding](DEFAULT_LEVELS[encoding] if level is None else level)
+
+
+def negotiate(accept_encoding: Optional[str], encodings: Sequence[str]) -> Optional[str]:
+    """Encoding from ``encodings`` (in server preference order) with the highest q in Accept-Encoding"""
+    weights: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        name, _, params = item.partition(";")
+        params = params.strip()
+        try:
+            weight = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            weight = 0.0
+        if name.strip():
+            weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    content_type = (content_type or "").lower()
+    return content_type.startswith(_COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+class CompressionMiddleware:
+    """Compresses responses with the best encoding the client accepts.
+
+    Bodies sent in one piece are compressed when they are at least
+    ``minimum_size`` bytes; streamed bodies (no Content-Length, e.g.
+    StreamingResponse and SSE) are compressed chunk by chunk with a flush
+    after each one, and their headers are sent right away. Responses that
+    are already encoded, have no body (204, 304) or are not text are passed
+    through unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, encodings: Sequence[str] = ("zstd", "br", "gzip"),
+                 levels: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [encoding for encoding in encodings if encoding in _CODECS]
+        self.levels = {**DEFAULT_LEVELS, **(levels or {})}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(send, encoding, self.levels[encoding], self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: str, level: int, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+        self.started = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=list(message["headers"]))
+            if "content-length" in headers and not _is_event_stream(headers):
+                # Заголовки отправляются вместе с первым фрагментом тела, когда известен его размер
+                self.start_message = message
+                return
+            # Потоковый ответ (StreamingResponse, SSE): решение принимается по заголовкам, и они
+            # уходят сразу, не дожидаясь первого события
+            self.started = True
+            if self._should_compress(message["status"], headers):
+                self.compressor = compressor(self.encoding, self.level)
+                del headers["Content-Length"]
+                self._mark_encoded(headers)
+            await self.send({**message, "headers": headers.raw})
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+
+        if self.started:
+            if self.compressor is not None:
+                body = self.compressor.compress(body) if more_body else self.compressor.finish(body)
+                message = {**message, "body": body}
+            await self.send(message)
+            return
+
+        self.started = True
+        headers = MutableHeaders(raw=list(self.start_message["headers"]))
+        large_enough = more_body or len(body) >= self.minimum_size
+        if large_enough and self._should_compress(self.start_message["status"], headers):
+            self.compressor = compressor(self.encoding, self.level)
+            if more_body:
+                compressed = self.compressor.compress(body)
+                del headers["Content-Length"]
+            else:
+                compressed = self.compressor.finish(body)
+                headers["Content-Length"] = str(len(compressed))
+            self._mark_encoded(headers)
+            message = {**message, "body": compressed}
+        await self.send({**self.start_message, "headers": headers.raw})
+        await self.send(message)
+
+    def _should_compress(self, status: int, headers: MutableHeaders) -> bool:
+        if status in (204, 304) or "content-encoding" in headers:
+            return False
+        return is_compressible(headers.get("content-type"))
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("ETag")
+        if etag and not etag.startswith("W/"):
+            # Сжатое тело побайтно отличается от исходного: строгий ETag становится слабым
+            headers["ETag"] = f"W/{etag}"
+
+
+def _is_event_stream(headers: MutableHeaders) -> bool:
+    return (headers.get("content-type") or "").lower().startswith("text/event-stream")
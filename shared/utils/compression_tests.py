@@ -0,0 +1,160 @@
+import asyncio
+import gzip
+import zlib
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from shared.utils.compression import CompressionMiddleware, compressor, negotiate, supported_encodings
+
+
+class TestNegotiate:
+
+    @pytest.mark.parametrize("accept_encoding, expected", [
+        (None, None),
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br, zstd", "zstd"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("zstd;q=0, gzip", "gzip"),
+        ("*", "zstd"),
+        ("*;q=0.1, br", "br"),
+        ("gzip;q=bogus", None)
+    ])
+    def test_picks_highest_weight_in_server_order(self, accept_encoding, expected):
+        # Act / Assert
+        assert negotiate(accept_encoding, ["zstd", "br", "gzip"]) == expected
+
+
+class TestCompressor:
+
+    @pytest.mark.parametrize("encoding", supported_encodings())
+    def test_flushed_chunks_form_one_stream(self, encoding):
+        # Arrange
+        chunks = [b'{"id": %d, "status": "stored"}\n' % i for i in range(50)]
+        stream = compressor(encoding)
+
+        # Act
+        parts = [stream.compress(chunk) for chunk in chunks] + [stream.finish()]
+
+        # Assert: каждый фрагмент сбрасывается сразу, а не копится в буфере
+        assert all(parts[:-1])
+        assert decompress(encoding, b"".join(parts)) == b"".join(chunks)
+
+
+class TestCompressionMiddleware:
+
+    @pytest.fixture
+    def f_client(self):
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, minimum_size=100, encodings=["gzip"])
+
+        @app.get("/large")
+        def large():
+            return Response(b'{"cargo": "' + b"x" * 1000 + b'"}', media_type="application/json",
+                            headers={"ETag": '"v1"'})
+
+        @app.get("/small")
+        def small():
+            return Response(b'{"id": 1}', media_type="application/json")
+
+        @app.get("/binary")
+        def binary():
+            return Response(b"\x00" * 1000, media_type="application/pdf")
+
+        @app.get("/not-modified")
+        def not_modified():
+            return Response(status_code=304, headers={"ETag": 'W/"v1"'})
+
+        @app.get("/stream")
+        def stream():
+            return StreamingResponse((b"data: %d\n\n" % i for i in range(20)), media_type="text/event-stream")
+
+        @app.get("/encoded")
+        def encoded():
+            return PlainTextResponse(gzip.compress(b"y" * 1000), headers={"Content-Encoding": "gzip"})
+
+        return TestClient(app)
+
+    def test_large_body_is_compressed(self, f_client):
+        # Act
+        response = f_client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < 1000
+        assert response.json()["cargo"] == "x" * 1000
+
+    def test_strong_etag_becomes_weak(self, f_client):
+        # Act
+        response = f_client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert response.headers["etag"] == 'W/"v1"'
+
+    @pytest.mark.parametrize("path", ["/small", "/binary", "/not-modified"])
+    def test_passed_through(self, f_client, path):
+        # Act
+        response = f_client.get(path, headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert "content-encoding" not in response.headers
+
+    def test_not_compressed_without_accept_encoding(self, f_client):
+        # Act
+        response = f_client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        # Assert
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == '"v1"'
+
+    def test_stream_is_compressed_by_chunks(self, f_client):
+        # Act
+        response = f_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == "".join(f"data: {i}\n\n" for i in range(20))
+
+    @pytest.mark.parametrize("media_type, compressed", [("text/event-stream", True), ("application/pdf", False)])
+    def test_stream_headers_are_sent_before_first_chunk(self, media_type, compressed):
+        # Arrange: SSE-поток, в котором первое событие еще не пришло
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        async def app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200,
+                        "headers": [(b"content-type", media_type.encode())]})
+
+        middleware = CompressionMiddleware(app, minimum_size=100, encodings=["gzip"])
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+
+        # Act
+        asyncio.run(middleware(scope, None, send))
+
+        # Assert
+        assert [message["type"] for message in sent] == ["http.response.start"]
+        encodings = [value for name, value in sent[0]["headers"] if name == b"content-encoding"]
+        assert encodings == ([b"gzip"] if compressed else [])
+
+    def test_encoded_body_is_not_compressed_twice(self, f_client):
+        # Act
+        response = f_client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+        # Assert
+        assert response.text == "y" * 1000
+
+
+def decompress(encoding: str, body: bytes) -> bytes:
+    if encoding == "gzip":
+        return zlib.decompress(body, zlib.MAX_WBITS | 16)
+    if encoding == "br":
+        import brotli
+        return brotli.decompress(body)
+    import zstandard
+    return zstandard.ZstdDecompressor().decompressobj().decompress(body)
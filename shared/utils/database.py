@@ -0,0 +1,290 @@
+import functools
+import inspect
+import itertools
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+import structlog
+from sqlalchemy import Select, create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Connection pool counters collected from pool events"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.checked_out = 0
+        self.max_checked_out = 0
+
+    def on_connect(self, *args) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, *args) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+
+    def on_checkin(self, *args) -> None:
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def on_invalidate(self, *args) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+
+_metrics: "weakref.WeakKeyDictionary[Engine, PoolMetrics]" = weakref.WeakKeyDictionary()
+
+
+def _instrument(engine: Engine) -> None:
+    metrics = PoolMetrics()
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "invalidate", metrics.on_invalidate)
+    _metrics[engine] = metrics
+
+
+def _set_local_statement_timeout(engine: Engine, statement_timeout_ms: int) -> None:
+    # Пулер в режиме транзакций не пропускает параметры запуска и может отдать
+    # соединение другому клиенту - таймаут задается на каждую транзакцию
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(statement_timeout_ms)}")
+
+
+def create_database_engine(database_url: str, application_name: str, pool_size: int = 10,
+                           max_overflow: int = 10, pool_timeout: float = 10.0, pool_recycle: int = 1800,
+                           pool_pre_ping: bool = True, statement_timeout_ms: int = 30000,
+                           pooler_mode: bool = False, echo: bool = False) -> Engine:
+    """Create a psycopg2 engine with explicit pool limits and server-side timeouts.
+
+    With ``pooler_mode`` (pgbouncer in transaction mode) no session state is
+    left on the server connection: the statement timeout is set per transaction.
+    """
+    connect_args: Dict[str, Any] = {"application_name": application_name}
+    if statement_timeout_ms and not pooler_mode:
+        connect_args["options"] = f"-c statement_timeout={int(statement_timeout_ms)}"
+
+    engine = create_engine(
+        database_url,
+        echo=echo,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        connect_args=connect_args
+    )
+    if statement_timeout_ms and pooler_mode:
+        _set_local_statement_timeout(engine, statement_timeout_ms)
+    _instrument(engine)
+    return engine
+
+
+def create_async_database_engine(database_url: str, application_name: str, pool_size: int = 10,
+                                 max_overflow: int = 10, pool_timeout: float = 10.0, pool_recycle: int = 1800,
+                                 pool_pre_ping: bool = True, statement_timeout_ms: int = 30000,
+                                 pooler_mode: bool = False, echo: bool = False) -> AsyncEngine:
+    """asyncpg counterpart of create_database_engine for the same database url"""
+    server_settings = {"application_name": application_name}
+    connect_args: Dict[str, Any] = {"server_settings": server_settings}
+    if pooler_mode:
+        # Подготовленные выражения живут в серверном соединении, которое пулер
+        # отдает разным клиентам - кэши asyncpg и SQLAlchemy отключаются
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+    elif statement_timeout_ms:
+        server_settings["statement_timeout"] = str(int(statement_timeout_ms))
+
+    async_engine = create_async_engine(
+        make_url(database_url).set(drivername="postgresql+asyncpg"),
+        echo=echo,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=pool_pre_ping,
+        connect_args=connect_args
+    )
+    if statement_timeout_ms and pooler_mode:
+        _set_local_statement_timeout(async_engine.sync_engine, statement_timeout_ms)
+    _instrument(async_engine.sync_engine)
+    return async_engine
+
+
+def get_pool_stats(engine: Union[Engine, AsyncEngine]) -> Dict[str, Any]:
+    """Current pool utilization plus counters since the engine was created"""
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    pool = engine.pool
+    stats: Dict[str, Any] = {}
+    if isinstance(pool, QueuePool):
+        size = pool.size()
+        capacity = size + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        stats.update({
+            "size": size,
+            "capacity": capacity,
+            "checked_in": pool.checkedin(),
+            "checked_out": checked_out,
+            "overflow": max(pool.overflow(), 0),
+            "utilization": round(checked_out / capacity, 3) if capacity else 0.0
+        })
+
+    metrics = _metrics.get(engine)
+    if metrics is not None:
+        stats.update({
+            "connects": metrics.connects,
+            "checkouts": metrics.checkouts,
+            "invalidations": metrics.invalidations,
+            "max_checked_out": metrics.max_checked_out
+        })
+    return stats
+
+
+class ReplicaSet:
+    """Round-robin over read replicas whose replication lag is within the limit.
+
+    Lag of each replica is measured at most once per ``check_interval_seconds``;
+    a replica that lags or fails the check is skipped until the next check.
+    """
+
+    # На догнавшей реплике receive и replay LSN совпадают - отставание 0 даже без новых записей
+    LAG_QUERY = text(
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self, engines: Iterable[Union[Engine, AsyncEngine]], max_lag_seconds: float = 5.0,
+                 check_interval_seconds: float = 1.0):
+        # Для AsyncEngine храним sync_engine: get_bind сессии работает с синхронными движками
+        self.engines: List[Engine] = [
+            engine.sync_engine if isinstance(engine, AsyncEngine) else engine for engine in engines
+        ]
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._lags: List[Optional[float]] = [None] * len(self.engines)
+        self._checked_at: List[Optional[float]] = [None] * len(self.engines)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.reads = 0
+        self.fallbacks = 0
+        self.logger = structlog.get_logger(self.__class__.__name__)
+
+    def choose(self) -> Optional[Engine]:
+        """Next fresh replica or None when all of them lag"""
+        start = next(self._counter)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self._is_fresh(index):
+                self.reads += 1
+                return self.engines[index]
+        self.fallbacks += 1
+        return None
+
+    def measure_lag(self, engine: Engine) -> float:
+        with engine.connect() as connection:
+            return float(connection.execute(self.LAG_QUERY).scalar())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "replicas": len(self.engines),
+            "lag_seconds": list(self._lags),
+            "reads": self.reads,
+            "fallbacks": self.fallbacks,
+            "pools": [get_pool_stats(engine) for engine in self.engines]
+        }
+
+    def _is_fresh(self, index: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            checked_at = self._checked_at[index]
+            due = checked_at is None or now - checked_at >= self.check_interval_seconds
+            if due:
+                # Проверку выполняет один поток, остальные пока используют прошлое значение
+                self._checked_at[index] = now
+
+        if due:
+            try:
+                self._lags[index] = self.measure_lag(self.engines[index])
+            except Exception as e:
+                self._lags[index] = None
+                self.logger.warning("Replica lag check failed", replica=index, error=str(e))
+
+        lag = self._lags[index]
+        return lag is not None and lag <= self.max_lag_seconds
+
+
+class RoutingSession(Session):
+    """Session that runs SELECTs issued inside replica_reads on a replica.
+
+    The first write (flush, DML or any non-SELECT statement) pins the session
+    to the primary until it is closed, so a request reads its own writes.
+    """
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self._replica_reads = 0
+        self._wrote = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if isinstance(clause, Select) and clause._for_update_arg is None:
+            if self._replica_reads and not self._wrote and self.replicas is not None:
+                engine = self.replicas.choose()
+                if engine is not None:
+                    return engine
+        else:
+            self._wrote = True
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def close(self) -> None:
+        super().close()
+        self._wrote = False
+
+
+@contextmanager
+def replica_reads(session: Any) -> Iterator[None]:
+    """Allow queries in the block to go to a replica; accepts Session or AsyncSession"""
+    routing_session = getattr(session, "sync_session", session)
+    if not isinstance(routing_session, RoutingSession):
+        yield
+        return
+    routing_session._replica_reads += 1
+    try:
+        yield
+    finally:
+        routing_session._replica_reads -= 1
+
+
+def replica_read(session_attribute: str) -> Callable:
+    """Repository method decorator for read-only queries that tolerate replication lag.
+
+    ``session_attribute`` is the name of the repository attribute holding the session.
+    """
+    def decorator(method: Callable) -> Callable:
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                with replica_reads(getattr(self, session_attribute)):
+                    return await method(self, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with replica_reads(getattr(self, session_attribute)):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
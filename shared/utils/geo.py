@@ -0,0 +1,124 @@
+import csv
+import json
+import math
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+Coordinates = Tuple[float, float]
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      "data", "gazetteer.csv")
+
+_NON_WORD = re.compile(r"[\W_]+")
+_MISSING = object()
+
+
+def haversine_km(origin: Coordinates, destination: Coordinates) -> float:
+    """Great-circle distance between two (lat, lon) points in kilometers"""
+    lat1, lon1 = math.radians(origin[0]), math.radians(origin[1])
+    lat2, lon2 = math.radians(destination[0]), math.radians(destination[1])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def normalize_address(address: str) -> str:
+    return " ".join(_NON_WORD.sub(" ", address.lower().replace("ё", "е")).split())
+
+
+class Gazetteer:
+    """Offline address-to-coordinates lookup over a local list of places.
+
+    The CSV file (``name,lat,lon``) lists places under every spelling in use.
+    An address resolves to the longest place name it contains, the rightmost
+    one on ties ("ул. Ленина 5, Казань"). Resolved addresses are appended to
+    ``cache_path`` (JSON lines) and loaded on start, so a restart does not
+    repeat the lookups. Memory and file keep at most ``cache_size`` recent
+    addresses; the file is rewritten once it has twice as many lines.
+    """
+
+    def __init__(self, path: str = DEFAULT_GAZETTEER_PATH, cache_path: Optional[str] = None,
+                 cache_size: int = 100_000):
+        self._places: Dict[str, Coordinates] = {}
+        with open(path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                self._places[normalize_address(row["name"])] = (float(row["lat"]), float(row["lon"]))
+        self._max_words = max((len(name.split()) for name in self._places), default=0)
+        self._cache_path = cache_path
+        self._cache_size = cache_size
+        # Нормализованный адрес -> координаты; None - адрес не найден (в файл не пишется)
+        self._resolved: Dict[str, Optional[Coordinates]] = {}
+        self._lock = threading.Lock()
+        # Строк в файле кэша: после вытеснения из памяти адрес дописывается снова
+        self._cache_lines = 0
+        if cache_path and os.path.exists(cache_path):
+            self._load_cache(cache_path)
+
+    def resolve(self, address: str) -> Optional[Coordinates]:
+        key = normalize_address(address)
+        # Одно чтение без блокировки: между "in" и [] адрес мог быть вытеснен другим потоком
+        coordinates = self._resolved.get(key, _MISSING)
+        if coordinates is not _MISSING:
+            return coordinates
+        coordinates = self._lookup(key.split())
+        with self._lock:
+            if len(self._resolved) >= self._cache_size:
+                self._resolved.pop(next(iter(self._resolved)))
+            self._resolved[key] = coordinates
+            if coordinates is not None and self._cache_path:
+                if self._cache_lines >= 2 * self._cache_size:
+                    self._rewrite_cache()
+                else:
+                    with open(self._cache_path, "a", encoding="utf-8") as file:
+                        file.write(_cache_line(key, coordinates))
+                    self._cache_lines += 1
+        return coordinates
+
+    def _lookup(self, words: List[str]) -> Optional[Coordinates]:
+        for size in range(min(self._max_words, len(words)), 0, -1):
+            for start in range(len(words) - size, -1, -1):
+                coordinates = self._places.get(" ".join(words[start:start + size]))
+                if coordinates is not None:
+                    return coordinates
+        return None
+
+    def _load_cache(self, cache_path: str) -> None:
+        with open(cache_path, encoding="utf-8") as file:
+            for line in file:
+                self._cache_lines += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Строка могла оборваться при остановке процесса
+                    continue
+                # Повтор адреса переносит его в конец: при переполнении вытесняются самые старые
+                self._resolved.pop(entry["address"], None)
+                self._resolved[entry["address"]] = (entry["lat"], entry["lon"])
+                if len(self._resolved) > self._cache_size:
+                    self._resolved.pop(next(iter(self._resolved)))
+        if self._cache_lines > self._cache_size:
+            self._rewrite_cache()
+
+    def _rewrite_cache(self) -> None:
+        # Файл переписывается целиком из памяти; замена атомарна, оборванной записи не будет
+        entries = [(key, coordinates) for key, coordinates in self._resolved.items() if coordinates is not None]
+        temporary_path = f"{self._cache_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.writelines(_cache_line(key, coordinates) for key, coordinates in entries)
+        os.replace(temporary_path, self._cache_path)
+        self._cache_lines = len(entries)
+
+
+def _cache_line(address: str, coordinates: Coordinates) -> str:
+    return json.dumps({"address": address, "lat": coordinates[0], "lon": coordinates[1]}, ensure_ascii=False) + "\n"
+
+
+def road_distance_km(gazetteer: Gazetteer, origin: str, destination: str, road_factor: float) -> Optional[float]:
+    """Straight-line distance between two addresses times ``road_factor``; None if either is not found"""
+    origin_coordinates = gazetteer.resolve(origin)
+    destination_coordinates = gazetteer.resolve(destination)
+    if origin_coordinates is None or destination_coordinates is None:
+        return None
+    return haversine_km(origin_coordinates, destination_coordinates) * road_factor
@@ -0,0 +1,119 @@
+import json
+import pytest
+from shared.utils.geo import Gazetteer, haversine_km, normalize_address, road_distance_km
+
+
+class TestHaversine:
+
+    def test_known_distance(self):
+        # Act
+        distance = haversine_km((55.7558, 37.6173), (59.9343, 30.3351))
+
+        # Assert: Москва - Санкт-Петербург по прямой около 634 км
+        assert distance == pytest.approx(634, abs=2)
+
+    def test_same_point(self):
+        # Act / Assert
+        assert haversine_km((55.0, 37.0), (55.0, 37.0)) == 0
+
+
+class TestGazetteer:
+
+    @pytest.fixture
+    def f_gazetteer_path(self, tmp_path):
+        path = tmp_path / "gazetteer.csv"
+        path.write_text("name,lat,lon\nMoscow,55.75,37.61\nНижний Новгород,56.29,43.93\nНовгород,58.52,31.27\n",
+                        encoding="utf-8")
+        return str(path)
+
+    def test_normalize_address(self):
+        # Act / Assert
+        assert normalize_address("  ул. Ленина, д.5 — Орёл ") == "ул ленина д 5 орел"
+
+    def test_longest_place_name_wins(self, f_gazetteer_path):
+        # Arrange
+        gazetteer = Gazetteer(f_gazetteer_path)
+
+        # Act
+        coordinates = gazetteer.resolve("ул. Рождественская 1, Нижний Новгород")
+
+        # Assert
+        assert coordinates == (56.29, 43.93)
+
+    def test_unknown_address(self, f_gazetteer_path):
+        # Arrange
+        gazetteer = Gazetteer(f_gazetteer_path)
+
+        # Act / Assert
+        assert gazetteer.resolve("123 Pickup St, City") is None
+
+    def test_resolved_addresses_survive_restart(self, f_gazetteer_path, tmp_path):
+        # Arrange
+        cache_path = str(tmp_path / "cache.jsonl")
+        Gazetteer(f_gazetteer_path, cache_path=cache_path).resolve("Tverskaya 1, Moscow")
+        empty_path = tmp_path / "empty.csv"
+        empty_path.write_text("name,lat,lon\n", encoding="utf-8")
+
+        # Act: справочник пуст, адрес берется из кэша
+        coordinates = Gazetteer(str(empty_path), cache_path=cache_path).resolve("Tverskaya 1, Moscow")
+
+        # Assert
+        assert coordinates == (55.75, 37.61)
+        with open(cache_path, encoding="utf-8") as file:
+            assert [json.loads(line)["address"] for line in file] == ["tverskaya 1 moscow"]
+
+    def test_cache_is_bounded(self, f_gazetteer_path):
+        # Arrange
+        gazetteer = Gazetteer(f_gazetteer_path, cache_size=2)
+
+        # Act
+        for i in range(5):
+            gazetteer.resolve(f"{i} Main St, Moscow")
+
+        # Assert
+        assert len(gazetteer._resolved) == 2
+
+    def test_cache_file_is_compacted(self, f_gazetteer_path, tmp_path):
+        # Arrange
+        cache_path = str(tmp_path / "cache.jsonl")
+        gazetteer = Gazetteer(f_gazetteer_path, cache_path=cache_path, cache_size=2)
+
+        # Act: адреса вытесняются из памяти и дописываются в файл снова
+        for _ in range(3):
+            for i in range(3):
+                gazetteer.resolve(f"{i} Main St, Moscow")
+
+        # Assert
+        with open(cache_path, encoding="utf-8") as file:
+            assert len(file.readlines()) <= 4
+
+    def test_load_keeps_newest_entries_within_cache_size(self, f_gazetteer_path, tmp_path):
+        # Arrange
+        cache_path = tmp_path / "cache.jsonl"
+        cache_path.write_text("".join(
+            json.dumps({"address": f"{i} main st moscow", "lat": 55.75, "lon": 37.61}) + "\n" for i in range(5)
+        ), encoding="utf-8")
+
+        # Act
+        gazetteer = Gazetteer(f_gazetteer_path, cache_path=str(cache_path), cache_size=2)
+
+        # Assert
+        assert list(gazetteer._resolved) == ["3 main st moscow", "4 main st moscow"]
+        assert [json.loads(line)["address"] for line in cache_path.read_text(encoding="utf-8").splitlines()] == \
+            ["3 main st moscow", "4 main st moscow"]
+
+
+class TestRoadDistance:
+
+    def test_scales_straight_line_distance(self, tmp_path):
+        # Arrange
+        path = tmp_path / "gazetteer.csv"
+        path.write_text("name,lat,lon\nMoscow,55.7558,37.6173\nSaint Petersburg,59.9343,30.3351\n", encoding="utf-8")
+        gazetteer = Gazetteer(str(path))
+
+        # Act
+        distance = road_distance_km(gazetteer, "Moscow", "Saint Petersburg", 1.3)
+
+        # Assert
+        assert distance == pytest.approx(haversine_km((55.7558, 37.6173), (59.9343, 30.3351)) * 1.3)
+        assert road_distance_km(gazetteer, "Moscow", "Nowhere", 1.3) is None
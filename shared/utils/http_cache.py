@@ -0,0 +1,99 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import httpx
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class ConditionalCache:
+    """Per-URL cache of JSON bodies for services polled over HTTP.
+
+    Bodies are stored with their ETag; the next GET sends If-None-Match and a
+    304 is answered from the cache without a payload. While a response is
+    fresh by its Cache-Control max-age no request is made at all. Holds at
+    most ``capacity`` URLs, least recently used are dropped first.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        # url -> (etag, тело, момент устаревания по monotonic)
+        self._entries: "OrderedDict[str, Tuple[Optional[str], Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> Any:
+        """GET the JSON body of ``url``; raises httpx errors like ``raise_for_status``"""
+        cached = self._fresh(url)
+        if cached is not None:
+            return cached
+        response = httpx.get(url, headers=self._conditional_headers(url, headers), **kwargs)
+        return self.resolve(url, response)
+
+    async def get_async(self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None,
+                        **kwargs) -> Any:
+        """Same as get, through an AsyncClient"""
+        cached = self._fresh(url)
+        if cached is not None:
+            return cached
+        response = await client.get(url, headers=self._conditional_headers(url, headers), **kwargs)
+        return self.resolve(url, response)
+
+    def resolve(self, url: str, response: httpx.Response) -> Any:
+        """Body of a (conditional) response to GET ``url``, taken from the cache on 304"""
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            with self._lock:
+                entry = self._entries.get(url)
+                if entry is not None:
+                    self._entries[url] = (response.headers.get("etag", entry[0]), entry[1], self._expires(response))
+                    self._entries.move_to_end(url)
+                    self.revalidations += 1
+                    return entry[1]
+        # 304 без записи (вытеснена между запросом и ответом) тоже уходит в raise_for_status
+        response.raise_for_status()
+        body = response.json()
+        etag, expires = response.headers.get("etag"), self._expires(response)
+        with self._lock:
+            self.misses += 1
+            if etag is None and expires <= time.monotonic():
+                # Без валидатора и срока свежести хранить нечего
+                self._entries.pop(url, None)
+                return body
+            self._entries[url] = (etag, body, expires)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        return body
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def _fresh(self, url: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or entry[2] <= time.monotonic():
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return entry[1]
+
+    def _conditional_headers(self, url: str, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        headers = dict(headers or {})
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is not None and entry[0] is not None:
+            headers["If-None-Match"] = entry[0]
+        return headers
+
+    @staticmethod
+    def _expires(response: httpx.Response) -> float:
+        cache_control = response.headers.get("cache-control", "")
+        match = _MAX_AGE.search(cache_control)
+        if match is None or "no-store" in cache_control:
+            return 0.0
+        return time.monotonic() + int(match.group(1))
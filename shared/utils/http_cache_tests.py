@@ -0,0 +1,95 @@
+import asyncio
+import httpx
+import pytest
+from shared.utils.http_cache import ConditionalCache
+
+URL = "http://fleet/vehicles/v1"
+
+
+class TestConditionalCache:
+
+    @pytest.fixture
+    def f_server(self):
+        # Минимальный сервер с ETag: считает запросы и помнит заголовки последнего
+        state = {"etag": 'W/"1"', "body": {"id": "v1", "status": "available"}, "requests": [], "max_age": 0}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            state["requests"].append(request)
+            headers = {"ETag": state["etag"], "Cache-Control": f"private, max-age={state['max_age']}, must-revalidate"}
+            if request.headers.get("if-none-match") == state["etag"]:
+                return httpx.Response(304, headers=headers)
+            return httpx.Response(200, json=state["body"], headers=headers)
+
+        state["transport"] = httpx.MockTransport(handler)
+        return state
+
+    def fetch(self, cache, f_server):
+        async def run():
+            async with httpx.AsyncClient(transport=f_server["transport"]) as client:
+                return await cache.get_async(client, URL, headers={"Authorization": "Bearer t"})
+        return asyncio.run(run())
+
+    def test_not_modified_is_served_from_cache(self, f_server):
+        # Arrange
+        cache = ConditionalCache()
+        self.fetch(cache, f_server)
+
+        # Act
+        body = self.fetch(cache, f_server)
+
+        # Assert
+        assert body == {"id": "v1", "status": "available"}
+        assert f_server["requests"][1].headers["if-none-match"] == 'W/"1"'
+        assert f_server["requests"][1].headers["authorization"] == "Bearer t"
+        assert (cache.misses, cache.revalidations) == (1, 1)
+
+    def test_changed_resource_replaces_entry(self, f_server):
+        # Arrange
+        cache = ConditionalCache()
+        self.fetch(cache, f_server)
+        f_server["etag"], f_server["body"] = 'W/"2"', {"id": "v1", "status": "in_use"}
+
+        # Act
+        body = self.fetch(cache, f_server)
+
+        # Assert
+        assert body["status"] == "in_use"
+        assert self.fetch(cache, f_server)["status"] == "in_use"
+        assert cache.revalidations == 1
+
+    def test_fresh_entry_skips_request(self, f_server):
+        # Arrange
+        f_server["max_age"] = 60
+        cache = ConditionalCache()
+        self.fetch(cache, f_server)
+
+        # Act
+        body = self.fetch(cache, f_server)
+
+        # Assert
+        assert body["id"] == "v1"
+        assert len(f_server["requests"]) == 1
+        assert cache.hits == 1
+
+    def test_capacity_evicts_least_recently_used(self):
+        # Arrange
+        cache = ConditionalCache(capacity=2)
+        for i in range(3):
+            response = httpx.Response(200, json={"i": i}, headers={"ETag": f'W/"{i}"'},
+                                      request=httpx.Request("GET", f"http://fleet/{i}"))
+            cache.resolve(f"http://fleet/{i}", response)
+
+        # Act
+        headers = [cache._conditional_headers(f"http://fleet/{i}", None) for i in range(3)]
+
+        # Assert
+        assert headers == [{}, {"If-None-Match": 'W/"1"'}, {"If-None-Match": 'W/"2"'}]
+
+    def test_errors_are_raised(self):
+        # Arrange
+        cache = ConditionalCache()
+        response = httpx.Response(404, request=httpx.Request("GET", URL))
+
+        # Act / Assert
+        with pytest.raises(httpx.HTTPStatusError):
+            cache.resolve(URL, response)
@@ -0,0 +1,112 @@
+import enum
+import functools
+import operator
+import typing
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+from pydantic import BaseModel, create_model
+from sqlalchemy.engine import Row
+
+T = TypeVar("T", bound=BaseModel)
+
+
+def _converter(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """Conversion from a stored column value to the field type, if they differ"""
+    if typing.get_origin(annotation) is typing.Union:
+        # Optional[X] - None значения конвертер не получает
+        types = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return _converter(types[0]) if len(types) == 1 else None
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return annotation
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        # Вложенные модели хранятся в JSON колонках
+        return annotation.model_validate
+    return None
+
+
+def select_fields(model_class: Type[BaseModel], fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parse a comma separated ``fields`` parameter into field names of the model.
+
+    Returns None when all fields are requested. ``id`` is always included and
+    names come in model order, so equal selections share one partial model.
+    Raises ValueError for unknown fields.
+    """
+    requested = {name.strip() for name in (fields or "").split(",") if name.strip()}
+    if not requested:
+        return None
+    unknown = requested - set(model_class.model_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if "id" in model_class.model_fields:
+        requested.add("id")
+    return tuple(name for name in model_class.model_fields if name in requested)
+
+
+@functools.lru_cache(maxsize=256)
+def partial_model(model_class: Type[BaseModel], fields: Optional[Tuple[str, ...]]) -> Type[BaseModel]:
+    """Model with only the given fields of ``model_class`` (same types, defaults and
+    serialization); ``model_class`` itself when fields is None"""
+    if not fields:
+        return model_class
+    return create_model(
+        f"{model_class.__name__}Fields",
+        **{name: (model_class.model_fields[name].annotation, model_class.model_fields[name]) for name in fields}
+    )
+
+
+class RowMapper(Generic[T]):
+    """Builds entities from database rows without pydantic validation.
+
+    Rows were validated when written, so values are copied straight into the
+    entity (as ``model_construct`` does, without its per-field bookkeeping).
+    Enum and nested model fields are converted from the stored strings and
+    JSON. Works with ORM objects and with rows selected by ``columns``.
+    """
+
+    def __init__(self, entity_class: Type[T]):
+        self.entity_class = entity_class
+        self.fields = tuple(entity_class.model_fields)
+        self._fields_set = set(self.fields)
+        self._get = operator.attrgetter(*self.fields)
+        self._converters: Dict[str, Callable[[Any], Any]] = {}
+        for name, field in entity_class.model_fields.items():
+            converter = _converter(field.annotation)
+            if converter is not None:
+                self._converters[name] = converter
+
+    def project(self, fields: Optional[Sequence[str]]) -> "RowMapper":
+        """Mapper building partial_model entities for a subset of fields"""
+        if not fields:
+            return self
+        return _projection(self.entity_class, tuple(fields))
+
+    def columns(self, model_class: Any) -> List[Any]:
+        """Model columns in entity field order, for selecting plain rows instead of ORM objects"""
+        return [getattr(model_class, name) for name in self.fields]
+
+    def one(self, row: Any) -> Optional[T]:
+        if row is None:
+            return None
+        if isinstance(row, Row) and row._fields == self.fields:
+            # Строка из columns: значения по позиции, без поиска по именам
+            values = dict(zip(self.fields, row))
+        else:
+            values = dict(zip(self.fields, self._get(row)))
+        for name, converter in self._converters.items():
+            value = values[name]
+            if value is not None:
+                values[name] = converter(value)
+        entity = self.entity_class.__new__(self.entity_class)
+        object.__setattr__(entity, "__dict__", values)
+        object.__setattr__(entity, "__pydantic_fields_set__", self._fields_set.copy())
+        object.__setattr__(entity, "__pydantic_extra__", None)
+        object.__setattr__(entity, "__pydantic_private__", None)
+        return entity
+
+    def many(self, rows: Iterable[Any]) -> List[T]:
+        one = self.one
+        return [one(row) for row in rows]
+
+
+@functools.lru_cache(maxsize=256)
+def _projection(entity_class: Type[BaseModel], fields: Tuple[str, ...]) -> RowMapper:
+    return RowMapper(partial_model(entity_class, fields))
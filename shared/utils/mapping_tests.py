@@ -0,0 +1,148 @@
+from datetime import datetime
+from enum import Enum
+from types import SimpleNamespace
+from typing import List, Optional
+import pytest
+from pydantic import BaseModel, EmailStr
+from sqlalchemy import JSON, Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+from shared.utils.mapping import RowMapper, partial_model, select_fields
+
+
+class Status(str, Enum):
+    ACTIVE = "active"
+    RETIRED = "retired"
+
+
+class Range(BaseModel):
+    low: float
+    high: float
+
+
+class Item(BaseModel):
+    id: int
+    email: EmailStr
+    status: Status
+    temperature: Optional[Range] = None
+    tags: List[str] = []
+    created_at: datetime
+
+
+Base = declarative_base()
+
+
+class ItemModel(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    email = Column(String)
+    status = Column(String)
+    temperature = Column(JSON)
+    tags = Column(JSON)
+    created_at = Column(DateTime)
+
+
+class TestRowMapper:
+
+    @pytest.fixture
+    def f_mapper(self):
+        return RowMapper(Item)
+
+    @pytest.fixture
+    def f_row(self):
+        return SimpleNamespace(id=1, email="a@example.com", status="active", temperature={"low": 2, "high": 8},
+                               tags=["fragile"], created_at=datetime(2024, 1, 1))
+
+    def test_builds_same_entity_as_validation(self, f_mapper, f_row):
+        # Act
+        item = f_mapper.one(f_row)
+
+        # Assert
+        assert item == Item.model_validate(f_row, from_attributes=True)
+        assert item.status is Status.ACTIVE
+        assert isinstance(item.temperature, Range)
+        assert item.model_dump()["temperature"] == {"low": 2, "high": 8}
+
+    def test_none_values_are_not_converted(self, f_mapper, f_row):
+        # Arrange
+        f_row.temperature = None
+
+        # Act
+        item = f_mapper.one(f_row)
+
+        # Assert
+        assert item.temperature is None
+
+    def test_missing_row_maps_to_none(self, f_mapper):
+        # Act & Assert
+        assert f_mapper.one(None) is None
+
+    def test_entities_are_independent(self, f_mapper, f_row):
+        # Act
+        first, second = f_mapper.many([f_row, f_row])
+        first.status = Status.RETIRED
+
+        # Assert
+        assert second.status is Status.ACTIVE
+
+    def test_maps_column_rows(self, f_mapper):
+        # Arrange
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(ItemModel(id=1, email="a@example.com", status="retired", temperature=None,
+                                  tags=[], created_at=datetime(2024, 1, 1)))
+            session.commit()
+
+            # Act
+            items = f_mapper.many(session.query(*f_mapper.columns(ItemModel)).all())
+
+        # Assert
+        assert [(item.id, item.status) for item in items] == [(1, Status.RETIRED)]
+
+    def test_projection_selects_and_maps_only_requested_columns(self, f_mapper):
+        # Arrange
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        mapper = f_mapper.project(("id", "status"))
+        with Session(engine) as session:
+            session.add(ItemModel(id=1, email="a@example.com", status="active", tags=[], created_at=datetime(2024, 1, 1)))
+            session.commit()
+
+            # Act
+            query = session.query(*mapper.columns(ItemModel))
+            items = mapper.many(query.all())
+
+        # Assert
+        assert [column["name"] for column in query.column_descriptions] == ["id", "status"]
+        assert [item.model_dump() for item in items] == [{"id": 1, "status": Status.ACTIVE}]
+        assert mapper is f_mapper.project(("id", "status"))
+        assert f_mapper.project(None) is f_mapper
+
+
+class TestFieldSelection:
+
+    def test_all_fields_when_not_given(self):
+        # Act & Assert
+        assert select_fields(Item, None) is None
+        assert select_fields(Item, " , ") is None
+
+    def test_id_is_added_and_order_follows_model(self):
+        # Act
+        fields = select_fields(Item, "created_at, status")
+
+        # Assert
+        assert fields == ("id", "status", "created_at")
+
+    def test_unknown_field_is_rejected(self):
+        # Act & Assert
+        with pytest.raises(ValueError, match="Unknown fields: secret"):
+            select_fields(Item, "status,secret")
+
+    def test_partial_model_keeps_field_types(self):
+        # Act
+        model = partial_model(Item, ("id", "status", "temperature"))
+
+        # Assert
+        assert list(model.model_fields) == ["id", "status", "temperature"]
+        assert model(id=1, status="retired").status is Status.RETIRED
+        assert partial_model(Item, None) is Item
@@ -0,0 +1,35 @@
+from typing import List, Union
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    """Records SQL statements sent through an engine inside a ``with`` block.
+
+    Used by tests to pin the number of round-trips an endpoint or use case makes.
+    """
+
+    def __init__(self, engine: Union[Engine, AsyncEngine]):
+        self.engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+        self.statements: List[str] = []
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def count_of(self, verb: str) -> int:
+        """Number of statements starting with the given keyword, e.g. SELECT or UPDATE"""
+        verb = verb.upper()
+        return sum(1 for statement in self.statements if statement.lstrip().upper().startswith(verb))
+
+    def _record(self, connection, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
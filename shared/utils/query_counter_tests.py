@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import create_engine, text
+from shared.utils.query_counter import QueryCounter
+
+
+class TestQueryCounter:
+
+    @pytest.fixture
+    def f_engine(self):
+        engine = create_engine("sqlite://")
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        yield engine
+        engine.dispose()
+
+    def test_counts_statements_inside_block(self, f_engine):
+        # Arrange
+        with f_engine.begin() as connection:
+            connection.execute(text("INSERT INTO items (name) VALUES ('before')"))
+
+            # Act
+            with QueryCounter(f_engine) as counter:
+                connection.execute(text("INSERT INTO items (name) VALUES ('a')"))
+                connection.execute(text("SELECT * FROM items"))
+                connection.execute(text("UPDATE items SET name = 'b'"))
+
+            connection.execute(text("SELECT * FROM items"))
+
+        # Assert
+        assert counter.count == 3
+        assert counter.count_of("select") == 1
+        assert counter.count_of("UPDATE") == 1
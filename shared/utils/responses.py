@@ -0,0 +1,62 @@
+import functools
+import hashlib
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response
+from shared.utils.mapping import select_fields
+
+
+@functools.lru_cache(maxsize=512)
+def _adapter(annotation: Any) -> TypeAdapter:
+    # Построение схемы дорогое - один адаптер на тип ответа
+    return TypeAdapter(annotation)
+
+
+def trusted_response(annotation: Any, content: Any, status_code: int = status.HTTP_200_OK,
+                     headers: Optional[Dict[str, str]] = None) -> Response:
+    """JSON response for repository output that is already an instance of the response model.
+
+    FastAPI validates the returned value against ``response_model`` again and
+    then encodes it in a separate pass. Here the value is written to JSON bytes
+    by the model's pydantic-core serializer in one pass, without validation.
+    Routes keep ``response_model`` for the OpenAPI schema.
+    """
+    return Response(_adapter(annotation).dump_json(content), status_code=status_code, headers=headers,
+                    media_type="application/json")
+
+
+def fields_parameter(model_class: Type[BaseModel]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """Dependency for the ``?fields=id,status`` projection of routes returning ``model_class``"""
+    def dependency(
+        fields: Optional[str] = Query(None, description=f"Comma separated {model_class.__name__} fields to return")
+    ) -> Optional[Tuple[str, ...]]:
+        try:
+            return select_fields(model_class, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return dependency
+
+
+def make_etag(*version: Any) -> str:
+    """Weak ETag from the version of a resource (updated_at, row count, ...)"""
+    # Слабый ETag: тело может отличаться побайтно (сжатие), но представление то же
+    digest = hashlib.blake2b(repr(version).encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against the current ETag"""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag.removeprefix("W/") for candidate in candidates)
+
+
+def cache_headers(etag: str, max_age: int = 0) -> Dict[str, str]:
+    """Validator and Cache-Control for responses of private, slowly changing resources"""
+    return {"ETag": etag, "Cache-Control": f"private, max-age={max_age}, must-revalidate"}
+
+
+def not_modified(etag: str, max_age: int = 0) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag, max_age))
@@ -0,0 +1,133 @@
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID, uuid4
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, Field
+from shared.utils.mapping import RowMapper
+from shared.utils.responses import etag_matches, fields_parameter, make_etag, not_modified, trusted_response
+
+
+class Status(str, Enum):
+    ACTIVE = "active"
+
+
+class Item(BaseModel):
+    id: UUID
+    name: str = Field(..., min_length=1)
+    status: Status
+    weight: Optional[float] = None
+    created_at: datetime
+
+
+class TestTrustedResponse:
+
+    @pytest.fixture
+    def f_items(self):
+        return [
+            Item(id=uuid4(), name="Pallet", status=Status.ACTIVE, weight=12.5, created_at=datetime(2024, 1, 1, 12)),
+            Item(id=uuid4(), name="Кран", status=Status.ACTIVE, created_at=datetime(2024, 1, 2))
+        ]
+
+    @pytest.fixture
+    def f_client(self, f_items):
+        app = FastAPI()
+
+        @app.get("/validated", response_model=List[Item])
+        def validated():
+            return f_items
+
+        @app.get("/trusted", response_model=List[Item])
+        def trusted():
+            return trusted_response(List[Item], f_items)
+
+        @app.get("/projected", response_model=List[Item])
+        def projected(fields=Depends(fields_parameter(Item))):
+            mapper = RowMapper(Item).project(fields)
+            return trusted_response(List[mapper.entity_class], mapper.many(f_items))
+
+        return TestClient(app)
+
+    def test_body_matches_validated_response(self, f_client):
+        # Act
+        validated = f_client.get("/validated")
+        trusted = f_client.get("/trusted")
+
+        # Assert
+        assert trusted.status_code == 200
+        assert trusted.headers["content-type"] == "application/json"
+        assert trusted.json() == validated.json()
+
+    def test_content_is_not_validated(self):
+        # Arrange: значение нарушает min_length, но уже считается проверенным
+        item = Item.model_construct(id=uuid4(), name="", status=Status.ACTIVE, created_at=datetime(2024, 1, 1))
+
+        # Act
+        response = trusted_response(Item, item, status_code=201)
+
+        # Assert
+        assert response.status_code == 201
+        assert b'"name":""' in response.body
+
+    def test_route_keeps_response_schema(self, f_client):
+        # Act
+        schema = f_client.get("/openapi.json").json()
+
+        # Assert
+        response_schema = schema["paths"]["/trusted"]["get"]["responses"]["200"]["content"]["application/json"]
+        assert response_schema["schema"]["items"] == {"$ref": "#/components/schemas/Item"}
+
+    def test_fields_trim_the_response(self, f_client, f_items):
+        # Act
+        response = f_client.get("/projected", params={"fields": "name"})
+
+        # Assert
+        assert response.json() == [{"id": str(item.id), "name": item.name} for item in f_items]
+
+    def test_unknown_fields_are_rejected(self, f_client):
+        # Act
+        response = f_client.get("/projected", params={"fields": "name,password"})
+
+        # Assert
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Unknown fields: password"}
+
+
+class TestConditionalResponses:
+
+    def test_etag_depends_on_version(self):
+        # Arrange
+        updated_at = datetime(2024, 1, 1, 12)
+
+        # Act
+        etag = make_etag(updated_at)
+
+        # Assert
+        assert etag.startswith('W/"')
+        assert etag == make_etag(updated_at)
+        assert etag != make_etag(datetime(2024, 1, 1, 13))
+        assert make_etag(3, updated_at) != make_etag(4, updated_at)
+
+    @pytest.mark.parametrize("if_none_match, expected", [
+        (None, False),
+        ('W/"abc"', True),
+        ('"abc"', True),
+        ('W/"old", W/"abc"', True),
+        ("*", True),
+        ('W/"old"', False)
+    ])
+    def test_etag_matches(self, if_none_match, expected):
+        # Act / Assert
+        assert etag_matches(if_none_match, 'W/"abc"') is expected
+
+    def test_not_modified_keeps_validators(self):
+        # Act
+        response = not_modified('W/"abc"', max_age=30)
+
+        # Assert
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == 'W/"abc"'
+        assert response.headers["cache-control"] == "private, max-age=30, must-revalidate"
@@ -0,0 +1,96 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+import httpx
+import structlog
+
+
+class RevocationList:
+    """Local copy of revoked access token ids.
+
+    The auth service is polled in bulk in the background, so request
+    authentication is a single dict lookup without network calls. Entries are
+    dropped once the token expires, keeping the set small.
+    """
+
+    # Запас на записи, закоммиченные в auth сервисе позже момента прошлого запроса
+    SYNC_OVERLAP = timedelta(seconds=30)
+
+    def __init__(self, auth_service_url: str, timeout: float = 5.0):
+        self.auth_service_url = auth_service_url
+        self.timeout = timeout
+        self._revoked: Dict[str, float] = {}
+        self._since: Optional[datetime] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.sync_count = 0
+        self.sync_error_count = 0
+        self.last_synced_at: Optional[datetime] = None
+        self.logger = structlog.get_logger(self.__class__.__name__)
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti:
+            return False
+        return jti in self._revoked
+
+    def add(self, entries: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            for entry in entries:
+                expires_at = entry["expires_at"]
+                if isinstance(expires_at, str):
+                    expires_at = datetime.fromisoformat(expires_at)
+                self._revoked[entry["jti"]] = expires_at.timestamp()
+
+    def prune(self) -> None:
+        now = datetime.utcnow().timestamp()
+        with self._lock:
+            # Новый словарь вместо удаления по месту: читатели обходятся без блокировки
+            self._revoked = {jti: expires_at for jti, expires_at in self._revoked.items() if expires_at > now}
+
+    def sync(self) -> None:
+        """Fetch revocations made since the previous sync"""
+        params = {}
+        if self._since is not None:
+            params["since"] = (self._since - self.SYNC_OVERLAP).isoformat()
+
+        response = httpx.get(f"{self.auth_service_url}/auth/revocations", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+
+        self.add(data["revoked"])
+        self.prune()
+        self._since = datetime.fromisoformat(data["server_time"])
+        self.sync_count += 1
+        self.last_synced_at = datetime.utcnow()
+
+    def start(self, interval_seconds: float) -> None:
+        """Start periodic background sync"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval_seconds,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout)
+            self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "revoked_tokens": len(self._revoked),
+            "syncs": self.sync_count,
+            "sync_errors": self.sync_error_count,
+            "last_synced_at": self.last_synced_at.isoformat() if self.last_synced_at else None
+        }
+
+    def _run(self, interval_seconds: float) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                self.sync_error_count += 1
+                self.logger.warning("Failed to sync token revocations", error=str(e))
+            self._stop.wait(interval_seconds)
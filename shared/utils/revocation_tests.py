@@ -0,0 +1,82 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from shared.utils.auth_utils import create_access_token, get_current_user
+from shared.utils.revocation import RevocationList
+
+
+SECRET_KEY = "test-secret"
+
+
+class TestRevocationList:
+
+    @pytest.fixture
+    def revocation_list(self):
+        return RevocationList("http://auth-service:8000")
+
+    def test_revoked_token_is_detected(self, revocation_list):
+        # Arrange
+        revocation_list.add([{"jti": "abc", "expires_at": (datetime.utcnow() + timedelta(minutes=5)).isoformat()}])
+
+        # Act & Assert
+        assert revocation_list.is_revoked("abc")
+        assert not revocation_list.is_revoked("other")
+        assert not revocation_list.is_revoked(None)
+
+    def test_expired_entries_are_pruned(self, revocation_list):
+        # Arrange
+        revocation_list.add([
+            {"jti": "expired", "expires_at": datetime.utcnow() - timedelta(seconds=1)},
+            {"jti": "active", "expires_at": datetime.utcnow() + timedelta(minutes=5)}
+        ])
+
+        # Act
+        revocation_list.prune()
+
+        # Assert
+        assert not revocation_list.is_revoked("expired")
+        assert revocation_list.is_revoked("active")
+
+    def test_sync_requests_changes_since_previous_server_time(self, revocation_list):
+        # Arrange
+        server_time = datetime(2024, 1, 1, 12, 0, 0)
+        expires_at = (datetime.utcnow() + timedelta(minutes=5)).isoformat()
+        response = Mock()
+        response.json.return_value = {"revoked": [{"jti": "abc", "expires_at": expires_at}],
+                                      "server_time": server_time.isoformat()}
+
+        # Act
+        with patch("shared.utils.revocation.httpx.get", return_value=response) as m_get:
+            revocation_list.sync()
+            revocation_list.sync()
+
+        # Assert
+        assert "since" not in m_get.call_args_list[0].kwargs["params"]
+        since = datetime.fromisoformat(m_get.call_args_list[1].kwargs["params"]["since"])
+        assert since == server_time - RevocationList.SYNC_OVERLAP
+        assert revocation_list.is_revoked("abc")
+        assert revocation_list.get_stats()["syncs"] == 2
+
+    def test_get_current_user_rejects_revoked_token(self, revocation_list):
+        # Arrange
+        token = create_access_token({"sub": "1", "role": "client", "jti": "abc"}, SECRET_KEY)
+        revocation_list.add([{"jti": "abc", "expires_at": datetime.utcnow() + timedelta(minutes=5)}])
+        dependency = get_current_user(SECRET_KEY, revocation_list=revocation_list)
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            dependency(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+        assert exc_info.value.status_code == 401
+
+    def test_get_current_user_accepts_active_token(self, revocation_list):
+        # Arrange
+        token = create_access_token({"sub": "1", "role": "client", "jti": "def"}, SECRET_KEY)
+        dependency = get_current_user(SECRET_KEY, revocation_list=revocation_list)
+
+        # Act
+        payload = dependency(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+        # Assert
+        assert payload["jti"] == "def"
@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple
 
 from entities.cargo import CargoCreate, CargoUpdate, CargoResponse
 from use_cases.create_cargo_use_case import CreateCargoUseCase
 from repositories.cargo_repository import CargoRepository
 from config.database import get_db
+from shared.utils.mapping import RowMapper
+from shared.utils.responses import fields_parameter, trusted_response
 from utils.auth_utils import get_current_user, require_any_role
 
+# Сущности из репозитория уже проверены: ответ собирается без повторной валидации полей
+cargo_response_mapper = RowMapper(CargoResponse)
 router = APIRouter(prefix="/cargo", tags=["cargo"])
 
 
@@ -58,49 +62,26 @@ def create_cargo(
 def get_all_cargo(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(CargoResponse)),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user())
 ):
     cargo_repository = CargoRepository(db)
-    cargo_list = cargo_repository.list_cargo(skip=skip, limit=limit)
+    cargo_list = cargo_repository.list_cargo(skip=skip, limit=limit, fields=fields)
     
-    return [
-        CargoResponse(
-            id=cargo.id,
-            tracking_number=cargo.tracking_number,
-            name=cargo.name,
-            description=cargo.description,
-            weight=cargo.weight,
-            volume=cargo.volume,
-            dimensions=cargo.dimensions,
-            value=cargo.value,
-            insurance_amount=cargo.insurance_amount,
-            cargo_type=cargo.cargo_type,
-            temperature_requirements=cargo.temperature_requirements,
-            humidity_requirements=cargo.humidity_requirements,
-            hazardous_material=cargo.hazardous_material,
-            hazardous_class=cargo.hazardous_class,
-            special_handling=cargo.special_handling,
-            fragility_level=cargo.fragility_level,
-            storage_duration=cargo.storage_duration,
-            expiration_date=cargo.expiration_date,
-            status=cargo.status,
-            warehouse_id=cargo.warehouse_id,
-            location_in_warehouse=cargo.location_in_warehouse,
-            created_at=cargo.created_at,
-            updated_at=cargo.updated_at
-        ) for cargo in cargo_list
-    ]
+    response_mapper = cargo_response_mapper.project(fields)
+    return trusted_response(List[response_mapper.entity_class], response_mapper.many(cargo_list))
 
 
 @router.get("/{cargo_id}", response_model=CargoResponse)
 def get_cargo(
     cargo_id: str,
+    fields: Optional[Tuple[str, ...]] = Depends(fields_parameter(CargoResponse)),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user())
 ):
     cargo_repository = CargoRepository(db)
-    cargo = cargo_repository.get_by_id(cargo_id)
+    cargo = cargo_repository.get_by_id(cargo_id, fields=fields)
     
     if not cargo:
         raise HTTPException(
@@ -108,31 +89,8 @@ def get_cargo(
             detail="Cargo not found"
         )
     
-    return CargoResponse(
-        id=cargo.id,
-        tracking_number=cargo.tracking_number,
-        name=cargo.name,
-        description=cargo.description,
-        weight=cargo.weight,
-        volume=cargo.volume,
-        dimensions=cargo.dimensions,
-        value=cargo.value,
-        insurance_amount=cargo.insurance_amount,
-        cargo_type=cargo.cargo_type,
-        temperature_requirements=cargo.temperature_requirements,
-        humidity_requirements=cargo.humidity_requirements,
-        hazardous_material=cargo.hazardous_material,
-        hazardous_class=cargo.hazardous_class,
-        special_handling=cargo.special_handling,
-        fragility_level=cargo.fragility_level,
-        storage_duration=cargo.storage_duration,
-        expiration_date=cargo.expiration_date,
-        status=cargo.status,
-        warehouse_id=cargo.warehouse_id,
-        location_in_warehouse=cargo.location_in_warehouse,
-        created_at=cargo.created_at,
-        updated_at=cargo.updated_at
-    )
+    response_mapper = cargo_response_mapper.project(fields)
+    return trusted_response(response_mapper.entity_class, response_mapper.one(cargo))
 
 
 @router.get("/tracking/{tracking_number}", response_model=CargoResponse)
@@ -150,31 +108,7 @@ def get_cargo_by_tracking(
             detail="Cargo not found"
         )
     
-    return CargoResponse(
-        id=cargo.id,
-        tracking_number=cargo.tracking_number,
-        cargo_type=cargo.cargo_type,
-        name=cargo.name,
-        description=cargo.description,
-        weight=cargo.weight,
-        volume=cargo.volume,
-        dimensions=cargo.dimensions,
-        value=cargo.value,
-        insurance_amount=cargo.insurance_amount,
-        temperature_requirements=cargo.temperature_requirements,
-        humidity_requirements=cargo.humidity_requirements,
-        hazardous_material=cargo.hazardous_material,
-        hazardous_class=cargo.hazardous_class,
-        special_handling=cargo.special_handling,
-        fragility_level=cargo.fragility_level,
-        storage_duration=cargo.storage_duration,
-        expiration_date=cargo.expiration_date,
-        status=cargo.status,
-        warehouse_id=cargo.warehouse_id,
-        location_in_warehouse=cargo.location_in_warehouse,
-        created_at=cargo.created_at,
-        updated_at=cargo.updated_at
-    )
+    return cargo_response_mapper.one(cargo)
 
 
 @router.get("/warehouse/{warehouse_id}", response_model=List[CargoResponse])
@@ -186,34 +120,7 @@ def list_cargo_by_warehouse(
     cargo_repository = CargoRepository(db)
     cargos = cargo_repository.get_by_warehouse_id(warehouse_id)
     
-    return [
-        CargoResponse(
-            id=cargo.id,
-            tracking_number=cargo.tracking_number,
-            cargo_type=cargo.cargo_type,
-            name=cargo.name,
-            description=cargo.description,
-            weight=cargo.weight,
-            volume=cargo.volume,
-            dimensions=cargo.dimensions,
-            value=cargo.value,
-            insurance_amount=cargo.insurance_amount,
-            temperature_requirements=cargo.temperature_requirements,
-            humidity_requirements=cargo.humidity_requirements,
-            hazardous_material=cargo.hazardous_material,
-            hazardous_class=cargo.hazardous_class,
-            special_handling=cargo.special_handling,
-            fragility_level=cargo.fragility_level,
-            storage_duration=cargo.storage_duration,
-            expiration_date=cargo.expiration_date,
-            status=cargo.status,
-            warehouse_id=cargo.warehouse_id,
-            location_in_warehouse=cargo.location_in_warehouse,
-            created_at=cargo.created_at,
-            updated_at=cargo.updated_at
-        )
-        for cargo in cargos
-    ]
+    return trusted_response(List[CargoResponse], cargo_response_mapper.many(cargos))
 
 
 @router.put("/{cargo_id}", response_model=CargoResponse)
@@ -232,31 +139,7 @@ def update_cargo(
             detail="Cargo not found"
         )
     
-    return CargoResponse(
-        id=updated_cargo.id,
-        tracking_number=updated_cargo.tracking_number,
-        cargo_type=updated_cargo.cargo_type,
-        name=updated_cargo.name,
-        description=updated_cargo.description,
-        weight=updated_cargo.weight,
-        volume=updated_cargo.volume,
-        dimensions=updated_cargo.dimensions,
-        value=updated_cargo.value,
-        insurance_amount=updated_cargo.insurance_amount,
-        temperature_requirements=updated_cargo.temperature_requirements,
-        humidity_requirements=updated_cargo.humidity_requirements,
-        hazardous_material=updated_cargo.hazardous_material,
-        hazardous_class=updated_cargo.hazardous_class,
-        special_handling=updated_cargo.special_handling,
-        fragility_level=updated_cargo.fragility_level,
-        storage_duration=updated_cargo.storage_duration,
-        expiration_date=updated_cargo.expiration_date,
-        status=updated_cargo.status,
-        warehouse_id=updated_cargo.warehouse_id,
-        location_in_warehouse=updated_cargo.location_in_warehouse,
-        created_at=updated_cargo.created_at,
-        updated_at=updated_cargo.updated_at
-    )
+    return cargo_response_mapper.one(updated_cargo)
 
 
 @router.delete("/{cargo_id}", status_code=status.HTTP_204_NO_CONTENT)
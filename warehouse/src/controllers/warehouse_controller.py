@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from entities.warehouse import WarehouseCreate, WarehouseUpdate, WarehouseResponse
 from use_cases.create_warehouse_use_case import CreateWarehouseUseCase
 from repositories.warehouse_repository import WarehouseRepository
 from config.database import get_db
+from config.settings import get_settings
+from shared.utils.mapping import RowMapper
+from shared.utils.responses import cache_headers, etag_matches, make_etag, not_modified, trusted_response
 from utils.auth_utils import get_current_user, require_any_role
 
+# Сущности из репозитория уже проверены: ответ собирается без повторной валидации полей
+warehouse_response_mapper = RowMapper(WarehouseResponse)
+settings = get_settings()
 router = APIRouter(prefix="/warehouses", tags=["warehouses"])
 
 
@@ -54,45 +60,37 @@ def create_warehouse(
 def get_all_warehouses(
     skip: int = 0,
     limit: int = 100,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user())
 ):
     warehouse_repository = WarehouseRepository(db)
+    etag = make_etag(*warehouse_repository.get_list_version())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, settings.http_cache_max_age_seconds)
+    
     warehouses = warehouse_repository.get_all(skip=skip, limit=limit)
     
-    return [
-        WarehouseResponse(
-            id=warehouse.id,
-            name=warehouse.name,
-            warehouse_type=warehouse.warehouse_type,
-            address=warehouse.address,
-            city=warehouse.city,
-            country=warehouse.country,
-            postal_code=warehouse.postal_code,
-            phone=warehouse.phone,
-            email=warehouse.email,
-            total_capacity_weight=warehouse.total_capacity_weight,
-            total_capacity_volume=warehouse.total_capacity_volume,
-            available_capacity_weight=warehouse.available_capacity_weight,
-            available_capacity_volume=warehouse.available_capacity_volume,
-            temperature_controlled=warehouse.temperature_controlled,
-            hazardous_materials_allowed=warehouse.hazardous_materials_allowed,
-            operating_hours=warehouse.operating_hours,
-            status=warehouse.status,
-            created_at=warehouse.created_at,
-            updated_at=warehouse.updated_at
-        ) for warehouse in warehouses
-    ]
+    return trusted_response(List[WarehouseResponse], warehouse_response_mapper.many(warehouses),
+                            headers=cache_headers(etag, settings.http_cache_max_age_seconds))
 
 
 @router.get("/{warehouse_id}", response_model=WarehouseResponse)
 def get_warehouse(
     warehouse_id: str,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user())
 ):
     warehouse_repository = WarehouseRepository(db)
-    warehouse = warehouse_repository.get_by_id(warehouse_id)
+    # Версия читается по первичному ключу: на 304 склад не загружается целиком
+    version = warehouse_repository.get_version(warehouse_id)
+    warehouse = None
+    if version is not None:
+        etag = make_etag(version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.http_cache_max_age_seconds)
+        warehouse = warehouse_repository.get_by_id(warehouse_id)
     
     if not warehouse:
         raise HTTPException(
@@ -100,27 +98,8 @@ def get_warehouse(
             detail="Warehouse not found"
         )
     
-    return WarehouseResponse(
-        id=warehouse.id,
-        name=warehouse.name,
-        warehouse_type=warehouse.warehouse_type,
-        address=warehouse.address,
-        city=warehouse.city,
-        country=warehouse.country,
-        postal_code=warehouse.postal_code,
-        phone=warehouse.phone,
-        email=warehouse.email,
-        total_capacity_weight=warehouse.total_capacity_weight,
-        total_capacity_volume=warehouse.total_capacity_volume,
-        available_capacity_weight=warehouse.available_capacity_weight,
-        available_capacity_volume=warehouse.available_capacity_volume,
-        temperature_controlled=warehouse.temperature_controlled,
-        hazardous_materials_allowed=warehouse.hazardous_materials_allowed,
-        operating_hours=warehouse.operating_hours,
-        status=warehouse.status,
-        created_at=warehouse.created_at,
-        updated_at=warehouse.updated_at
-    )
+    return trusted_response(WarehouseResponse, warehouse_response_mapper.one(warehouse),
+                            headers=cache_headers(etag, settings.http_cache_max_age_seconds))
 
 
 @router.put("/{warehouse_id}", response_model=WarehouseResponse)
@@ -139,27 +118,7 @@ def update_warehouse(
             detail="Warehouse not found"
         )
     
-    return WarehouseResponse(
-        id=updated_warehouse.id,
-        name=updated_warehouse.name,
-        warehouse_type=updated_warehouse.warehouse_type,
-        address=updated_warehouse.address,
-        city=updated_warehouse.city,
-        country=updated_warehouse.country,
-        postal_code=updated_warehouse.postal_code,
-        phone=updated_warehouse.phone,
-        email=updated_warehouse.email,
-        total_capacity_weight=updated_warehouse.total_capacity_weight,
-        total_capacity_volume=updated_warehouse.total_capacity_volume,
-        available_capacity_weight=updated_warehouse.available_capacity_weight,
-        available_capacity_volume=updated_warehouse.available_capacity_volume,
-        temperature_controlled=updated_warehouse.temperature_controlled,
-        hazardous_materials_allowed=updated_warehouse.hazardous_materials_allowed,
-        operating_hours=updated_warehouse.operating_hours,
-        status=updated_warehouse.status,
-        created_at=updated_warehouse.created_at,
-        updated_at=updated_warehouse.updated_at
-    )
+    return warehouse_response_mapper.one(updated_warehouse)
 
 
 @router.delete("/{warehouse_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -8,6 +8,8 @@ Base = declarative_base()
 
 class WarehouseModel(Base):
     __tablename__ = "warehouses"
+    # created_at/updated_at вычисляются сервером: INSERT/UPDATE ... RETURNING возвращает их сразу, без refresh
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(100), nullable=False, unique=True)
@@ -32,6 +34,8 @@ class WarehouseModel(Base):
 
 class CargoModel(Base):
     __tablename__ = "cargo"
+    # created_at/updated_at вычисляются сервером: INSERT/UPDATE ... RETURNING возвращает их сразу, без refresh
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     tracking_number = Column(String(50), nullable=False, unique=True)
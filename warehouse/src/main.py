@@ -1,19 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 import structlog
 
 from config import get_settings, setup_logging
-from config.database import create_tables, engine
+from config.database import create_tables, engine, async_engine, replica_set
+from shared.utils.compression import CompressionMiddleware
+from shared.utils.database import get_pool_stats
 from controllers import warehouse_controller, cargo_controller, compatibility_controller
 from admin import setup_admin
+from utils.auth_utils import revocation_list, jwks_client
 
 settings = get_settings()
 
 app = FastAPI(
     title="Warehouse Service",
     description="Warehouse and cargo management service",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -24,6 +28,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    encodings=settings.compression_encodings
+)
+
 setup_logging(settings.log_level)
 logger = structlog.get_logger()
 
@@ -36,17 +46,33 @@ def startup_event():
     logger.info("Warehouse service starting up")
     create_tables()
     setup_admin(app, engine)
+    revocation_list.start(settings.token_revocation_sync_seconds)
+    if jwks_client is not None:
+        jwks_client.start(settings.jwks_refresh_seconds)
     logger.info("Database tables created")
     logger.info("Admin panel setup complete")
 
 @app.on_event("shutdown")
 def shutdown_event():
     logger.info("Warehouse service shutting down")
+    revocation_list.stop()
+    if jwks_client is not None:
+        jwks_client.stop()
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "service": "warehouse"}
 
+
+@app.get("/health/db")
+def database_pool_health():
+    # Загрузка пулов соединений: рост checked_out до capacity - признак исчерпания пула
+    return {
+        "sync": get_pool_stats(engine),
+        "async": get_pool_stats(async_engine),
+        "replicas": replica_set.get_stats() if replica_set else None
+    }
+
 @app.get("/admin-login")
 async def admin_login_page():
     """Кастомная страница входа в админ-панель"""
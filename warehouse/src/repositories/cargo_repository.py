@@ -1,12 +1,19 @@
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from sqlalchemy.orm import Session
 from sqlalchemy import select, update, delete
+from shared.utils.database import replica_read
+from shared.utils.mapping import RowMapper
 
-from entities.cargo import Cargo, CargoCreate, CargoUpdate, CargoType, CargoStatus
+from entities.cargo import Cargo, CargoCreate, CargoUpdate, CargoStatus
 from entities.database_models import CargoModel
 from repositories.interfaces.cargo_repository import CargoRepositoryInterface
 
 
+cargo_mapper = RowMapper(Cargo)
+# Списки читаются строками колонок: без ORM объектов и identity map
+CARGO_COLUMNS = cargo_mapper.columns(CargoModel)
+
+
 class CargoRepository(CargoRepositoryInterface):
     def __init__(self, session: Session):
         self.session = session
@@ -36,66 +43,22 @@ class CargoRepository(CargoRepositoryInterface):
         )
         
         self.session.add(db_cargo)
-        self.session.commit()
-        self.session.refresh(db_cargo)
+        self.session.flush()
         
-        return Cargo(
-            id=db_cargo.id,
-            tracking_number=db_cargo.tracking_number,
-            cargo_type=CargoType(db_cargo.cargo_type),
-            name=db_cargo.name,
-            description=db_cargo.description,
-            weight=db_cargo.weight,
-            volume=db_cargo.volume,
-            dimensions=db_cargo.dimensions,
-            value=db_cargo.value,
-            insurance_amount=db_cargo.insurance_amount,
-            temperature_requirements=db_cargo.temperature_requirements,
-            humidity_requirements=db_cargo.humidity_requirements,
-            hazardous_material=db_cargo.hazardous_material,
-            hazardous_class=db_cargo.hazardous_class,
-            special_handling=db_cargo.special_handling,
-            fragility_level=db_cargo.fragility_level,
-            storage_duration=db_cargo.storage_duration,
-            expiration_date=db_cargo.expiration_date,
-            status=CargoStatus(db_cargo.status),
-            warehouse_id=db_cargo.warehouse_id,
-            location_in_warehouse=db_cargo.location_in_warehouse,
-            created_at=db_cargo.created_at,
-            updated_at=db_cargo.updated_at
-        )
+        result = cargo_mapper.one(db_cargo)
+        self.session.commit()
+        return result
     
-    def get_by_id(self, cargo_id: str) -> Optional[Cargo]:
+    def get_by_id(self, cargo_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Cargo]:
+        if fields:
+            mapper = cargo_mapper.project(fields)
+            return mapper.one(self.session.query(*mapper.columns(CargoModel)).filter(CargoModel.id == cargo_id).first())
         db_cargo = self.session.query(CargoModel).filter(CargoModel.id == cargo_id).first()
         
         if not db_cargo:
             return None
             
-        return Cargo(
-            id=db_cargo.id,
-            tracking_number=db_cargo.tracking_number,
-            cargo_type=CargoType(db_cargo.cargo_type),
-            name=db_cargo.name,
-            description=db_cargo.description,
-            weight=db_cargo.weight,
-            volume=db_cargo.volume,
-            dimensions=db_cargo.dimensions,
-            value=db_cargo.value,
-            insurance_amount=db_cargo.insurance_amount,
-            temperature_requirements=db_cargo.temperature_requirements,
-            humidity_requirements=db_cargo.humidity_requirements,
-            hazardous_material=db_cargo.hazardous_material,
-            hazardous_class=db_cargo.hazardous_class,
-            special_handling=db_cargo.special_handling,
-            fragility_level=db_cargo.fragility_level,
-            storage_duration=db_cargo.storage_duration,
-            expiration_date=db_cargo.expiration_date,
-            status=CargoStatus(db_cargo.status),
-            warehouse_id=db_cargo.warehouse_id,
-            location_in_warehouse=db_cargo.location_in_warehouse,
-            created_at=db_cargo.created_at,
-            updated_at=db_cargo.updated_at
-        )
+        return cargo_mapper.one(db_cargo)
     
     def get_by_tracking_number(self, tracking_number: str) -> Optional[Cargo]:
         db_cargo = self.session.query(CargoModel).filter(CargoModel.tracking_number == tracking_number).first()
@@ -103,101 +66,26 @@ class CargoRepository(CargoRepositoryInterface):
         if not db_cargo:
             return None
             
-        return Cargo(
-            id=db_cargo.id,
-            tracking_number=db_cargo.tracking_number,
-            cargo_type=CargoType(db_cargo.cargo_type),
-            name=db_cargo.name,
-            description=db_cargo.description,
-            weight=db_cargo.weight,
-            volume=db_cargo.volume,
-            dimensions=db_cargo.dimensions,
-            value=db_cargo.value,
-            insurance_amount=db_cargo.insurance_amount,
-            temperature_requirements=db_cargo.temperature_requirements,
-            humidity_requirements=db_cargo.humidity_requirements,
-            hazardous_material=db_cargo.hazardous_material,
-            hazardous_class=db_cargo.hazardous_class,
-            special_handling=db_cargo.special_handling,
-            fragility_level=db_cargo.fragility_level,
-            storage_duration=db_cargo.storage_duration,
-            expiration_date=db_cargo.expiration_date,
-            status=CargoStatus(db_cargo.status),
-            warehouse_id=db_cargo.warehouse_id,
-            location_in_warehouse=db_cargo.location_in_warehouse,
-            created_at=db_cargo.created_at,
-            updated_at=db_cargo.updated_at
-        )
+        return cargo_mapper.one(db_cargo)
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Cargo]:
-        db_cargos = self.session.query(CargoModel).offset(skip).limit(limit).all()
+    @replica_read("session")
+    def get_all(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Cargo]:
+        mapper = cargo_mapper.project(fields)
+        db_cargos = self.session.query(*mapper.columns(CargoModel)).offset(skip).limit(limit).all()
         
-        return [
-            Cargo(
-                id=db_cargo.id,
-                tracking_number=db_cargo.tracking_number,
-                cargo_type=CargoType(db_cargo.cargo_type),
-                name=db_cargo.name,
-                description=db_cargo.description,
-                weight=db_cargo.weight,
-                volume=db_cargo.volume,
-                dimensions=db_cargo.dimensions,
-                value=db_cargo.value,
-                insurance_amount=db_cargo.insurance_amount,
-                temperature_requirements=db_cargo.temperature_requirements,
-                humidity_requirements=db_cargo.humidity_requirements,
-                hazardous_material=db_cargo.hazardous_material,
-                hazardous_class=db_cargo.hazardous_class,
-                special_handling=db_cargo.special_handling,
-                fragility_level=db_cargo.fragility_level,
-                storage_duration=db_cargo.storage_duration,
-                expiration_date=db_cargo.expiration_date,
-                status=CargoStatus(db_cargo.status),
-                warehouse_id=db_cargo.warehouse_id,
-                location_in_warehouse=db_cargo.location_in_warehouse,
-                created_at=db_cargo.created_at,
-                updated_at=db_cargo.updated_at
-            )
-            for db_cargo in db_cargos
-        ]
+        return mapper.many(db_cargos)
     
-    def list_cargo(self, skip: int = 0, limit: int = 100) -> List[Cargo]:
-        return self.get_all(skip, limit)
+    def list_cargo(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Cargo]:
+        return self.get_all(skip, limit, fields)
     
+    @replica_read("session")
     def get_by_warehouse_id(self, warehouse_id: str) -> List[Cargo]:
-        db_cargos = self.session.query(CargoModel).filter(CargoModel.warehouse_id == warehouse_id).all()
+        db_cargos = self.session.query(*CARGO_COLUMNS).filter(CargoModel.warehouse_id == warehouse_id).all()
         
-        return [
-            Cargo(
-                id=db_cargo.id,
-                tracking_number=db_cargo.tracking_number,
-                cargo_type=CargoType(db_cargo.cargo_type),
-                name=db_cargo.name,
-                description=db_cargo.description,
-                weight=db_cargo.weight,
-                volume=db_cargo.volume,
-                dimensions=db_cargo.dimensions,
-                value=db_cargo.value,
-                insurance_amount=db_cargo.insurance_amount,
-                temperature_requirements=db_cargo.temperature_requirements,
-                humidity_requirements=db_cargo.humidity_requirements,
-                hazardous_material=db_cargo.hazardous_material,
-                hazardous_class=db_cargo.hazardous_class,
-                special_handling=db_cargo.special_handling,
-                fragility_level=db_cargo.fragility_level,
-                storage_duration=db_cargo.storage_duration,
-                expiration_date=db_cargo.expiration_date,
-                status=CargoStatus(db_cargo.status),
-                warehouse_id=db_cargo.warehouse_id,
-                location_in_warehouse=db_cargo.location_in_warehouse,
-                created_at=db_cargo.created_at,
-                updated_at=db_cargo.updated_at
-            )
-            for db_cargo in db_cargos
-        ]
+        return cargo_mapper.many(db_cargos)
     
     def update(self, cargo_id: str, cargo_update: CargoUpdate) -> Optional[Cargo]:
-        db_cargo = self.session.query(CargoModel).filter(CargoModel.id == cargo_id).first()
+        db_cargo = self.session.get(CargoModel, cargo_id)
         
         if not db_cargo:
             return None
@@ -243,37 +131,14 @@ class CargoRepository(CargoRepositoryInterface):
         if cargo_update.location_in_warehouse is not None:
             db_cargo.location_in_warehouse = cargo_update.location_in_warehouse
         
-        self.session.commit()
-        self.session.refresh(db_cargo)
+        self.session.flush()
         
-        return Cargo(
-            id=db_cargo.id,
-            tracking_number=db_cargo.tracking_number,
-            cargo_type=CargoType(db_cargo.cargo_type),
-            name=db_cargo.name,
-            description=db_cargo.description,
-            weight=db_cargo.weight,
-            volume=db_cargo.volume,
-            dimensions=db_cargo.dimensions,
-            value=db_cargo.value,
-            insurance_amount=db_cargo.insurance_amount,
-            temperature_requirements=db_cargo.temperature_requirements,
-            humidity_requirements=db_cargo.humidity_requirements,
-            hazardous_material=db_cargo.hazardous_material,
-            hazardous_class=db_cargo.hazardous_class,
-            special_handling=db_cargo.special_handling,
-            fragility_level=db_cargo.fragility_level,
-            storage_duration=db_cargo.storage_duration,
-            expiration_date=db_cargo.expiration_date,
-            status=CargoStatus(db_cargo.status),
-            warehouse_id=db_cargo.warehouse_id,
-            location_in_warehouse=db_cargo.location_in_warehouse,
-            created_at=db_cargo.created_at,
-            updated_at=db_cargo.updated_at
-        )
+        result = cargo_mapper.one(db_cargo)
+        self.session.commit()
+        return result
     
     def delete(self, cargo_id: str) -> bool:
-        db_cargo = self.session.query(CargoModel).filter(CargoModel.id == cargo_id).first()
+        db_cargo = self.session.get(CargoModel, cargo_id)
         if not db_cargo:
             return False
         
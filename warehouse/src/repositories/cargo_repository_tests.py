@@ -73,7 +73,6 @@ def test_create_cargo_success(f_cargo_repository, m_session, f_cargo_create_data
     # Mock session behavior
     m_session.add.return_value = None
     m_session.commit.return_value = None
-    m_session.refresh.return_value = None
     
     # Mock the created object to have proper values
     created_cargo = CargoModel(
@@ -102,13 +101,14 @@ def test_create_cargo_success(f_cargo_repository, m_session, f_cargo_create_data
         updated_at=datetime.utcnow()
     )
     
-    # Mock refresh to set the created object
-    def mock_refresh(obj):
+    # Mock flush: INSERT ... RETURNING fills server-generated values
+    def mock_flush():
+        obj = m_session.add.call_args.args[0]
         obj.id = created_cargo.id
         obj.created_at = created_cargo.created_at
         obj.updated_at = created_cargo.updated_at
     
-    m_session.refresh.side_effect = mock_refresh
+    m_session.flush.side_effect = mock_flush
     
     # Execute repository method
     result = f_cargo_repository.create(f_cargo_create_data)
@@ -116,7 +116,8 @@ def test_create_cargo_success(f_cargo_repository, m_session, f_cargo_create_data
     # Verify session calls
     m_session.add.assert_called_once()
     m_session.commit.assert_called_once()
-    m_session.refresh.assert_called_once()
+    m_session.flush.assert_called_once()
+    m_session.refresh.assert_not_called()
     
     # Verify result
     assert result.tracking_number == f_cargo_create_data.tracking_number
@@ -232,13 +233,9 @@ def test_get_by_warehouse_id_success(f_cargo_repository, m_session, f_db_cargo_m
 
 
 def test_update_cargo_success(f_cargo_repository, m_session, f_db_cargo_model):
-    # Mock query result
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = f_db_cargo_model
-    m_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_session.get.return_value = f_db_cargo_model
     m_session.commit.return_value = None
-    m_session.refresh.return_value = None
     
     # Create update data
     update_data = CargoUpdate(
@@ -251,7 +248,8 @@ def test_update_cargo_success(f_cargo_repository, m_session, f_db_cargo_model):
     
     # Verify session calls
     m_session.commit.assert_called_once()
-    m_session.refresh.assert_called_once()
+    m_session.flush.assert_called_once()
+    m_session.refresh.assert_not_called()
     
     # Verify result
     assert result is not None
@@ -260,11 +258,8 @@ def test_update_cargo_success(f_cargo_repository, m_session, f_db_cargo_model):
 
 
 def test_update_cargo_not_found(f_cargo_repository, m_session):
-    # Mock query result
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = None
-    m_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_session.get.return_value = None
     
     # Create update data
     update_data = CargoUpdate(name="Updated Cargo")
@@ -278,11 +273,8 @@ def test_update_cargo_not_found(f_cargo_repository, m_session):
 
 
 def test_delete_cargo_success(f_cargo_repository, m_session, f_db_cargo_model):
-    # Mock query result
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = f_db_cargo_model
-    m_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_session.get.return_value = f_db_cargo_model
     m_session.delete.return_value = None
     m_session.commit.return_value = None
     
@@ -298,11 +290,8 @@ def test_delete_cargo_success(f_cargo_repository, m_session, f_db_cargo_model):
 
 
 def test_delete_cargo_not_found(f_cargo_repository, m_session):
-    # Mock query result
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = None
-    m_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_session.get.return_value = None
     
     # Execute repository method
     result = f_cargo_repository.delete("nonexistent-id")
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from entities.cargo import Cargo, CargoCreate, CargoUpdate
 
 
@@ -9,7 +9,7 @@ class CargoRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    def get_by_id(self, cargo_id: str) -> Optional[Cargo]:
+    def get_by_id(self, cargo_id: str, fields: Optional[Sequence[str]] = None) -> Optional[Cargo]:
         pass
     
     @abstractmethod
@@ -17,11 +17,11 @@ class CargoRepositoryInterface(ABC):
         pass
     
     @abstractmethod
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Cargo]:
+    def get_all(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Cargo]:
         pass
     
     @abstractmethod
-    def list_cargo(self, skip: int = 0, limit: int = 100) -> List[Cargo]:
+    def list_cargo(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Cargo]:
         pass
     
     @abstractmethod
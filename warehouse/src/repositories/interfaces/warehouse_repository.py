@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Tuple
 from entities.warehouse import Warehouse, WarehouseCreate, WarehouseUpdate
 
 
@@ -12,6 +13,14 @@ class IWarehouseRepository(ABC):
     def get_by_id(self, warehouse_id: str) -> Optional[Warehouse]:
         pass
     
+    @abstractmethod
+    def get_version(self, warehouse_id: str) -> Optional[datetime]:
+        pass
+    
+    @abstractmethod
+    def get_list_version(self) -> Tuple[int, Optional[datetime]]:
+        pass
+    
     @abstractmethod
     def get_by_name(self, name: str) -> Optional[Warehouse]:
         pass
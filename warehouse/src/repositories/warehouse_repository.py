@@ -1,12 +1,22 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete
+from sqlalchemy import func, select, update, delete
+from shared.utils.database import replica_read
+from shared.utils.mapping import RowMapper
 
-from entities.warehouse import Warehouse, WarehouseCreate, WarehouseUpdate, WarehouseType, WarehouseStatus
+from entities.warehouse import Warehouse, WarehouseCreate, WarehouseUpdate, WarehouseStatus
 from entities.database_models import WarehouseModel
 from repositories.interfaces.warehouse_repository import IWarehouseRepository
 
 
+warehouse_mapper = RowMapper(Warehouse)
+# Списки читаются строками колонок: без ORM объектов и identity map
+WAREHOUSE_COLUMNS = warehouse_mapper.columns(WarehouseModel)
+# Версия строки для ETag
+WAREHOUSE_VERSION = func.coalesce(WarehouseModel.updated_at, WarehouseModel.created_at)
+
+
 class WarehouseRepository(IWarehouseRepository):
     def __init__(self, session: Session):
         self.session = session
@@ -32,30 +42,11 @@ class WarehouseRepository(IWarehouseRepository):
         )
         
         self.session.add(db_warehouse)
-        self.session.commit()
-        self.session.refresh(db_warehouse)
+        self.session.flush()
         
-        return Warehouse(
-            id=db_warehouse.id,
-            name=db_warehouse.name,
-            warehouse_type=WarehouseType(db_warehouse.warehouse_type),
-            address=db_warehouse.address,
-            city=db_warehouse.city,
-            country=db_warehouse.country,
-            postal_code=db_warehouse.postal_code,
-            phone=db_warehouse.phone,
-            email=db_warehouse.email,
-            total_capacity_weight=db_warehouse.total_capacity_weight,
-            total_capacity_volume=db_warehouse.total_capacity_volume,
-            available_capacity_weight=db_warehouse.available_capacity_weight,
-            available_capacity_volume=db_warehouse.available_capacity_volume,
-            temperature_controlled=db_warehouse.temperature_controlled,
-            hazardous_materials_allowed=db_warehouse.hazardous_materials_allowed,
-            operating_hours=db_warehouse.operating_hours,
-            status=WarehouseStatus(db_warehouse.status),
-            created_at=db_warehouse.created_at,
-            updated_at=db_warehouse.updated_at
-        )
+        result = warehouse_mapper.one(db_warehouse)
+        self.session.commit()
+        return result
     
     def get_by_id(self, warehouse_id: str) -> Optional[Warehouse]:
         db_warehouse = self.session.query(WarehouseModel).filter(WarehouseModel.id == warehouse_id).first()
@@ -63,27 +54,17 @@ class WarehouseRepository(IWarehouseRepository):
         if not db_warehouse:
             return None
             
-        return Warehouse(
-            id=db_warehouse.id,
-            name=db_warehouse.name,
-            warehouse_type=WarehouseType(db_warehouse.warehouse_type),
-            address=db_warehouse.address,
-            city=db_warehouse.city,
-            country=db_warehouse.country,
-            postal_code=db_warehouse.postal_code,
-            phone=db_warehouse.phone,
-            email=db_warehouse.email,
-            total_capacity_weight=db_warehouse.total_capacity_weight,
-            total_capacity_volume=db_warehouse.total_capacity_volume,
-            available_capacity_weight=db_warehouse.available_capacity_weight,
-            available_capacity_volume=db_warehouse.available_capacity_volume,
-            temperature_controlled=db_warehouse.temperature_controlled,
-            hazardous_materials_allowed=db_warehouse.hazardous_materials_allowed,
-            operating_hours=db_warehouse.operating_hours,
-            status=WarehouseStatus(db_warehouse.status),
-            created_at=db_warehouse.created_at,
-            updated_at=db_warehouse.updated_at
-        )
+        return warehouse_mapper.one(db_warehouse)
+    
+    def get_version(self, warehouse_id: str) -> Optional[datetime]:
+        """Last change time of the warehouse, None if it does not exist; cheaper than loading it"""
+        return self.session.scalar(select(WAREHOUSE_VERSION).where(WarehouseModel.id == warehouse_id))
+    
+    @replica_read("session")
+    def get_list_version(self) -> Tuple[int, Optional[datetime]]:
+        """Row count and last change time: any insert, update or delete changes the pair"""
+        count, changed_at = self.session.execute(select(func.count(), func.max(WAREHOUSE_VERSION))).one()
+        return count, changed_at
     
     def get_by_name(self, name: str) -> Optional[Warehouse]:
         db_warehouse = self.session.query(WarehouseModel).filter(WarehouseModel.name == name).first()
@@ -91,61 +72,19 @@ class WarehouseRepository(IWarehouseRepository):
         if not db_warehouse:
             return None
             
-        return Warehouse(
-            id=db_warehouse.id,
-            name=db_warehouse.name,
-            warehouse_type=WarehouseType(db_warehouse.warehouse_type),
-            address=db_warehouse.address,
-            city=db_warehouse.city,
-            country=db_warehouse.country,
-            postal_code=db_warehouse.postal_code,
-            phone=db_warehouse.phone,
-            email=db_warehouse.email,
-            total_capacity_weight=db_warehouse.total_capacity_weight,
-            total_capacity_volume=db_warehouse.total_capacity_volume,
-            available_capacity_weight=db_warehouse.available_capacity_weight,
-            available_capacity_volume=db_warehouse.available_capacity_volume,
-            temperature_controlled=db_warehouse.temperature_controlled,
-            hazardous_materials_allowed=db_warehouse.hazardous_materials_allowed,
-            operating_hours=db_warehouse.operating_hours,
-            status=WarehouseStatus(db_warehouse.status),
-            created_at=db_warehouse.created_at,
-            updated_at=db_warehouse.updated_at
-        )
+        return warehouse_mapper.one(db_warehouse)
     
+    @replica_read("session")
     def get_all(self, skip: int = 0, limit: int = 100) -> List[Warehouse]:
-        db_warehouses = self.session.query(WarehouseModel).offset(skip).limit(limit).all()
+        db_warehouses = self.session.query(*WAREHOUSE_COLUMNS).offset(skip).limit(limit).all()
         
-        return [
-            Warehouse(
-                id=db_warehouse.id,
-                name=db_warehouse.name,
-                warehouse_type=WarehouseType(db_warehouse.warehouse_type),
-                address=db_warehouse.address,
-                city=db_warehouse.city,
-                country=db_warehouse.country,
-                postal_code=db_warehouse.postal_code,
-                phone=db_warehouse.phone,
-                email=db_warehouse.email,
-                total_capacity_weight=db_warehouse.total_capacity_weight,
-                total_capacity_volume=db_warehouse.total_capacity_volume,
-                available_capacity_weight=db_warehouse.available_capacity_weight,
-                available_capacity_volume=db_warehouse.available_capacity_volume,
-                temperature_controlled=db_warehouse.temperature_controlled,
-                hazardous_materials_allowed=db_warehouse.hazardous_materials_allowed,
-                operating_hours=db_warehouse.operating_hours,
-                status=WarehouseStatus(db_warehouse.status),
-                created_at=db_warehouse.created_at,
-                updated_at=db_warehouse.updated_at
-            )
-            for db_warehouse in db_warehouses
-        ]
+        return warehouse_mapper.many(db_warehouses)
     
     def list_warehouses(self, skip: int = 0, limit: int = 100) -> List[Warehouse]:
         return self.get_all(skip, limit)
     
     def update(self, warehouse_id: str, warehouse_update: WarehouseUpdate) -> Optional[Warehouse]:
-        db_warehouse = self.session.query(WarehouseModel).filter(WarehouseModel.id == warehouse_id).first()
+        db_warehouse = self.session.get(WarehouseModel, warehouse_id)
         
         if not db_warehouse:
             return None
@@ -179,33 +118,14 @@ class WarehouseRepository(IWarehouseRepository):
         if warehouse_update.status is not None:
             db_warehouse.status = warehouse_update.status.value
         
-        self.session.commit()
-        self.session.refresh(db_warehouse)
+        self.session.flush()
         
-        return Warehouse(
-            id=db_warehouse.id,
-            name=db_warehouse.name,
-            warehouse_type=WarehouseType(db_warehouse.warehouse_type),
-            address=db_warehouse.address,
-            city=db_warehouse.city,
-            country=db_warehouse.country,
-            postal_code=db_warehouse.postal_code,
-            phone=db_warehouse.phone,
-            email=db_warehouse.email,
-            total_capacity_weight=db_warehouse.total_capacity_weight,
-            total_capacity_volume=db_warehouse.total_capacity_volume,
-            available_capacity_weight=db_warehouse.available_capacity_weight,
-            available_capacity_volume=db_warehouse.available_capacity_volume,
-            temperature_controlled=db_warehouse.temperature_controlled,
-            hazardous_materials_allowed=db_warehouse.hazardous_materials_allowed,
-            operating_hours=db_warehouse.operating_hours,
-            status=WarehouseStatus(db_warehouse.status),
-            created_at=db_warehouse.created_at,
-            updated_at=db_warehouse.updated_at
-        )
+        result = warehouse_mapper.one(db_warehouse)
+        self.session.commit()
+        return result
     
     def delete(self, warehouse_id: str) -> bool:
-        db_warehouse = self.session.query(WarehouseModel).filter(WarehouseModel.id == warehouse_id).first()
+        db_warehouse = self.session.get(WarehouseModel, warehouse_id)
         if not db_warehouse:
             return False
         
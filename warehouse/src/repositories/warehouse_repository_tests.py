@@ -65,7 +65,6 @@ def test_create_warehouse_success(f_warehouse_repository, m_session, f_warehouse
     # Mock session behavior
     m_session.add.return_value = None
     m_session.commit.return_value = None
-    m_session.refresh.return_value = None
     
     # Mock the created object to have proper values
     created_warehouse = WarehouseModel(
@@ -90,13 +89,14 @@ def test_create_warehouse_success(f_warehouse_repository, m_session, f_warehouse
         updated_at=datetime.utcnow()
     )
     
-    # Mock refresh to set the created object
-    def mock_refresh(obj):
+    # Mock flush: INSERT ... RETURNING fills server-generated values
+    def mock_flush():
+        obj = m_session.add.call_args.args[0]
         obj.id = created_warehouse.id
         obj.created_at = created_warehouse.created_at
         obj.updated_at = created_warehouse.updated_at
     
-    m_session.refresh.side_effect = mock_refresh
+    m_session.flush.side_effect = mock_flush
     
     # Execute repository method
     result = f_warehouse_repository.create(f_warehouse_create_data)
@@ -104,7 +104,8 @@ def test_create_warehouse_success(f_warehouse_repository, m_session, f_warehouse
     # Verify session calls
     m_session.add.assert_called_once()
     m_session.commit.assert_called_once()
-    m_session.refresh.assert_called_once()
+    m_session.flush.assert_called_once()
+    m_session.refresh.assert_not_called()
     
     # Verify result
     assert result.name == f_warehouse_create_data.name
@@ -205,13 +206,9 @@ def test_get_all_success(f_warehouse_repository, m_session, f_db_warehouse_model
 
 
 def test_update_warehouse_success(f_warehouse_repository, m_session, f_db_warehouse_model):
-    # Mock query result
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = f_db_warehouse_model
-    m_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_session.get.return_value = f_db_warehouse_model
     m_session.commit.return_value = None
-    m_session.refresh.return_value = None
     
     # Create update data
     update_data = WarehouseUpdate(
@@ -224,7 +221,8 @@ def test_update_warehouse_success(f_warehouse_repository, m_session, f_db_wareho
     
     # Verify session calls
     m_session.commit.assert_called_once()
-    m_session.refresh.assert_called_once()
+    m_session.flush.assert_called_once()
+    m_session.refresh.assert_not_called()
     
     # Verify result
     assert result is not None
@@ -233,11 +231,8 @@ def test_update_warehouse_success(f_warehouse_repository, m_session, f_db_wareho
 
 
 def test_update_warehouse_not_found(f_warehouse_repository, m_session):
-    # Mock query result
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = None
-    m_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_session.get.return_value = None
     
     # Create update data
     update_data = WarehouseUpdate(name="Updated Warehouse")
@@ -251,11 +246,8 @@ def test_update_warehouse_not_found(f_warehouse_repository, m_session):
 
 
 def test_delete_warehouse_success(f_warehouse_repository, m_session, f_db_warehouse_model):
-    # Mock query result
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = f_db_warehouse_model
-    m_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_session.get.return_value = f_db_warehouse_model
     m_session.delete.return_value = None
     m_session.commit.return_value = None
     
@@ -271,11 +263,8 @@ def test_delete_warehouse_success(f_warehouse_repository, m_session, f_db_wareho
 
 
 def test_delete_warehouse_not_found(f_warehouse_repository, m_session):
-    # Mock query result
-    mock_query = MagicMock()
-    mock_query.filter.return_value = mock_query
-    mock_query.first.return_value = None
-    m_session.query.return_value = mock_query
+    # Mock primary key lookup
+    m_session.get.return_value = None
     
     # Execute repository method
     result = f_warehouse_repository.delete("nonexistent-id")
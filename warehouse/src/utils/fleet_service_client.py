@@ -1,10 +1,14 @@
 import httpx
 from typing import Optional, Dict, Any
 from config.settings import get_settings
+from shared.utils.http_cache import ConditionalCache
 from utils.auth_utils import get_auth_service_client
 
 
 class FleetServiceClient:
+    # Общий для всех экземпляров: клиент создается на каждую проверку совместимости
+    cache = ConditionalCache()
+    
     def __init__(self):
         self.settings = get_settings()
         # In Docker, use the service name, otherwise use localhost
@@ -20,18 +24,15 @@ class FleetServiceClient:
         try:
             async with httpx.AsyncClient() as client:
                 headers = {"Authorization": f"Bearer {token}"}
-                response = await client.get(f"{self.base_url}/vehicles/{vehicle_id}", headers=headers)
-                if response.status_code == 200:
-                    vehicle_data = response.json()
-                    return {
-                        "id": vehicle_data["id"],
-                        "capacity_weight": vehicle_data["capacity_weight"],
-                        "capacity_volume": vehicle_data["capacity_volume"],
-                        "temperature_controlled": self._is_temperature_controlled(vehicle_data),
-                        "hazardous_materials_certified": self._is_hazardous_certified(vehicle_data),
-                        "special_equipment": self._get_special_equipment(vehicle_data)
-                    }
-                return None
+                vehicle_data = await self.cache.get_async(client, f"{self.base_url}/vehicles/{vehicle_id}", headers=headers)
+                return {
+                    "id": vehicle_data["id"],
+                    "capacity_weight": vehicle_data["capacity_weight"],
+                    "capacity_volume": vehicle_data["capacity_volume"],
+                    "temperature_controlled": self._is_temperature_controlled(vehicle_data),
+                    "hazardous_materials_certified": self._is_hazardous_certified(vehicle_data),
+                    "special_equipment": self._get_special_equipment(vehicle_data)
+                }
         except Exception:
             return None
     